@@ -0,0 +1,431 @@
+"""
+Champions Gen - Mock AI Engine
+
+Simulated prediction models behind the /api/predict and /api/explain routes.
+Each prediction has a scalar form taking one player record and a NumPy
+vectorized ``*_batch`` form that scores whole arrays of players at once and
+returns results in the same structure.
+
+Every method accepts an optional ``numpy.random.Generator``. Without one the
+scalar forms draw from the global ``random`` module as before; with a
+generator from ``prediction_rng`` a prediction becomes a pure function of
+(player, record version, prediction type, MODEL_VERSION).
+
+``apply_workload`` overlays measured wearables workload on an injury
+prediction, so live load changes never invalidate the seeded base.
+
+The batch forms are built on ``*_columns`` forms that return one array per
+output field, for callers that want a dense matrix rather than dicts.
+"""
+
+import hashlib
+import random
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Bump whenever prediction logic changes so seeded outputs and cached responses roll over
+MODEL_VERSION = '1.0.0'
+
+POSITION_RISK_FACTORS = {'Goalkeeper': -5, 'Defender': 2, 'Midfielder': 3, 'Forward': 4}
+# Market value multipliers for the next five horizons, by age bucket (<24, <28, older)
+VALUE_MULTIPLIERS = np.array([
+    [1.05, 1.15, 1.20, 1.15, 1.05],
+    [0.98, 0.95, 0.90, 0.85, 0.75],
+    [0.90, 0.80, 0.65, 0.50, 0.35],
+])
+PERFORMANCE_TRENDS = ['positive', 'stable', 'declining']
+CONTRACT_STATUSES = ['favorable', 'neutral', 'concerning']
+INJURY_DRIVERS = [
+    # (driver name, column)
+    ('Training Load', 'training_load'),
+    ('Match Density', 'match_density'),
+    ('Recovery Time', 'recovery_time'),
+    ('Age Factor', 'age_factor'),
+    ('Physical Condition', 'physical_condition'),
+]
+XAI_FACTORS = {
+    # (factor, importance range, explanation)
+    'recruitment': [
+        ('Age Profile', (0.8, 0.95), 'Optimal age for position development'),
+        ('Performance Metrics', (0.7, 0.9), 'Strong statistical performance in key areas'),
+        ('Injury History', (0.6, 0.85), 'Clean injury record indicates reliability'),
+        ('League Adaptation', (0.5, 0.8), 'Successfully adapted to competitive league'),
+    ],
+    'development': [
+        ('Training Response', (0.8, 0.95), 'Positive response to structured training'),
+        ('Physical Attributes', (0.7, 0.9), 'Strong physical foundation for improvement'),
+        ('Mental Maturity', (0.6, 0.85), 'Demonstrates tactical awareness and decision-making'),
+        ('Playing Time', (0.5, 0.8), 'Regular playing time accelerates development'),
+    ],
+}
+DEVELOPMENT_SKILLS = [
+    # (skill, current range, potential range), inclusive like random.randint
+    ('Technical', (70, 95), (75, 98)),
+    ('Physical', (65, 90), (70, 95)),
+    ('Mental', (60, 85), (70, 92)),
+    ('Tactical', (65, 88), (75, 95)),
+]
+
+
+def acwr_impact(acwr: float) -> float:
+    """Training Load driver from the acute:chronic workload ratio.
+
+    0.8-1.3 is the protective band (most protective near 1.05); spikes past
+    1.3 raise risk up to +8 at 2.0, and detraining below 0.8 adds up to +3.
+    """
+    if acwr > 1.3:
+        return 8.0 * min(1.0, (acwr - 1.3) / 0.7)
+    if acwr < 0.8:
+        return 3.0 * (0.8 - acwr) / 0.8
+    return -3.0 * (1 - abs(acwr - 1.05) / 0.25)
+
+
+def recovery_impact(load_48h: float, chronic_load: float) -> float:
+    """Recovery Time driver: the last two days' load against two typical days"""
+    if chronic_load <= 0:
+        return 0.0
+    return float(np.clip(2.5 * (load_48h / (2 * chronic_load) - 1), -2, 5))
+
+
+def _lookup(values: Sequence[str], table: Dict[str, float], default: float = 0) -> np.ndarray:
+    """Map a sequence of category strings through ``table`` without a per-item dict lookup"""
+    uniques, inverse = np.unique(np.asarray(values, dtype=object), return_inverse=True)
+    mapped = np.array([table.get(u, default) for u in uniques], dtype=np.float64)
+    return mapped[inverse.reshape(-1)]
+
+
+def _round(values: np.ndarray) -> List[float]:
+    return np.round(values, 1).tolist()
+
+
+def prediction_seed(player_id: str, version: int, prediction_type: str,
+                    model_version: str = MODEL_VERSION) -> int:
+    """Stable 64-bit seed for one (player, record version, prediction type, model version)"""
+    key = f'{model_version}|{prediction_type}|{player_id}|{version}'.encode()
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), 'little')
+
+
+def prediction_rng(player_id: str, version: int, prediction_type: str,
+                   model_version: str = MODEL_VERSION) -> np.random.Generator:
+    """Fresh generator seeded for a single deterministic prediction"""
+    return np.random.default_rng(prediction_seed(player_id, version, prediction_type, model_version))
+
+
+class _GeneratorDraws:
+    """``random``-module style draws backed by a numpy Generator"""
+
+    def __init__(self, rng: np.random.Generator):
+        self.rng = rng
+
+    def uniform(self, low: float, high: float) -> float:
+        return float(self.rng.uniform(low, high))
+
+    def randint(self, low: int, high: int) -> int:
+        return int(self.rng.integers(low, high + 1))
+
+    def choice(self, options: Sequence):
+        return options[int(self.rng.integers(len(options)))]
+
+
+def _draws(rng: Optional[np.random.Generator]):
+    return random if rng is None else _GeneratorDraws(rng)
+
+
+class MockAIEngine:
+    """Mock AI engine that simulates real AI predictions and analytics"""
+    
+    @staticmethod
+    def predict_injury_risk(player_data: Dict, rng: Optional[np.random.Generator] = None) -> Dict:
+        """Mock injury risk prediction with realistic factors"""
+        draw = _draws(rng)
+        base_risk = draw.uniform(10, 35)
+        age_factor = max(0, (player_data.get('age', 25) - 25) * 0.5)
+        position_factor = POSITION_RISK_FACTORS.get(player_data.get('position', 'Midfielder'), 0)
+        
+        current_risk = max(5, min(50, base_risk + age_factor + position_factor))
+        
+        return {
+            'current_risk': round(current_risk, 1),
+            'weekly_risk': round(current_risk * 1.3, 1),
+            'biweekly_risk': round(current_risk * 1.6, 1),
+            'confidence': round(draw.uniform(85, 98), 1),
+            'drivers': [
+                {'name': 'Training Load', 'impact': round(draw.uniform(-3, 8), 1)},
+                {'name': 'Match Density', 'impact': round(draw.uniform(0, 6), 1)},
+                {'name': 'Recovery Time', 'impact': round(draw.uniform(-2, 5), 1)},
+                {'name': 'Age Factor', 'impact': round(age_factor, 1)},
+                {'name': 'Physical Condition', 'impact': round(draw.uniform(-4, 3), 1)}
+            ]
+        }
+    
+    @staticmethod
+    def apply_workload(prediction: Dict, workload: Optional[Dict]) -> Dict:
+        """Injury prediction with Training Load and Recovery Time taken from measured workload.
+
+        ``workload`` is a wearables.WorkloadTracker reading; both drivers are
+        added to the risk. Returns a new dict and leaves ``prediction`` as is.
+        """
+        if not workload or workload.get('acwr') is None:
+            return prediction
+        impacts = {
+            'Training Load': round(acwr_impact(workload['acwr']), 1),
+            'Recovery Time': round(recovery_impact(workload['load_48h'], workload['chronic_load']), 1)
+        }
+        current_risk = max(5, min(50, prediction['current_risk'] + sum(impacts.values())))
+        return {
+            **prediction,
+            'current_risk': round(current_risk, 1),
+            'weekly_risk': round(current_risk * 1.3, 1),
+            'biweekly_risk': round(current_risk * 1.6, 1),
+            'drivers': [{'name': d['name'], 'impact': impacts.get(d['name'], d['impact'])}
+                        for d in prediction['drivers']],
+            'workload': workload
+        }
+    
+    @staticmethod
+    def predict_player_development(player_data: Dict, rng: Optional[np.random.Generator] = None) -> Dict:
+        """Mock player development prediction"""
+        draw = _draws(rng)
+        age = player_data.get('age', 25)
+        position = player_data.get('position', 'Midfielder')
+        
+        # Age-based development curve
+        if age < 23:
+            potential_growth = draw.uniform(5, 15)
+        elif age < 27:
+            potential_growth = draw.uniform(2, 8)
+        else:
+            potential_growth = draw.uniform(-2, 3)
+        
+        return {
+            'potential_growth': round(potential_growth, 1),
+            'peak_age': 28 if position in ['Midfielder', 'Forward'] else 30,
+            'development_areas': [
+                {'skill': 'Technical', 'current': draw.randint(70, 95), 'potential': draw.randint(75, 98)},
+                {'skill': 'Physical', 'current': draw.randint(65, 90), 'potential': draw.randint(70, 95)},
+                {'skill': 'Mental', 'current': draw.randint(60, 85), 'potential': draw.randint(70, 92)},
+                {'skill': 'Tactical', 'current': draw.randint(65, 88), 'potential': draw.randint(75, 95)}
+            ],
+            'confidence': round(draw.uniform(80, 95), 1)
+        }
+    
+    @staticmethod
+    def predict_market_value(player_data: Dict, rng: Optional[np.random.Generator] = None) -> Dict:
+        """Mock market value prediction"""
+        draw = _draws(rng)
+        current_value = player_data.get('current_value', 50000000)
+        age = player_data.get('age', 25)
+        position = player_data.get('position', 'Midfielder')
+        
+        # Age-based value curve
+        if age < 24:
+            multipliers = [1.05, 1.15, 1.20, 1.15, 1.05]
+        elif age < 28:
+            multipliers = [0.98, 0.95, 0.90, 0.85, 0.75]
+        else:
+            multipliers = [0.90, 0.80, 0.65, 0.50, 0.35]
+        
+        predictions = [int(current_value * m) for m in multipliers]
+        
+        return {
+            'current_value': current_value,
+            'predictions': predictions,
+            'optimal_sell_window': '12-18 months' if age < 28 else '6-12 months',
+            'confidence': round(draw.uniform(75, 92), 1),
+            'factors': [
+                {'name': 'Age Profile', 'impact': 'high' if age < 26 else 'medium'},
+                {'name': 'Position Demand', 'impact': 'high' if position in ['Forward', 'Midfielder'] else 'medium'},
+                {'name': 'Performance Trend', 'impact': draw.choice(['positive', 'stable', 'declining'])},
+                {'name': 'Contract Status', 'impact': draw.choice(['favorable', 'neutral', 'concerning'])}
+            ]
+        }
+    
+    @staticmethod
+    def generate_xai_explanation(player_data: Dict, prediction_type: str,
+                                 rng: Optional[np.random.Generator] = None) -> Dict:
+        """Generate explainable AI insights"""
+        draw = _draws(rng)
+        # Every type's importances are drawn, in table order, so seeded outputs stay stable
+        explanations = {
+            name: [{'factor': factor, 'importance': draw.uniform(low, high), 'explanation': explanation}
+                   for factor, (low, high), explanation in factors]
+            for name, factors in XAI_FACTORS.items()
+        }
+        
+        return {
+            'prediction_type': prediction_type,
+            'confidence': round(draw.uniform(85, 98), 1),
+            'explanations': explanations.get(prediction_type, explanations['recruitment'])
+        }
+    
+    @staticmethod
+    def generate_training_recommendations(player_data: Dict,
+                                          rng: Optional[np.random.Generator] = None) -> List[Dict]:
+        """Mock personalized training recommendations"""
+        draw = _draws(rng)
+        return [
+            {
+                'category': 'Technical',
+                'priority': draw.choice(['HIGH', 'MEDIUM', 'LOW']),
+                'title': f'Improve {draw.choice(["passing accuracy", "first touch", "ball control"])}',
+                'description': 'Focus on technical drills to enhance ball manipulation skills',
+                'duration': f'{draw.randint(15, 30)} minutes',
+                'frequency': f'{draw.randint(2, 4)}x per week'
+            },
+            {
+                'category': 'Physical',
+                'priority': draw.choice(['HIGH', 'MEDIUM', 'LOW']),
+                'title': f'Enhance {draw.choice(["sprint speed", "endurance", "strength"])}',
+                'description': 'Targeted physical conditioning program',
+                'duration': f'{draw.randint(20, 45)} minutes',
+                'frequency': f'{draw.randint(2, 5)}x per week'
+            },
+            {
+                'category': 'Tactical',
+                'priority': draw.choice(['HIGH', 'MEDIUM', 'LOW']),
+                'title': f'Develop {draw.choice(["positioning", "decision making", "game reading"])}',
+                'description': 'Tactical awareness and game intelligence training',
+                'duration': f'{draw.randint(10, 25)} minutes',
+                'frequency': f'{draw.randint(1, 3)}x per week'
+            }
+        ]
+    
+    # Vectorized forms. ``*_columns`` take parallel arrays for N players and
+    # return one array per output field; ``*_batch`` returns N results shaped
+    # exactly like the scalar method's output.
+    
+    @staticmethod
+    def predict_injury_risk_columns(ages: np.ndarray, positions: Sequence[str],
+                                    rng: Optional[np.random.Generator] = None) -> Dict[str, np.ndarray]:
+        """Vectorized predict_injury_risk, unrounded; drivers keyed by their INJURY_DRIVERS column"""
+        rng = rng or np.random.default_rng()
+        n = len(ages)
+        base_risk = rng.uniform(10, 35, n)
+        age_factor = np.maximum(0, (np.asarray(ages, dtype=np.float64) - 25) * 0.5)
+        position_factor = _lookup(positions, POSITION_RISK_FACTORS)
+        current_risk = np.clip(base_risk + age_factor + position_factor, 5, 50)
+        return {
+            'current_risk': current_risk,
+            'weekly_risk': current_risk * 1.3,
+            'biweekly_risk': current_risk * 1.6,
+            'confidence': rng.uniform(85, 98, n),
+            'training_load': rng.uniform(-3, 8, n),
+            'match_density': rng.uniform(0, 6, n),
+            'recovery_time': rng.uniform(-2, 5, n),
+            'age_factor': age_factor,
+            'physical_condition': rng.uniform(-4, 3, n)
+        }
+    
+    @staticmethod
+    def predict_injury_risk_batch(ages: np.ndarray, positions: Sequence[str],
+                                  rng: Optional[np.random.Generator] = None) -> List[Dict]:
+        """Vectorized predict_injury_risk"""
+        columns = {k: _round(v) for k, v in MockAIEngine.predict_injury_risk_columns(ages, positions, rng).items()}
+        return [{
+            'current_risk': columns['current_risk'][i],
+            'weekly_risk': columns['weekly_risk'][i],
+            'biweekly_risk': columns['biweekly_risk'][i],
+            'confidence': columns['confidence'][i],
+            'drivers': [{'name': name, 'impact': columns[key][i]} for name, key in INJURY_DRIVERS]
+        } for i in range(len(ages))]
+    
+    @staticmethod
+    def predict_player_development_columns(ages: np.ndarray, positions: Sequence[str],
+                                           rng: Optional[np.random.Generator] = None) -> Dict[str, np.ndarray]:
+        """Vectorized predict_player_development; skills as ``<skill>_current``/``<skill>_potential``"""
+        rng = rng or np.random.default_rng()
+        ages = np.asarray(ages)
+        n = len(ages)
+        low = np.select([ages < 23, ages < 27], [5, 2], -2)
+        high = np.select([ages < 23, ages < 27], [15, 8], 3)
+        columns = {
+            'potential_growth': rng.uniform(low, high),
+            'peak_age': np.where(np.isin(np.asarray(positions, dtype=object), ['Midfielder', 'Forward']), 28, 30)
+        }
+        for name, cur, pot in DEVELOPMENT_SKILLS:
+            columns[f'{name.lower()}_current'] = rng.integers(cur[0], cur[1] + 1, n)
+            columns[f'{name.lower()}_potential'] = rng.integers(pot[0], pot[1] + 1, n)
+        columns['confidence'] = rng.uniform(80, 95, n)
+        return columns
+    
+    @staticmethod
+    def predict_player_development_batch(ages: np.ndarray, positions: Sequence[str],
+                                         rng: Optional[np.random.Generator] = None) -> List[Dict]:
+        """Vectorized predict_player_development"""
+        columns = MockAIEngine.predict_player_development_columns(ages, positions, rng)
+        growth = _round(columns['potential_growth'])
+        peak_age = columns['peak_age'].tolist()
+        skills = [(name, columns[f'{name.lower()}_current'].tolist(), columns[f'{name.lower()}_potential'].tolist())
+                  for name, _, _ in DEVELOPMENT_SKILLS]
+        confidence = _round(columns['confidence'])
+        
+        return [{
+            'potential_growth': growth[i],
+            'peak_age': peak_age[i],
+            'development_areas': [
+                {'skill': name, 'current': current[i], 'potential': potential[i]}
+                for name, current, potential in skills
+            ],
+            'confidence': confidence[i]
+        } for i in range(len(peak_age))]
+    
+    @staticmethod
+    def predict_market_value_columns(current_values: np.ndarray, ages: np.ndarray, positions: Sequence[str],
+                                     rng: Optional[np.random.Generator] = None) -> Dict[str, np.ndarray]:
+        """Vectorized predict_market_value; ``predictions`` is (N, 5), trend/contract are indexes
+        into PERFORMANCE_TRENDS/CONTRACT_STATUSES"""
+        rng = rng or np.random.default_rng()
+        ages = np.asarray(ages)
+        current_values = np.asarray(current_values, dtype=np.int64)
+        n = len(ages)
+        bucket = np.select([ages < 24, ages < 28], [0, 1], 2)
+        return {
+            'current_value': current_values,
+            # Truncate toward zero like int() in the scalar path
+            'predictions': np.trunc(current_values[:, None] * VALUE_MULTIPLIERS[bucket]).astype(np.int64),
+            'optimal_sell_window': np.where(ages < 28, '12-18 months', '6-12 months'),
+            'confidence': rng.uniform(75, 92, n),
+            'age_profile': np.where(ages < 26, 'high', 'medium'),
+            'position_demand': np.where(np.isin(np.asarray(positions, dtype=object), ['Forward', 'Midfielder']),
+                                        'high', 'medium'),
+            'performance_trend': rng.integers(0, len(PERFORMANCE_TRENDS), n),
+            'contract_status': rng.integers(0, len(CONTRACT_STATUSES), n)
+        }
+    
+    @staticmethod
+    def predict_market_value_batch(current_values: np.ndarray, ages: np.ndarray, positions: Sequence[str],
+                                   rng: Optional[np.random.Generator] = None) -> List[Dict]:
+        """Vectorized predict_market_value"""
+        columns = MockAIEngine.predict_market_value_columns(current_values, ages, positions, rng)
+        values = columns['current_value'].tolist()
+        predictions = columns['predictions'].tolist()
+        sell_window = columns['optimal_sell_window'].tolist()
+        confidence = _round(columns['confidence'])
+        age_profile = columns['age_profile'].tolist()
+        demand = columns['position_demand'].tolist()
+        trend = columns['performance_trend'].tolist()
+        contract = columns['contract_status'].tolist()
+        
+        return [{
+            'current_value': values[i],
+            'predictions': predictions[i],
+            'optimal_sell_window': sell_window[i],
+            'confidence': confidence[i],
+            'factors': [
+                {'name': 'Age Profile', 'impact': age_profile[i]},
+                {'name': 'Position Demand', 'impact': demand[i]},
+                {'name': 'Performance Trend', 'impact': PERFORMANCE_TRENDS[trend[i]]},
+                {'name': 'Contract Status', 'impact': CONTRACT_STATUSES[contract[i]]}
+            ]
+        } for i in range(len(values))]
+    
+    @staticmethod
+    def generate_xai_explanation_columns(n: int, prediction_type: str,
+                                         rng: Optional[np.random.Generator] = None) -> Dict[str, np.ndarray]:
+        """Vectorized generate_xai_explanation: importance per factor (keyed by factor name) and confidence"""
+        rng = rng or np.random.default_rng()
+        factors = XAI_FACTORS.get(prediction_type, XAI_FACTORS['recruitment'])
+        columns = {factor: rng.uniform(low, high, n) for factor, (low, high), _ in factors}
+        columns['confidence'] = rng.uniform(85, 98, n)
+        return columns
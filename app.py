@@ -7,138 +7,95 @@ This backend provides realistic mock endpoints for the Champions Gen platform,
 simulating AI-powered player analytics, injury prediction, and strategic insights.
 """
 
-from flask import Flask, jsonify, request, render_template
+from flask import Flask, Blueprint, current_app, jsonify, request, render_template, g, has_request_context, redirect, url_for
 from flask_cors import CORS
 import random
 import json
+import base64
 import datetime
-from typing import Dict, List, Any
+import functools
+import gc
+import os
+import threading
+import time
+from typing import Dict, List, Any, Optional, Tuple
 import numpy as np
 
-app = Flask(__name__)
-CORS(app)
+from ai_engine import MockAIEngine, MODEL_VERSION, prediction_rng, prediction_seed
+from assets import AssetManifest, IMMUTABLE, Representation
+from data_sources import SourceGateway, configured_sources, DATA_SOURCES, SOURCE_NAMES
+from live import LiveHub, StreamsFull, Topic
+from metrics import MetricsRegistry, ProcessSampler, instrument_engine, render_gauges
+from json_provider import FastJSONProvider
+from export import DEFAULT_CHUNK_SIZE, csv_stream, iter_export_chunks, ndjson_stream
+from materializer import PredictionMaterializer, PREDICTION_TYPES, score_rows_batch
+from offload import DEFAULT_TIMEOUT as DEFAULT_OFFLOAD_TIMEOUT, JobTimeout, OffloadExecutor, Overloaded
+from player_store import PlayerStore, SORT_KEYS, resolve_fields
+from rotation import (FORMATIONS, INTENSITIES, MAX_FATIGUE, MAX_MATCH_RISK, POSITIONS as ROTATION_POSITIONS,
+                      default_fixtures, plan_rotation)
+from response_cache import ResponseCache, etag_for
+from scouting import FORMATS as MATRIX_FORMATS, MIMETYPES as MATRIX_MIMETYPES, arrow_available, \
+    encode_arrow, encode_npy, prediction_matrix
+from search import SearchIndex
+from similarity import SimilarityIndex, METRICS as SIMILARITY_METRICS
+from valuation import DEFAULT_PATHS, MAX_PATHS, MIN_PATHS, ValueSimulator, simulation_inputs, value_bands
+from training_jobs import FINISHED_STATES, TrainingJobs
+from timeseries import (TimeSeriesStore, AGGREGATIONS, SESSION_DTYPE, WEEK, METRICS as PERFORMANCE_METRICS,
+                        downsample, parse_duration, synthetic_sessions, trend_label)
+from wearables import WorkloadTracker, parse_binary, parse_ndjson
 
-# Mock AI Models and Data
-class MockAIEngine:
-    """Mock AI engine that simulates real AI predictions and analytics"""
-    
-    @staticmethod
-    def predict_injury_risk(player_data: Dict) -> Dict:
-        """Mock injury risk prediction with realistic factors"""
-        base_risk = random.uniform(10, 35)
-        age_factor = max(0, (player_data.get('age', 25) - 25) * 0.5)
-        position_factor = {'Goalkeeper': -5, 'Defender': 2, 'Midfielder': 3, 'Forward': 4}.get(
-            player_data.get('position', 'Midfielder'), 0)
-        
-        current_risk = max(5, min(50, base_risk + age_factor + position_factor))
-        
-        return {
-            'current_risk': round(current_risk, 1),
-            'weekly_risk': round(current_risk * 1.3, 1),
-            'biweekly_risk': round(current_risk * 1.6, 1),
-            'confidence': round(random.uniform(85, 98), 1),
-            'drivers': [
-                {'name': 'Training Load', 'impact': round(random.uniform(-3, 8), 1)},
-                {'name': 'Match Density', 'impact': round(random.uniform(0, 6), 1)},
-                {'name': 'Recovery Time', 'impact': round(random.uniform(-2, 5), 1)},
-                {'name': 'Age Factor', 'impact': round(age_factor, 1)},
-                {'name': 'Physical Condition', 'impact': round(random.uniform(-4, 3), 1)}
-            ]
-        }
-    
-    @staticmethod
-    def predict_player_development(player_data: Dict) -> Dict:
-        """Mock player development prediction"""
-        age = player_data.get('age', 25)
-        position = player_data.get('position', 'Midfielder')
-        
-        # Age-based development curve
-        if age < 23:
-            potential_growth = random.uniform(5, 15)
-        elif age < 27:
-            potential_growth = random.uniform(2, 8)
-        else:
-            potential_growth = random.uniform(-2, 3)
-        
-        return {
-            'potential_growth': round(potential_growth, 1),
-            'peak_age': 28 if position in ['Midfielder', 'Forward'] else 30,
-            'development_areas': [
-                {'skill': 'Technical', 'current': random.randint(70, 95), 'potential': random.randint(75, 98)},
-                {'skill': 'Physical', 'current': random.randint(65, 90), 'potential': random.randint(70, 95)},
-                {'skill': 'Mental', 'current': random.randint(60, 85), 'potential': random.randint(70, 92)},
-                {'skill': 'Tactical', 'current': random.randint(65, 88), 'potential': random.randint(75, 95)}
-            ],
-            'confidence': round(random.uniform(80, 95), 1)
-        }
-    
-    @staticmethod
-    def predict_market_value(player_data: Dict) -> Dict:
-        """Mock market value prediction"""
-        current_value = player_data.get('current_value', 50000000)
-        age = player_data.get('age', 25)
-        position = player_data.get('position', 'Midfielder')
-        
-        # Age-based value curve
-        if age < 24:
-            multipliers = [1.05, 1.15, 1.20, 1.15, 1.05]
-        elif age < 28:
-            multipliers = [0.98, 0.95, 0.90, 0.85, 0.75]
-        else:
-            multipliers = [0.90, 0.80, 0.65, 0.50, 0.35]
-        
-        predictions = [int(current_value * m) for m in multipliers]
-        
-        return {
-            'current_value': current_value,
-            'predictions': predictions,
-            'optimal_sell_window': '12-18 months' if age < 28 else '6-12 months',
-            'confidence': round(random.uniform(75, 92), 1),
-            'factors': [
-                {'name': 'Age Profile', 'impact': 'high' if age < 26 else 'medium'},
-                {'name': 'Position Demand', 'impact': 'high' if position in ['Forward', 'Midfielder'] else 'medium'},
-                {'name': 'Performance Trend', 'impact': random.choice(['positive', 'stable', 'declining'])},
-                {'name': 'Contract Status', 'impact': random.choice(['favorable', 'neutral', 'concerning'])}
-            ]
-        }
+# Request instrumentation, exposed at /api/metrics; CHAMPIONS_METRICS=0 disables recording
+METRICS = MetricsRegistry(enabled=os.environ.get('CHAMPIONS_METRICS', '1') != '0')
+PROCESS = ProcessSampler()
+ENGINE_METHODS = (
+    'predict_injury_risk', 'predict_player_development', 'predict_market_value',
+    'generate_xai_explanation', 'generate_training_recommendations',
+    'predict_injury_risk_batch', 'predict_player_development_batch', 'predict_market_value_batch',
+    'apply_workload', 'predict_injury_risk_columns', 'predict_player_development_columns',
+    'predict_market_value_columns', 'generate_xai_explanation_columns'
+)
+
+def route_label() -> str:
+    """Route template for metric labels, so /api/players/<player_id> is one series"""
+    if not has_request_context():
+        return 'none'
+    return request.url_rule.rule if request.url_rule else 'unmatched'
+
+class InstrumentedJSONProvider(FastJSONProvider):
+    """Fast JSON provider that records response serialization time per route"""
     
-    @staticmethod
-    def generate_xai_explanation(player_data: Dict, prediction_type: str) -> Dict:
-        """Generate explainable AI insights"""
-        explanations = {
-            'recruitment': [
-                {'factor': 'Age Profile', 'importance': random.uniform(0.8, 0.95), 
-                 'explanation': 'Optimal age for position development'},
-                {'factor': 'Performance Metrics', 'importance': random.uniform(0.7, 0.9), 
-                 'explanation': 'Strong statistical performance in key areas'},
-                {'factor': 'Injury History', 'importance': random.uniform(0.6, 0.85), 
-                 'explanation': 'Clean injury record indicates reliability'},
-                {'factor': 'League Adaptation', 'importance': random.uniform(0.5, 0.8), 
-                 'explanation': 'Successfully adapted to competitive league'}
-            ],
-            'development': [
-                {'factor': 'Training Response', 'importance': random.uniform(0.8, 0.95), 
-                 'explanation': 'Positive response to structured training'},
-                {'factor': 'Physical Attributes', 'importance': random.uniform(0.7, 0.9), 
-                 'explanation': 'Strong physical foundation for improvement'},
-                {'factor': 'Mental Maturity', 'importance': random.uniform(0.6, 0.85), 
-                 'explanation': 'Demonstrates tactical awareness and decision-making'},
-                {'factor': 'Playing Time', 'importance': random.uniform(0.5, 0.8), 
-                 'explanation': 'Regular playing time accelerates development'}
-            ]
-        }
-        
-        return {
-            'prediction_type': prediction_type,
-            'confidence': round(random.uniform(85, 98), 1),
-            'explanations': explanations.get(prediction_type, explanations['recruitment'])
-        }
+    def response(self, *args, **kwargs):
+        start = time.perf_counter()
+        response = super().response(*args, **kwargs)
+        METRICS.record_serialization(route_label(), time.perf_counter() - start)
+        return response
+
+# Routes, request hooks and template globals; create_app() registers them on a Flask app
+api = Blueprint('champions', __name__)
+
+@api.before_app_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@api.after_app_request
+def record_request_metrics(response):
+    started = g.pop('request_started', None)
+    if started is not None:
+        METRICS.record_request(request.method, route_label(), response.status_code,
+                               time.perf_counter() - started, response.content_length)
+    return response
 
-# Initialize AI engine
-ai_engine = MockAIEngine()
+# Initialize AI engine; public methods are timed into METRICS
+ai_engine = instrument_engine(MockAIEngine(), METRICS, ENGINE_METHODS)
 
-# Mock player database
-PLAYERS_DB = {
+# Mock player database; CHAMPIONS_PLAYERS_DIR serves a store written by PlayerStore.save
+# instead, memory-mapped so workers share its pages and only touched records are read
+PLAYERS_DIR = os.environ.get('CHAMPIONS_PLAYERS_DIR') or None
+# State every serving process must see alike (training jobs) lives in files under
+# CHAMPIONS_STATE_DIR; serve.py points prefork workers at a shared one when it is unset
+STATE_DIR = os.environ.get('CHAMPIONS_STATE_DIR') or None
+PLAYER_CACHE_SIZE = int(os.environ.get('CHAMPIONS_PLAYER_CACHE_SIZE', 10000))
+DEMO_PLAYERS = {
     'bellingham': {
         'id': 'bellingham',
         'name': 'Jude Bellingham',
@@ -192,16 +149,439 @@ PLAYERS_DB = {
             'tackles_90': 0.8,
             'dribbles_90': 4.2
         }
+    },
+    'camavinga': {
+        'id': 'camavinga',
+        'name': 'Eduardo Camavinga',
+        'position': 'Midfielder',
+        'club': 'Real Madrid',
+        'league': 'La Liga',
+        'age': 22,
+        'nationality': 'France',
+        'current_value': 90000000,
+        'stats': {
+            'overall': 89,
+            'goals_90': 0.6,
+            'assists_90': 1.4,
+            'pass_accuracy': 87,
+            'tackles_90': 2.8,
+            'dribbles_90': 2.9
+        }
+    },
+    'gavi': {
+        'id': 'gavi',
+        'name': 'Pablo Gavi',
+        'position': 'Midfielder',
+        'club': 'FC Barcelona',
+        'league': 'La Liga',
+        'age': 20,
+        'nationality': 'Spain',
+        'current_value': 75000000,
+        'stats': {
+            'overall': 86,
+            'goals_90': 0.9,
+            'assists_90': 1.6,
+            'pass_accuracy': 84,
+            'tackles_90': 2.1,
+            'dribbles_90': 3.8
+        }
+    },
+    'haaland': {
+        'id': 'haaland',
+        'name': 'Erling Haaland',
+        'position': 'Forward',
+        'club': 'Manchester City',
+        'league': 'Premier League',
+        'age': 24,
+        'nationality': 'Norway',
+        'current_value': 180000000,
+        'stats': {
+            'overall': 95,
+            'goals_90': 3.2,
+            'assists_90': 1.1,
+            'pass_accuracy': 72,
+            'tackles_90': 0.6,
+            'dribbles_90': 2.1
+        }
+    },
+    'vinicius': {
+        'id': 'vinicius',
+        'name': 'Vinicius Jr',
+        'position': 'Forward',
+        'club': 'Real Madrid',
+        'league': 'La Liga',
+        'age': 24,
+        'nationality': 'Brazil',
+        'current_value': 150000000,
+        'stats': {
+            'overall': 92,
+            'goals_90': 2.1,
+            'assists_90': 2.4,
+            'pass_accuracy': 79,
+            'tackles_90': 1.2,
+            'dribbles_90': 5.8
+        }
     }
 }
+if PLAYERS_DIR:
+    PLAYERS_DB = PlayerStore.open(PLAYERS_DIR, PLAYER_CACHE_SIZE)
+else:
+    PLAYERS_DB = PlayerStore.from_dict(DEMO_PLAYERS, PLAYER_CACHE_SIZE)
+
+# Deterministic predictions are seeded per (player, record version, type, model version),
+# which makes predict/explain/training responses cacheable. CHAMPIONS_DETERMINISTIC=0
+# restores fresh random draws on every call and bypasses the cache.
+DETERMINISTIC_PREDICTIONS = os.environ.get('CHAMPIONS_DETERMINISTIC', '1') != '0'
+RESPONSE_CACHE = ResponseCache(
+    maxsize=int(os.environ.get('CHAMPIONS_CACHE_SIZE', 4096)),
+    ttl=float(os.environ.get('CHAMPIONS_CACHE_TTL', 300))
+)
+
+# Per-request engine calls (on-demand predictions, explanations, training plans) run through OFFLOAD:
+# in CHAMPIONS_OFFLOAD_PROCESSES worker processes (0 runs them inline), with identical
+# in-flight jobs shared, a 503 once CHAMPIONS_OFFLOAD_QUEUE jobs are pending and a 504
+# after CHAMPIONS_OFFLOAD_TIMEOUT seconds. CHAMPIONS_SIMULATED_INFERENCE_MS adds CPU
+# time per job to stand in for real model inference.
+OFFLOAD = OffloadExecutor(
+    processes=int(os.environ.get('CHAMPIONS_OFFLOAD_PROCESSES', 0)),
+    max_pending=int(os.environ.get('CHAMPIONS_OFFLOAD_QUEUE', 0)) or None,
+    timeout=float(os.environ.get('CHAMPIONS_OFFLOAD_TIMEOUT', DEFAULT_OFFLOAD_TIMEOUT)),
+    simulated_ms=float(os.environ.get('CHAMPIONS_SIMULATED_INFERENCE_MS', 0)),
+    on_job=METRICS.record_engine
+)
+PREDICTION_METHODS = {
+    'injury': 'predict_injury_risk',
+    'development': 'predict_player_development',
+    'value': 'predict_market_value'
+}
+
+def offloaded(kind: str, player_id: str, method: str, *args, version=None):
+    """Engine call through OFFLOAD; deterministic calls are seeded and coalesced per record version"""
+    if not DETERMINISTIC_PREDICTIONS:
+        return OFFLOAD.run(None, method, *args)
+    if version is None:
+        version = PLAYERS_DB.version(player_id)
+    return OFFLOAD.run((kind, player_id, version, MODEL_VERSION), method, *args,
+                       seed=prediction_seed(player_id, version, kind))
+
+# Precomputed predictions, refreshed for players whose record version changed; an
+# on-disk database materializes only the players actually requested
+PREDICTIONS = PredictionMaterializer(
+    lambda: PLAYERS_DB, ai_engine, eager=not PLAYERS_DIR,
+    compute=lambda kind, player_id, version, record: offloaded(kind, player_id, PREDICTION_METHODS[kind], record,
+                                                               version=version))
+MATERIALIZE_INTERVAL = float(os.environ.get('CHAMPIONS_MATERIALIZE_INTERVAL', 30))
+
+# Rolling workloads from ingested wearables samples, overlaid on injury predictions;
+# prefork workers share them through a file in STATE_DIR
+WORKLOADS = WorkloadTracker(directory=STATE_DIR)
+MAX_WEARABLES_BATCH = int(os.environ.get('CHAMPIONS_WEARABLES_MAX_BATCH', 1000000))
+
+def with_workload(prediction_type: str, player_id: str, prediction: Dict) -> Dict:
+    """Injury predictions reflect the player's latest measured workload"""
+    if prediction_type != 'injury':
+        return prediction
+    return ai_engine.apply_workload(prediction, WORKLOADS.workload(player_id))
+
+def player_prediction(prediction_type: str, player_id: str, player: Dict) -> Dict:
+    """Materialized prediction in deterministic mode, a fresh random draw otherwise"""
+    if DETERMINISTIC_PREDICTIONS:
+        return PREDICTIONS.get(prediction_type, player_id)
+    return offloaded(prediction_type, player_id, PREDICTION_METHODS[prediction_type], player)
+
+# Training plans for many players at once (/api/training/jobs), generated in batches of
+# CHAMPIONS_TRAINING_BATCH_SIZE in the background, in CHAMPIONS_TRAINING_PROCESSES worker
+# processes (default one per core, 0 runs batches in the job runner thread). Jobs and results
+# live in CHAMPIONS_STATE_DIR, shared by every serving process. Plans are kept per player
+# record version for reuse, at most CHAMPIONS_TRAINING_PLANS players.
+TRAINING_JOBS = TrainingJobs(
+    lambda: PLAYERS_DB,
+    processes=int(os.environ.get('CHAMPIONS_TRAINING_PROCESSES') or os.cpu_count() or 1),
+    batch_size=int(os.environ.get('CHAMPIONS_TRAINING_BATCH_SIZE', 50)),
+    seed=(lambda player_id, version: prediction_seed(player_id, version, 'training')) if DETERMINISTIC_PREDICTIONS else None,
+    simulated_ms=float(os.environ.get('CHAMPIONS_SIMULATED_INFERENCE_MS', 0)),
+    max_plans=int(os.environ.get('CHAMPIONS_TRAINING_PLANS', 100000)),
+    on_batch=METRICS.record_engine,
+    directory=STATE_DIR
+)
+
+def player_rng(player_id: str, prediction_type: str):
+    """Seeded generator for a deterministic prediction, or None for global random draws"""
+    if not DETERMINISTIC_PREDICTIONS:
+        return None
+    return prediction_rng(player_id, PLAYERS_DB.version(player_id), prediction_type)
+
+def cached_player_response(kind: str, vary_on=(), vary_key=None):
+    """Serve a per-player route from RESPONSE_CACHE with ETag/If-None-Match support.
+
+    The cache key covers the route kind, player id, record version, model
+    version, any query parameters named in ``vary_on`` and, if given, the
+    tuple ``vary_key(player_id)`` returns. Conditional requests whose ETag
+    matches get a 304 without building the response.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(player_id):
+            version = PLAYERS_DB.version(player_id)
+            if not DETERMINISTIC_PREDICTIONS or version is None:
+                return view(player_id)
+            
+            key = (kind, player_id, version, MODEL_VERSION) + tuple(request.args.get(a) for a in vary_on)
+            if vary_key is not None:
+                key += vary_key(player_id)
+            etag = etag_for(key)
+            if request.if_none_match.contains_weak(etag):
+                RESPONSE_CACHE.record_not_modified()
+                response = current_app.response_class(status=304)
+            else:
+                cached = RESPONSE_CACHE.get(key)
+                if cached is not None:
+                    response = current_app.response_class(cached[0], mimetype=cached[1])
+                else:
+                    response = current_app.make_response(view(player_id))
+                    if response.status_code != 200:
+                        return response
+                    RESPONSE_CACHE.put(key, response.get_data(), response.mimetype)
+            response.set_etag(etag, weak=True)
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+        return wrapper
+    return decorator
+
+# Stat-vector similarity behind /api/compare and /api/players/<id>/similar
+SIMILARITY = SimilarityIndex(lambda: PLAYERS_DB)
+MAX_SIMILAR_PLAYERS = 100
+
+# Accent-folded, typo-tolerant text index behind /api/players/search
+SEARCH = SearchIndex(lambda: PLAYERS_DB)
+MAX_SEARCH_RESULTS = 100
+MAX_SEARCH_QUERY_LENGTH = 200
+
+def comparison_recommendation(score: float) -> str:
+    if score >= 85:
+        return 'Similar playing styles detected'
+    if score >= 60:
+        return 'Players have complementary skill sets'
+    return 'Significant tactical differences identified'
+
+# Upstream data sources, fetched concurrently per player (see data_sources.py)
+SOURCES = SourceGateway(configured_sources(), pool_size=int(os.environ.get('CHAMPIONS_SOURCE_POOL', 10)))
+
+# Per-session performance history behind /api/analytics/performance; with
+# CHAMPIONS_TIMESERIES_DIR set, sealed chunks persist there and load memory-mapped
+PERFORMANCE = TimeSeriesStore(os.environ.get('CHAMPIONS_TIMESERIES_DIR') or None)
+MAX_PERFORMANCE_POINTS = 1000
+# Metric names in responses (goals are reported as goals_scored)
+PERFORMANCE_LABELS = {'goals': 'goals_scored'}
+TREND_METRICS = ('passing_accuracy', 'dribbling_success', 'defensive_actions')
+
+def seed_performance_history(years: int = 2):
+    """Demo session history for players without any stored sessions"""
+    end = int(time.time()) // 86400 * 86400
+    for player_id in PLAYERS_DB.ids:
+        if not PERFORMANCE.slices(player_id):
+            PERFORMANCE.append(player_id, synthetic_sessions(player_id, end - years * 365 * 86400, end))
+
+if not PLAYERS_DIR:
+    seed_performance_history()
+
+# Listing limits keep response size bounded regardless of database size
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+def encode_cursor(offset: int) -> str:
+    """Opaque cursor pointing at the next page"""
+    return base64.urlsafe_b64encode(json.dumps({'offset': offset}).encode()).decode().rstrip('=')
+
+def decode_cursor(cursor: str) -> int:
+    padded = cursor + '=' * (-len(cursor) % 4)
+    offset = json.loads(base64.urlsafe_b64decode(padded.encode()))['offset']
+    if not isinstance(offset, int) or offset < 0:
+        raise ValueError('Invalid cursor')
+    return offset
+
+def parse_listing_args() -> Dict[str, Any]:
+    """Parse sort=, fields=, limit=, offset= and cursor= shared by listing routes.
+
+    Raises ValueError with a client-facing message on bad input.
+    """
+    sort = request.args.get('sort')
+    descending = False
+    if sort:
+        descending = sort.startswith('-')
+        sort = sort.lstrip('-')
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Unsupported sort key: {sort}. Use one of {', '.join(SORT_KEYS)}")
+
+    fields = request.args.get('fields')
+    if fields:
+        fields = [f.strip() for f in fields.split(',') if f.strip()]
+        resolve_fields(fields)
+    else:
+        fields = None
+
+    limit = request.args.get('limit', DEFAULT_PAGE_SIZE, type=int)
+    if limit < 1:
+        raise ValueError('limit must be positive')
+    limit = min(limit, MAX_PAGE_SIZE)
+
+    cursor = request.args.get('cursor')
+    try:
+        offset = decode_cursor(cursor) if cursor else request.args.get('offset', 0, type=int)
+    except (ValueError, KeyError, TypeError):
+        raise ValueError('Invalid cursor')
+    if offset < 0:
+        raise ValueError('offset must not be negative')
+
+    return {'sort': sort, 'descending': descending, 'fields': fields, 'limit': limit, 'offset': offset}
+
+def apply_sort(rows, listing: Dict[str, Any]):
+    if listing['sort']:
+        rows = PLAYERS_DB.sort_rows(rows, listing['sort'], listing['descending'])
+    return rows
+
+def paginate(rows, listing: Dict[str, Any]):
+    """Slice sorted rows, returning (page rows, pagination metadata)"""
+    offset, limit = listing['offset'], listing['limit']
+    page = rows[offset:offset + limit]
+    next_offset = offset + len(page)
+    return page, {
+        'total': len(rows),
+        'offset': offset,
+        'limit': limit,
+        'next_cursor': encode_cursor(next_offset) if next_offset < len(rows) else None
+    }
+
+def filtered_rows():
+    """Rows matching the position/league/min_age/max_age/max_value (millions) query filters"""
+    position = request.args.get('position')
+    league = request.args.get('league')
+    min_age = request.args.get('min_age', type=int)
+    max_age = request.args.get('max_age', type=int)
+    max_value = request.args.get('max_value', type=int)
+    return PLAYERS_DB.filter(
+        position=position if position and position != 'All Positions' else None,
+        league=league if league and league != 'All Leagues' else None,
+        min_age=min_age or None,
+        max_age=max_age or None,
+        max_value=max_value * 1000000 if max_value else None
+    )
 
 # Routes
-@app.route('/')
+def player_records(rows, fields=None) -> List:
+    """Records for a page of rows; full records come pre-encoded from the store's LRU"""
+    if fields is None:
+        return [PLAYERS_DB.encoded_record(row, current_app.json.encode_fragment) for row in rows.tolist()]
+    return PLAYERS_DB.records(rows, fields)
+
+# Static files are served content-hashed and precompressed from /assets with immutable
+# caching (see assets.py); the debug server keeps plain /static URLs so edits show up.
+# create_app() builds the manifest from the app's static folder.
+ASSETS: Optional[AssetManifest] = None
+PAGES: Dict[str, Representation] = {}
+
+@api.app_template_global()
+def asset_url(filename: str) -> str:
+    if current_app.debug:
+        return url_for('static', filename=filename)
+    return url_for('champions.get_asset', filename=ASSETS.url_name(filename))
+
+@api.route('/assets/<path:filename>')
+def get_asset(filename):
+    """Serve a hashed static file; an outdated hash redirects to the current one"""
+    asset = ASSETS.get(filename)
+    if asset is None:
+        current = ASSETS.current_name(filename)
+        if current is None:
+            return jsonify({'error': 'Asset not found'}), 404
+        return redirect(url_for('champions.get_asset', filename=current))
+    return asset.response(request, current_app.response_class, IMMUTABLE)
+
+# Everything the single-page app renders about players, built from the store and the
+# models once per database state and revalidated by ETag
+BOOTSTRAP_PLAYERS = int(os.environ.get('CHAMPIONS_BOOTSTRAP_PLAYERS', 200))
+BOOTSTRAP_RECORD_FIELDS = ('id', 'name', 'position', 'club', 'league', 'age', 'nationality', 'current_value', 'stats')
+BOOTSTRAP_FIELDS = BOOTSTRAP_RECORD_FIELDS + ('injury', 'development', 'value', 'explanation', 'training', 'workload',
+                                              'similarity', 'comparable')
+COMPARABLE_PLAYERS = 3
+# (key, body), replaced as a whole so concurrent requests never see one without the other
+BOOTSTRAP: Optional[Tuple[Any, Representation]] = None
+
+def bootstrap_rows() -> np.ndarray:
+    """Every player of a small database, the highest rated BOOTSTRAP_PLAYERS of a large one"""
+    rows = np.arange(len(PLAYERS_DB), dtype=np.intp)
+    if len(rows) <= BOOTSTRAP_PLAYERS:
+        return rows
+    return PLAYERS_DB.sort_rows(rows, 'overall', descending=True)[:BOOTSTRAP_PLAYERS]
+
+def bootstrap_payload() -> Dict:
+    """Columnar bootstrap data: ``players`` rows hold BOOTSTRAP_FIELDS in order.
+
+    ``similarity`` is the best stat-profile match among the other bootstrap
+    players and ``comparable`` lists the closest ones as indexes into
+    ``players``.
+    """
+    rows = bootstrap_rows()
+    records = PLAYERS_DB.records(rows)
+    similarity = SIMILARITY.pairwise(rows) if len(rows) > 1 else np.zeros((len(rows), len(rows)))
+    np.fill_diagonal(similarity, -np.inf)
+    nearest = np.argsort(-similarity, axis=1, kind='stable')[:, :min(COMPARABLE_PLAYERS, len(rows) - 1)]
+    players = []
+    for i, player in enumerate(records):
+        player_id = player['id']
+        players.append([player[f] for f in BOOTSTRAP_RECORD_FIELDS] + [
+            with_workload('injury', player_id, player_prediction('injury', player_id, player)),
+            player_prediction('development', player_id, player),
+            player_prediction('value', player_id, player),
+            ai_engine.generate_xai_explanation(player, 'recruitment', rng=player_rng(player_id, 'explain-recruitment')),
+            ai_engine.generate_training_recommendations(player, rng=player_rng(player_id, 'training')),
+            WORKLOADS.workload(player_id),
+            round(float(similarity[i, nearest[i, 0]]), 1) if nearest.shape[1] else None,
+            nearest[i]
+        ])
+    return {
+        'fields': BOOTSTRAP_FIELDS,
+        'players': players,
+        'total_players': len(PLAYERS_DB),
+        'model_version': MODEL_VERSION
+    }
+
+def bootstrap_representation() -> Representation:
+    if not DETERMINISTIC_PREDICTIONS:
+        return Representation(current_app.json.dumps_bytes(bootstrap_payload()), current_app.json.mimetype)
+    global BOOTSTRAP
+    # Versions only grow, so their sum changes with every record update; workload windows
+    # end at the current UTC day, so the payload also changes at midnight without new samples
+    key = (MODEL_VERSION, len(PLAYERS_DB), int(PLAYERS_DB.versions.sum()), WORKLOADS.samples,
+           datetime.datetime.now(datetime.timezone.utc).date())
+    cached = BOOTSTRAP
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    body = Representation(current_app.json.dumps_bytes(bootstrap_payload()), current_app.json.mimetype)
+    BOOTSTRAP = (key, body)
+    return body
+
+@api.route('/')
 def index():
-    """Serve the main HTML page"""
-    return render_template('index.html')
+    """Serve the main HTML page, rendered once and precompressed outside debug mode"""
+    page = PAGES.get('index')
+    if page is None:
+        page = Representation(render_template('index.html').encode(), 'text/html')
+        if not current_app.debug:
+            PAGES['index'] = page
+    return page.response(request, current_app.response_class)
+
+@api.route('/api/bootstrap')
+def get_bootstrap():
+    """Players, predictions, explanations and training plans for the web app.
+
+    Columnar and precompressed; the ETag changes only with the database,
+    ingested workloads, the (UTC) day or the model version, so reloads get
+    a 304.
+    """
+    return bootstrap_representation().response(request, current_app.response_class)
 
-@app.route('/api/health')
+@api.route('/api/health')
 def health_check():
     """Health check endpoint"""
     return jsonify({
@@ -215,36 +595,29 @@ def health_check():
         }
     })
 
-@app.route('/api/players')
+@api.route('/api/players')
 def get_players():
-    """Get all players with optional filtering"""
+    """Get players with optional filtering, sorting, pagination and field projection"""
+    try:
+        listing = parse_listing_args()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
     position = request.args.get('position')
     league = request.args.get('league')
     min_age = request.args.get('min_age', type=int)
     max_age = request.args.get('max_age', type=int)
     max_value = request.args.get('max_value', type=int)
     
-    players = list(PLAYERS_DB.values())
-    
-    # Apply filters
-    if position and position != 'All Positions':
-        players = [p for p in players if position.lower() in p['position'].lower()]
-    
-    if league and league != 'All Leagues':
-        players = [p for p in players if p['league'] == league]
-    
-    if min_age:
-        players = [p for p in players if p['age'] >= min_age]
-    
-    if max_age:
-        players = [p for p in players if p['age'] <= max_age]
-    
-    if max_value:
-        players = [p for p in players if p['current_value'] <= max_value * 1000000]
+    rows = filtered_rows()
+    page, pagination = paginate(apply_sort(rows, listing), listing)
+    players = player_records(page, listing['fields'])
     
     return jsonify({
         'players': players,
         'count': len(players),
+        'pagination': pagination,
+        'sort': request.args.get('sort'),
         'filters_applied': {
             'position': position,
             'league': league,
@@ -253,23 +626,131 @@ def get_players():
         }
     })
 
-@app.route('/api/players/<player_id>')
+@api.route('/api/players/search')
+def search_players():
+    """Players matching a free-text query on name, club, league and nationality"""
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': 'q is required'}), 400
+    if len(query) > MAX_SEARCH_QUERY_LENGTH:
+        return jsonify({'error': f'q must be at most {MAX_SEARCH_QUERY_LENGTH} characters'}), 400
+    limit = request.args.get('limit', 20, type=int)
+    if limit < 1:
+        return jsonify({'error': 'limit must be positive'}), 400
+    fields = request.args.get('fields')
+    try:
+        fields = [f.strip() for f in fields.split(',') if f.strip()] if fields else None
+        resolve_fields(fields)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    found = SEARCH.search(query, min(limit, MAX_SEARCH_RESULTS))
+    players = PLAYERS_DB.records(found['rows'], fields)
+    
+    return jsonify({
+        'query': query,
+        'terms': found['terms'],
+        'results': [{'player': player, 'score': score} for player, score in zip(players, found['scores'])],
+        'count': len(players),
+        'total': found['total'],
+        'partial': found['partial']
+    })
+
+@api.route('/api/players/<player_id>')
 def get_player(player_id):
     """Get detailed player information"""
-    player = PLAYERS_DB.get(player_id)
-    if not player:
+    row = PLAYERS_DB.index.get(player_id)
+    if row is None:
+        return jsonify({'error': 'Player not found'}), 404
+    
+    return jsonify(PLAYERS_DB.encoded_record(row, current_app.json.encode_fragment))
+
+@api.route('/api/players/<player_id>/similar')
+def get_similar_players(player_id):
+    """Nearest players by normalized stat profile"""
+    row = PLAYERS_DB.index.get(player_id)
+    if row is None:
+        return jsonify({'error': 'Player not found'}), 404
+    
+    k = request.args.get('k', 10, type=int)
+    metric = request.args.get('metric', 'cosine')
+    if k < 1:
+        return jsonify({'error': 'k must be positive'}), 400
+    if metric not in SIMILARITY_METRICS:
+        return jsonify({'error': f"metric must be one of {', '.join(SIMILARITY_METRICS)}"}), 400
+    fields = request.args.get('fields')
+    try:
+        fields = [f.strip() for f in fields.split(',') if f.strip()] if fields else None
+        resolve_fields(fields)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    exact = request.args.get('exact')
+    
+    neighbours = SIMILARITY.nearest(row, min(k, MAX_SIMILAR_PLAYERS), metric,
+                                    exact=None if exact is None else exact.lower() in ('1', 'true'))
+    players = PLAYERS_DB.records(np.array([r for r, _ in neighbours], dtype=np.intp), fields)
+    
+    return jsonify({
+        'player_id': player_id,
+        'metric': metric,
+        'similar': [{'player': player, 'similarity': score}
+                    for player, (_, score) in zip(players, neighbours)]
+    })
+
+@api.route('/api/players/<player_id>/sources')
+def get_player_sources(player_id):
+    """Fetch a player's upstream records from every configured data source concurrently"""
+    if player_id not in PLAYERS_DB:
+        return jsonify({'error': 'Player not found'}), 404
+    
+    requested = request.args.get('sources')
+    keys = [k.strip() for k in requested.split(',') if k.strip()] if requested else list(SOURCES.sources)
+    unknown = [k for k in keys if k not in SOURCE_NAMES]
+    if unknown:
+        return jsonify({'error': f"Unknown sources: {', '.join(unknown)}. Use {', '.join(SOURCE_NAMES)}"}), 400
+    unconfigured = [k for k in keys if k not in SOURCES.sources]
+    if unconfigured or not keys:
+        return jsonify({'error': 'Data sources not configured: ' + (', '.join(unconfigured) or 'none'),
+                        'configured': list(SOURCES.sources)}), 503
+    
+    start = datetime.datetime.now()
+    results = SOURCES.fetch_player(player_id, keys)
+    
+    return jsonify({
+        'player_id': player_id,
+        'sources': results,
+        'complete': all(r['status'] == 'ok' for r in results.values()),
+        'latency_ms': round((datetime.datetime.now() - start).total_seconds() * 1000, 2),
+        'timestamp': datetime.datetime.now().isoformat()
+    })
+
+@api.route('/api/players/<player_id>', methods=['PATCH'])
+def update_player(player_id):
+    """Partially update a player record; bumps its version so derived predictions refresh"""
+    if player_id not in PLAYERS_DB:
         return jsonify({'error': 'Player not found'}), 404
     
-    return jsonify(player)
+    changes = request.get_json(silent=True)
+    if not isinstance(changes, dict) or not changes:
+        return jsonify({'error': 'Request body must be a non-empty JSON object'}), 400
+    
+    try:
+        version = PLAYERS_DB.update(player_id, changes)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    LIVE.notify()
+    
+    return jsonify({'player': PLAYERS_DB[player_id], 'version': version})
 
-@app.route('/api/predict/injury/<player_id>')
+@api.route('/api/predict/injury/<player_id>')
+@cached_player_response('injury', vary_key=WORKLOADS.signature)
 def predict_injury(player_id):
     """Predict injury risk for a player"""
     player = PLAYERS_DB.get(player_id)
     if not player:
         return jsonify({'error': 'Player not found'}), 404
     
-    prediction = ai_engine.predict_injury_risk(player)
+    prediction = with_workload('injury', player_id, player_prediction('injury', player_id, player))
     
     return jsonify({
         'player_id': player_id,
@@ -278,14 +759,15 @@ def predict_injury(player_id):
         'timestamp': datetime.datetime.now().isoformat()
     })
 
-@app.route('/api/predict/development/<player_id>')
+@api.route('/api/predict/development/<player_id>')
+@cached_player_response('development')
 def predict_development(player_id):
     """Predict player development potential"""
     player = PLAYERS_DB.get(player_id)
     if not player:
         return jsonify({'error': 'Player not found'}), 404
     
-    prediction = ai_engine.predict_player_development(player)
+    prediction = player_prediction('development', player_id, player)
     
     return jsonify({
         'player_id': player_id,
@@ -294,14 +776,15 @@ def predict_development(player_id):
         'timestamp': datetime.datetime.now().isoformat()
     })
 
-@app.route('/api/predict/value/<player_id>')
+@api.route('/api/predict/value/<player_id>')
+@cached_player_response('value')
 def predict_value(player_id):
     """Predict market value trajectory"""
     player = PLAYERS_DB.get(player_id)
     if not player:
         return jsonify({'error': 'Player not found'}), 404
     
-    prediction = ai_engine.predict_market_value(player)
+    prediction = player_prediction('value', player_id, player)
     
     return jsonify({
         'player_id': player_id,
@@ -310,7 +793,178 @@ def predict_value(player_id):
         'timestamp': datetime.datetime.now().isoformat()
     })
 
-@app.route('/api/explain/<player_id>')
+# Monte Carlo value bands (see valuation.py); batches adapt their path count to the
+# latency budget and CHAMPIONS_SIMULATION_PROCESSES > 1 fans very large ones out to a pool
+VALUE_SIMULATOR = ValueSimulator(processes=int(os.environ.get('CHAMPIONS_SIMULATION_PROCESSES', 0)))
+SIMULATION_BUDGET_MS = float(os.environ.get('CHAMPIONS_SIMULATION_BUDGET_MS', 500))
+MAX_SIMULATION_PLAYERS = 5000
+
+def simulate_value_rows(rows: np.ndarray, paths: int, budget_ms=None):
+    """(per-player band dicts, raw simulation) for store rows, seeded per record version"""
+    records = PLAYERS_DB.records(rows, ['id', 'name', 'position', 'age', 'current_value'])
+    predictions = [player_prediction('value', p['id'], PLAYERS_DB[p['id']]) for p in records]
+    seeds = None
+    if DETERMINISTIC_PREDICTIONS:
+        seeds = [prediction_seed(p['id'], v, 'value-simulation') for p, v in zip(records, PLAYERS_DB.versions[rows].tolist())]
+    result = VALUE_SIMULATOR.simulate(
+        [p['current_value'] for p in records], [p['age'] for p in records], [p['position'] for p in records],
+        paths=paths, budget_ms=budget_ms, seeds=seeds, **simulation_inputs(predictions))
+    bands = [{
+        'player_id': player['id'],
+        'player_name': player['name'],
+        **value_bands(player['current_value'], result['bands'][i], result['mean'][i], result['confidence'][i])
+    } for i, player in enumerate(records)]
+    return bands, result
+
+@api.route('/api/predict/value/<player_id>/simulation')
+@cached_player_response('value-simulation', vary_on=('paths',))
+def simulate_value(player_id):
+    """Monte Carlo market value bands (5th-95th percentile) for the next five years"""
+    if player_id not in PLAYERS_DB:
+        return jsonify({'error': 'Player not found'}), 404
+    paths = request.args.get('paths', DEFAULT_PATHS, type=int)
+    if not MIN_PATHS <= paths <= MAX_PATHS:
+        return jsonify({'error': f'paths must be between {MIN_PATHS} and {MAX_PATHS}'}), 400
+    
+    bands, result = simulate_value_rows(PLAYERS_DB.rows_for_ids([player_id]), paths)
+    return jsonify({
+        **bands[0],
+        'paths': result['paths'],
+        'timestamp': datetime.datetime.now().isoformat()
+    })
+
+def selected_rows(payload: Dict):
+    """(rows, error) for a JSON body naming ``player_ids``, a ``club`` or a ``league``"""
+    player_ids = payload.get('player_ids')
+    if player_ids is not None:
+        if not isinstance(player_ids, list) or not player_ids or not all(isinstance(p, str) for p in player_ids):
+            return None, 'player_ids must be a non-empty list of ids'
+        return PLAYERS_DB.rows_for_ids(player_ids), None
+    field = 'club' if payload.get('club') else 'league'
+    column = PLAYERS_DB.categorical[field]
+    if not isinstance(payload.get(field), str) or payload[field] not in column.lookup:
+        return None, 'Give player_ids or a known club or league'
+    return np.sort(column.rows_for([column.lookup[payload[field]]])), None
+
+@api.route('/api/predict/value/simulate', methods=['POST'])
+def simulate_value_batch():
+    """Monte Carlo value bands for listed players, a club or a whole league in one call.
+
+    JSON body: ``player_ids``, ``club`` or ``league``; ``paths`` per player
+    and ``budget_ms`` (null for none), which lowers the path count to what
+    fits at the measured simulation throughput.
+    """
+    payload = request.get_json(silent=True) or {}
+    player_ids = payload.get('player_ids')
+    paths = payload.get('paths', DEFAULT_PATHS)
+    budget_ms = payload.get('budget_ms', SIMULATION_BUDGET_MS)
+    
+    if not isinstance(paths, int) or not MIN_PATHS <= paths <= MAX_PATHS:
+        return jsonify({'error': f'paths must be an integer between {MIN_PATHS} and {MAX_PATHS}'}), 400
+    if budget_ms is not None and (not isinstance(budget_ms, (int, float)) or budget_ms <= 0):
+        return jsonify({'error': 'budget_ms must be a positive number or null'}), 400
+    rows, error = selected_rows(payload)
+    if error:
+        return jsonify({'error': error}), 400
+    if len(rows) > MAX_SIMULATION_PLAYERS:
+        return jsonify({'error': f'At most {MAX_SIMULATION_PLAYERS} players per simulation'}), 400
+    
+    bands, result = simulate_value_rows(rows, paths, budget_ms)
+    return jsonify({
+        'count': len(rows),
+        'missing': [pid for pid in player_ids if pid not in PLAYERS_DB] if player_ids else [],
+        'results': bands,
+        'paths': result['paths'],
+        'requested_paths': paths,
+        'budget_ms': budget_ms,
+        'elapsed_ms': round(result['elapsed_ms'], 2),
+        'processes': VALUE_SIMULATOR.processes
+    })
+
+# Batch predictions cap the number of players scored per request
+MAX_BATCH_PLAYERS = 10000
+
+def predict_rows_batch(rows, prediction_type: str, rng=None) -> List[Dict]:
+    """Score store rows with the vectorized engine methods"""
+    return score_rows_batch(ai_engine, PLAYERS_DB, rows, prediction_type, rng)
+
+@api.route('/api/predict/batch', methods=['POST'])
+def predict_batch():
+    """Run injury/development/value predictions for many players in one request"""
+    payload = request.get_json(silent=True) or {}
+    player_ids = payload.get('player_ids')
+    types = payload.get('types', list(PREDICTION_TYPES))
+    
+    if not isinstance(player_ids, list) or not player_ids or not all(isinstance(p, str) for p in player_ids):
+        return jsonify({'error': 'player_ids must be a non-empty list of ids'}), 400
+    if len(player_ids) > MAX_BATCH_PLAYERS:
+        return jsonify({'error': f'At most {MAX_BATCH_PLAYERS} players per batch'}), 400
+    if not isinstance(types, list) or not types or any(t not in PREDICTION_TYPES for t in types):
+        return jsonify({'error': f"types must be a list drawn from {', '.join(PREDICTION_TYPES)}"}), 400
+    
+    rows = PLAYERS_DB.rows_for_ids(player_ids)
+    found_ids = PLAYERS_DB.records(rows, ['id', 'name'])
+    timestamp = datetime.datetime.now().isoformat()
+    
+    predictions = {}
+    for prediction_type in dict.fromkeys(types):
+        if DETERMINISTIC_PREDICTIONS:
+            # Materialized lookups, as in exports: a player's result never depends on the rest of the batch
+            results = [PREDICTIONS.get(prediction_type, player['id']) for player in found_ids]
+        else:
+            results = predict_rows_batch(rows, prediction_type)
+        predictions[prediction_type] = [{
+            'player_id': player['id'],
+            'player_name': player['name'],
+            'prediction': with_workload(prediction_type, player['id'], prediction),
+            'timestamp': timestamp
+        } for player, prediction in zip(found_ids, results)]
+    
+    return jsonify({
+        'count': len(rows),
+        'missing': [pid for pid in player_ids if pid not in PLAYERS_DB],
+        'predictions': predictions
+    })
+
+@api.route('/api/export/players')
+def export_players():
+    """Stream every matching player joined with its predictions as NDJSON or CSV"""
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in ('ndjson', 'csv'):
+        return jsonify({'error': 'format must be ndjson or csv'}), 400
+    requested = request.args.get('predictions')
+    types = [t.strip() for t in requested.split(',') if t.strip()] if requested is not None else list(PREDICTION_TYPES)
+    if any(t not in PREDICTION_TYPES for t in types):
+        return jsonify({'error': f"predictions must be drawn from {', '.join(PREDICTION_TYPES)}"}), 400
+    chunk_size = request.args.get('chunk_size', DEFAULT_CHUNK_SIZE, type=int)
+    if not 1 <= chunk_size <= 10000:
+        return jsonify({'error': 'chunk_size must be between 1 and 10000'}), 400
+    
+    store = PLAYERS_DB
+    rows = filtered_rows()
+    
+    def predict_chunk(chunk, prediction_type):
+        # Materialized lookups keep exports identical to the per-player endpoints
+        if DETERMINISTIC_PREDICTIONS:
+            results = [PREDICTIONS.get(prediction_type, store.ids[r]) for r in chunk.tolist()]
+        else:
+            results = predict_rows_batch(chunk, prediction_type)
+        return [with_workload(prediction_type, store.ids[r], p) for r, p in zip(chunk.tolist(), results)]
+    
+    chunks = iter_export_chunks(store, rows, types, predict_chunk, chunk_size)
+    if export_format == 'csv':
+        body, mimetype = csv_stream(chunks, types), 'text/csv'
+    else:
+        dumps = functools.partial(current_app.json.dumps, separators=(',', ':'))
+        body, mimetype = ndjson_stream(chunks, dumps), 'application/x-ndjson'
+    
+    response = current_app.response_class(body, mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename=players.{export_format}'
+    response.headers['X-Total-Count'] = str(len(rows))
+    return response
+
+@api.route('/api/explain/<player_id>')
+@cached_player_response('explain', vary_on=('type',))
 def explain_prediction(player_id):
     """Get XAI explanation for player predictions"""
     player = PLAYERS_DB.get(player_id)
@@ -318,7 +972,8 @@ def explain_prediction(player_id):
         return jsonify({'error': 'Player not found'}), 404
     
     prediction_type = request.args.get('type', 'recruitment')
-    explanation = ai_engine.generate_xai_explanation(player, prediction_type)
+    explanation = offloaded(f'explain-{prediction_type}', player_id, 'generate_xai_explanation',
+                            player, prediction_type)
     
     return jsonify({
         'player_id': player_id,
@@ -327,76 +982,138 @@ def explain_prediction(player_id):
         'timestamp': datetime.datetime.now().isoformat()
     })
 
-@app.route('/api/compare')
+@api.route('/api/compare')
 def compare_players():
     """Compare multiple players"""
     player_ids = request.args.getlist('players')
+    if len(player_ids) == 1 and ',' in player_ids[0]:
+        player_ids = player_ids[0].split(',')
     
     if len(player_ids) < 2:
         return jsonify({'error': 'At least 2 players required for comparison'}), 400
     
-    players = []
-    for player_id in player_ids:
-        player = PLAYERS_DB.get(player_id)
-        if player:
-            players.append(player)
+    try:
+        listing = parse_listing_args()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    if len(players) < 2:
+    rows = PLAYERS_DB.rows_for_ids(player_ids)
+    
+    if len(rows) < 2:
         return jsonify({'error': 'Invalid player IDs provided'}), 400
     
+    metric = request.args.get('metric', 'cosine')
+    if metric not in SIMILARITY_METRICS:
+        return jsonify({'error': f"metric must be one of {', '.join(SIMILARITY_METRICS)}"}), 400
+    
+    # Metrics cover every compared player; the player objects themselves are paged and projected
+    rows = apply_sort(rows, listing)
+    page, pagination = paginate(rows, listing)
+    
+    # Mean pairwise similarity over distinct players (duplicate ids would inflate it)
+    unique_rows = np.unique(rows)
+    matrix = SIMILARITY.pairwise(rows, metric)
+    unique_matrix = SIMILARITY.pairwise(unique_rows, metric)
+    off_diagonal = unique_matrix[~np.eye(len(unique_rows), dtype=bool)]
+    similarity_score = round(float(off_diagonal.mean()), 1) if len(off_diagonal) else 100.0
+    
     # Generate comparison metrics
     comparison = {
-        'players': players,
+        'players': player_records(page, listing['fields']),
+        'player_ids': [PLAYERS_DB.ids[r] for r in rows.tolist()],
+        'pagination': pagination,
         'metrics': {
-            'overall_rating': [p['stats']['overall'] for p in players],
-            'market_value': [p['current_value'] for p in players],
-            'age': [p['age'] for p in players],
-            'goals_90': [p['stats']['goals_90'] for p in players],
-            'assists_90': [p['stats']['assists_90'] for p in players]
+            'overall_rating': PLAYERS_DB.column('overall')[rows],
+            'market_value': PLAYERS_DB.column('current_value')[rows],
+            'age': PLAYERS_DB.column('age')[rows],
+            'goals_90': PLAYERS_DB.column('goals_90')[rows],
+            'assists_90': PLAYERS_DB.column('assists_90')[rows]
         },
-        'similarity_score': round(random.uniform(75, 95), 1),
-        'recommendation': random.choice([
-            'Players have complementary skill sets',
-            'Similar playing styles detected',
-            'Significant tactical differences identified'
-        ])
+        'similarity_metric': metric,
+        'similarity_matrix': np.round(matrix, 1),
+        'similarity_score': similarity_score,
+        'recommendation': comparison_recommendation(similarity_score)
     }
     
     return jsonify(comparison)
 
-@app.route('/api/training/recommendations/<player_id>')
+# Scouting matrix: every model for many players in one vectorized pass (see scouting.py)
+MAX_MATRIX_PLAYERS = 1000
+
+def matrix_prediction(kind: str, player_id: str) -> Dict:
+    """A matrix row's prediction, identical to the per-player predict and explain routes"""
+    if kind.startswith('explain-'):
+        return ai_engine.generate_xai_explanation({}, kind[len('explain-'):], rng=player_rng(player_id, kind))
+    return PREDICTIONS.get(kind, player_id)
+
+@api.route('/api/compare/matrix', methods=['GET', 'POST'])
+def compare_matrix():
+    """Dense stats + predictions + XAI matrix for up to MAX_MATRIX_PLAYERS players.
+
+    GET takes ``players=id1,id2``; POST takes {"player_ids": [...]} for long
+    lists. ``format`` is json (default), npy or arrow; ``explain`` picks the
+    XAI factor set (recruitment or development).
+    """
+    if request.method == 'POST':
+        payload = request.get_json(silent=True) or {}
+        player_ids = payload.get('player_ids')
+        options = {**request.args, **{k: payload[k] for k in ('format', 'explain') if k in payload}}
+    else:
+        raw = request.args.get('players', '')
+        player_ids = [p.strip() for p in raw.split(',') if p.strip()]
+        options = request.args
+    matrix_format = options.get('format', 'json')
+    explain = options.get('explain', 'recruitment')
+    
+    if not isinstance(player_ids, list) or not player_ids or not all(isinstance(p, str) for p in player_ids):
+        return jsonify({'error': 'player_ids must be a non-empty list of ids'}), 400
+    if len(player_ids) > MAX_MATRIX_PLAYERS:
+        return jsonify({'error': f'At most {MAX_MATRIX_PLAYERS} players per matrix'}), 400
+    if matrix_format not in MATRIX_FORMATS:
+        return jsonify({'error': f"format must be one of {', '.join(MATRIX_FORMATS)}"}), 400
+    if matrix_format == 'arrow' and not arrow_available():
+        return jsonify({'error': 'arrow format requires pyarrow on the server; use npy'}), 400
+    if explain not in ('recruitment', 'development'):
+        return jsonify({'error': 'explain must be recruitment or development'}), 400
+    
+    rows = PLAYERS_DB.rows_for_ids(player_ids)
+    predictions = matrix_prediction if DETERMINISTIC_PREDICTIONS else None
+    names, matrix = prediction_matrix(ai_engine, PLAYERS_DB, rows, {}, explain, WORKLOADS.workload, predictions)
+    found_ids = [PLAYERS_DB.ids[r] for r in rows.tolist()]
+    missing = [pid for pid in player_ids if pid not in PLAYERS_DB]
+    
+    if matrix_format != 'json':
+        encode = encode_npy if matrix_format == 'npy' else encode_arrow
+        response = current_app.response_class(encode(found_ids, names, matrix), mimetype=MATRIX_MIMETYPES[matrix_format])
+        response.headers['Content-Disposition'] = f'attachment; filename=scouting.{matrix_format}'
+        # Binary tables only hold the players found; their player_id column says which
+        response.headers['X-Missing-Count'] = str(len(missing))
+        return response
+    
+    return jsonify({
+        'player_ids': found_ids,
+        'player_names': [p['name'] for p in PLAYERS_DB.records(rows, ['name'])],
+        'columns': names,
+        'data': matrix,
+        'shape': list(matrix.shape),
+        'explain': explain,
+        'missing': missing
+    })
+
+@api.route('/api/training/recommendations/<player_id>')
+@cached_player_response('training')
 def get_training_recommendations(player_id):
     """Get personalized training recommendations"""
     player = PLAYERS_DB.get(player_id)
     if not player:
         return jsonify({'error': 'Player not found'}), 404
     
-    recommendations = [
-        {
-            'category': 'Technical',
-            'priority': random.choice(['HIGH', 'MEDIUM', 'LOW']),
-            'title': f'Improve {random.choice(["passing accuracy", "first touch", "ball control"])}',
-            'description': 'Focus on technical drills to enhance ball manipulation skills',
-            'duration': f'{random.randint(15, 30)} minutes',
-            'frequency': f'{random.randint(2, 4)}x per week'
-        },
-        {
-            'category': 'Physical',
-            'priority': random.choice(['HIGH', 'MEDIUM', 'LOW']),
-            'title': f'Enhance {random.choice(["sprint speed", "endurance", "strength"])}',
-            'description': 'Targeted physical conditioning program',
-            'duration': f'{random.randint(20, 45)} minutes',
-            'frequency': f'{random.randint(2, 5)}x per week'
-        },
-        {
-            'category': 'Tactical',
-            'priority': random.choice(['HIGH', 'MEDIUM', 'LOW']),
-            'title': f'Develop {random.choice(["positioning", "decision making", "game reading"])}',
-            'description': 'Tactical awareness and game intelligence training',
-            'duration': f'{random.randint(10, 25)} minutes',
-            'frequency': f'{random.randint(1, 3)}x per week'
-        }
-    ]
+    # A plan a training job generated for this record version is reused as is
+    version = PLAYERS_DB.version(player_id)
+    recommendations = TRAINING_JOBS.plan(player_id, version)
+    if recommendations is None:
+        recommendations = offloaded('training', player_id, 'generate_training_recommendations', player, version=version)
+        TRAINING_JOBS.remember(player_id, version, recommendations)
     
     return jsonify({
         'player_id': player_id,
@@ -405,54 +1122,288 @@ def get_training_recommendations(player_id):
         'generated_at': datetime.datetime.now().isoformat()
     })
 
-@app.route('/api/analytics/performance')
+MAX_TRAINING_JOB_PLAYERS = 100000
+MAX_TRAINING_RESULTS_PAGE = 1000
+# Seconds a streamed result fetch waits for a running job before checking again
+TRAINING_STREAM_POLL_SECONDS = 15.0
+
+def training_result(player_id: str, player_name: str, version: int, plan: List[Dict]) -> Dict:
+    """One job result; ``stale`` once the player's record changed after the plan was generated"""
+    return {
+        'player_id': player_id,
+        'player_name': player_name,
+        'version': version,
+        'stale': PLAYERS_DB.version(player_id) != version,
+        'recommendations': plan
+    }
+
+@api.route('/api/training/jobs', methods=['POST'])
+def submit_training_job():
+    """Queue training plan generation for many players; poll the returned job for progress.
+
+    JSON body: ``player_ids``, ``club`` or ``league``. Answers 202 with the
+    job status and its URL in ``Location``.
+    """
+    payload = request.get_json(silent=True) or {}
+    rows, error = selected_rows(payload)
+    if error:
+        return jsonify({'error': error}), 400
+    if len(rows) > MAX_TRAINING_JOB_PLAYERS:
+        return jsonify({'error': f'At most {MAX_TRAINING_JOB_PLAYERS} players per job'}), 400
+    player_ids = payload.get('player_ids') or []
+    status = TRAINING_JOBS.submit(rows, missing=[pid for pid in player_ids if pid not in PLAYERS_DB])
+    response = jsonify(status)
+    response.status_code = 202
+    response.headers['Location'] = url_for('champions.get_training_job', job_id=status['job_id'])
+    return response
+
+@api.route('/api/training/jobs/<job_id>')
+def get_training_job(job_id):
+    """Training job state and progress"""
+    status = TRAINING_JOBS.status(job_id)
+    if status is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(status)
+
+@api.route('/api/training/jobs/<job_id>', methods=['DELETE'])
+def cancel_training_job(job_id):
+    """Cancel a queued or running training job; results so far stay readable"""
+    status = TRAINING_JOBS.cancel(job_id)
+    if status is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(status)
+
+@api.route('/api/training/jobs/<job_id>/results')
+def get_training_job_results(job_id):
+    """Results of a training job in completion order, a page at a time or streamed as NDJSON.
+
+    Pages (``offset``, ``limit``) can be read while the job runs: keep
+    requesting ``next_offset`` until ``done`` is true. ``format=ndjson``
+    streams every result, following a running job until it finishes.
+    """
+    status = TRAINING_JOBS.status(job_id)
+    if status is None:
+        return jsonify({'error': 'Job not found'}), 404
+    offset = request.args.get('offset', 0, type=int)
+    if offset < 0:
+        return jsonify({'error': 'offset must be non-negative'}), 400
+    
+    if request.args.get('format') == 'ndjson':
+        dumps = functools.partial(current_app.json.dumps, separators=(',', ':'))
+        
+        def stream():
+            position = offset
+            while True:
+                results, finished = TRAINING_JOBS.wait(job_id, position, TRAINING_STREAM_POLL_SECONDS)
+                if results:
+                    position += len(results)
+                    yield ''.join(dumps(training_result(*result)) + '\n' for result in results)
+                elif finished:
+                    return
+        
+        response = current_app.response_class(stream(), mimetype='application/x-ndjson')
+        response.headers['X-Total-Count'] = str(status['total'])
+        return response
+    
+    limit = request.args.get('limit', 100, type=int)
+    if not 1 <= limit <= MAX_TRAINING_RESULTS_PAGE:
+        return jsonify({'error': f'limit must be between 1 and {MAX_TRAINING_RESULTS_PAGE}'}), 400
+    results = TRAINING_JOBS.results(job_id, offset, limit)
+    next_offset = offset + len(results)
+    return jsonify({
+        'job_id': job_id,
+        'state': status['state'],
+        'offset': offset,
+        'limit': limit,
+        'count': len(results),
+        'total': status['total'],
+        'next_offset': next_offset,
+        # Status read before the page, so no result can have arrived after it
+        'done': status['state'] in FINISHED_STATES and next_offset >= status['completed'],
+        'results': [training_result(*result) for result in results]
+    })
+
+@api.route('/api/training/jobs/status')
+def get_training_jobs_status():
+    """Training job runner mode, jobs by state and stored plans"""
+    return jsonify(TRAINING_JOBS.stats())
+
+# Epoch seconds of 0001-01-01 and 9999-12-31T23:59:59 UTC, the range ISO dates can express
+MIN_TIMESTAMP, MAX_TIMESTAMP = -62135596800, 253402300799
+
+def parse_timestamp(value: str) -> int:
+    """Epoch seconds from an epoch number or an ISO 8601 date/datetime (UTC if naive).
+
+    Raises ValueError for anything else, including inf/nan and numbers outside
+    MIN_TIMESTAMP..MAX_TIMESTAMP.
+    """
+    try:
+        seconds = float(value)
+    except ValueError:
+        parsed = datetime.datetime.fromisoformat(value)
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+        try:
+            seconds = parsed.timestamp()
+        except (OverflowError, OSError):
+            raise ValueError(f'Timestamp out of range: {value}') from None
+    if not MIN_TIMESTAMP <= seconds <= MAX_TIMESTAMP:
+        # Also false for nan
+        raise ValueError(f'Timestamp must be a finite time between years 1 and 9999: {value}')
+    return int(seconds)
+
+@api.route('/api/analytics/performance')
 def get_performance_analytics():
     """Get team/player performance analytics"""
     timeframe = request.args.get('timeframe', '12weeks')
     player_id = request.args.get('player_id')
+    aggregation = request.args.get('agg', 'auto')
+    
+    if player_id and player_id not in PLAYERS_DB:
+        return jsonify({'error': 'Player not found'}), 404
+    if aggregation not in AGGREGATIONS:
+        return jsonify({'error': f"agg must be one of {', '.join(AGGREGATIONS)}"}), 400
+    try:
+        end = parse_timestamp(request.args['end']) if 'end' in request.args else int(time.time())
+        if 'start' in request.args:
+            start = parse_timestamp(request.args['start'])
+        else:
+            start = max(end - parse_duration(timeframe), MIN_TIMESTAMP)
+        bucket = parse_duration(request.args['bucket']) if 'bucket' in request.args else WEEK
+    except (ValueError, OverflowError) as e:
+        return jsonify({'error': str(e)}), 400
+    if start >= end:
+        return jsonify({'error': 'start must be before end'}), 400
+    # Widen the bucket rather than return an unbounded number of points
+    bucket = max(bucket, -(-(end - start) // MAX_PERFORMANCE_POINTS))
+    
+    # Team analytics aggregate each player's sessions separately and combine per bucket
+    sessions = [part for pid in ([player_id] if player_id else PERFORMANCE.players())
+                for part in PERFORMANCE.slices(pid, start, end)]
+    series = downsample(sessions, start, end, bucket, aggregation)
+    
+    def points(values):
+        rounded = np.round(values, 2).tolist()
+        return [None if v != v else v for v in rounded]
+    
+    trends, slopes = {}, {}
+    for metric in TREND_METRICS:
+        trends[metric], slope = trend_label(series[metric])
+        slopes[metric] = None if slope is None else round(slope, 4)
     
-    # Generate mock performance data
-    weeks = 12 if timeframe == '12weeks' else 24
     performance_data = {
-        'timeframe': timeframe,
-        'data_points': weeks,
-        'metrics': {
-            'passing_accuracy': [random.uniform(80, 95) for _ in range(weeks)],
-            'dribbling_success': [random.uniform(65, 85) for _ in range(weeks)],
-            'defensive_actions': [random.uniform(60, 90) for _ in range(weeks)],
-            'goals_scored': [random.randint(0, 3) for _ in range(weeks)],
-            'assists': [random.randint(0, 2) for _ in range(weeks)]
-        },
-        'trends': {
-            'passing_accuracy': random.choice(['improving', 'stable', 'declining']),
-            'dribbling_success': random.choice(['improving', 'stable', 'declining']),
-            'defensive_actions': random.choice(['improving', 'stable', 'declining'])
-        }
+        'timeframe': timeframe if 'start' not in request.args else None,
+        'start': datetime.datetime.fromtimestamp(start, datetime.timezone.utc).isoformat(),
+        'end': datetime.datetime.fromtimestamp(end, datetime.timezone.utc).isoformat(),
+        'bucket_seconds': bucket,
+        'aggregation': aggregation,
+        'sessions': sum(len(s) for s in sessions),
+        'data_points': len(series['passing_accuracy']),
+        'metrics': {PERFORMANCE_LABELS.get(m, m): points(v) for m, v in series.items()},
+        'trends': trends,
+        'trend_slopes': slopes
     }
     
     if player_id:
-        player = PLAYERS_DB.get(player_id)
-        if player:
-            performance_data['player'] = player['name']
+        performance_data['player'] = PLAYERS_DB[player_id]['name']
     
     return jsonify(performance_data)
 
-@app.route('/api/governance/status')
-def get_governance_status():
-    """Get data governance and system status"""
+@api.route('/api/analytics/performance/<player_id>/sessions', methods=['POST'])
+def append_performance_sessions(player_id):
+    """Append match/training sessions to a player's history (append-only)"""
+    if player_id not in PLAYERS_DB:
+        return jsonify({'error': 'Player not found'}), 404
+    
+    body = request.get_json(silent=True) or {}
+    rows = body.get('sessions')
+    if not isinstance(rows, list) or not rows:
+        return jsonify({'error': 'sessions must be a non-empty list'}), 400
+    sessions = np.zeros(len(rows), dtype=SESSION_DTYPE)
+    try:
+        for i, row in enumerate(rows):
+            sessions['t'][i] = parse_timestamp(str(row['timestamp']))
+            for metric in PERFORMANCE_METRICS:
+                sessions[metric][i] = float(row.get(PERFORMANCE_LABELS.get(metric, metric), row.get(metric, 0)))
+        total = PERFORMANCE.append(player_id, sessions)
+    except (KeyError, TypeError, ValueError, OverflowError) as e:
+        return jsonify({'error': f'Invalid session: {e}'}), 400
+    
+    return jsonify({'player_id': player_id, 'appended': len(rows), 'sessions': total}), 201
+
+@api.route('/api/wearables/samples', methods=['POST'])
+def ingest_wearables_samples():
+    """Fold a batch of GPS/heart-rate samples into the players' rolling workloads.
+
+    Send packed wearables.SAMPLE_DTYPE records as application/octet-stream,
+    or NDJSON lines of {"player_id", "t", "speed", "heart_rate"}.
+    """
+    try:
+        if request.mimetype == 'application/octet-stream':
+            samples = parse_binary(request.get_data())
+        else:
+            samples = parse_ndjson(request.get_data(as_text=True))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if len(samples) > MAX_WEARABLES_BATCH:
+        return jsonify({'error': f'At most {MAX_WEARABLES_BATCH} samples per batch'}), 413
+    
+    received = len(samples)
+    try:
+        ids = {i: i.decode() for i in np.unique(samples['player_id']).tolist()}
+    except UnicodeDecodeError:
+        return jsonify({'error': 'player_id must be UTF-8 text'}), 400
+    unknown = [i for i, player_id in ids.items() if player_id not in PLAYERS_DB]
+    if unknown:
+        samples = samples[~np.isin(samples['player_id'], unknown)]
+    result = WORKLOADS.ingest(samples)
+    LIVE.notify()
+    
     return jsonify({
-        'data_sources': [
-            {'name': 'Performance Database', 'status': 'online', 'latency_ms': random.randint(10, 50)},
-            {'name': 'Biomedical EMR', 'status': 'online', 'latency_ms': random.randint(15, 60)},
-            {'name': 'Wearables Data', 'status': random.choice(['online', 'warning']), 'latency_ms': random.randint(50, 200)},
-            {'name': 'Match Statistics', 'status': 'online', 'latency_ms': random.randint(20, 80)},
-            {'name': 'Training Data', 'status': 'online', 'latency_ms': random.randint(10, 40)}
-        ],
+        **result,
+        'rejected': received - result['samples'],
+        'unknown_players': [ids[i] for i in unknown]
+    })
+
+@api.route('/api/wearables/workload/<player_id>')
+def get_player_workload(player_id):
+    """Rolling acute/chronic workload for a player from ingested samples"""
+    if player_id not in PLAYERS_DB:
+        return jsonify({'error': 'Player not found'}), 404
+    
+    return jsonify({'player_id': player_id, 'workload': WORKLOADS.workload(player_id)})
+
+@api.route('/api/wearables/status')
+def get_wearables_status():
+    """Samples ingested, players tracked and last batch throughput"""
+    return jsonify(WORKLOADS.stats())
+
+def data_source_status() -> List[Dict]:
+    """Per-source status and last measured latency from the source gateway"""
+    stats = SOURCES.stats()
+    sources = []
+    for key, name in DATA_SOURCES:
+        source = stats.get(key)
+        if source is None:
+            status = 'unconfigured'
+        elif source['last_status'] is None:
+            status = 'idle'
+        else:
+            status = 'online' if source['last_status'] in ('ok', 'not_found') else 'warning'
+        sources.append({
+            'name': name,
+            'status': status,
+            'latency_ms': source['last_latency_ms'] if source else None
+        })
+    return sources
+
+def governance_status() -> Dict:
+    """Data governance and system status"""
+    return {
+        'data_sources': data_source_status(),
         'system_health': {
-            'cpu_usage': random.uniform(30, 80),
-            'memory_usage': random.uniform(40, 85),
-            'disk_usage': random.uniform(20, 60),
-            'network_latency': random.uniform(5, 25)
+            **PROCESS.snapshot(),
+            'request_latency_ms': round(METRICS.mean_request_latency() * 1000, 3)
         },
         'compliance': {
             'gdpr_compliant': True,
@@ -467,62 +1418,401 @@ def get_governance_status():
             'failed_login_attempts': random.randint(0, 3),
             'session_timeout_minutes': 30
         }
-    })
+    }
 
-@app.route('/api/strategy/squad')
-def get_squad_strategy():
-    """Get squad rotation and strategy recommendations"""
-    return jsonify({
+@api.route('/api/governance/status')
+def get_governance_status():
+    """Get data governance and system status"""
+    return jsonify(governance_status())
+
+# Rotation planning (see rotation.py)
+MAX_SQUAD_SIZE = 60
+MAX_PLAN_HORIZON = 40
+HIGH_RISK_THRESHOLD = 30
+POSITION_GROUPS = {'Goalkeeper': 'Goalkeeper', 'Defender': 'Defence', 'Midfielder': 'Midfield', 'Forward': 'Attack'}
+
+def squad_rows(club=None, player_ids=None) -> np.ndarray:
+    """Store rows of the squad to plan: listed players, a club, or the whole (small) database"""
+    if player_ids:
+        unknown = [pid for pid in player_ids if pid not in PLAYERS_DB]
+        if unknown:
+            raise ValueError(f"Unknown players: {', '.join(unknown)}")
+        rows = PLAYERS_DB.rows_for_ids(dict.fromkeys(player_ids))
+    elif club:
+        clubs = PLAYERS_DB.categorical['club']
+        if club not in clubs.lookup:
+            raise ValueError(f'Unknown club: {club}')
+        rows = np.sort(clubs.rows_for([clubs.lookup[club]]))
+    elif len(PLAYERS_DB) <= MAX_SQUAD_SIZE:
+        rows = np.arange(len(PLAYERS_DB), dtype=np.intp)
+    else:
+        # Large databases default to the strongest players of the biggest club
+        clubs = PLAYERS_DB.categorical['club']
+        rows = clubs.rows_for([int(np.bincount(clubs.codes).argmax())])
+        rows = np.sort(PLAYERS_DB.sort_rows(rows, 'overall', descending=True)[:MAX_SQUAD_SIZE])
+    if len(rows) > MAX_SQUAD_SIZE:
+        raise ValueError(f'At most {MAX_SQUAD_SIZE} players per squad')
+    return rows
+
+def squad_strategy(club=None, player_ids=None, horizon: int = 5, formation: str = '4-3-3',
+                   fixtures=None) -> Dict:
+    """Squad rotation plan over the upcoming fixtures; raises ValueError on bad input"""
+    if formation not in FORMATIONS:
+        raise ValueError(f"formation must be one of {', '.join(FORMATIONS)}")
+    if fixtures is None:
+        if not 1 <= horizon <= MAX_PLAN_HORIZON:
+            raise ValueError(f'horizon must be between 1 and {MAX_PLAN_HORIZON}')
+        fixtures = default_fixtures(horizon)
+    elif not isinstance(fixtures, list) or not 1 <= len(fixtures) <= MAX_PLAN_HORIZON:
+        raise ValueError(f'fixtures must be a list of 1 to {MAX_PLAN_HORIZON} fixtures')
+    elif any(not isinstance(f, dict) or f.get('intensity', 'Medium') not in INTENSITIES for f in fixtures):
+        raise ValueError(f"fixture intensity must be one of {', '.join(INTENSITIES)}")
+
+    rows = squad_rows(club, player_ids)
+    players = PLAYERS_DB.records(rows, ['id', 'name', 'position'])
+    strength = PLAYERS_DB.column('overall')[rows]
+    injury = [with_workload('injury', p['id'], player_prediction('injury', p['id'], PLAYERS_DB[p['id']]))
+              for p in players]
+    base_risk = np.array([i['current_risk'] for i in injury], dtype=np.float64)
+    # Starting fatigue follows the Training Load driver (measured ACWR when wearables data exists)
+    training_load = np.array([next(d['impact'] for d in i['drivers'] if d['name'] == 'Training Load')
+                              for i in injury], dtype=np.float64)
+    initial_fatigue = np.clip(20 + 5 * training_load, 0, 60)
+    positions = [p['position'] for p in players]
+
+    start = time.perf_counter()
+    plan = plan_rotation(strength, base_risk, positions, initial_fatigue, fixtures, formation)
+    solve_ms = (time.perf_counter() - start) * 1000
+
+    # The strongest lineup ignoring fatigue, to describe what each planned lineup rotates
+    by_strength = sorted(range(len(players)), key=lambda i: -strength[i])
+    strongest = set()
+    for position, count in zip(ROTATION_POSITIONS, FORMATIONS[formation]):
+        strongest.update([i for i in by_strength if positions[i] == position][:count])
+
+    upcoming = []
+    for t, fixture in enumerate(fixtures):
+        lineup = set(plan['lineups'][t])
+        rotated = len(strongest - lineup)
+        upcoming.append({
+            'opponent': fixture.get('opponent'),
+            'date': fixture.get('date'),
+            'venue': fixture.get('venue'),
+            'intensity': fixture.get('intensity', 'Medium'),
+            'recommended_lineup': 'Full strength' if not rotated else f"Rotate {rotated} player{'s' if rotated > 1 else ''}",
+            'lineup': [players[i]['id'] for i in plan['lineups'][t]],
+            'rested': [players[i]['id'] for i in sorted(strongest - lineup)],
+            'expected_strength': round(plan['expected_strength'][t], 1),
+            'shortfall': plan['shortfalls'][t]
+        })
+
+    # Who sits out the next fixture, and why
+    first = set(plan['lineups'][0])
+    capped = (plan['match_risk'][0] > MAX_MATCH_RISK) | (plan['fatigue'][0] > MAX_FATIGUE)
+    recommendations = []
+    for position in ROTATION_POSITIONS:
+        rested = [i for i in by_strength if positions[i] == position and i in strongest and i not in first]
+        if not rested:
+            continue
+        deployed = [i for i in by_strength if positions[i] == position and i in first and i not in strongest]
+        high = any(capped[i] for i in rested)
+        change = 'Rest ' + ', '.join(players[i]['name'] for i in rested)
+        if deployed:
+            change += ', deploy ' + ', '.join(players[i]['name'] for i in deployed)
+        recommendations.append({
+            'position': POSITION_GROUPS[position],
+            'priority': 'HIGH' if high else 'MEDIUM',
+            'reason': 'Fatigue or injury risk over the safe limit' if high else 'Manage load across the upcoming fixtures',
+            'suggested_changes': change
+        })
+
+    return {
         'squad_fatigue': {
-            'overall_level': random.uniform(50, 85),
-            'high_risk_players': random.randint(2, 6),
-            'recommended_rest': random.randint(1, 4)
+            'overall_level': round(float(np.mean(initial_fatigue)), 1) if players else 0.0,
+            'high_risk_players': int(np.sum(base_risk >= HIGH_RISK_THRESHOLD)),
+            'recommended_rest': len(strongest - first)
         },
-        'upcoming_fixtures': [
-            {
-                'opponent': 'Barcelona',
-                'date': '2024-10-26',
-                'venue': 'Home',
-                'intensity': 'High',
-                'recommended_lineup': 'Full strength'
-            },
-            {
-                'opponent': 'Atletico Madrid',
-                'date': '2024-10-29',
-                'venue': 'Away',
-                'intensity': 'Medium',
-                'recommended_lineup': 'Rotate 2-3 players'
-            }
-        ],
-        'rotation_recommendations': [
-            {
-                'position': 'Midfield',
-                'priority': 'HIGH',
-                'reason': 'High fatigue levels detected',
-                'suggested_changes': 'Rest Bellingham, deploy Camavinga'
-            },
-            {
-                'position': 'Forward',
-                'priority': 'MEDIUM',
-                'reason': 'Manage load distribution',
-                'suggested_changes': 'Rotate Mbappé and Vinicius'
-            }
-        ]
+        'upcoming_fixtures': upcoming,
+        'rotation_recommendations': recommendations,
+        'players': [{
+            'id': player['id'],
+            'name': player['name'],
+            'position': player['position'],
+            'injury_risk': float(base_risk[i]),
+            'appearances': sum(i in lineup for lineup in plan['lineups']),
+            'fatigue': np.round(plan['fatigue'][:, i], 1).tolist()
+        } for i, player in enumerate(players)],
+        'plan': {
+            'formation': formation,
+            'fixtures': len(fixtures),
+            'squad_size': len(players),
+            'objective': round(plan['objective'], 2),
+            'iterations': plan['iterations'],
+            'solve_ms': round(solve_ms, 2)
+        }
+    }
+
+@api.route('/api/strategy/squad', methods=['GET', 'POST'])
+def get_squad_strategy():
+    """Get squad rotation and strategy recommendations.
+
+    GET plans ``horizon`` default fixtures for ``club`` or ``players``; POST
+    takes the same fields as JSON, with an explicit ``fixtures`` list of
+    {opponent, date, venue, intensity} in place of ``horizon`` if given.
+    """
+    if request.method == 'POST':
+        body = request.get_json(silent=True) or {}
+        options = {
+            'club': body.get('club'),
+            'player_ids': body.get('players'),
+            'horizon': body.get('horizon', 5),
+            'formation': body.get('formation', '4-3-3'),
+            'fixtures': body.get('fixtures')
+        }
+        if isinstance(options['horizon'], bool) or not isinstance(options['horizon'], int):
+            return jsonify({'error': 'horizon must be an integer'}), 400
+        if options['player_ids'] is not None and (not isinstance(options['player_ids'], list)
+                                                  or not all(isinstance(p, str) for p in options['player_ids'])):
+            return jsonify({'error': 'players must be a list of player ids'}), 400
+    else:
+        player_ids = request.args.get('players')
+        options = {
+            'club': request.args.get('club'),
+            'player_ids': [p.strip() for p in player_ids.split(',') if p.strip()] if player_ids else None,
+            'horizon': request.args.get('horizon', 5, type=int),
+            'formation': request.args.get('formation', '4-3-3')
+        }
+    try:
+        return jsonify(squad_strategy(**options))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+def live_squad(_=None) -> Dict:
+    """Default squad plan for the live topic, without the per-run solve time"""
+    strategy = squad_strategy()
+    strategy['plan'] = {k: v for k, v in strategy['plan'].items() if k != 'solve_ms'}
+    return strategy
+
+def live_squad_signature(_=None) -> Tuple:
+    """Everything the default squad plan depends on: its players, their record versions and workloads,
+    and the day the default fixtures start from"""
+    rows = squad_rows()
+    ids = [PLAYERS_DB.ids[r] for r in rows.tolist()]
+    return (datetime.date.today(), tuple(ids), PLAYERS_DB.versions[rows].tobytes(),
+            tuple(WORKLOADS.signature(pid) for pid in ids))
+
+def live_governance(_=None) -> Dict:
+    """Governance state for the live topic: source status, compliance and access settings.
+
+    Leaves out what moves on every call (process metrics, scan time, mock
+    session counts); /api/governance/status still reports them.
+    """
+    status = governance_status()
+    compliance = {k: v for k, v in status['compliance'].items() if k != 'last_security_scan'}
+    access = {k: status['access_control'][k] for k in ('admin_users', 'session_timeout_minutes')}
+    return {'data_sources': status['data_sources'], 'compliance': compliance, 'access_control': access}
+
+# Server-sent events for live dashboards: one producer recomputes what subscribers
+# follow and pushes only changes (see live.py)
+LIVE = LiveHub([
+    Topic('injury', lambda pid: with_workload('injury', pid, player_prediction('injury', pid, PLAYERS_DB[pid])),
+          signature=lambda pid: (PLAYERS_DB.version(pid), WORKLOADS.signature(pid)), per_player=True),
+    Topic('squad', live_squad, signature=live_squad_signature),
+    Topic('governance', live_governance),
+], interval=float(os.environ.get('CHAMPIONS_LIVE_INTERVAL', 2)),
+   # Unset means no cap; serve.py's prefork mode keeps half of each worker's threads for the API
+   max_streams=int(os.environ['CHAMPIONS_LIVE_MAX_STREAMS']) if os.environ.get('CHAMPIONS_LIVE_MAX_STREAMS') else None)
+MAX_LIVE_PLAYERS = 100
+
+@api.route('/api/live/stream')
+def live_stream():
+    """Subscribe to live prediction and status changes as server-sent events.
+
+    ``topics`` picks from injury, squad and governance (default: all);
+    ``players`` lists the players whose injury predictions to follow. The
+    stream opens with a ``snapshot`` event, then sends one event per change
+    carrying only the fields that changed.
+    """
+    topics = request.args.get('topics')
+    topics = {t.strip() for t in topics.split(',') if t.strip()} if topics else set(LIVE.topics)
+    players = {p.strip() for p in request.args.get('players', '').split(',') if p.strip()}
+    
+    unknown_topics = topics - set(LIVE.topics)
+    if unknown_topics:
+        return jsonify({'error': f"topics must be drawn from {', '.join(LIVE.topics)}"}), 400
+    if len(players) > MAX_LIVE_PLAYERS:
+        return jsonify({'error': f'At most {MAX_LIVE_PLAYERS} players per stream'}), 400
+    unknown_players = sorted(p for p in players if p not in PLAYERS_DB)
+    if unknown_players:
+        return jsonify({'error': f"Unknown players: {', '.join(unknown_players)}"}), 404
+    
+    try:
+        subscriber = LIVE.subscribe(topics, players)
+    except StreamsFull as e:
+        response = jsonify({'error': str(e), 'retry_after': e.retry_after})
+        response.status_code = 503
+        response.headers['Retry-After'] = str(e.retry_after)
+        return response
+    return current_app.response_class(LIVE.stream(subscriber), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+@api.route('/api/live/status')
+def get_live_status():
+    """Subscribers, published events and producer tick cost"""
+    return jsonify(LIVE.stats())
+
+@api.route('/api/predictions/status')
+def get_predictions_status():
+    """Materialized prediction coverage and last refresh"""
+    return jsonify(PREDICTIONS.status())
+
+@api.route('/api/predictions/refresh', methods=['POST'])
+def refresh_predictions():
+    """Recompute changed players now, or every player with {"full": true}"""
+    payload = request.get_json(silent=True) or {}
+    return jsonify(PREDICTIONS.refresh(full=bool(payload.get('full'))))
+
+@api.route('/api/metrics')
+def get_metrics():
+    """Prometheus text exposition of request, engine, cache and process metrics"""
+    process = PROCESS.snapshot()
+    cache = RESPONSE_CACHE.stats()
+    predictions = PREDICTIONS.status()
+    lines = METRICS.render()
+    lines += render_gauges('champions_process_cpu_seconds_total', 'User and system CPU time',
+                           {(): process['cpu_seconds']}, 'counter')
+    lines += render_gauges('champions_process_resident_memory_bytes', 'Resident set size',
+                           {(): process['rss_bytes']})
+    lines += render_gauges('champions_process_uptime_seconds', 'Seconds since the process started',
+                           {(): process['uptime_seconds']})
+    lines += render_gauges('champions_response_cache_events_total', 'Prediction response cache events', {
+        (('event', event),): cache[event] for event in ('hits', 'misses', 'not_modified', 'evictions', 'expirations')
+    }, 'counter')
+    lines += render_gauges('champions_response_cache_hit_ratio', 'Cache hits over lookups', {(): cache['hit_ratio']})
+    lines += render_gauges('champions_response_cache_entries', 'Cached responses', {(): cache['size']})
+    lines += render_gauges('champions_materialized_players', 'Players by prediction freshness', {
+        (('state', 'fresh'),): predictions['materialized'], (('state', 'stale'),): predictions['stale']
     })
+    offload = OFFLOAD.stats()
+    lines += render_gauges('champions_offload_jobs_total', 'Engine jobs by outcome', {
+        (('outcome', outcome),): offload[outcome] for outcome in ('completed', 'coalesced', 'rejected', 'timeouts', 'errors')
+    }, 'counter')
+    lines += render_gauges('champions_offload_pending_jobs', 'Engine jobs queued or running', {(): offload['pending']})
+    training = TRAINING_JOBS.stats()
+    lines += render_gauges('champions_training_jobs', 'Training plan jobs by state', {
+        (('state', state),): count for state, count in training['jobs'].items()
+    })
+    lines += render_gauges('champions_training_plans_total', 'Training plans served by jobs', {
+        (('source', source),): training[source] for source in ('generated', 'reused')
+    }, 'counter')
+    lines += render_gauges('champions_source_requests_total', 'Upstream data source fetches by outcome', {
+        (('source', key), ('status', status)): source[status]
+        for key, source in SOURCES.stats().items() for status in ('ok', 'not_found', 'timeout', 'error')
+    }, 'counter')
+    return current_app.response_class('\n'.join(lines) + '\n', content_type='text/plain; version=0.0.4; charset=utf-8')
+
+@api.route('/api/cache/stats')
+def get_cache_stats():
+    """Response cache hit ratio, evictions and occupancy"""
+    return jsonify({
+        'deterministic_predictions': DETERMINISTIC_PREDICTIONS,
+        'model_version': MODEL_VERSION,
+        'response_cache': RESPONSE_CACHE.stats(),
+        'player_records': PLAYERS_DB.cache_stats()
+    })
+
+@api.route('/api/offload/status')
+def get_offload_status():
+    """Engine job executor mode, queue depth and job outcomes"""
+    return jsonify(OFFLOAD.stats())
+
+@api.app_errorhandler(Overloaded)
+def overloaded(error):
+    response = jsonify({'error': 'Prediction capacity exhausted, retry later', 'retry_after': error.retry_after})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
 
-@app.errorhandler(404)
+@api.app_errorhandler(JobTimeout)
+def job_timeout(error):
+    return jsonify({'error': str(error)}), 504
+
+@api.app_errorhandler(404)
 def not_found(error):
     return jsonify({'error': 'Endpoint not found'}), 404
 
-@app.errorhandler(500)
+@api.app_errorhandler(500)
 def internal_error(error):
     return jsonify({'error': 'Internal server error'}), 500
 
+def create_app() -> Flask:
+    """Build a Flask app serving the Champions Gen routes.
+
+    Importing this module does not create one: WSGI servers and serve.py
+    use ``app`` below, which is built on first access, and tests or tools
+    can build their own.
+    """
+    global ASSETS
+    flask_app = Flask(__name__)
+    # CHAMPIONS_JSON_BACKEND=orjson|msgspec|stdlib pins the encoder; auto takes the fastest installed
+    flask_app.json = InstrumentedJSONProvider(flask_app, os.environ.get('CHAMPIONS_JSON_BACKEND', 'auto'))
+    CORS(flask_app)
+    flask_app.register_blueprint(api)
+    if ASSETS is None:
+        ASSETS = AssetManifest(flask_app.static_folder)
+    LIVE.dumps = flask_app.json.dumps
+    return flask_app
+
+_APP_LOCK = threading.Lock()
+
+def get_app() -> Flask:
+    """The process-wide default app, created on first call"""
+    with _APP_LOCK:
+        if 'app' not in globals():
+            globals()['app'] = create_app()
+    return globals()['app']
+
+def __getattr__(name: str):
+    # ``app.app`` (gunicorn app:app, serve.py, benchmarks) is created on first access
+    if name == 'app':
+        return get_app()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+def preload() -> Flask:
+    """Build the default app and everything its first requests would otherwise build.
+
+    serve.py calls this once before serving; in prefork mode that happens in
+    the gunicorn master, so every forked worker starts with materialized
+    predictions, the similarity and search indexes, the rendered page and
+    bootstrap data and shares their memory copy-on-write. The warmed
+    objects are then frozen out of the garbage collector, whose passes
+    would otherwise write to (and so copy) those shared pages in every
+    worker.
+    """
+    flask_app = get_app()
+    if DETERMINISTIC_PREDICTIONS and PREDICTIONS.eager:
+        PREDICTIONS.refresh()
+    SEARCH.refresh()
+    SIMILARITY.warm()
+    with flask_app.test_request_context('/'):
+        index()
+        if DETERMINISTIC_PREDICTIONS:
+            bootstrap_representation()
+    gc.collect()
+    gc.freeze()
+    return flask_app
+
+def start_background_tasks():
+    """Start per-process background work; serve.py calls this once in every serving process"""
+    if DETERMINISTIC_PREDICTIONS:
+        PREDICTIONS.start(MATERIALIZE_INTERVAL)
+
 if __name__ == '__main__':
-    print("🚀 Starting Champions Gen Backend Server...")
-    print("📊 AI-Powered Football Analytics Platform")
-    print("🔗 API endpoints available at http://localhost:5000/api/")
-    print("🌐 Frontend available at http://localhost:5000/")
-    print("📋 Health check: http://localhost:5000/api/health")
+    import sys
+    import serve
     
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    # serve imports this module as ``app``; reuse it instead of loading a second copy
+    sys.modules.setdefault('app', sys.modules[__name__])
+    serve.main(sys.argv[1:], default_mode='dev')
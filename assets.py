@@ -0,0 +1,165 @@
+"""
+Champions Gen - Static Assets
+
+Content-hashed, precompressed static files. Every file under the static
+folder is read once at startup, fingerprinted (``styles.3f2a9c1b7d4e.css``)
+and, for text types, compressed with gzip and, when the brotli module is
+installed, brotli. A hashed URL never changes content, so it is served
+with a year-long immutable Cache-Control and the browser does not even
+revalidate it; a changed file gets a new hash and therefore a new URL.
+Stylesheet ``url()`` references are rewritten to hashed names before the
+stylesheet itself is hashed, so a changed image also changes the CSS URL.
+
+``Representation`` is the shared piece: one body with its compressed
+variants and an ETag, answered with the best encoding the client accepts
+or a 304. Generated bodies (the rendered page, /api/bootstrap) use it too.
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+from typing import Dict, Optional
+
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'image/svg+xml')
+# Preference when the client accepts several encodings equally
+ENCODINGS = ('br', 'gzip')
+IMMUTABLE = 'public, max-age=31536000, immutable'
+HASH_LENGTH = 12
+CSS_URL = re.compile(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)""")
+
+
+def brotli_available() -> bool:
+    return brotli is not None
+
+
+def compress(data: bytes) -> Dict[str, bytes]:
+    """Compressed variants of ``data``, keeping only those that are actually smaller"""
+    variants = {'gzip': gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants['br'] = brotli.compress(data, quality=11)
+    return {encoding: body for encoding, body in variants.items() if len(body) < len(data)}
+
+
+def compressible(mimetype: str) -> bool:
+    return mimetype.startswith(COMPRESSIBLE_TYPES)
+
+
+def hashed_name(filename: str, digest: str) -> str:
+    stem, ext = os.path.splitext(filename)
+    return f'{stem}.{digest[:HASH_LENGTH]}{ext}'
+
+
+class Representation:
+    """A response body with precompressed variants and a weak ETag"""
+
+    __slots__ = ('bodies', 'etag', 'mimetype')
+
+    def __init__(self, data: bytes, mimetype: str):
+        self.mimetype = mimetype
+        self.bodies = {'identity': data}
+        if compressible(mimetype):
+            self.bodies.update(compress(data))
+        self.etag = hashlib.blake2b(data, digest_size=12).hexdigest()
+
+    def encoding_for(self, accept_encodings) -> str:
+        """Best available encoding under the client's Accept-Encoding"""
+        best, best_quality = 'identity', 0.0
+        for encoding in ENCODINGS:
+            if encoding in self.bodies:
+                quality = accept_encodings[encoding]
+                if quality > best_quality:
+                    best, best_quality = encoding, quality
+        return best
+
+    def size(self, encoding: str = 'identity') -> int:
+        return len(self.bodies.get(encoding, self.bodies['identity']))
+
+    def response(self, request, response_class, cache_control: str = 'no-cache'):
+        if request.if_none_match.contains_weak(self.etag):
+            response = response_class(status=304)
+        else:
+            encoding = self.encoding_for(request.accept_encodings)
+            response = response_class(self.bodies[encoding], mimetype=self.mimetype)
+            if encoding != 'identity':
+                response.headers['Content-Encoding'] = encoding
+        response.set_etag(self.etag, weak=True)
+        response.headers['Cache-Control'] = cache_control
+        response.vary.add('Accept-Encoding')
+        return response
+
+
+class AssetManifest:
+    """Hashed names and precompressed bodies for every file under ``folder``"""
+
+    def __init__(self, folder: str):
+        self.folder = folder
+        self.names: Dict[str, str] = {}
+        self.assets: Dict[str, Representation] = {}
+        self.build()
+
+    def build(self):
+        files = []
+        for root, _, filenames in os.walk(self.folder):
+            for filename in filenames:
+                files.append(os.path.relpath(os.path.join(root, filename), self.folder).replace(os.sep, '/'))
+        # Stylesheets last, so their url() references can point at hashed names
+        for filename in sorted(files, key=lambda f: (f.endswith('.css'), f)):
+            with open(os.path.join(self.folder, filename), 'rb') as f:
+                data = f.read()
+            if filename.endswith('.css'):
+                data = self._rewrite_css(filename, data)
+            mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+            name = hashed_name(filename, hashlib.sha256(data).hexdigest())
+            self.names[filename] = name
+            self.assets[name] = Representation(data, mimetype)
+
+    def _rewrite_css(self, filename: str, data: bytes) -> bytes:
+        base = os.path.dirname(filename)
+
+        def replace(match):
+            target = match.group(2)
+            if ':' in target or target.startswith(('/', '#')):
+                return match.group(0)
+            path = os.path.normpath(os.path.join(base, target)).replace(os.sep, '/')
+            if path not in self.names:
+                return match.group(0)
+            hashed = os.path.relpath(self.names[path], base or '.').replace(os.sep, '/')
+            return f"url('{hashed}')"
+
+        return CSS_URL.sub(replace, data.decode()).encode()
+
+    def url_name(self, filename: str) -> str:
+        """Hashed name for a static file (the plain name for files added since startup)"""
+        return self.names.get(filename, filename)
+
+    def get(self, name: str) -> Optional[Representation]:
+        return self.assets.get(name)
+
+    def current_name(self, name: str) -> Optional[str]:
+        """The current hashed name for ``name`` carrying an outdated hash, if the file still exists"""
+        stem, ext = os.path.splitext(name)
+        stem, _, digest = stem.rpartition('.')
+        if not stem or len(digest) != HASH_LENGTH:
+            return None
+        return self.names.get(stem + ext)
+
+    def stats(self) -> Dict:
+        total = {'identity': 0, 'gzip': 0, 'br': 0}
+        for asset in self.assets.values():
+            for encoding in total:
+                total[encoding] += asset.size(encoding)
+        return {
+            'files': len(self.assets),
+            'bytes': total,
+            'brotli': brotli_available()
+        }
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark: MockAIEngine throughput, scalar per-player calls vs vectorized batch.
+
+Finishes by checking, through the Flask test client, that POST
+/api/predict/batch returns exactly what the per-player /api/predict/<type>
+routes do for the same players, whichever players share the batch.
+
+Usage: python benchmarks/bench_batch_predict.py
+       CHAMPIONS_BENCH_SIZES=1000,100000 python benchmarks/bench_batch_predict.py
+"""
+
+import time
+
+import numpy as np
+
+from synthetic import generate_players, scale_from_env
+from ai_engine import MockAIEngine
+from player_store import PlayerStore
+
+ENGINE = MockAIEngine()
+CONSISTENCY_PLAYERS = 50
+
+
+def scalar_path(store, rows, prediction_type):
+    """One record rebuild + engine call per player, as the per-player routes do"""
+    method = {
+        'injury': ENGINE.predict_injury_risk,
+        'development': ENGINE.predict_player_development,
+        'value': ENGINE.predict_market_value,
+    }[prediction_type]
+    return [method(player) for player in store.records(rows)]
+
+
+def batch_path(store, rows, prediction_type, rng):
+    ages = store.column('age')[rows]
+    positions = store.categorical['position'].values(rows)
+    if prediction_type == 'injury':
+        return ENGINE.predict_injury_risk_batch(ages, positions, rng)
+    if prediction_type == 'development':
+        return ENGINE.predict_player_development_batch(ages, positions, rng)
+    return ENGINE.predict_market_value_batch(store.column('current_value')[rows], ages, positions, rng)
+
+
+def best_of(fn, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def check_routes_agree(n):
+    """Batch predictions equal the per-player routes, alone and in two different batches"""
+    import app as champions_app
+    champions_app.PLAYERS_DB = PlayerStore(generate_players(n))
+    client = champions_app.app.test_client()
+    ids = list(champions_app.PLAYERS_DB.ids[:CONSISTENCY_PLAYERS])
+    batches = [ids, ids[::-1][:CONSISTENCY_PLAYERS // 2]]
+    for batch in batches:
+        response = client.post('/api/predict/batch', json={'player_ids': batch})
+        assert response.status_code == 200, response.data
+        for prediction_type, results in response.get_json()['predictions'].items():
+            for result in results:
+                single = client.get(f'/api/predict/{prediction_type}/{result["player_id"]}').get_json()
+                assert result['prediction'] == single['prediction'], (prediction_type, result['player_id'])
+    print(f'\n/api/predict/batch matches the per-player routes for {len(ids)} players in {len(batches)} batches')
+
+
+def main():
+    rng = np.random.default_rng(0)
+    for n in scale_from_env('1000,100000'):
+        store = PlayerStore(generate_players(n))
+        rows = np.arange(n, dtype=np.intp)
+        print(f'\n{n:,} players')
+        print(f'{"prediction":<12} {"scalar p/s":>12} {"batch p/s":>12} {"speedup":>8}')
+        for prediction_type in ('injury', 'development', 'value'):
+            scalar_s = best_of(lambda: scalar_path(store, rows, prediction_type))
+            batch_s = best_of(lambda: batch_path(store, rows, prediction_type, rng))
+            print(f'{prediction_type:<12} {n / scalar_s:>12,.0f} {n / batch_s:>12,.0f} '
+                  f'{scalar_s / batch_s:>7.1f}x')
+    check_routes_agree(1000)
+
+
+if __name__ == '__main__':
+    main()
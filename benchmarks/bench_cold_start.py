@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cold start to first served request.
+
+Three views, each in fresh processes:
+
+- phases: ``import app``, ``create_app``, ``preload`` and the first (then a
+  second) request to the page, /api/bootstrap and a prediction, through
+  the test client. Run with and without preload, and once with aiohttp
+  imported up front, which is what every start paid before it became a
+  lazy import.
+- launchers: ``serve.py`` (threaded, and prefork if gunicorn is installed)
+  and ``run.py`` are started and polled until /api/health answers; the
+  time to that first response and until the page and /api/bootstrap after
+  it have been served are reported. The launcher run.py used to be is
+  priced from its parts: the ``pip install`` it ran on every start (timed
+  here with everything already satisfied, which makes it a lower bound)
+  plus its fixed 2 s pause.
+- prefork memory: total PSS (shared pages divided among the processes
+  mapping them) of the master and its workers after every worker served
+  the page and bootstrap data, with and without preload. Linux only.
+
+Database size 0 means the demo players; larger sizes are written with
+``PlayerStore.save`` and served through CHAMPIONS_PLAYERS_DIR.
+
+Usage: python benchmarks/bench_cold_start.py
+       CHAMPIONS_BENCH_SIZES=0,200000 python benchmarks/bench_cold_start.py
+"""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+import numpy as np
+
+from synthetic import REPO_ROOT, generate_players, scale_from_env
+
+REPEATS = 3
+WORKERS = 2
+LEGACY_SLEEP_S = 2.0
+FIRST_REQUESTS = ('/', '/api/bootstrap', '/api/predict/injury/{player_id}')
+
+
+def phases(preload: bool, eager_aiohttp: bool):
+    """Child process: time each startup phase and the first requests, print JSON"""
+    timings = {}
+    start = time.perf_counter()
+    if eager_aiohttp:
+        import aiohttp  # noqa: F401
+    import app as champions_app
+    timings['import'] = time.perf_counter() - start
+    mark = time.perf_counter()
+    flask_app = champions_app.get_app()
+    timings['create_app'] = time.perf_counter() - mark
+    if preload:
+        mark = time.perf_counter()
+        champions_app.preload()
+        timings['preload'] = time.perf_counter() - mark
+    client = flask_app.test_client()
+    player_id = champions_app.PLAYERS_DB.ids[0]
+    for attempt in ('first', 'second'):
+        for url in FIRST_REQUESTS:
+            mark = time.perf_counter()
+            assert client.get(url.format(player_id=player_id)).status_code == 200, url
+            timings[f'{attempt} {url.split("/")[-2] if "{" in url else url}'] = time.perf_counter() - mark
+    timings['ready'] = time.perf_counter() - start
+    print(json.dumps(timings))
+
+
+def run_phases(env, preload, eager_aiohttp):
+    runs = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        output = subprocess.run([sys.executable, __file__, '--phases', str(int(preload)), str(int(eager_aiohttp))],
+                                env=env, cwd=REPO_ROOT, capture_output=True, text=True, check=True).stdout
+        result = json.loads(output.splitlines()[-1])
+        result['process'] = time.perf_counter() - start
+        runs.append(result)
+    return {key: float(np.median([r[key] for r in runs])) * 1000 for key in runs[0]}
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def get(port, path, timeout=5.0):
+    with urllib.request.urlopen(f'http://127.0.0.1:{port}{path}', timeout=timeout) as response:
+        response.read()
+        return response.status
+
+
+def wait_for(port, deadline=60.0):
+    start = time.perf_counter()
+    while time.perf_counter() - start < deadline:
+        try:
+            if get(port, '/api/health') == 200:
+                return time.perf_counter() - start
+        except OSError:
+            time.sleep(0.01)
+    raise RuntimeError(f'server on port {port} did not come up')
+
+
+def children(pid):
+    try:
+        with open(f'/proc/{pid}/task/{pid}/children') as f:
+            return [int(c) for c in f.read().split()]
+    except OSError:
+        return []
+
+
+def pss_kb(pid) -> int:
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            if line.startswith('Pss:'):
+                return int(line.split()[1])
+    return 0
+
+
+def launch(command, env, port, measure_memory=False):
+    """Start a server, time its first /api/health response and the page load after it, optionally read its PSS"""
+    start = time.perf_counter()
+    process = subprocess.Popen(command, env=env, cwd=REPO_ROOT, stdout=subprocess.DEVNULL,
+                               stderr=subprocess.DEVNULL, start_new_session=True)
+    try:
+        wait_for(port)
+        first = time.perf_counter() - start
+        get(port, '/')
+        get(port, '/api/bootstrap')
+        page = time.perf_counter() - start
+        memory = None
+        if measure_memory:
+            # Enough requests that every worker has most likely served the page and bootstrap data
+            for _ in range(8 * WORKERS):
+                get(port, '/')
+                get(port, '/api/bootstrap')
+            processes = [process.pid] + children(process.pid)
+            memory = sum(pss_kb(p) for p in processes) / 1024
+        return first * 1000, page * 1000, memory
+    finally:
+        os.killpg(process.pid, 15)
+        process.wait()
+
+
+def run_bare() -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', 'pass'], check=True)
+    return (time.perf_counter() - start) * 1000
+
+
+def pip_check_ms() -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-m', 'pip', 'install', '-r', 'requirements.txt'], cwd=REPO_ROOT,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return (time.perf_counter() - start) * 1000
+
+
+def gunicorn_available() -> bool:
+    try:
+        import gunicorn  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def report(n, env):
+    label = f'{n:,} players' if n else 'demo players'
+    print(f'\n== {label}: startup phases in a fresh process (median of {REPEATS}, ms)')
+    variants = (('preload', True, False), ('no preload', False, False), ('eager aiohttp', False, True))
+    results = [(name, run_phases(env, preload, eager)) for name, preload, eager in variants]
+    keys = [k for k in results[0][1] if k != 'ready'] + ['ready']
+    print(f'{"phase":<24}' + ''.join(f'{name:>15}' for name, _ in results))
+    for key in keys:
+        print(f'{key:<24}' + ''.join(f'{r.get(key, 0.0):>15.1f}' for _, r in results))
+
+    print(f'\n== {label}: launchers, spawn to first response (ms)')
+    print(f'{"launcher":<34} {"health":>9} {"page+data":>10}')
+    launchers = [('serve.py threaded', ['--mode', 'threaded']),
+                 ('serve.py threaded --no-preload', ['--mode', 'threaded', '--no-preload'])]
+    if gunicorn_available():
+        launchers += [(f'serve.py prefork x{WORKERS}', ['--mode', 'prefork', '--workers', str(WORKERS)]),
+                      (f'serve.py prefork x{WORKERS} --no-preload',
+                       ['--mode', 'prefork', '--workers', str(WORKERS), '--no-preload'])]
+    for name, args in launchers:
+        port = free_port()
+        first, page, _ = launch([sys.executable, 'serve.py', *args, '--port', str(port)], env, port)
+        print(f'{name:<34} {first:>9.0f} {page:>10.0f}')
+    port = free_port()
+    first, page, _ = launch([sys.executable, 'run.py', '--no-browser', '--mode', 'threaded', '--port', str(port)],
+                            env, port)
+    print(f'{"run.py threaded":<34} {first:>9.0f} {page:>10.0f}')
+    legacy = pip_check_ms() + LEGACY_SLEEP_S * 1000
+    print(f'{"previous run.py (pip + 2 s pause)":<34} {first + legacy:>9.0f} {page + legacy:>10.0f}')
+
+    if gunicorn_available() and os.path.exists('/proc/self/smaps_rollup'):
+        print(f'\n== {label}: prefork master + {WORKERS} workers after serving the page and bootstrap data')
+        print(f'{"mode":<14} {"total PSS MB":>13}')
+        for name, args in (('preload', []), ('no preload', ['--no-preload'])):
+            port = free_port()
+            _, _, memory = launch([sys.executable, 'serve.py', '--mode', 'prefork', '--workers', str(WORKERS),
+                                   '--port', str(port), *args], env, port, measure_memory=True)
+            print(f'{name:<14} {memory:>13.1f}')
+
+
+def main():
+    base_env = dict(os.environ, CHAMPIONS_LIVE_INTERVAL='3600')
+    base_env.pop('CHAMPIONS_PLAYERS_DIR', None)
+    print(f'interpreter start-up alone: {np.median([run_bare() for _ in range(REPEATS)]):.1f} ms')
+    for n in scale_from_env('0,100000'):
+        if not n:
+            report(n, base_env)
+            continue
+        with tempfile.TemporaryDirectory() as tmp:
+            from player_store import PlayerStore
+            store_dir = os.path.join(tmp, 'players')
+            PlayerStore(generate_players(n)).save(store_dir)
+            report(n, dict(base_env, CHAMPIONS_PLAYERS_DIR=store_dir))
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == '--phases':
+        phases(sys.argv[2] == '1', sys.argv[3] == '1')
+    else:
+        main()
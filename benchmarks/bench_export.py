@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark: whole-database export, one jsonify body vs streamed NDJSON/CSV.
+
+The "before" path is what a warehouse dump used to take: every player record
+plus its predictions collected into one list and serialized in one response.
+The streamed path is /api/export/players read chunk by chunk through the
+test client. Reports time to first byte, total time and peak Python heap
+(tracemalloc, measured in a separate pass).
+
+Usage: python benchmarks/bench_export.py
+       CHAMPIONS_BENCH_SIZES=100000 python benchmarks/bench_export.py
+"""
+
+import time
+import tracemalloc
+
+from synthetic import generate_players, scale_from_env
+import app as champions_app
+from materializer import PREDICTION_TYPES
+from player_store import PlayerStore
+
+
+def one_body(store):
+    """Collect everything, then serialize once"""
+    players = store.records(store.filter())
+    for player in players:
+        player['predictions'] = {t: champions_app.PREDICTIONS.get(t, player['id']) for t in PREDICTION_TYPES}
+    with champions_app.app.app_context():
+        body = champions_app.jsonify({'players': players, 'count': len(players)}).get_data()
+    yield body
+
+
+def streamed(client, url):
+    response = client.get(url, buffered=False)
+    yield from response.iter_encoded()
+    response.close()
+
+
+def measure(make_iter):
+    start = time.perf_counter()
+    first = None
+    size = 0
+    for part in make_iter():
+        if first is None:
+            first = time.perf_counter() - start
+        size += len(part)
+    return first * 1000, (time.perf_counter() - start) * 1000, size
+
+
+def peak_mib(make_iter):
+    tracemalloc.start()
+    for _ in make_iter():
+        pass
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 2 ** 20
+
+
+def main():
+    client = champions_app.app.test_client()
+    for n in scale_from_env('50000'):
+        champions_app.PLAYERS_DB = PlayerStore(generate_players(n))
+        refresh = champions_app.PREDICTIONS.refresh(full=True)
+        print(f'\n{n:,} players (materialized predictions in {refresh["duration_ms"] / 1000:.1f} s)')
+        print(f'{"path":<26} {"first byte ms":>14} {"total ms":>10} {"MB out":>8} {"peak heap MiB":>14}')
+        cases = [
+            ('one jsonify body', lambda: one_body(champions_app.PLAYERS_DB)),
+            ('stream ndjson', lambda: streamed(client, '/api/export/players')),
+            ('stream csv', lambda: streamed(client, '/api/export/players?format=csv')),
+        ]
+        for label, make_iter in cases:
+            first, total, size = measure(make_iter)
+            print(f'{label:<26} {first:>14.1f} {total:>10.0f} {size / 1e6:>8.1f} {peak_mib(make_iter):>14.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark: page-load bytes, requests and modelled time to interactive.
+
+The web app is loaded through the Flask test client the way a browser
+loads it: the HTML, then every same-origin stylesheet, script and preload
+it references (the Chart.js CDN script is left out). A small HTTP cache
+keeps validators and honours Cache-Control, so a repeat visit skips
+immutable assets and revalidates the rest. Each visit is made with plain
+/static URLs served uncompressed (what the debug server still does) and
+with hashed, precompressed /assets under each Accept-Encoding. Database
+size 0 means the demo players.
+
+Time to interactive is modelled rather than measured in a browser: the
+HTML round trip, then one round of parallel subresource fetches sharing
+the link, plus measured server time, excluding connection setup.
+
+Usage: python benchmarks/bench_first_load.py
+       CHAMPIONS_BENCH_SIZES=0,1000000 python benchmarks/bench_first_load.py
+"""
+
+import gzip
+import re
+import time
+
+from synthetic import generate_players, scale_from_env
+import app as champions_app
+from assets import brotli_available
+from player_store import PlayerStore
+
+# (name, bits per second, round-trip seconds)
+NETWORKS = (('slow 4G', 1.6e6, 0.150), ('4G', 9e6, 0.060), ('broadband', 50e6, 0.020))
+SUBRESOURCE = re.compile(r'<(?:script|link)[^>]*?(?:src|href)="(/[^"]+)"')
+
+
+class BrowserCache:
+    """Validators and bodies per URL; immutable entries are reused without a request"""
+
+    def __init__(self):
+        self.entries = {}
+
+    def fetch(self, client, url, encoding):
+        entry = self.entries.get(url)
+        if entry and 'immutable' in entry['cache_control']:
+            return None
+        headers = {'Accept-Encoding': encoding}
+        if entry and entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        start = time.perf_counter()
+        response = client.get(url, headers=headers)
+        server = time.perf_counter() - start
+        if response.status_code == 304:
+            body = entry['body']
+        else:
+            assert response.status_code == 200, (url, response.status_code)
+            body = response.data
+            if response.headers.get('Content-Encoding') == 'gzip':
+                body = gzip.decompress(body)
+            elif response.headers.get('Content-Encoding') == 'br':
+                import brotli
+                body = brotli.decompress(body)
+        self.entries[url] = {
+            'etag': response.headers.get('ETag'),
+            'cache_control': response.headers.get('Cache-Control', ''),
+            'body': body
+        }
+        return {'wire': len(response.data) + len(str(response.headers)), 'server': server, 'body': body}
+
+
+def visit(client, cache, encoding):
+    page = cache.fetch(client, '/', encoding)
+    urls = SUBRESOURCE.findall(page['body'].decode())
+    fetched = [cache.fetch(client, url, encoding) for url in urls]
+    return page, [f for f in fetched if f is not None]
+
+
+def modelled_ms(page, fetched, bandwidth, rtt):
+    elapsed = rtt + page['wire'] * 8 / bandwidth + page['server']
+    if fetched:
+        elapsed += rtt + sum(f['wire'] for f in fetched) * 8 / bandwidth + max(f['server'] for f in fetched)
+    return elapsed * 1000
+
+
+def main():
+    flask_app = champions_app.app
+    client = flask_app.test_client()
+    encodings = ['identity', 'gzip'] + (['br'] if brotli_available() else [])
+    modes = [('plain /static', True, 'identity')] + [(f'hashed {e}', False, e) for e in encodings]
+    print(f'{"players":>9} {"setup":<16} {"visit":<7} {"requests":>8} {"KB":>8}'
+          + ''.join(f'{name + " ms":>14}' for name, _, _ in NETWORKS))
+    for n in scale_from_env('0,100000'):
+        if n:
+            champions_app.PLAYERS_DB = PlayerStore(generate_players(n))
+        for label, debug, encoding in modes:
+            flask_app.debug = debug
+            champions_app.PAGES.clear()
+            champions_app.BOOTSTRAP = None
+            cache = BrowserCache()
+            for name in ('first', 'repeat'):
+                page, fetched = visit(client, cache, encoding)
+                wire = page['wire'] + sum(f['wire'] for f in fetched)
+                times = ''.join(f'{modelled_ms(page, fetched, bw, rtt):>14,.0f}' for _, bw, rtt in NETWORKS)
+                print(f'{n or len(champions_app.DEMO_PLAYERS):>9,} {label:<16} {name:<7} {1 + len(fetched):>8} '
+                      f'{wire / 1024:>8.1f}{times}')
+        flask_app.debug = False
+
+
+if __name__ == '__main__':
+    main()
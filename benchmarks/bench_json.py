@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark: response serialization time per route and JSON backend.
+
+Each route is requested once through the Flask test client over a
+synthetic database and the object handed to ``jsonify`` is captured; the
+script then times ``app.json.response`` on those payloads with every
+installed backend (orjson, msgspec, stdlib) plus Flask's stock
+DefaultJSONProvider as the baseline. Full player records are served from
+the store's LRU pre-encoded where the backend supports fragments; each
+backend is timed on the payload it would actually get, and a page of
+plain record dicts is timed as well. The Flask baseline gets NumPy arrays
+already converted to lists and records as dicts, as routes used to build
+them, so conversion time is not counted against it.
+
+Usage: python benchmarks/bench_json.py
+       CHAMPIONS_BENCH_SIZES=20000 python benchmarks/bench_json.py
+"""
+
+import json
+import time
+
+import numpy as np
+from flask.json.provider import DefaultJSONProvider
+
+from synthetic import generate_players, scale_from_env
+import app as champions_app
+from json_provider import FastJSONProvider, Fragment, available_backends
+from player_store import PlayerStore
+
+REPEATS = 200
+
+
+class CapturingProvider(FastJSONProvider):
+    captured = None
+
+    def response(self, *args, **kwargs):
+        CapturingProvider.captured = self._prepare_response_obj(args, kwargs)
+        return super().response(*args, **kwargs)
+
+
+def capture_payloads(client, player_ids):
+    many = player_ids[:200]
+    requests = [
+        ('players page', 'GET', '/api/players?limit=50', None),
+        ('players page (fields)', 'GET', '/api/players?limit=50&fields=id,name,stats', None),
+        ('player', 'GET', f'/api/players/{player_ids[0]}', None),
+        ('predict injury', 'GET', f'/api/predict/injury/{player_ids[1]}', None),
+        ('predict value', 'GET', f'/api/predict/value/{player_ids[1]}', None),
+        ('explain', 'GET', f'/api/explain/{player_ids[1]}', None),
+        ('compare 20', 'GET', f'/api/compare?players={",".join(player_ids[:20])}', None),
+        ('analytics 5 years', 'GET', f'/api/analytics/performance?player_id={player_ids[0]}&timeframe=5years', None),
+        ('predict batch 200', 'POST', '/api/predict/batch', {'player_ids': many}),
+        ('matrix 200', 'POST', '/api/compare/matrix', {'player_ids': many}),
+    ]
+    payloads = []
+    for label, method, url, body in requests:
+        champions_app.RESPONSE_CACHE.clear()
+        response = client.open(url, method=method, json=body)
+        assert response.status_code == 200, (url, response.status_code)
+        payloads.append((label, CapturingProvider.captured))
+    page = champions_app.PLAYERS_DB.records(np.arange(50))
+    payloads.insert(1, ('players page (dicts)', {'players': page, 'count': len(page)}))
+    return payloads
+
+
+def as_served(payload, provider=None):
+    """Payload as ``provider`` would serve it; without one, as routes built it before
+    NumPy and fragment support"""
+    if isinstance(payload, dict):
+        return {k: as_served(v, provider) for k, v in payload.items()}
+    if isinstance(payload, list):
+        return [as_served(v, provider) for v in payload]
+    if isinstance(payload, Fragment):
+        record = json.loads(payload.data)
+        return provider.encode_fragment(record) if provider else record
+    if provider is None and isinstance(payload, (np.ndarray, np.generic)):
+        return payload.tolist()
+    return payload
+
+
+def time_response(provider, payload):
+    provider.response(payload)
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        body = provider.response(payload).get_data()
+    return (time.perf_counter() - start) / REPEATS * 1e6, len(body)
+
+
+def main():
+    app = champions_app.app
+    size = scale_from_env('5000')[0]
+    champions_app.PLAYERS_DB = PlayerStore(generate_players(size))
+    player_ids = list(champions_app.PLAYERS_DB.ids)
+    for player_id in player_ids[:3]:
+        champions_app.PERFORMANCE.append(player_id, champions_app.synthetic_sessions(
+            player_id, int(time.time()) - 5 * 365 * 86400, int(time.time())))
+
+    original = app.json
+    app.json = CapturingProvider(app, 'stdlib')
+    payloads = capture_payloads(app.test_client(), player_ids)
+    app.json = original
+
+    providers = [('flask', DefaultJSONProvider(app))] + [(b, FastJSONProvider(app, b)) for b in available_backends()]
+    print(f'{size:,} players; microseconds per response (body KB with the first backend)')
+    print(f'{"route":<26}' + ''.join(f'{name:>10}' for name, _ in providers) + f'{"speedup":>9}{"KB":>8}')
+    with app.app_context():
+        for label, payload in payloads:
+            timings = [time_response(providers[0][1], as_served(payload))]
+            timings += [time_response(p, as_served(payload, p)) for _, p in providers[1:]]
+            cells = ''.join(f'{t[0]:>10,.1f}' for t in timings)
+            print(f'{label:<26}{cells}{timings[0][0] / timings[1][0]:>8.1f}x{timings[1][1] / 1024:>8.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark: live dashboards over SSE vs polling.
+
+A coaching staff keeps ``SCREENS`` dashboards open, each following the
+injury risk of a whole squad plus squad strategy and governance status.
+Polling means every screen requests every resource every ``POLL_SECONDS``;
+with /api/live/stream each screen holds one connection and the hub's single
+producer pushes only what changed. Over one simulated minute (a couple of
+record updates per tick) the script counts requests vs events and times the
+polling work through the test client against the producer's ticks.
+``CHAMPIONS_BENCH_SIZES`` sets the number of screens.
+
+Usage: python benchmarks/bench_live.py
+       CHAMPIONS_BENCH_SIZES=10,100 python benchmarks/bench_live.py
+"""
+
+import time
+
+import numpy as np
+
+from synthetic import generate_players, scale_from_env
+import app as champions_app
+from live import LiveHub
+from player_store import PlayerStore
+
+SQUAD = 25
+POLL_SECONDS = 2
+MINUTE_TICKS = 60 // POLL_SECONDS
+UPDATES_PER_TICK = 2
+
+
+def poll_cycle_ms(client, player_ids):
+    """One screen refreshing everything once"""
+    start = time.perf_counter()
+    for player_id in player_ids:
+        client.get(f'/api/predict/injury/{player_id}')
+    client.get('/api/strategy/squad')
+    client.get('/api/governance/status')
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    champions_app.PLAYERS_DB = PlayerStore(generate_players(SQUAD))
+    store = champions_app.PLAYERS_DB
+    player_ids = [str(pid) for pid in store.ids]
+    client = champions_app.app.test_client()
+    rng = np.random.default_rng(3)
+    poll_cycle_ms(client, player_ids)
+    cycle_ms = min(poll_cycle_ms(client, player_ids) for _ in range(5))
+
+    print(f'{SQUAD}-player squad, {POLL_SECONDS} s poll interval, {UPDATES_PER_TICK} record updates per tick, one minute')
+    print(f'{"screens":>8} {"poll requests":>14} {"poll CPU ms":>12} {"SSE conns":>10} '
+          f'{"SSE events":>11} {"deliveries":>11} {"producer ms":>12}')
+    for screens in scale_from_env('10,50'):
+        # A private hub with a long interval, so ticks run only when driven here
+        hub = LiveHub(list(champions_app.LIVE.topics.values()), interval=3600, dumps=champions_app.app.json.dumps)
+        subscribers = [hub.subscribe({'injury', 'squad', 'governance'}, set(player_ids)) for _ in range(screens)]
+        for subscriber in subscribers:
+            hub.snapshot(subscriber)
+        hub.tick()
+        for subscriber in subscribers:
+            subscriber.queue.queue.clear()
+
+        deliveries, producer = hub.deliveries, 0.0
+        events = hub.events
+        for _ in range(MINUTE_TICKS):
+            for row in rng.choice(len(player_ids), UPDATES_PER_TICK, replace=False).tolist():
+                store.update(player_ids[row], {'current_value': int(store.column('current_value')[row]) + 1000})
+            start = time.perf_counter()
+            hub.tick()
+            producer += time.perf_counter() - start
+            for subscriber in subscribers:
+                subscriber.queue.queue.clear()
+
+        requests = screens * (SQUAD + 2) * MINUTE_TICKS
+        print(f'{screens:>8} {requests:>14,} {cycle_ms * screens * MINUTE_TICKS:>12,.0f} {screens:>10} '
+              f'{hub.events - events:>11,} {hub.deliveries - deliveries:>11,} {producer * 1000:>12,.1f}')
+
+
+if __name__ == '__main__':
+    main()
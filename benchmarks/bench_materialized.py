@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark: materialized predictions, full vs incremental refresh and lookup vs compute.
+
+Usage: python benchmarks/bench_materialized.py
+       CHAMPIONS_BENCH_SIZES=5000 python benchmarks/bench_materialized.py
+"""
+
+import time
+
+import numpy as np
+
+from synthetic import generate_players, scale_from_env
+from ai_engine import MockAIEngine, prediction_rng
+from materializer import PredictionMaterializer, PREDICTION_TYPES
+from player_store import PlayerStore
+
+ENGINE = MockAIEngine()
+LOOKUPS = 20000
+
+
+def on_demand(store, player_id, prediction_type):
+    """The pre-materializer route: rebuild the record and run the model"""
+    record = store[player_id]
+    method = {
+        'injury': ENGINE.predict_injury_risk,
+        'development': ENGINE.predict_player_development,
+        'value': ENGINE.predict_market_value,
+    }[prediction_type]
+    return method(record, rng=prediction_rng(player_id, store.version(player_id), prediction_type))
+
+
+def per_call_us(fn, ids):
+    start = time.perf_counter()
+    for player_id in ids:
+        fn(player_id)
+    return (time.perf_counter() - start) / len(ids) * 1e6
+
+
+def main():
+    rng = np.random.default_rng(0)
+    for n in scale_from_env('1000,5000'):
+        store = PlayerStore(generate_players(n))
+        materializer = PredictionMaterializer(lambda: store, ENGINE)
+        print(f'\n{n:,} players')
+
+        full = materializer.refresh(full=True)
+        print(f'full refresh          {full["rows"]:>8,} rows {full["duration_ms"]:>10.1f} ms')
+
+        touched = rng.choice(n, max(1, n // 100), replace=False)
+        for row in touched.tolist():
+            store.update(store.ids[row], {'age': int(store.column('age')[row]) + 1})
+        incremental = materializer.refresh()
+        print(f'incremental (1% dirty) {incremental["rows"]:>7,} rows {incremental["duration_ms"]:>10.1f} ms')
+
+        ids = [store.ids[r] for r in rng.integers(0, n, LOOKUPS).tolist()]
+        for prediction_type in PREDICTION_TYPES:
+            compute_us = per_call_us(lambda pid: on_demand(store, pid, prediction_type), ids)
+            lookup_us = per_call_us(lambda pid: materializer.get(prediction_type, pid), ids)
+            assert materializer.get(prediction_type, ids[0]) == on_demand(store, ids[0], prediction_type)
+            print(f'{prediction_type:<12} compute {compute_us:>7.1f} us   lookup {lookup_us:>6.2f} us '
+                  f'  {compute_us / lookup_us:>5.0f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Benchmark: light-route latency under heavy engine jobs, inline vs process pool.
+
+Starts serve.py (threaded) with CHAMPIONS_SIMULATED_INFERENCE_MS of CPU
+burned per engine job, standing in for real model inference, and fresh
+random predictions (CHAMPIONS_DETERMINISTIC=0) so every explanation is a
+job rather than a cached response. Light clients fetch player records
+while heavy clients request explanations; the light route's p50/p99 is
+reported alone and under the heavy load, once with jobs run inline in the
+request thread and once in CHAMPIONS_OFFLOAD_PROCESSES worker processes.
+Heavy requests past the queue limit are answered 503 (counted, not
+timed). A last run fires identical cold explanation requests at once
+against a deterministic server and reports how many jobs actually ran.
+
+On a single core the pool cannot add compute; what it removes is the GIL
+contention between the job and the request threads.
+
+Usage: python benchmarks/bench_offload.py
+       CHAMPIONS_OFFLOAD_PROCESSES=4 CHAMPIONS_LOAD_SECONDS=10 python benchmarks/bench_offload.py
+"""
+
+import http.client
+import json
+import os
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+
+from load_test import free_port, start_server, stop_server, wait_until_up
+
+HOST = '127.0.0.1'
+LIGHT_PATH = '/api/players/bellingham'
+HEAVY_PATHS = [f'/api/explain/{player}?type={kind}' for player in ('pedri', 'mbappe', 'haaland')
+               for kind in ('recruitment', 'injury', 'development')]
+LIGHT_CLIENTS = 4
+HEAVY_CLIENTS = 4
+BURST = 16
+
+
+def client(port, paths, deadline, latencies, statuses, lock):
+    conn = http.client.HTTPConnection(HOST, port, timeout=30)
+    local, codes, i = [], Counter(), 0
+    while time.perf_counter() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            conn.request('GET', path)
+            response = conn.getresponse()
+            response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            conn = http.client.HTTPConnection(HOST, port, timeout=30)
+            status = 'error'
+        codes[status] += 1
+        if status == 200:
+            local.append((time.perf_counter() - start) * 1000)
+    conn.close()
+    with lock:
+        latencies.extend(local)
+        statuses.update(codes)
+
+
+def drive(port, seconds, heavy: bool):
+    """(light latencies, heavy latencies, heavy status counts) for one run"""
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+    light, heavy_latencies, light_statuses, heavy_statuses = [], [], Counter(), Counter()
+    threads = [threading.Thread(target=client, args=(port, [LIGHT_PATH], deadline, light, light_statuses, lock))
+               for _ in range(LIGHT_CLIENTS)]
+    if heavy:
+        threads += [threading.Thread(target=client, args=(port, HEAVY_PATHS[i::HEAVY_CLIENTS], deadline,
+                                                          heavy_latencies, heavy_statuses, lock))
+                    for i in range(HEAVY_CLIENTS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return light, heavy_latencies, heavy_statuses
+
+
+def status(port):
+    conn = http.client.HTTPConnection(HOST, port, timeout=10)
+    conn.request('GET', '/api/offload/status')
+    return json.loads(conn.getresponse().read())
+
+
+def serve(env):
+    os.environ.update(env)
+    port = free_port()
+    process = start_server('threaded', port, ['--threads', str(LIGHT_CLIENTS + HEAVY_CLIENTS)])
+    wait_until_up(HOST, port)
+    return process, port
+
+
+def percentiles(latencies):
+    return np.percentile(latencies, [50, 99]) if latencies else (float('nan'), float('nan'))
+
+
+def burst(port):
+    """BURST identical cold explanation requests at once; (status counts, offload stats after)"""
+    statuses, lock = Counter(), threading.Lock()
+    barrier = threading.Barrier(BURST)
+
+    def one():
+        conn = http.client.HTTPConnection(HOST, port, timeout=30)
+        barrier.wait()
+        conn.request('GET', '/api/explain/vinicius?type=value')
+        response = conn.getresponse()
+        response.read()
+        with lock:
+            statuses[response.status] += 1
+
+    threads = [threading.Thread(target=one) for _ in range(BURST)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return statuses, status(port)
+
+
+def main():
+    seconds = float(os.environ.get('CHAMPIONS_LOAD_SECONDS', 5))
+    processes = int(os.environ.get('CHAMPIONS_OFFLOAD_PROCESSES') or 2)
+    heavy_ms = float(os.environ.get('CHAMPIONS_SIMULATED_INFERENCE_MS') or 50)
+    base = {'CHAMPIONS_LIVE_INTERVAL': '3600', 'CHAMPIONS_SIMULATED_INFERENCE_MS': str(heavy_ms)}
+    print(f'{heavy_ms:.0f} ms per engine job, {LIGHT_CLIENTS} light + {HEAVY_CLIENTS} heavy clients, '
+          f'{seconds:.0f} s per run, {os.cpu_count()} CPU(s)')
+    print(f'{"mode":<12} {"load":<7} {"light p50":>10} {"light p99":>10} {"light/s":>8} '
+          f'{"heavy p50":>10} {"heavy p99":>10} {"heavy/s":>8} {"503":>5} {"504":>5}')
+    for label, count in (('inline', 0), (f'pool x{processes}', processes)):
+        process, port = serve(dict(base, CHAMPIONS_DETERMINISTIC='0', CHAMPIONS_OFFLOAD_PROCESSES=str(count)))
+        try:
+            # Warm-up, which also starts the pool's worker processes
+            drive(port, 1.0, heavy=True)
+            for load in ('light', 'mixed'):
+                light, heavy, codes = drive(port, seconds, heavy=load == 'mixed')
+                light_p50, light_p99 = percentiles(light)
+                heavy_p50, heavy_p99 = percentiles(heavy)
+                print(f'{label:<12} {load:<7} {light_p50:>10.2f} {light_p99:>10.2f} {len(light) / seconds:>8.0f} '
+                      f'{heavy_p50:>10.1f} {heavy_p99:>10.1f} {len(heavy) / seconds:>8.1f} '
+                      f'{codes[503]:>5} {codes[504]:>5}')
+        finally:
+            stop_server(process)
+
+    process, port = serve(dict(base, CHAMPIONS_DETERMINISTIC='1', CHAMPIONS_OFFLOAD_PROCESSES=str(processes)))
+    try:
+        codes, stats = burst(port)
+        print(f'\n{BURST} identical cold /api/explain requests at once (pool x{processes}): '
+              f'{dict(codes)} responses, {stats["completed"]} job(s) computed, {stats["coalesced"]} coalesced')
+    finally:
+        stop_server(process)
+
+
+if __name__ == '__main__':
+    main()
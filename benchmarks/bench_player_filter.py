@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark: /api/players filtering, dict-of-dicts scan vs columnar PlayerStore.
+
+Usage: python benchmarks/bench_player_filter.py
+       CHAMPIONS_BENCH_SIZES=100000 python benchmarks/bench_player_filter.py
+"""
+
+import time
+
+from synthetic import generate_players_db, scale_from_env
+from player_store import PlayerStore
+
+QUERIES = [
+    ('position', dict(position='Forward')),
+    ('league', dict(league='Serie A')),
+    ('age range', dict(min_age=20, max_age=23)),
+    ('max value', dict(max_value=5000000)),
+    ('all filters', dict(position='mid', league='La Liga', min_age=18, max_age=24, max_value=40000000)),
+]
+
+
+def legacy_filter(db, position=None, league=None, min_age=None, max_age=None, max_value=None):
+    """The list-comprehension pipeline get_players used before the columnar store"""
+    players = list(db.values())
+    if position:
+        players = [p for p in players if position.lower() in p['position'].lower()]
+    if league:
+        players = [p for p in players if p['league'] == league]
+    if min_age:
+        players = [p for p in players if p['age'] >= min_age]
+    if max_age:
+        players = [p for p in players if p['age'] <= max_age]
+    if max_value:
+        players = [p for p in players if p['current_value'] <= max_value]
+    return players
+
+
+def best_of(fn, repeat=5):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    for n in scale_from_env('100000,1000000'):
+        db = generate_players_db(n)
+        start = time.perf_counter()
+        store = PlayerStore.from_dict(db)
+        build = time.perf_counter() - start
+        print(f'\n{n:,} players (store build {build * 1000:.0f} ms)')
+        print(f'{"query":<12} {"matches":>9} {"legacy ms":>10} {"store ms":>9} {"speedup":>8}')
+        for label, query in QUERIES:
+            legacy_s, legacy = best_of(lambda: legacy_filter(db, **query))
+            store_s, rows = best_of(lambda: store.filter(**query))
+            assert [p['id'] for p in legacy] == [store.ids[r] for r in rows.tolist()]
+            print(f'{label:<12} {len(rows):>9,} {legacy_s * 1000:>10.2f} {store_s * 1000:>9.3f} '
+                  f'{legacy_s / store_s:>7.0f}x')
+
+
+if __name__ == '__main__':
+    main()
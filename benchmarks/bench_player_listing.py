@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Benchmark: /api/players response size and latency, full dump vs paged/projected.
+
+Swaps a synthetic PlayerStore into app.PLAYERS_DB and drives the route
+through the Flask test client.
+
+Usage: python benchmarks/bench_player_listing.py
+"""
+
+import time
+
+from synthetic import generate_players, scale_from_env
+import app as champions_app
+from player_store import PlayerStore
+
+CASES = [
+    ('full dump (limit=max)', '/api/players?limit=500'),
+    ('default page', '/api/players'),
+    ('page sorted by value', '/api/players?sort=-current_value'),
+    ('projected id,name,overall', '/api/players?sort=-overall&fields=id,name,stats.overall'),
+    ('filtered + sorted page', '/api/players?position=Forward&sort=-goals_90&limit=20'),
+]
+
+
+def legacy_full_response(client, store):
+    """What the unpaginated route returned: every match in one body"""
+    start = time.perf_counter()
+    body = champions_app.jsonify({'players': store.records(store.filter()), 'count': len(store)})
+    return time.perf_counter() - start, len(body.get_data())
+
+
+def main():
+    client = champions_app.app.test_client()
+    for n in scale_from_env('100000'):
+        store = PlayerStore(generate_players(n))
+        champions_app.PLAYERS_DB = store
+        print(f'\n{n:,} players')
+        print(f'{"case":<28} {"bytes":>12} {"ms":>9}')
+        with champions_app.app.app_context():
+            elapsed, size = legacy_full_response(client, store)
+        print(f'{"unpaginated (before)":<28} {size:>12,} {elapsed * 1000:>9.1f}')
+        for label, url in CASES:
+            best, size = float('inf'), 0
+            for _ in range(5):
+                start = time.perf_counter()
+                response = client.get(url)
+                best = min(best, time.perf_counter() - start)
+                size = len(response.get_data())
+            print(f'{label:<28} {size:>12,} {best * 1000:>9.2f}')
+
+
+if __name__ == '__main__':
+    main()
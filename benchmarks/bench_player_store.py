@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark: worker startup time and memory, in-memory vs memory-mapped player store.
+
+For each database size in ``CHAMPIONS_BENCH_SIZES`` the synthetic players
+are written both as a JSON dump (what an in-process dict costs: every
+worker parses and holds all of it) and as a ``PlayerStore.save``
+directory. ``WORKERS`` worker processes are then started side by side for
+each backend; each one opens the database, serves a few thousand random
+record lookups and a filtered listing, and stays up while its RSS and PSS
+(proportional set size: shared pages divided among the processes mapping
+them) are read from /proc. Linux only.
+
+Usage: python benchmarks/bench_player_store.py
+       CHAMPIONS_BENCH_SIZES=100000,1000000 python benchmarks/bench_player_store.py
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from synthetic import generate_players, scale_from_env
+
+WORKERS = 4
+LOOKUPS = 5000
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def worker(backend, path):
+    """Open the database, serve some reads, report startup, then wait for the parent"""
+    start = time.perf_counter()
+    sys.path.insert(0, ROOT)
+    from player_store import PlayerStore
+    if backend == 'memory':
+        with open(path) as f:
+            store = PlayerStore(json.load(f))
+    else:
+        store = PlayerStore.open(path)
+    startup = time.perf_counter() - start
+    ids = [store.ids[r] for r in np.random.default_rng(os.getpid()).integers(0, len(store), LOOKUPS).tolist()]
+    start = time.perf_counter()
+    for player_id in ids:
+        store[player_id]
+    lookup = (time.perf_counter() - start) / LOOKUPS
+    store.records(store.filter(position='Forward', max_age=23)[:50])
+    print(json.dumps({'startup': startup, 'lookup': lookup}), flush=True)
+    sys.stdin.read()
+
+
+def memory_kb(pid):
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        fields = dict(line.split(':', 1) for line in f if line[0].isupper() and ':' in line)
+    return int(fields['Rss'].split()[0]), int(fields['Pss'].split()[0])
+
+
+def run_workers(backend, path):
+    processes = [subprocess.Popen([sys.executable, __file__, '--worker', backend, path],
+                                  stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+                 for _ in range(WORKERS)]
+    reports = [json.loads(p.stdout.readline()) for p in processes]
+    memory = [memory_kb(p.pid) for p in processes]
+    for p in processes:
+        p.communicate('')
+    return {
+        'startup_ms': np.mean([r['startup'] for r in reports]) * 1000,
+        'lookup_us': np.mean([r['lookup'] for r in reports]) * 1e6,
+        'rss_mb': np.mean([m[0] for m in memory]) / 1024,
+        'pss_mb': np.mean([m[1] for m in memory]) / 1024,
+    }
+
+
+def main():
+    print(f'{WORKERS} workers side by side, {LOOKUPS:,} random record lookups each')
+    print(f'{"players":>9} {"backend":>8} {"build s":>8} {"startup ms":>11} {"lookup us":>10} '
+          f'{"RSS/worker MB":>14} {"PSS/worker MB":>14}')
+    for n in scale_from_env('100000,1000000'):
+        with tempfile.TemporaryDirectory() as tmp:
+            start = time.perf_counter()
+            players = generate_players(n)
+            json_path = os.path.join(tmp, 'players.json')
+            with open(json_path, 'w') as f:
+                json.dump(players, f)
+            json_build = time.perf_counter() - start
+
+            sys.path.insert(0, ROOT)
+            from player_store import PlayerStore
+            start = time.perf_counter()
+            store_dir = os.path.join(tmp, 'players')
+            PlayerStore(players).save(store_dir)
+            mmap_build = time.perf_counter() - start
+            del players
+
+            for backend, path, build in (('memory', json_path, json_build), ('mmap', store_dir, mmap_build)):
+                result = run_workers(backend, path)
+                print(f'{n:>9,} {backend:>8} {build:>8.1f} {result["startup_ms"]:>11,.1f} '
+                      f'{result["lookup_us"]:>10.1f} {result["rss_mb"]:>14.1f} {result["pss_mb"]:>14.1f}')
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == '--worker':
+        worker(sys.argv[2], sys.argv[3])
+    else:
+        main()
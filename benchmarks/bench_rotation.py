@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Benchmark: squad rotation planning time and plan quality.
+
+For squads of each size in ``CHAMPIONS_BENCH_SIZES`` (position mix of a
+real squad, seeded strengths and injury risks) the planner behind
+/api/strategy/squad is solved over growing fixture horizons. The objective
+(risk-adjusted, fatigue-discounted strength summed over the plan) is
+compared with the myopic baseline that picks each lineup on the current
+fixture alone and pays for it with tired, capped players later on.
+
+Usage: python benchmarks/bench_rotation.py
+       CHAMPIONS_BENCH_SIZES=25,60 python benchmarks/bench_rotation.py
+"""
+
+import time
+
+import numpy as np
+
+from synthetic import scale_from_env
+from rotation import POSITIONS, default_fixtures, plan_rotation
+
+HORIZONS = (5, 10, 20, 38)
+# Share of a squad per position (GK, DEF, MID, FWD)
+POSITION_MIX = (0.12, 0.32, 0.32, 0.24)
+
+
+def synthetic_squad(size, seed=7):
+    rng = np.random.default_rng(seed)
+    counts = np.maximum(1, np.round(np.array(POSITION_MIX) * size).astype(int))
+    counts[2] += size - counts.sum()
+    positions = [p for p, c in zip(POSITIONS, counts) for _ in range(c)]
+    strength = rng.integers(68, 93, size).astype(np.float64)
+    base_risk = np.round(rng.gamma(3.0, 7.0, size).clip(3, 70), 1)
+    fatigue = rng.uniform(10, 50, size)
+    return strength, base_risk, positions, fatigue
+
+
+def main():
+    print(f'{"squad":>6} {"fixtures":>9} {"solve ms":>9} {"iters":>6} {"objective":>10} '
+          f'{"myopic":>10} {"gain":>7} {"shortfalls":>11}')
+    for size in scale_from_env('25,40,60'):
+        squad = synthetic_squad(size)
+        for horizon in HORIZONS:
+            fixtures = default_fixtures(horizon)
+            plan_rotation(*squad, fixtures)
+            start = time.perf_counter()
+            plan = plan_rotation(*squad, fixtures)
+            elapsed = (time.perf_counter() - start) * 1000
+            myopic = plan_rotation(*squad, fixtures, lookahead=False)
+            gain = (plan['objective'] / myopic['objective'] - 1) * 100 if myopic['objective'] else 0.0
+            shortfalls = sum(sum(s.values()) for s in plan['shortfalls'])
+            print(f'{size:>6} {horizon:>9} {elapsed:>9.1f} {plan["iterations"]:>6} {plan["objective"]:>10.1f} '
+                  f'{myopic["objective"]:>10.1f} {gain:>6.1f}% {shortfalls:>11}')
+
+
+if __name__ == '__main__':
+    main()
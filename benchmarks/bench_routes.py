@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+"""
+Route regression suite: every /api route, in-process and over HTTP, against a baseline.
+
+For each scale in CHAMPIONS_BENCH_SIZES a synthetic player database is
+written with PlayerStore.save and served through CHAMPIONS_PLAYERS_DIR.
+Every case in CASES then runs:
+
+- in-process: through the Flask test client, in a fresh interpreter per
+  scale (module state is per process). Latency p50/p90/p99 and req/s from
+  an untraced pass, then allocations per request (tracemalloc peak) and
+  bytes retained per request from a short traced pass, and the process's
+  peak RSS after the route;
+- http: against serve.py (threaded unless --serve-mode says otherwise)
+  with --concurrency keep-alive clients for --seconds per route; latency,
+  req/s, errors and the server's peak RSS (VmHWM, workers included).
+
+Upstream data sources are local stubs answering without delay, so
+/api/players/<id>/sources measures the fan-out itself. Streaming routes
+(/api/live/stream) are timed to their first event. Routes
+that change state (PATCH, appends, ingests, jobs) touch dedicated synthetic
+players so the read routes keep measuring the same records.
+
+Every /api rule of the app must be hit by some case: uncovered rules are
+listed and fail the run, so a new route cannot land without a benchmark.
+``--save-baseline`` stores the results as JSON; later runs compare against
+that baseline (``--baseline``, default benchmarks/baselines/routes.json when
+present) and exit 1 when a route's p50, req/s, allocations or peak RSS is
+worse than ``--tolerance`` allows. Baselines are only comparable on the
+machine that recorded them; a differing environment is reported.
+
+Usage: python benchmarks/bench_routes.py
+       python benchmarks/bench_routes.py --save-baseline
+       CHAMPIONS_BENCH_SIZES=1000,100000,1000000 python benchmarks/bench_routes.py --modes http --concurrency 16
+       python benchmarks/bench_routes.py --routes predict,explain --sizes 1000
+"""
+
+import argparse
+import http.client
+import itertools
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+import numpy as np
+from werkzeug.exceptions import HTTPException
+
+from load_test import free_port, start_server, stop_server, wait_until_up
+from synthetic import REPO_ROOT, generate_players, scale_from_env
+from stub_sources import start_stub_sources
+from player_store import PlayerStore
+from data_sources import DATA_SOURCES
+
+HOST = '127.0.0.1'
+DEFAULT_BASELINE = os.path.join(REPO_ROOT, 'benchmarks', 'baselines', 'routes.json')
+WARMUP = 3
+# Traced requests per route for allocation figures
+ALLOC_SAMPLES = 5
+# Differences under these floors are noise, whatever the tolerance
+LATENCY_FLOOR_MS = 0.5
+ALLOC_FLOOR_KB = 16.0
+RSS_FLOOR_MB = 8.0
+
+# Synthetic players the cases use: reads, writes (PATCH, ingests) and a second for pairs
+READ_PLAYER = 'player-0'
+PAIR_PLAYER = 'player-1'
+WRITE_PLAYER = 'player-2'
+SQUAD = [f'player-{i}' for i in range(25)]
+BATCH = [f'player-{i}' for i in range(200)]
+# Appends rotate over player-{SLOT_BASE}..: concurrent appends to one player could arrive out of order
+SLOT_BASE = 500
+SLOTS = 500
+
+_sequence = itertools.count(1)
+
+
+def session_body(n):
+    # Each player's appends move forward in time: request n carries a later timestamp than n - SLOTS
+    return {'sessions': [{'timestamp': 1_700_000_000 + n * 3600, 'passing_accuracy': 85, 'goals': 1}]}
+
+
+def wearables_body(n):
+    t = 1_700_000_000 + n * 60
+    return ''.join(json.dumps({'player_id': WRITE_PLAYER, 't': t + i, 'speed': 5.0, 'heart_rate': 150}) + '\n'
+                   for i in range(100))
+
+
+class Case:
+    """One request to benchmark.
+
+    ``path`` may use {player}, {pair}, {writer}, {squad}, {job} and {slot},
+    a write player that changes with every request; a callable ``body``
+    gets the request's sequence number.
+    """
+
+    def __init__(self, method, path, body=None, content_type='application/json', expect=(200,), stream=False):
+        self.method = method
+        self.path = path
+        self.body = body
+        self.content_type = content_type
+        self.expect = expect
+        self.stream = stream
+
+    @property
+    def name(self):
+        return f'{self.method} {self.path}'
+
+    def url(self, context, n=0):
+        return self.path.format(slot=f'player-{SLOT_BASE + n % SLOTS}', **context)
+
+    def request(self, context):
+        """(url, body bytes or None) for the next request"""
+        n = next(_sequence)
+        body = self.body(n) if callable(self.body) else self.body
+        if body is None:
+            return self.url(context, n), None
+        return self.url(context, n), body.encode() if isinstance(body, str) else json.dumps(body).encode()
+
+
+CASES = [
+    Case('GET', '/api/health'),
+    Case('GET', '/api/bootstrap'),
+    Case('GET', '/api/players?limit=50'),
+    Case('GET', '/api/players?league=La%20Liga&position=Forward&sort=-overall&limit=50&fields=id,name,stats'),
+    Case('GET', '/api/players/search?q=gonzalez&limit=20'),
+    Case('GET', '/api/players/{player}'),
+    Case('PATCH', '/api/players/{writer}', {'current_value': 50000000}),
+    Case('GET', '/api/players/{player}/similar?k=10'),
+    Case('GET', '/api/players/{player}/sources'),
+    Case('GET', '/api/predict/injury/{player}'),
+    Case('GET', '/api/predict/development/{player}'),
+    Case('GET', '/api/predict/value/{player}'),
+    Case('GET', '/api/predict/value/{player}/simulation?paths=1000'),
+    Case('POST', '/api/predict/value/simulate', {'player_ids': BATCH[:100], 'paths': 500, 'budget_ms': None}),
+    Case('POST', '/api/predict/batch', {'player_ids': BATCH, 'types': ['injury', 'development', 'value']}),
+    Case('GET', '/api/explain/{player}?type=recruitment'),
+    Case('GET', '/api/export/players?league=La%20Liga&position=Forward&min_age=20&max_age=21'),
+    Case('GET', '/api/compare?players={player},{pair}'),
+    Case('GET', '/api/compare/matrix?players={player},{pair}&explain=recruitment'),
+    Case('POST', '/api/compare/matrix', {'player_ids': BATCH}),
+    Case('GET', '/api/training/recommendations/{player}'),
+    Case('POST', '/api/training/jobs', {'player_ids': BATCH[:20]}, expect=(202,)),
+    Case('GET', '/api/training/jobs/{job}'),
+    Case('GET', '/api/training/jobs/{job}/results?limit=100'),
+    Case('DELETE', '/api/training/jobs/{job}'),
+    Case('GET', '/api/training/jobs/status'),
+    Case('GET', '/api/analytics/performance?timeframe=12weeks'),
+    Case('GET', '/api/analytics/performance?player_id={player}&timeframe=5years&bucket=4weeks'),
+    Case('POST', '/api/analytics/performance/{slot}/sessions', session_body, expect=(201,)),
+    Case('POST', '/api/wearables/samples', wearables_body, content_type='application/x-ndjson'),
+    Case('GET', '/api/wearables/workload/{writer}'),
+    Case('GET', '/api/wearables/status'),
+    Case('GET', '/api/strategy/squad?players={squad}&horizon=5'),
+    Case('POST', '/api/strategy/squad', {'players': SQUAD, 'horizon': 3}),
+    Case('GET', '/api/live/stream?players={player}&topics=injury', stream=True),
+    Case('GET', '/api/live/status'),
+    Case('GET', '/api/governance/status'),
+    Case('GET', '/api/predictions/status'),
+    Case('POST', '/api/predictions/refresh', {}),
+    Case('GET', '/api/cache/stats'),
+    Case('GET', '/api/offload/status'),
+    Case('GET', '/api/metrics'),
+]
+
+def request_context(job_id):
+    return {'player': READ_PLAYER, 'pair': PAIR_PLAYER, 'writer': WRITE_PLAYER, 'squad': ','.join(SQUAD), 'job': job_id}
+
+
+def summarize(latencies, elapsed, errors):
+    p50, p90, p99 = np.percentile(latencies, [50, 90, 99]) if latencies else (float('nan'),) * 3
+    return {'p50_ms': round(float(p50), 3), 'p90_ms': round(float(p90), 3), 'p99_ms': round(float(p99), 3),
+            'rps': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+            'requests': len(latencies), 'errors': errors}
+
+
+def environment():
+    return {'python': platform.python_version(), 'machine': platform.machine(), 'system': platform.system(),
+            'cpus': os.cpu_count(), 'numpy': np.__version__}
+
+
+# In-process: Flask test client, one interpreter per scale
+
+def client_call(client, case, context):
+    url, data = case.request(context)
+    response = client.open(url, method=case.method, data=data, content_type=case.content_type if data else None,
+                           buffered=not case.stream)
+    if case.stream:
+        next(iter(response.response))
+    status = response.status_code
+    response.close()
+    return status
+
+
+def inprocess_worker(options):
+    """Run every selected case through the test client; prints the results as JSON"""
+    import app as champions
+
+    flask_app = champions.create_app()
+    client = flask_app.test_client()
+    job = client.post('/api/training/jobs', json={'player_ids': [READ_PLAYER, PAIR_PLAYER]}).get_json()
+    context = request_context(job['job_id'])
+    results = {}
+    for case in selected(options['routes']):
+        for _ in range(WARMUP):
+            client_call(client, case, context)
+        latencies, errors = [], 0
+        start = time.perf_counter()
+        while len(latencies) + errors < options['iterations'] and time.perf_counter() - start < options['seconds']:
+            began = time.perf_counter()
+            status = client_call(client, case, context)
+            if status in case.expect:
+                latencies.append((time.perf_counter() - began) * 1000)
+            else:
+                errors += 1
+        result = summarize(latencies, time.perf_counter() - start, errors)
+
+        tracemalloc.start()
+        peaks = []
+        baseline, _ = tracemalloc.get_traced_memory()
+        for _ in range(ALLOC_SAMPLES):
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            client_call(client, case, context)
+            peaks.append(tracemalloc.get_traced_memory()[1] - current)
+        retained = tracemalloc.get_traced_memory()[0] - baseline
+        tracemalloc.stop()
+        result['alloc_kb'] = round(float(np.median(peaks)) / 1024, 1)
+        result['retained_kb'] = round(retained / ALLOC_SAMPLES / 1024, 1)
+        result['rss_mb'] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+        results[case.name] = result
+    json.dump(results, sys.stdout)
+
+
+def run_inprocess(store_dir, options):
+    env = dict(os.environ, CHAMPIONS_PLAYERS_DIR=store_dir, CHAMPIONS_LIVE_INTERVAL='3600')
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), '--inprocess-worker', json.dumps(options)],
+                            env=env, cwd=REPO_ROOT, check=True, stdout=subprocess.PIPE).stdout
+    return json.loads(output)
+
+
+# Over HTTP: serve.py with concurrent keep-alive clients
+
+def http_call(conn, case, context):
+    url, data = case.request(context)
+    headers = {'Content-Type': case.content_type} if data else {}
+    conn.request(case.method, url, data, headers)
+    response = conn.getresponse()
+    if case.stream:
+        # The first event ends with a blank line; the stream itself never ends
+        while response.readline() not in (b'\n', b''):
+            pass
+        conn.close()
+    else:
+        response.read()
+    return response.status
+
+
+def drive(port, case, context, concurrency, seconds):
+    latencies, errors, lock = [], [0], threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def client():
+        conn = http.client.HTTPConnection(HOST, port, timeout=30)
+        local, failed = [], 0
+        while time.perf_counter() < deadline:
+            began = time.perf_counter()
+            try:
+                status = http_call(conn, case, context)
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                status = None
+            if status in case.expect:
+                local.append((time.perf_counter() - began) * 1000)
+            else:
+                failed += 1
+        conn.close()
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summarize(latencies, time.perf_counter() - start, errors[0])
+
+
+def peak_rss_mb(pid) -> float:
+    """VmHWM of a process and its children (prefork workers)"""
+    total, pending = 0, [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            with open(f'/proc/{current}/status') as f:
+                total += next(int(line.split()[1]) for line in f if line.startswith('VmHWM:'))
+            with open(f'/proc/{current}/task/{current}/children') as f:
+                pending += [int(c) for c in f.read().split()]
+        except (OSError, StopIteration):
+            pass
+    return round(total / 1024, 1)
+
+
+def run_http(store_dir, options):
+    os.environ.update(CHAMPIONS_PLAYERS_DIR=store_dir, CHAMPIONS_LIVE_INTERVAL='3600')
+    port = free_port()
+    extra = ['--threads', str(max(options['concurrency'], 4))]
+    if options['serve_mode'] == 'prefork':
+        extra += ['--workers', 'auto']
+    process = start_server(options['serve_mode'], port, extra)
+    try:
+        wait_until_up(HOST, port, timeout=300)
+        conn = http.client.HTTPConnection(HOST, port, timeout=30)
+        conn.request('POST', '/api/training/jobs', json.dumps({'player_ids': [READ_PLAYER, PAIR_PLAYER]}),
+                     {'Content-Type': 'application/json'})
+        job = json.loads(conn.getresponse().read())
+        conn.close()
+        context = request_context(job['job_id'])
+        results = {}
+        for case in selected(options['routes']):
+            drive(port, case, context, 1, 0.2)
+            result = drive(port, case, context, options['concurrency'], options['seconds'])
+            result['rss_mb'] = peak_rss_mb(process.pid)
+            results[case.name] = result
+        return results
+    finally:
+        stop_server(process)
+
+
+# Coverage, reporting and baselines
+
+def selected(routes):
+    return [case for case in CASES if not routes or any(r in case.path for r in routes)]
+
+
+def uncovered():
+    """(rule, method) pairs of the app's /api rules that no case reaches"""
+    import app as champions
+
+    adapter = champions.create_app().url_map.bind('localhost')
+    context = request_context('job')
+    hit = set()
+    for case in CASES:
+        path = case.url(context).split('?')[0]
+        try:
+            rule, _ = adapter.match(path, case.method, return_rule=True)
+        except HTTPException:
+            raise SystemExit(f'{case.name} matches no route')
+        hit.add((rule.rule, case.method))
+    return sorted((rule.rule, method) for rule in adapter.map.iter_rules() if rule.rule.startswith('/api/')
+                  for method in rule.methods - {'HEAD', 'OPTIONS'} if (rule.rule, method) not in hit)
+
+
+def print_results(mode, n, results):
+    print(f'\n{mode}, {n:,} players')
+    print(f'{"route":<72} {"p50":>8} {"p90":>8} {"p99":>8} {"req/s":>8} {"err":>4} {"alloc KB":>9} '
+          f'{"kept KB":>8} {"RSS MB":>7}')
+    for name, r in results.items():
+        print(f'{name[:72]:<72} {r["p50_ms"]:>8.2f} {r["p90_ms"]:>8.2f} {r["p99_ms"]:>8.2f} {r["rps"]:>8.0f} '
+              f'{r["errors"]:>4} {r.get("alloc_kb", float("nan")):>9.1f} {r.get("retained_kb", float("nan")):>8.1f} '
+              f'{r["rss_mb"]:>7.0f}')
+
+
+def regressions(current, baseline, tolerance):
+    """Lines describing each metric worse than the baseline by more than ``tolerance``"""
+    found = []
+    for mode, scales in current.items():
+        for n, routes in scales.items():
+            for name, now in routes.items():
+                before = baseline.get(mode, {}).get(n, {}).get(name)
+                if before is None:
+                    continue
+                checks = [
+                    ('p50_ms', now['p50_ms'] > before['p50_ms'] * (1 + tolerance)
+                     and now['p50_ms'] - before['p50_ms'] > LATENCY_FLOOR_MS),
+                    ('rps', now['rps'] < before['rps'] / (1 + tolerance)
+                     and 1000 / max(now['rps'], 1e-9) - 1000 / max(before['rps'], 1e-9) > LATENCY_FLOOR_MS),
+                    ('alloc_kb', 'alloc_kb' in now and now['alloc_kb'] > before.get('alloc_kb', 0) * (1 + tolerance)
+                     and now['alloc_kb'] - before.get('alloc_kb', 0) > ALLOC_FLOOR_KB),
+                    ('rss_mb', now['rss_mb'] > before['rss_mb'] * (1 + tolerance)
+                     and now['rss_mb'] - before['rss_mb'] > RSS_FLOOR_MB),
+                    ('errors', now['errors'] > before['errors']),
+                ]
+                for metric, worse in checks:
+                    if worse:
+                        found.append(f'{mode} {int(n):,} {name}: {metric} {before[metric]} -> {now[metric]}')
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', default=','.join(map(str, scale_from_env('1000,100000'))))
+    parser.add_argument('--modes', default='inprocess,http')
+    parser.add_argument('--routes', default='', help='comma-separated path substrings; default every case')
+    parser.add_argument('--iterations', type=int, default=200, help='in-process requests per route (at most)')
+    parser.add_argument('--seconds', type=float, default=float(os.environ.get('CHAMPIONS_LOAD_SECONDS', 2)),
+                        help='time per route (a cap in-process, the run length over HTTP)')
+    parser.add_argument('--concurrency', type=int, default=int(os.environ.get('CHAMPIONS_LOAD_CONCURRENCY', 8)))
+    parser.add_argument('--serve-mode', default='threaded', choices=('threaded', 'prefork', 'dev'))
+    parser.add_argument('--baseline', default=None, help=f'baseline to compare with (default {DEFAULT_BASELINE} if present)')
+    parser.add_argument('--save-baseline', nargs='?', const=DEFAULT_BASELINE, default=None, metavar='PATH')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed relative slowdown before flagging')
+    parser.add_argument('--inprocess-worker', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.inprocess_worker:
+        inprocess_worker(json.loads(args.inprocess_worker))
+        return 0
+
+    options = {'routes': [r for r in args.routes.split(',') if r], 'iterations': args.iterations,
+               'seconds': args.seconds, 'concurrency': args.concurrency, 'serve_mode': args.serve_mode}
+    missing = uncovered()
+    for rule, method in missing:
+        print(f'not covered: {method} {rule}')
+
+    runners = {'inprocess': run_inprocess, 'http': run_http}
+    results = {mode: {} for mode in args.modes.split(',')}
+    urls, stop_sources = start_stub_sources({key: 0.0 for key, _ in DATA_SOURCES})
+    os.environ.update({f'CHAMPIONS_SOURCE_{key.upper()}_URL': url for key, url in urls.items()})
+    try:
+        for n in [int(s) for s in args.sizes.split(',') if s.strip()]:
+            with tempfile.TemporaryDirectory() as tmp:
+                store_dir = os.path.join(tmp, 'players')
+                PlayerStore(generate_players(n)).save(store_dir)
+                for mode in results:
+                    results[mode][str(n)] = runners[mode](store_dir, options)
+                    print_results(mode, n, results[mode][str(n)])
+    finally:
+        stop_sources()
+
+    current = {'environment': environment(), 'options': options, 'results': results}
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save_baseline)), exist_ok=True)
+        with open(args.save_baseline, 'w') as f:
+            json.dump(current, f, indent=1, sort_keys=True)
+        print(f'\nbaseline saved to {args.save_baseline}')
+        return 1 if missing else 0
+
+    path = args.baseline or (DEFAULT_BASELINE if os.path.exists(DEFAULT_BASELINE) else None)
+    found = []
+    if path:
+        with open(path) as f:
+            baseline = json.load(f)
+        if baseline['environment'] != current['environment']:
+            print(f'\nbaseline recorded on {baseline["environment"]}, this run on {current["environment"]}')
+        found = regressions(results, baseline['results'], args.tolerance)
+        print(f'\n{len(found)} regression(s) against {path} (tolerance {args.tolerance:.0%})')
+        for line in found:
+            print(f'  {line}')
+    return 1 if missing or found else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
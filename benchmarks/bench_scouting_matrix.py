@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark: scouting matrix vs the equivalent per-player calls.
+
+For each candidate count in ``CHAMPIONS_BENCH_SIZES`` the same information
+is fetched two ways through the Flask test client: N x 4 single requests
+(/api/predict/injury, /development, /value and /api/explain per player),
+cold and again with the response cache warm, and one /api/compare/matrix
+request as JSON and as ``.npy``. Cold single calls run against a freshly
+swapped store, so nothing is materialized or cached yet. A last check
+asserts the matrix cells equal the per-player responses for the same
+players, in matrices of differing membership.
+
+Usage: python benchmarks/bench_scouting_matrix.py
+       CHAMPIONS_BENCH_SIZES=50,500 python benchmarks/bench_scouting_matrix.py
+"""
+
+import time
+
+from synthetic import generate_players, scale_from_env
+import app as champions_app
+from player_store import PlayerStore
+
+DATABASE = 5000
+SINGLE_ROUTES = ('/api/predict/injury/{}', '/api/predict/development/{}', '/api/predict/value/{}', '/api/explain/{}')
+
+
+def single_calls(client, player_ids):
+    start = time.perf_counter()
+    size = 0
+    for player_id in player_ids:
+        for route in SINGLE_ROUTES:
+            size += len(client.get(route.format(player_id)).data)
+    return (time.perf_counter() - start) * 1000, size
+
+
+def matrix_call(client, player_ids, matrix_format):
+    start = time.perf_counter()
+    response = client.post('/api/compare/matrix', json={'player_ids': player_ids, 'format': matrix_format})
+    assert response.status_code == 200, response.data
+    return (time.perf_counter() - start) * 1000, len(response.data)
+
+
+def check_matrix_agrees(client, player_ids):
+    """Matrix cells equal the per-player predict/explain responses, whoever shares the matrix"""
+    for members in (player_ids, player_ids[::-1][:len(player_ids) // 2]):
+        body = client.post('/api/compare/matrix', json={'player_ids': members}).get_json()
+        columns = {name: i for i, name in enumerate(body['columns'])}
+        for player_id, row in zip(body['player_ids'], body['data']):
+            injury = client.get(f'/api/predict/injury/{player_id}').get_json()['prediction']
+            development = client.get(f'/api/predict/development/{player_id}').get_json()['prediction']
+            value = client.get(f'/api/predict/value/{player_id}').get_json()['prediction']
+            explanation = client.get(f'/api/explain/{player_id}').get_json()['explanation']
+            expected = {
+                'injury.current_risk': injury['current_risk'],
+                'injury.training_load': injury['drivers'][0]['impact'],
+                'development.potential_growth': development['potential_growth'],
+                'development.technical_current': development['development_areas'][0]['current'],
+                'value.horizon_5': value['predictions'][4],
+                'value.confidence': value['confidence'],
+                'xai.age_profile': round(explanation['explanations'][0]['importance'], 4),
+                'xai.confidence': explanation['confidence'],
+            }
+            for name, cell in expected.items():
+                assert row[columns[name]] == cell, (player_id, name, row[columns[name]], cell)
+    print(f'matrix cells match the per-player routes for {len(player_ids)} players')
+
+
+def main():
+    client = champions_app.app.test_client()
+    print(f'{"players":>8} {"requests":>9} {"cold ms":>9} {"warm ms":>9} {"matrix json ms":>15} '
+          f'{"matrix npy ms":>14} {"speedup":>8} {"singles KB":>11} {"json KB":>8} {"npy KB":>7}')
+    for n in scale_from_env('50,200,500'):
+        champions_app.PLAYERS_DB = PlayerStore(generate_players(max(n, DATABASE)))
+        champions_app.RESPONSE_CACHE.clear()
+        player_ids = list(champions_app.PLAYERS_DB.ids[:n])
+        cold, single_size = single_calls(client, player_ids)
+        warm, _ = single_calls(client, player_ids)
+        matrix_call(client, player_ids, 'json')
+        as_json, json_size = min(matrix_call(client, player_ids, 'json') for _ in range(3))
+        as_npy, npy_size = min(matrix_call(client, player_ids, 'npy') for _ in range(3))
+        print(f'{n:>8} {n * len(SINGLE_ROUTES):>9} {cold:>9,.0f} {warm:>9,.0f} {as_json:>15,.1f} {as_npy:>14,.1f} '
+              f'{cold / as_npy:>7.0f}x {single_size / 1024:>11,.0f} {json_size / 1024:>8,.0f} {npy_size / 1024:>7,.0f}')
+    check_matrix_agrees(client, player_ids[:50])
+
+
+if __name__ == '__main__':
+    main()
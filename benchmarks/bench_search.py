@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark: /api/players/search, term index vs a substring scan.
+
+Reports the index build time and size, then per-query latency (p50/p99)
+and result counts for a mix of exact, prefix, accent-free, misspelled and
+club/league queries, against the scan a search box without an index does
+(lower-cased substring match over every name), and p50/p99 over all the
+queries' runs together. The scan finds neither "gonzalez" in "González"
+nor misspellings; its counts show what it misses. A last row times
+queries with MAX_DIRTY_ROWS updated records pending, scored from their
+live values before the next rebuild.
+
+Measured on one core: 0.75 ms p50 / 2.0 ms p99 over all queries at 100k
+players, 5.5 ms / 12.8 ms at 1M, where "la liga" (142k matches) is the
+slowest at 11.6 ms p50 and the substring scan takes ~240 ms.
+
+Usage: python benchmarks/bench_search.py
+       CHAMPIONS_BENCH_SIZES=1000000 python benchmarks/bench_search.py
+"""
+
+import time
+
+import numpy as np
+
+from synthetic import generate_players, scale_from_env
+from player_store import PlayerStore
+from search import MAX_DIRTY_ROWS, SearchIndex
+
+QUERIES = ('mbappe', 'mbap', 'Gonzalez', 'gonzla', 'bellignham', 'pedri gonzalez', 'la liga', 'bundesliga club 7',
+           'spain', 'xyzzy')
+REPEATS = 20
+LIMIT = 20
+
+
+def timed(fn, repeats=REPEATS, times=None):
+    """(p50 ms, p99 ms, last result), appending each run's time to ``times`` if given"""
+    runs = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        runs.append((time.perf_counter() - start) * 1000)
+    if times is not None:
+        times.extend(runs)
+    return np.percentile(runs, 50), np.percentile(runs, 99), result
+
+
+def substring_scan(names, query):
+    needle = query.lower()
+    return [row for row, name in enumerate(names) if needle in name.lower()]
+
+
+def main():
+    for n in scale_from_env('100000,1000000'):
+        store = PlayerStore(generate_players(n))
+        index = SearchIndex(lambda: store)
+        index.refresh()
+        stats = index.stats()
+        group_codes, row_groups, group_offsets, group_rows = index._groups
+        size_mb = (index.vocabulary.nbytes + sum(offsets.nbytes + values.nbytes
+                                                  for _, _, offsets, values in index._fields.values())
+                   + sum(codes.nbytes for codes in group_codes.values()) + row_groups.nbytes
+                   + group_offsets.nbytes + group_rows.nbytes) / 2 ** 20
+        print(f'\n{n:,} players: build {stats["build_ms"]:.0f} ms, {stats["terms"]:,} terms, '
+              f'{stats["postings"]:,} postings, {size_mb:.1f} MB')
+        print(f'{"query":<20} {"index p50":>10} {"index p99":>10} {"matches":>9} '
+              f'{"scan p50":>9} {"matches":>9}')
+        names = list(store.names)
+        times = []
+        for query in QUERIES:
+            p50, p99, found = timed(lambda: index.search(query, LIMIT), times=times)
+            scan_p50, _, scanned = timed(lambda: substring_scan(names, query), repeats=3)
+            print(f'{query:<20} {p50:>10.2f} {p99:>10.2f} {found["total"]:>9,} {scan_p50:>9.1f} {len(scanned):>9,}')
+        print(f'{"all queries":<20} {np.percentile(times, 50):>10.2f} {np.percentile(times, 99):>10.2f}')
+
+        rng = np.random.default_rng(3)
+        rows = rng.choice(n, min(MAX_DIRTY_ROWS, n // 20), replace=False)
+        for row in rows.tolist():
+            store.update(store.ids[row], {'club': 'Real Madrid'})
+        sync_p50, _, _ = timed(lambda: index.search('real madrid', LIMIT), repeats=1)
+        p50, p99, found = timed(lambda: index.search('real madrid', LIMIT))
+        print(f'{"+" + str(len(rows)) + " dirty rows":<20} {p50:>10.2f} {p99:>10.2f} {found["total"]:>9,} '
+              f'(first query, folding the updates: {sync_p50:.1f} ms)')
+
+
+if __name__ == '__main__':
+    main()
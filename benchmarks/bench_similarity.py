@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark: /api/players/<id>/similar, IVF index vs exact brute force.
+
+Reports index build time, per-query latency (p50/p99) for both search paths
+and recall@k of the IVF results against the exact top-k. Then updates
+REBUILD_FRACTION of the rows and reports the query that catches up with
+them, IVF latency while the replacement index builds in the background, and
+how long until it is swapped in.
+
+Usage: python benchmarks/bench_similarity.py
+       CHAMPIONS_BENCH_SIZES=100000 python benchmarks/bench_similarity.py
+"""
+
+import time
+
+import numpy as np
+
+from synthetic import generate_players, scale_from_env
+from player_store import PlayerStore
+from similarity import REBUILD_FRACTION, SimilarityIndex, METRICS
+
+QUERIES = 200
+K = 10
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main():
+    rng = np.random.default_rng(0)
+    for n in scale_from_env('100000,1000000'):
+        store = PlayerStore(generate_players(n))
+        index = SimilarityIndex(lambda: store)
+        queries = rng.integers(0, n, QUERIES).tolist()
+        build_ms, _ = timed(lambda: index.pairwise(np.array([0]), 'cosine'))
+        print(f'\n{n:,} players (embed + IVF cells {build_ms:.0f} ms)')
+        print(f'{"metric":<10} {"exact p50":>10} {"exact p99":>10} '
+              f'{"ivf p50":>8} {"ivf p99":>8} {"recall@10":>10}')
+        for metric in METRICS:
+            exact_ms, ivf_ms, recall = [], [], []
+            for row in queries:
+                ms, exact = timed(lambda: index.nearest(row, K, metric, exact=True))
+                exact_ms.append(ms)
+                ms, approx = timed(lambda: index.nearest(row, K, metric, exact=False))
+                ivf_ms.append(ms)
+                truth = {r for r, _ in exact}
+                recall.append(len(truth & {r for r, _ in approx}) / len(truth))
+            print(f'{metric:<10} {np.percentile(exact_ms, 50):>10.2f} '
+                  f'{np.percentile(exact_ms, 99):>10.2f} {np.percentile(ivf_ms, 50):>8.2f} '
+                  f'{np.percentile(ivf_ms, 99):>8.2f} {np.mean(recall):>10.3f}')
+
+        updated = rng.choice(n, int(n * REBUILD_FRACTION) + 1, replace=False)
+        for row in updated.tolist():
+            store.update(store.ids[row], {'stats': {'overall': int(rng.integers(40, 100))}})
+        catch_up_ms, _ = timed(lambda: index.nearest(queries[0], K, 'cosine', exact=False))
+        start, during = time.perf_counter(), []
+        while index.rebuilds == 0 and time.perf_counter() - start < 120:
+            ms, _ = timed(lambda: index.nearest(int(rng.integers(0, n)), K, 'cosine', exact=False))
+            during.append(ms)
+        swap_ms = (time.perf_counter() - start) * 1000
+        print(f'{len(updated):,} updates: catch-up query {catch_up_ms:.1f} ms, ivf p50 '
+              f'{np.percentile(during, 50):.2f} / p99 {np.percentile(during, 99):.2f} ms over {len(during)} '
+              f'queries during the background rebuild, swapped in after {swap_ms:.0f} ms')
+
+
+if __name__ == '__main__':
+    main()
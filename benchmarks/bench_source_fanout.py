@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark: /api/players/<id>/sources, concurrent fan-out vs sequential fetches.
+
+Starts the five stub sources with their default delays, then compares
+fetching them one after another against the route's concurrent gateway.
+A concurrent request should take about as long as the slowest source.
+
+Usage: python benchmarks/bench_source_fanout.py
+"""
+
+import json
+import time
+import urllib.request
+
+import numpy as np
+
+from stub_sources import DEFAULT_DELAYS, start_stub_sources
+import app as champions_app
+from data_sources import SourceGateway
+
+REQUESTS = 30
+
+
+def sequential(urls, player_id):
+    """The naive path: one blocking request per source"""
+    return {key: json.load(urllib.request.urlopen(f'{url}/players/{player_id}', timeout=5))
+            for key, url in urls.items()}
+
+
+def timed_ms(fn, repeat=REQUESTS):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return np.percentile(samples, [50, 99])
+
+
+def main():
+    urls, stop = start_stub_sources()
+    champions_app.SOURCES = SourceGateway({key: {'url': url, 'timeout': 2.0} for key, url in urls.items()})
+    client = champions_app.app.test_client()
+    try:
+        delays_ms = {k: v * 1000 for k, v in DEFAULT_DELAYS.items()}
+        print('source delays (ms): ' + ', '.join(f'{k}={v:.0f}' for k, v in delays_ms.items()))
+        print(f'sum {sum(delays_ms.values()):.0f} ms, slowest {max(delays_ms.values()):.0f} ms\n')
+        print(f'{"path":<28} {"p50 ms":>8} {"p99 ms":>8}')
+
+        p50, p99 = timed_ms(lambda: sequential(urls, 'bellingham'))
+        print(f'{"sequential urllib":<28} {p50:>8.1f} {p99:>8.1f}')
+
+        client.get('/api/players/bellingham/sources')  # open pooled connections
+        p50, p99 = timed_ms(lambda: client.get('/api/players/bellingham/sources'))
+        print(f'{"concurrent gateway (route)":<28} {p50:>8.1f} {p99:>8.1f}')
+
+        # One source past its timeout: the request is bounded by the timeout, not blocked by it
+        champions_app.SOURCES.sources['wearables']['timeout'] = 0.05
+        body = client.get('/api/players/bellingham/sources').get_json()
+        print(f'\nwearables timeout=50ms -> status {body["sources"]["wearables"]["status"]}, '
+              f'request {body["latency_ms"]:.1f} ms, complete={body["complete"]}')
+    finally:
+        champions_app.SOURCES.close()
+        stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark: 5-year performance-history queries at per-session granularity.
+
+Fills a TimeSeriesStore (in memory, and on disk with memory-mapped sealed
+chunks) with five years of sessions for a squad, then times the pieces of
+/api/analytics/performance: the range query, weekly downsampling, rolling
+trend regression and the whole endpoint through the test client, for one
+player and for the team. A plain Python list scan with per-week grouping is
+the baseline. ``CHAMPIONS_BENCH_SIZES`` sets the sessions per week.
+
+Usage: python benchmarks/bench_timeseries.py
+       CHAMPIONS_BENCH_SIZES=7,70 python benchmarks/bench_timeseries.py
+"""
+
+import statistics
+import tempfile
+import time
+
+from synthetic import generate_players, scale_from_env
+import app as champions_app
+from player_store import PlayerStore
+from timeseries import METRICS, WEEK, TimeSeriesStore, downsample, synthetic_sessions, trend_label
+
+PLAYERS = 25
+YEARS = 5
+REPEAT = 30
+
+
+def timed_ms(fn, repeat=REPEAT):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def list_scan(rows, start, end):
+    """Baseline: scan a list of session dicts and average per week in Python"""
+    buckets = {}
+    for row in rows:
+        if start <= row['t'] < end:
+            buckets.setdefault((row['t'] - start) // WEEK, []).append(row)
+    return {m: [sum(r[m] for r in b) / len(b) for _, b in sorted(buckets.items())] for m in METRICS}
+
+
+def main():
+    end = int(time.time()) // 86400 * 86400
+    start = end - YEARS * 365 * 86400
+    champions_app.PLAYERS_DB = PlayerStore(generate_players(PLAYERS))
+    player_ids = list(champions_app.PLAYERS_DB.ids)
+    client = champions_app.app.test_client()
+    for per_week in scale_from_env('7,70'):
+        history = {pid: synthetic_sessions(pid, start, end, sessions_per_week=per_week) for pid in player_ids}
+        n = len(history[player_ids[0]])
+        print(f'\n{per_week} sessions/week: {n:,} sessions per player over {YEARS} years, {PLAYERS} players')
+        rows = [dict(zip(('t',) + METRICS, map(float, r))) for r in history[player_ids[0]].tolist()]
+        print(f'{"python list scan, one player":<38} {timed_ms(lambda: list_scan(rows, start, end), 5):>9.2f} ms')
+
+        with tempfile.TemporaryDirectory() as directory:
+            for label, store in (('in memory', TimeSeriesStore()), ('mmap', TimeSeriesStore(directory))):
+                load = time.perf_counter()
+                for pid, sessions in history.items():
+                    store.append(pid, sessions)
+                if label == 'mmap':
+                    # Reopen: sealed chunks come back memory-mapped, open chunks from their tail logs
+                    store = TimeSeriesStore(directory)
+                    for pid, sessions in history.items():
+                        assert len(store.range(pid)) == len(sessions), pid
+                print(f'-- {label} (loaded in {(time.perf_counter() - load) * 1000:.0f} ms)')
+                pid = player_ids[0]
+                sessions = store.range(pid, start, end)
+                series = downsample(sessions, start, end, WEEK)
+                cases = [
+                    ('range query, one player', lambda: store.range(pid, start, end)),
+                    ('weekly downsample, one player', lambda: downsample(sessions, start, end, WEEK)),
+                    ('trend regression, 3 metrics', lambda: [trend_label(series[m]) for m in METRICS[:3]]),
+                    ('range + downsample, team', lambda: downsample(
+                        [c for p in player_ids for c in store.slices(p, start, end)], start, end, WEEK)),
+                ]
+                for name, fn in cases:
+                    print(f'{name:<38} {timed_ms(fn):>9.3f} ms')
+
+                champions_app.PERFORMANCE = store
+                for name, url in (('endpoint, one player', f'/api/analytics/performance?player_id={pid}&timeframe=5years'),
+                                  ('endpoint, team', '/api/analytics/performance?timeframe=5years')):
+                    assert client.get(url).status_code == 200
+                    print(f'{name:<38} {timed_ms(lambda: client.get(url)):>9.3f} ms')
+                champions_app.PERFORMANCE = None
+
+
+if __name__ == '__main__':
+    main()
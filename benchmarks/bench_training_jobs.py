@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark: training plans for a whole academy, per-player requests vs one job.
+
+Serves a synthetic database (CHAMPIONS_PLAYERS_DIR) with
+CHAMPIONS_SIMULATED_INFERENCE_MS of CPU per plan standing in for real
+model inference, and generates plans for N players three ways:
+
+- sequential: one GET /api/training/recommendations/<id> per player, as a
+  client looping over a squad does today;
+- job inline: one POST /api/training/jobs, batches run in the job runner
+  thread, polled until done and then read in pages;
+- job pool: the same with CHAMPIONS_TRAINING_PROCESSES worker processes.
+
+A last submission of the same players reports how many plans the job
+reused from the previous run rather than generating again. With one CPU
+the pool only removes the GIL handoffs; its gain grows with cores.
+
+Usage: python benchmarks/bench_training_jobs.py
+       CHAMPIONS_BENCH_SIZES=200,1000 CHAMPIONS_TRAINING_PROCESSES=4 python benchmarks/bench_training_jobs.py
+"""
+
+import http.client
+import json
+import os
+import tempfile
+import time
+
+from load_test import free_port, start_server, stop_server, wait_until_up
+from synthetic import generate_players, scale_from_env
+from player_store import PlayerStore
+
+HOST = '127.0.0.1'
+POLL_SECONDS = 0.05
+PAGE = 1000
+
+
+def request(conn, method, path, body=None):
+    headers = {'Content-Type': 'application/json'} if body is not None else {}
+    conn.request(method, path, json.dumps(body) if body is not None else None, headers)
+    response = conn.getresponse()
+    return response.status, json.loads(response.read())
+
+
+def sequential(port, ids):
+    conn = http.client.HTTPConnection(HOST, port, timeout=60)
+    start = time.perf_counter()
+    for player_id in ids:
+        status, _ = request(conn, 'GET', f'/api/training/recommendations/{player_id}')
+        assert status == 200, status
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return elapsed, len(ids), 0
+
+
+def job(port, ids):
+    """(seconds to every result fetched, HTTP requests made, plans reused)"""
+    conn = http.client.HTTPConnection(HOST, port, timeout=60)
+    start = time.perf_counter()
+    status, submitted = request(conn, 'POST', '/api/training/jobs', {'player_ids': ids})
+    assert status == 202, submitted
+    requests, offset, results = 1, 0, 0
+    job_id = submitted['job_id']
+    while True:
+        _, page = request(conn, 'GET', f'/api/training/jobs/{job_id}/results?offset={offset}&limit={PAGE}')
+        requests += 1
+        results += page['count']
+        offset = page['next_offset']
+        if page['done']:
+            break
+        if not page['count']:
+            time.sleep(POLL_SECONDS)
+    elapsed = time.perf_counter() - start
+    _, status = request(conn, 'GET', f'/api/training/jobs/{job_id}')
+    conn.close()
+    assert results == len(ids), (results, len(ids))
+    return elapsed, requests + 1, status['reused']
+
+
+def serve(env, port):
+    os.environ.update(env)
+    process = start_server('threaded', port, [])
+    wait_until_up(HOST, port)
+    return process
+
+
+def main():
+    processes = int(os.environ.get('CHAMPIONS_TRAINING_PROCESSES') or 2)
+    plan_ms = float(os.environ.get('CHAMPIONS_SIMULATED_INFERENCE_MS') or 2)
+    print(f'{plan_ms:g} ms simulated inference per plan, {os.cpu_count()} CPU(s)')
+    print(f'{"players":>8} {"mode":<16} {"seconds":>8} {"plans/s":>8} {"requests":>9} {"reused":>7}')
+    for n in scale_from_env('100,500'):
+        players = generate_players(n)
+        ids = [p['id'] for p in players]
+        with tempfile.TemporaryDirectory() as tmp:
+            store_dir = os.path.join(tmp, 'players')
+            PlayerStore(players).save(store_dir)
+            runs = (('sequential', 0, sequential), ('job inline', 0, job), (f'job pool x{processes}', processes, job))
+            for label, count, run in runs:
+                port = free_port()
+                process = serve({'CHAMPIONS_PLAYERS_DIR': store_dir, 'CHAMPIONS_LIVE_INTERVAL': '3600',
+                                 'CHAMPIONS_SIMULATED_INFERENCE_MS': str(plan_ms),
+                                 'CHAMPIONS_TRAINING_PROCESSES': str(count)}, port)
+                try:
+                    if count:
+                        # Start the worker processes before timing
+                        job(port, ids[:1])
+                    elapsed, requests, reused = run(port, ids)
+                    print(f'{n:>8,} {label:<16} {elapsed:>8.2f} {n / elapsed:>8.0f} {requests:>9,} {reused:>7,}')
+                    if run is job and not count:
+                        elapsed, requests, reused = job(port, ids)
+                        print(f'{n:>8,} {"job resubmitted":<16} {elapsed:>8.2f} {n / elapsed:>8.0f} '
+                              f'{requests:>9,} {reused:>7,}')
+                finally:
+                    stop_server(process)
+
+
+if __name__ == '__main__':
+    main()
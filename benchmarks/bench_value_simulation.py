@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Monte Carlo value-band simulation, paths x players scaling.
+
+Synthetic players (ages, values, positions, trends and contract terms
+drawn from the generator's distributions) are simulated at each path
+count, in process and, with CHAMPIONS_SIMULATION_PROCESSES > 1 and at
+least POOL_MIN_PLAYERS players, through the process pool as well. A
+second table runs a whole batch under latency budgets and reports the
+paths the simulator chose and the time it actually took (a budget below
+MIN_PATHS per player is overrun rather than sampled thinner). Throughput is player-paths per second; on a single core
+the pool only adds process start-up and pickling.
+
+Usage: python benchmarks/bench_value_simulation.py
+       CHAMPIONS_BENCH_SIZES=500,5000 CHAMPIONS_SIMULATION_PROCESSES=4 python benchmarks/bench_value_simulation.py
+"""
+
+import os
+import time
+
+import numpy as np
+
+from synthetic import generate_players, scale_from_env
+from valuation import CONTRACT_YEARS, MIN_PATHS, POOL_MIN_PLAYERS, ValueSimulator
+
+PATHS = (200, 1000, 2000, 5000)
+BUDGETS_MS = (100, 250, 500, 1000)
+
+
+def simulation_batch(n, seed=11):
+    players = generate_players(n)
+    rng = np.random.default_rng(seed)
+    return {
+        'current_values': [p['current_value'] for p in players],
+        'ages': [p['age'] for p in players],
+        'positions': [p['position'] for p in players],
+        'trends': rng.integers(0, 3, n),
+        'contract_years': rng.choice(CONTRACT_YEARS, n),
+        'seeds': np.arange(n)
+    }
+
+
+def timed(simulator, batch, **kwargs):
+    start = time.perf_counter()
+    result = simulator.simulate(**batch, **kwargs)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    processes = int(os.environ.get('CHAMPIONS_SIMULATION_PROCESSES', 0))
+    simulators = [('in-process', ValueSimulator())]
+    if processes > 1:
+        simulators.append((f'pool x{processes}', ValueSimulator(processes)))
+    sizes = scale_from_env('100,500,2000,5000')
+
+    print(f'{"players":>8} {"paths":>6} {"mode":<12} {"ms":>9} {"Mpaths/s":>9} {"p5-p95 y5":>10} {"confidence":>11}')
+    for n in sizes:
+        batch = simulation_batch(n)
+        for paths in PATHS:
+            for label, simulator in simulators:
+                if simulator.processes and n < POOL_MIN_PLAYERS:
+                    continue
+                # Warm-up run: pool start-up and the first throughput estimate
+                timed(simulator, batch, paths=MIN_PATHS)
+                result, elapsed = timed(simulator, batch, paths=paths)
+                spread = np.median(result['bands'][:, -1, -1] / result['bands'][:, -1, 0])
+                print(f'{n:>8,} {paths:>6} {label:<12} {elapsed:>9.1f} {n * paths / elapsed / 1000:>9.2f} '
+                      f'{spread:>9.1f}x {np.median(result["confidence"]):>11.1f}')
+
+    print()
+    print(f'{"players":>8} {"budget ms":>10} {"paths":>6} {"ms":>9} {"within":>7}')
+    simulator = ValueSimulator()
+    for n in sizes:
+        batch = simulation_batch(n)
+        for budget in BUDGETS_MS:
+            result, elapsed = timed(simulator, batch, paths=5000, budget_ms=budget)
+            print(f'{n:>8,} {budget:>10} {result["paths"]:>6} {elapsed:>9.1f} {"yes" if elapsed <= budget else "no":>7}')
+    for _, simulator in simulators:
+        simulator.close()
+
+
+if __name__ == '__main__':
+    main()
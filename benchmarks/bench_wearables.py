@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark: wearables ingestion throughput in samples/sec across a full squad.
+
+A day of 10 Hz GPS/heart-rate data for a 25-player squad (90-minute
+sessions, 1.35M samples) is fed in batches of each size in
+``CHAMPIONS_BENCH_SIZES``: straight into WorkloadTracker.ingest, through
+binary parsing, through NDJSON parsing, and end to end via
+POST /api/wearables/samples on the Flask test client, plus straight ingest
+into a tracker sharing its totals through a file (as prefork workers do).
+Reading a workload afterwards costs the same however much history was
+ingested, in memory or from the shared file.
+
+Usage: python benchmarks/bench_wearables.py
+       CHAMPIONS_BENCH_SIZES=1000,100000 python benchmarks/bench_wearables.py
+"""
+
+import json
+import tempfile
+import time
+
+from synthetic import generate_players, iter_wearable_days, scale_from_env
+import app as champions_app
+from player_store import PlayerStore
+from wearables import WorkloadTracker, parse_binary, parse_ndjson
+
+SQUAD = 25
+# NDJSON encoding in Python is slow; time its parsing on a slice of the day
+NDJSON_SAMPLES = 200000
+
+
+def throughput(samples, batch, ingest):
+    start = time.perf_counter()
+    for offset in range(0, len(samples), batch):
+        ingest(samples[offset:offset + batch])
+    return len(samples) / (time.perf_counter() - start)
+
+
+def main():
+    champions_app.PLAYERS_DB = PlayerStore(generate_players(SQUAD))
+    player_ids = [str(pid) for pid in champions_app.PLAYERS_DB.ids]
+    # The last complete day: today's 10:00 UTC session may still be in the future, and is rejected
+    last_day = int(time.time()) // 86400 - 1
+    day = next(iter_wearable_days(player_ids, last_day, 1))
+    ndjson_lines = [json.dumps({'player_id': s[0].decode(), 't': s[1], 'speed': s[2], 'heart_rate': s[3]})
+                    for s in day[:NDJSON_SAMPLES].tolist()]
+    client = champions_app.app.test_client()
+    print(f'{SQUAD} players, {len(day):,} samples/day at 10 Hz')
+    print(f'{"batch":>8} {"ingest":>14} {"binary parse":>14} {"ndjson parse":>14} {"HTTP binary":>14} '
+          f'{"shared file":>14}  samples/s')
+    state = tempfile.TemporaryDirectory()
+
+    for batch in scale_from_env('1000,10000,100000'):
+        direct = throughput(day, batch, WorkloadTracker().ingest)
+        tracker = WorkloadTracker()
+        binary = throughput(day, batch, lambda s: tracker.ingest(parse_binary(s.tobytes())))
+        tracker = WorkloadTracker()
+        start = time.perf_counter()
+        for offset in range(0, len(ndjson_lines), batch):
+            tracker.ingest(parse_ndjson('\n'.join(ndjson_lines[offset:offset + batch])))
+        ndjson = len(ndjson_lines) / (time.perf_counter() - start)
+
+        champions_app.WORKLOADS = WorkloadTracker()
+        http = throughput(day, batch, lambda s: client.post(
+            '/api/wearables/samples', data=s.tobytes(), content_type='application/octet-stream'))
+        shared = throughput(day, batch, WorkloadTracker(directory=tempfile.mkdtemp(dir=state.name)).ingest)
+        print(f'{batch:>8} {direct:>14,.0f} {binary:>14,.0f} {ndjson:>14,.0f} {http:>14,.0f} {shared:>14,.0f}')
+
+    print()
+    for label, tracker in (('in memory', WorkloadTracker()),
+                           ('shared file', WorkloadTracker(directory=tempfile.mkdtemp(dir=state.name)))):
+        for samples in iter_wearable_days(player_ids, last_day - 27, 28, hz=1):
+            tracker.ingest(samples)
+        start = time.perf_counter()
+        for player_id in player_ids:
+            tracker.workload(player_id)
+        per_player = (time.perf_counter() - start) / len(player_ids) * 1e6
+        print(f'workload read after 28 days of history ({label}): {per_player:.1f} us/player')
+    state.cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Load test: p50/p99 latency and req/s for /api/players and /api/predict/* per serving mode.
+
+Starts serve.py in each mode on a free local port, drives each route with
+CHAMPIONS_LOAD_CONCURRENCY keep-alive client threads for
+CHAMPIONS_LOAD_SECONDS, then stops the server.
+
+Usage: python benchmarks/load_test.py
+       CHAMPIONS_LOAD_MODES=threaded,prefork CHAMPIONS_LOAD_CONCURRENCY=32 python benchmarks/load_test.py
+       python benchmarks/load_test.py --url http://localhost:5000   # an already running server
+"""
+
+import argparse
+import http.client
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+
+import numpy as np
+
+from synthetic import REPO_ROOT
+
+ROUTES = [
+    '/api/players',
+    '/api/predict/injury/bellingham',
+    '/api/predict/development/pedri',
+    '/api/predict/value/mbappe',
+]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_up(host: str, port: int, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=1)
+            conn.request('GET', '/api/health')
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f'server on port {port} did not come up')
+
+
+def start_server(mode: str, port: int, extra_args) -> subprocess.Popen:
+    # Own process group so the dev reloader's child and gunicorn workers stop with it
+    return subprocess.Popen(
+        [sys.executable, os.path.join(REPO_ROOT, 'serve.py'), '--mode', mode,
+         '--host', '127.0.0.1', '--port', str(port)] + extra_args,
+        cwd=REPO_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+
+
+def stop_server(proc: subprocess.Popen):
+    os.killpg(proc.pid, signal.SIGTERM)
+    try:
+        proc.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        os.killpg(proc.pid, signal.SIGKILL)
+
+
+def drive(host: str, port: int, path: str, concurrency: int, seconds: float):
+    """Hammer one route; returns (latencies in ms, errors, elapsed seconds)"""
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def client():
+        conn = http.client.HTTPConnection(host, port, timeout=10)
+        local = []
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                conn.request('GET', path)
+                response = conn.getresponse()
+                response.read()
+                ok = response.status == 200
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                conn = http.client.HTTPConnection(host, port, timeout=10)
+                ok = False
+            if ok:
+                local.append((time.perf_counter() - start) * 1000)
+            else:
+                with lock:
+                    errors[0] += 1
+        conn.close()
+        with lock:
+            latencies.extend(local)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors[0], time.perf_counter() - start
+
+
+def report(label: str, host: str, port: int, concurrency: int, seconds: float):
+    print(f'\n{label} (concurrency {concurrency}, {seconds:.0f}s per route)')
+    print(f'{"route":<34} {"req/s":>9} {"p50 ms":>8} {"p99 ms":>8} {"errors":>7}')
+    for path in ROUTES:
+        latencies, errors, elapsed = drive(host, port, path, concurrency, seconds)
+        if latencies:
+            p50, p99 = np.percentile(latencies, [50, 99])
+        else:
+            p50 = p99 = float('nan')
+        print(f'{path:<34} {len(latencies) / elapsed:>9,.0f} {p50:>8.2f} {p99:>8.2f} {errors:>7}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--url', help='benchmark an already running server instead of starting one')
+    parser.add_argument('--modes', default=os.environ.get('CHAMPIONS_LOAD_MODES', 'dev,threaded,prefork'))
+    parser.add_argument('--concurrency', type=int, default=int(os.environ.get('CHAMPIONS_LOAD_CONCURRENCY', 16)))
+    parser.add_argument('--seconds', type=float, default=float(os.environ.get('CHAMPIONS_LOAD_SECONDS', 5)))
+    parser.add_argument('--workers', default='auto')
+    parser.add_argument('--threads', default='4')
+    args = parser.parse_args()
+
+    if args.url:
+        url = urllib.parse.urlsplit(args.url)
+        report(args.url, url.hostname, url.port or 80, args.concurrency, args.seconds)
+        return
+
+    for mode in args.modes.split(','):
+        port = free_port()
+        extra = ['--workers', args.workers, '--threads', args.threads] if mode == 'prefork' else []
+        proc = start_server(mode, port, extra)
+        try:
+            wait_until_up('127.0.0.1', port)
+            label = f'{mode} ({args.workers} workers x {args.threads} threads)' if mode == 'prefork' else mode
+            report(label, '127.0.0.1', port, args.concurrency, args.seconds)
+        finally:
+            stop_server(proc)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Replay a recorded wearables sample file into the ingestion pipeline.
+
+Recordings are packed wearables.SAMPLE_DTYPE records (``.bin``) or NDJSON
+lines (``.ndjson``/``.jsonl``). Samples are posted in batches to
+``/api/wearables/samples`` of a running server in the file's own format, or
+with no ``--url`` folded into an in-process WorkloadTracker, after which the
+resulting workloads are printed. ``--speed`` paces batches by their recorded
+timestamps (1 = real time, 60 = a minute per second, 0 = as fast as possible).
+Workloads are read as of today, so a recording older than 28 days replays
+to empty windows; --generate writes one ending yesterday.
+
+Usage: python benchmarks/replay_wearables.py --generate session.bin --days 28
+       python benchmarks/replay_wearables.py session.bin
+       python benchmarks/replay_wearables.py session.bin --url http://localhost:5000 --batch 20000
+"""
+
+import argparse
+import http.client
+import itertools
+import json
+import time
+import urllib.parse
+
+import numpy as np
+
+from synthetic import iter_wearable_days
+from wearables import SAMPLE_DTYPE, WorkloadTracker, parse_ndjson
+
+DEMO_PLAYERS = ['bellingham', 'pedri', 'mbappe']
+
+
+def is_ndjson(path: str) -> bool:
+    return path.endswith(('.ndjson', '.jsonl'))
+
+
+def read_batches(path: str, batch: int):
+    """(samples, raw body) per batch; raw is what gets posted"""
+    if is_ndjson(path):
+        with open(path) as f:
+            while True:
+                lines = list(itertools.islice(f, batch))
+                if not lines:
+                    return
+                body = ''.join(lines)
+                yield parse_ndjson(body), body.encode()
+    else:
+        samples = np.memmap(path, dtype=SAMPLE_DTYPE, mode='r')
+        for start in range(0, len(samples), batch):
+            chunk = np.asarray(samples[start:start + batch])
+            yield chunk, chunk.tobytes()
+
+
+def generate(path: str, days: int, hz: int, players):
+    # Ends yesterday: samples later than now are rejected, and workloads are read as of today
+    first_day = int(time.time()) // 86400 - days
+    written = 0
+    with open(path, 'w' if is_ndjson(path) else 'wb') as f:
+        for samples in iter_wearable_days(players, first_day, days, hz=hz):
+            if is_ndjson(path):
+                f.writelines(json.dumps({'player_id': s[0].decode(), 't': s[1], 'speed': round(s[2], 2),
+                                         'heart_rate': round(s[3], 1)}) + '\n' for s in samples.tolist())
+            else:
+                samples.tofile(f)
+            written += len(samples)
+    print(f'wrote {written:,} samples for {len(players)} players over {days} days to {path}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('path', nargs='?')
+    parser.add_argument('--url', help='server to post to; in-process when omitted')
+    parser.add_argument('--batch', type=int, default=10000, help='samples per batch')
+    parser.add_argument('--speed', type=float, default=0, help='replay speed factor, 0 = unpaced')
+    parser.add_argument('--generate', metavar='PATH', help='write a synthetic recording instead')
+    parser.add_argument('--days', type=int, default=28)
+    parser.add_argument('--hz', type=int, default=1)
+    parser.add_argument('--players', default=','.join(DEMO_PLAYERS))
+    args = parser.parse_args()
+
+    if args.generate:
+        generate(args.generate, args.days, args.hz, args.players.split(','))
+        return
+    if not args.path:
+        parser.error('a recording path (or --generate PATH) is required')
+
+    tracker = conn = None
+    if args.url:
+        url = urllib.parse.urlsplit(args.url)
+        conn = http.client.HTTPConnection(url.hostname, url.port or 80)
+        content_type = 'application/x-ndjson' if is_ndjson(args.path) else 'application/octet-stream'
+    else:
+        tracker = WorkloadTracker()
+
+    total, wall_start, recorded_start = 0, time.perf_counter(), None
+    for samples, body in read_batches(args.path, args.batch):
+        if not len(samples):
+            continue
+        if args.speed > 0:
+            recorded_start = samples['t'][0] if recorded_start is None else recorded_start
+            delay = (samples['t'][0] - recorded_start) / args.speed - (time.perf_counter() - wall_start)
+            if delay > 0:
+                time.sleep(delay)
+        if conn is not None:
+            conn.request('POST', '/api/wearables/samples', body=body, headers={'Content-Type': content_type})
+            response = conn.getresponse()
+            payload = response.read()
+            if response.status != 200:
+                raise SystemExit(f'HTTP {response.status}: {payload.decode()}')
+        else:
+            tracker.ingest(samples)
+        total += len(samples)
+
+    elapsed = time.perf_counter() - wall_start
+    print(f'replayed {total:,} samples in {elapsed:.2f} s ({total / elapsed:,.0f} samples/s)')
+    if tracker is not None:
+        for player_id in tracker.players():
+            print(player_id, tracker.workload(player_id))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Local stub servers for the upstream data sources in data_sources.py.
+
+Each source answers ``GET /players/<id>`` after a configurable delay with a
+small synthetic payload. Run standalone to develop against the
+/api/players/<id>/sources route:
+
+    python benchmarks/stub_sources.py --base-port 9101
+    # then export the printed CHAMPIONS_SOURCE_*_URL variables and start the app
+
+or call ``start_stub_sources`` from a benchmark to run them on a background thread.
+"""
+
+import argparse
+import asyncio
+import threading
+from typing import Callable, Dict, Tuple
+
+from aiohttp import web
+
+from synthetic import REPO_ROOT  # noqa: F401  (puts the repository root on sys.path)
+from data_sources import DATA_SOURCES
+
+# Typical upstream latencies in seconds; wearables is the slow one
+DEFAULT_DELAYS = {'performance': 0.02, 'biomedical': 0.04, 'wearables': 0.12, 'match': 0.06, 'training': 0.025}
+
+
+def make_source_app(key: str, delay: float) -> web.Application:
+    async def player(request):
+        await asyncio.sleep(delay)
+        player_id = request.match_info['player_id']
+        if player_id.startswith('missing'):
+            raise web.HTTPNotFound()
+        return web.json_response({'source': key, 'player_id': player_id, 'records': [
+            {'metric': f'{key}_metric_{i}', 'value': i * 1.5} for i in range(5)
+        ]})
+
+    app = web.Application()
+    app.router.add_get('/players/{player_id}', player)
+    return app
+
+
+async def _start_runners(delays: Dict[str, float], host: str, base_port: int):
+    runners, urls = [], {}
+    for i, (key, _) in enumerate(DATA_SOURCES):
+        if key not in delays:
+            continue
+        runner = web.AppRunner(make_source_app(key, delays[key]), access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, host, base_port + i if base_port else 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        urls[key] = f'http://{host}:{port}'
+        runners.append(runner)
+    return runners, urls
+
+
+def start_stub_sources(delays: Dict[str, float] = None, host: str = '127.0.0.1',
+                       base_port: int = 0) -> Tuple[Dict[str, str], Callable[[], None]]:
+    """Serve stub sources on a background loop; returns (source key -> URL, stop function)"""
+    delays = DEFAULT_DELAYS if delays is None else delays
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name='stub-sources', daemon=True).start()
+    runners, urls = asyncio.run_coroutine_threadsafe(_start_runners(delays, host, base_port), loop).result()
+
+    def stop():
+        async def cleanup():
+            for runner in runners:
+                await runner.cleanup()
+        asyncio.run_coroutine_threadsafe(cleanup(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+
+    return urls, stop
+
+
+def parse_delays(raw: str) -> Dict[str, float]:
+    delays = dict(DEFAULT_DELAYS)
+    for item in filter(None, (part.strip() for part in raw.split(','))):
+        key, _, value = item.partition('=')
+        delays[key] = float(value)
+    return delays
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve stub upstream data sources')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--base-port', type=int, default=9101)
+    parser.add_argument('--delays', default='', help='e.g. wearables=0.3,match=0.05 (seconds)')
+    args = parser.parse_args()
+
+    urls, stop = start_stub_sources(parse_delays(args.delays), args.host, args.base_port)
+    for key, url in urls.items():
+        print(f'export CHAMPIONS_SOURCE_{key.upper()}_URL={url}')
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+Synthetic player datasets for the Champions Gen benchmarks.
+
+Records follow the ``PLAYERS_DB`` schema in app.py so they can be loaded into
+any player store the API uses.
+"""
+
+import os
+import sys
+from typing import Dict, Iterator, List
+
+import numpy as np
+
+# Benchmarks run as plain scripts from the repository root or this directory
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+POSITIONS = ['Goalkeeper', 'Defender', 'Midfielder', 'Forward']
+LEAGUES = ['La Liga', 'Premier League', 'Serie A', 'Bundesliga', 'Ligue 1', 'Eredivisie', 'Primeira Liga']
+NATIONALITIES = ['England', 'Spain', 'France', 'Germany', 'Italy', 'Brazil', 'Argentina', 'Portugal', 'Netherlands']
+FIRST_NAMES = ['Jude', 'Pedri', 'Kylian', 'Vinicius', 'Erling', 'Jamal', 'Florian', 'Bukayo', 'Rodrigo', 'Josko']
+LAST_NAMES = ['Bellingham', 'González', 'Mbappé', 'Júnior', 'Haaland', 'Musiala', 'Wirtz', 'Saka', 'Hernández', 'Gvardiol']
+
+
+def generate_players(n: int, seed: int = 7) -> List[Dict]:
+    """Generate ``n`` player records with realistic value/age/stat spreads"""
+    rng = np.random.default_rng(seed)
+    positions = rng.integers(0, len(POSITIONS), n)
+    leagues = rng.integers(0, len(LEAGUES), n)
+    clubs = rng.integers(0, 20, n)
+    nations = rng.integers(0, len(NATIONALITIES), n)
+    first = rng.integers(0, len(FIRST_NAMES), n)
+    last = rng.integers(0, len(LAST_NAMES), n)
+    ages = rng.integers(16, 38, n)
+    values = (rng.lognormal(16.5, 1.2, n)).astype(np.int64)
+    overall = rng.integers(55, 97, n)
+    goals = np.round(rng.gamma(1.5, 0.4, n), 1)
+    assists = np.round(rng.gamma(1.5, 0.35, n), 1)
+    passing = rng.integers(60, 95, n)
+    tackles = np.round(rng.gamma(2.0, 0.6, n), 1)
+    dribbles = np.round(rng.gamma(2.0, 0.9, n), 1)
+
+    players = []
+    for i in range(n):
+        league = LEAGUES[leagues[i]]
+        players.append({
+            'id': f'player-{i}',
+            'name': f'{FIRST_NAMES[first[i]]} {LAST_NAMES[last[i]]} {i}',
+            'position': POSITIONS[positions[i]],
+            'club': f'{league} Club {clubs[i]}',
+            'league': league,
+            'age': int(ages[i]),
+            'nationality': NATIONALITIES[nations[i]],
+            'current_value': int(values[i]),
+            'stats': {
+                'overall': int(overall[i]),
+                'goals_90': float(goals[i]),
+                'assists_90': float(assists[i]),
+                'pass_accuracy': int(passing[i]),
+                'tackles_90': float(tackles[i]),
+                'dribbles_90': float(dribbles[i]),
+            }
+        })
+    return players
+
+
+def generate_players_db(n: int, seed: int = 7) -> Dict[str, Dict]:
+    """Same as ``generate_players`` but keyed by id like ``PLAYERS_DB``"""
+    return {p['id']: p for p in generate_players(n, seed)}
+
+
+def scale_from_env(default: str) -> List[int]:
+    """Parse ``CHAMPIONS_BENCH_SIZES`` (e.g. ``1000,100000``) with a default"""
+    raw = os.environ.get('CHAMPIONS_BENCH_SIZES', default)
+    return [int(s) for s in raw.split(',') if s.strip()]
+
+
+def iter_wearable_days(player_ids: List[str], first_day: int, days: int, session_minutes: int = 90,
+                       hz: int = 10, seed: int = 7) -> Iterator[np.ndarray]:
+    """One day of interleaved GPS/heart-rate samples per yield (wearables.SAMPLE_DTYPE).
+
+    Every player trains ``session_minutes`` a day from 10:00 UTC at ``hz``
+    samples per second; daily intensity varies so workloads move.
+    """
+    from wearables import SAMPLE_DTYPE
+
+    rng = np.random.default_rng(seed)
+    n = session_minutes * 60 * hz
+    offsets = np.arange(n) / hz
+    ids = np.array([pid.encode() for pid in player_ids])
+    for day in range(first_day, first_day + days):
+        samples = np.empty(n * len(player_ids), dtype=SAMPLE_DTYPE)
+        intensity = rng.uniform(0.6, 1.4, len(player_ids))
+        speed = np.clip(rng.gamma(2.0, 1.4, (len(player_ids), n)) * intensity[:, None], 0, 10)
+        samples['player_id'] = np.repeat(ids, n)
+        samples['t'] = np.tile(day * 86400 + 36000 + offsets, len(player_ids))
+        samples['speed'] = speed.ravel()
+        samples['heart_rate'] = np.clip(110 + 9 * speed + rng.normal(0, 5, speed.shape), 50, 205).ravel()
+        # Interleave players the way a live feed delivers them
+        yield samples[np.argsort(samples['t'], kind='stable')]
@@ -0,0 +1,157 @@
+"""
+Champions Gen - Upstream Data Source Gateway
+
+Fetches a player's records from the upstream sources listed by
+/api/governance/status (performance database, biomedical EMR, wearables,
+match statistics, training data) concurrently. Requests for one player fan
+out with ``asyncio.gather`` so a multi-source lookup costs roughly the
+slowest source rather than the sum of all of them.
+
+Each source gets its own aiohttp session with a bounded connection pool and
+its own timeout. The sessions live on an event loop running in a background
+thread, so they are reused across requests while Flask views stay
+synchronous; the loop is (re)started lazily per process, which keeps it safe
+under pre-forked workers. aiohttp itself is imported on the first fetch: it
+is a large import that deployments without configured sources never need.
+
+Sources are configured through ``CHAMPIONS_SOURCE_<KEY>_URL`` (and optionally
+``CHAMPIONS_SOURCE_<KEY>_TIMEOUT``); a source answers ``GET {url}/players/<id>``.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, Iterable, Optional
+
+if TYPE_CHECKING:
+    import aiohttp
+
+# (key, display name) in the order /api/governance/status lists them
+DATA_SOURCES = (
+    ('performance', 'Performance Database'),
+    ('biomedical', 'Biomedical EMR'),
+    ('wearables', 'Wearables Data'),
+    ('match', 'Match Statistics'),
+    ('training', 'Training Data'),
+)
+SOURCE_NAMES = dict(DATA_SOURCES)
+DEFAULT_TIMEOUT = 2.0
+DEFAULT_POOL_SIZE = 10
+
+
+def _aiohttp():
+    import aiohttp
+    return aiohttp
+
+
+def configured_sources(environ=None) -> Dict[str, Dict]:
+    """Source key -> {'url', 'timeout'} for every source with a configured URL"""
+    environ = os.environ if environ is None else environ
+    default_timeout = float(environ.get('CHAMPIONS_SOURCE_TIMEOUT', DEFAULT_TIMEOUT))
+    sources = {}
+    for key, _ in DATA_SOURCES:
+        url = environ.get(f'CHAMPIONS_SOURCE_{key.upper()}_URL')
+        if url:
+            sources[key] = {
+                'url': url.rstrip('/'),
+                'timeout': float(environ.get(f'CHAMPIONS_SOURCE_{key.upper()}_TIMEOUT', default_timeout))
+            }
+    return sources
+
+
+class SourceGateway:
+    """Concurrent per-player fetches across upstream sources with per-source pools"""
+
+    def __init__(self, sources: Dict[str, Dict], pool_size: int = DEFAULT_POOL_SIZE):
+        self.sources = sources
+        self.pool_size = pool_size
+        self._lock = threading.Lock()
+        self._pid = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._sessions: Dict[str, 'aiohttp.ClientSession'] = {}
+        self._stats = {key: {'ok': 0, 'timeout': 0, 'error': 0, 'not_found': 0,
+                             'last_status': None, 'last_latency_ms': None}
+                       for key in sources}
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        # A forked worker inherits the attributes but not the loop thread
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._loop = asyncio.new_event_loop()
+                    self._sessions = {}
+                    threading.Thread(target=self._loop.run_forever, name='source-gateway', daemon=True).start()
+                    self._pid = os.getpid()
+        return self._loop
+
+    def _session(self, key: str) -> 'aiohttp.ClientSession':
+        session = self._sessions.get(key)
+        if session is None:
+            aiohttp = _aiohttp()
+            session = self._sessions[key] = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size))
+        return session
+
+    async def _fetch(self, key: str, player_id: str) -> Dict:
+        aiohttp = _aiohttp()
+        result = {'name': SOURCE_NAMES[key]}
+        start = time.perf_counter()
+        try:
+            source = self.sources[key]
+            timeout = aiohttp.ClientTimeout(total=source['timeout'])
+            async with self._session(key).get(f"{source['url']}/players/{player_id}", timeout=timeout) as response:
+                if response.status == 404:
+                    result['status'] = 'not_found'
+                elif response.status != 200:
+                    result['status'] = 'error'
+                    result['error'] = f'HTTP {response.status}'
+                else:
+                    result['status'] = 'ok'
+                    result['data'] = await response.json()
+        except asyncio.TimeoutError:
+            result['status'] = 'timeout'
+        except (aiohttp.ClientError, ValueError) as e:
+            result['status'] = 'error'
+            result['error'] = str(e) or type(e).__name__
+        result['latency_ms'] = round((time.perf_counter() - start) * 1000, 2)
+
+        stats = self._stats[key]
+        stats[result['status']] += 1
+        stats['last_status'] = result['status']
+        stats['last_latency_ms'] = result['latency_ms']
+        return result
+
+    async def _fan_out(self, player_id: str, keys) -> Dict[str, Dict]:
+        results = await asyncio.gather(*(self._fetch(key, player_id) for key in keys))
+        return dict(zip(keys, results))
+
+    def fetch_player(self, player_id: str, keys: Optional[Iterable[str]] = None) -> Dict[str, Dict]:
+        """Fetch one player from the given (default: all configured) sources concurrently.
+
+        Never raises for upstream failures: each source reports ``ok``,
+        ``not_found``, ``timeout`` or ``error`` with its latency.
+        """
+        keys = list(self.sources if keys is None else keys)
+        if not keys:
+            return {}
+        loop = self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(self._fan_out(player_id, keys), loop)
+        # Every source is bounded by its own timeout; allow a margin for scheduling
+        return future.result(timeout=max(self.sources[k]['timeout'] for k in keys) + 1.0)
+
+    def stats(self) -> Dict[str, Dict]:
+        return {key: {'name': SOURCE_NAMES[key], **stats} for key, stats in self._stats.items()}
+
+    def close(self):
+        """Close pooled connections and stop the loop thread"""
+        if self._loop is None or self._pid != os.getpid():
+            return
+
+        async def close_sessions():
+            for session in self._sessions.values():
+                await session.close()
+
+        asyncio.run_coroutine_threadsafe(close_sessions(), self._loop).result(timeout=5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._pid = None
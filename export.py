@@ -0,0 +1,85 @@
+"""
+Champions Gen - Streaming Export
+
+Generators behind /api/export/players. Rows are produced chunk by chunk:
+each chunk of player records is joined with its predictions and encoded as
+NDJSON (one JSON object per line) or CSV before the next chunk is touched,
+so memory stays flat and the first bytes go out as soon as the first chunk
+is ready, however large the database.
+"""
+
+import csv
+import io
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence
+
+import numpy as np
+
+from player_store import RECORD_FIELDS, STAT_FIELDS
+
+DEFAULT_CHUNK_SIZE = 500
+
+# Flat CSV columns per prediction type: (column suffix, getter)
+CSV_PREDICTION_COLUMNS = {
+    'injury': [
+        ('current_risk', lambda p: p['current_risk']),
+        ('weekly_risk', lambda p: p['weekly_risk']),
+        ('biweekly_risk', lambda p: p['biweekly_risk']),
+        ('confidence', lambda p: p['confidence']),
+    ],
+    'development': [
+        ('potential_growth', lambda p: p['potential_growth']),
+        ('peak_age', lambda p: p['peak_age']),
+        ('confidence', lambda p: p['confidence']),
+    ],
+    'value': [
+        *[(f'year_{i + 1}', lambda p, i=i: p['predictions'][i]) for i in range(5)],
+        ('optimal_sell_window', lambda p: p['optimal_sell_window']),
+        ('confidence', lambda p: p['confidence']),
+    ],
+}
+
+
+def iter_export_chunks(store, rows: np.ndarray, prediction_types: Sequence[str],
+                       predict_chunk: Callable[[np.ndarray, str], List[Dict]],
+                       chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[List[Dict]]:
+    """Player records with a ``predictions`` object, ``chunk_size`` rows at a time"""
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        players = store.records(chunk)
+        if prediction_types:
+            results = {t: predict_chunk(chunk, t) for t in prediction_types}
+            for i, player in enumerate(players):
+                player['predictions'] = {t: results[t][i] for t in prediction_types}
+        yield players
+
+
+def ndjson_stream(chunks: Iterable[List[Dict]], dumps: Callable[[Dict], str]) -> Iterator[str]:
+    for players in chunks:
+        yield ''.join(dumps(player) + '\n' for player in players)
+
+
+def csv_header(prediction_types: Sequence[str]) -> List[str]:
+    header = [f for f in RECORD_FIELDS if f != 'stats'] + [f'stats.{f}' for f in STAT_FIELDS]
+    for prediction_type in prediction_types:
+        header += [f'{prediction_type}.{name}' for name, _ in CSV_PREDICTION_COLUMNS[prediction_type]]
+    return header
+
+
+def csv_stream(chunks: Iterable[List[Dict]], prediction_types: Sequence[str]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(csv_header(prediction_types))
+    yield buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    top_fields = [f for f in RECORD_FIELDS if f != 'stats']
+    for players in chunks:
+        for player in players:
+            row = [player[f] for f in top_fields] + [player['stats'][f] for f in STAT_FIELDS]
+            for prediction_type in prediction_types:
+                prediction = player['predictions'][prediction_type]
+                row += [getter(prediction) for _, getter in CSV_PREDICTION_COLUMNS[prediction_type]]
+            writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
@@ -0,0 +1,180 @@
+"""
+Champions Gen - JSON Provider
+
+Flask JSON provider that encodes with the fastest available backend:
+orjson, then msgspec, then the standard library (``backend`` or
+CHAMPIONS_JSON_BACKEND picks one explicitly). Output matches Flask's
+default provider apart from whitespace-free formatting and non-ASCII text
+sent as UTF-8 rather than ``\\u`` escapes: keys are sorted, datetimes go
+through Flask's RFC 822 formatting, and every backend serializes NumPy
+scalars and arrays natively, so routes can hand over arrays without
+``tolist()``.
+
+``Fragment`` wraps JSON that is already encoded (a cached player record,
+say) and is embedded in a response as is. orjson >= 3.9 and msgspec do
+this natively; the stdlib backend encodes a placeholder string and splices
+the fragment in afterwards. Older orjson re-encodes a record faster than
+it could splice one, so there ``encode_fragment`` keeps the object itself.
+"""
+
+import json
+import re
+import secrets
+from typing import Any, List, Optional
+
+import numpy as np
+from flask.json.provider import DefaultJSONProvider
+
+BACKENDS = ('auto', 'orjson', 'msgspec', 'stdlib')
+
+
+class Fragment:
+    """Pre-encoded JSON (UTF-8 bytes) to embed in a response without re-encoding"""
+
+    __slots__ = ('data',)
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+
+def _numpy_default(obj: Any) -> Any:
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError
+
+
+def available_backends() -> List[str]:
+    found = []
+    for name in ('orjson', 'msgspec'):
+        try:
+            __import__(name)
+        except ImportError:
+            continue
+        found.append(name)
+    return found + ['stdlib']
+
+
+class _Splicer:
+    """Placeholder strings for fragments, replaced by their bytes after encoding"""
+
+    def __init__(self):
+        # A per-process nonce keeps real strings from ever matching a placeholder
+        nonce = secrets.token_hex(6)
+        self.token = f'\x00fragment-{nonce}:'
+        self.pattern = re.compile(rb'"\\u0000fragment-' + nonce.encode() + rb':(\d+)\\u0000"')
+
+    def placeholder(self, fragments: List[bytes], fragment: Fragment) -> str:
+        fragments.append(fragment.data)
+        return f'{self.token}{len(fragments) - 1}\x00'
+
+    def splice(self, encoded: bytes, fragments: List[bytes]) -> bytes:
+        if not fragments:
+            return encoded
+        return self.pattern.sub(lambda m: fragments[int(m.group(1))], encoded)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """DefaultJSONProvider with a pluggable fast encoder, NumPy support and pre-encoded fragments"""
+
+    backend = 'auto'
+
+    def __init__(self, app, backend: Optional[str] = None):
+        super().__init__(app)
+        requested = backend or self.backend
+        if requested not in BACKENDS:
+            raise ValueError(f"JSON backend must be one of {', '.join(BACKENDS)}")
+        found = available_backends()
+        if requested == 'auto':
+            requested = found[0]
+        elif requested not in found:
+            raise ValueError(f'JSON backend {requested} is not installed')
+        self.backend = requested
+        self._splicer = _Splicer()
+        self._encode = getattr(self, f'_encode_{requested}')
+        self.fragments = True
+        if requested == 'orjson':
+            import orjson
+            self._orjson = orjson
+            self.fragments = hasattr(orjson, 'Fragment')
+            self._orjson_options = (orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS |
+                                    orjson.OPT_PASSTHROUGH_DATETIME)
+        elif requested == 'msgspec':
+            import msgspec
+            self._msgspec = msgspec
+
+    def _fallback(self, obj: Any) -> Any:
+        try:
+            return _numpy_default(obj)
+        except TypeError:
+            return self.default(obj)
+
+    def _encode_orjson(self, obj: Any, sort_keys: bool, indent: Optional[int], **_) -> bytes:
+        orjson = self._orjson
+        fragments: List[bytes] = []
+
+        def default(value):
+            if isinstance(value, Fragment):
+                if self.fragments:
+                    return orjson.Fragment(value.data)
+                return self._splicer.placeholder(fragments, value)
+            return self._fallback(value)
+
+        options = self._orjson_options
+        if sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        return self._splicer.splice(orjson.dumps(obj, default=default, option=options), fragments)
+
+    def _encode_msgspec(self, obj: Any, sort_keys: bool, indent: Optional[int], **_) -> bytes:
+        msgspec = self._msgspec
+
+        def enc_hook(value):
+            if isinstance(value, Fragment):
+                return msgspec.Raw(value.data)
+            return self._fallback(value)
+
+        encoded = msgspec.json.encode(obj, enc_hook=enc_hook, order='sorted' if sort_keys else None)
+        return msgspec.json.format(encoded, indent=indent) if indent else encoded
+
+    def _encode_stdlib(self, obj: Any, sort_keys: bool, indent: Optional[int], **kwargs) -> bytes:
+        fragments: List[bytes] = []
+
+        def default(value):
+            if isinstance(value, Fragment):
+                return self._splicer.placeholder(fragments, value)
+            return self._fallback(value)
+
+        kwargs.setdefault('ensure_ascii', self.ensure_ascii)
+        if indent is None:
+            kwargs.setdefault('separators', (',', ':'))
+        encoded = json.dumps(obj, default=default, sort_keys=sort_keys, indent=indent, **kwargs)
+        return self._splicer.splice(encoded.encode(), fragments)
+
+    def dumps_bytes(self, obj: Any, **kwargs) -> bytes:
+        """Encode to UTF-8 bytes; ``sort_keys`` and ``indent`` are honoured by every backend,
+        other ``json.dumps`` arguments only by the stdlib one"""
+        sort_keys = kwargs.pop('sort_keys', self.sort_keys)
+        indent = kwargs.pop('indent', None)
+        return self._encode(obj, sort_keys, indent, **kwargs)
+
+    def dumps(self, obj: Any, **kwargs) -> str:
+        return self.dumps_bytes(obj, **kwargs).decode()
+
+    def loads(self, s, **kwargs) -> Any:
+        if kwargs or self.backend == 'stdlib':
+            return json.loads(s, **kwargs)
+        if self.backend == 'orjson':
+            return self._orjson.loads(s)
+        return self._msgspec.json.decode(s)
+
+    def encode_fragment(self, obj: Any) -> Any:
+        """``obj`` pre-encoded for embedding in later responses (``obj`` itself where that is not faster)"""
+        return Fragment(self.dumps_bytes(obj)) if self.fragments else obj
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = 2 if (self.compact is None and self._app.debug) or self.compact is False else None
+        return self._app.response_class(self.dumps_bytes(obj, indent=indent) + b'\n', mimetype=self.mimetype)
@@ -0,0 +1,298 @@
+"""
+Champions Gen - Live Update Hub
+
+Server-sent events behind /api/live/stream. One producer thread per process
+recomputes the state of every (topic, player) pair that any subscriber
+follows, diffs it against what was last published and fans out only the
+changes. Each change is encoded once and shared by all subscribers, so a
+room of dashboards costs one computation per change instead of one request
+per screen per player per poll.
+
+Topics carry a cheap ``signature`` (record versions, workload readings,
+...): while it is unchanged the topic is not recomputed at all. A topic
+without one is recomputed each tick and only its changed fields are sent,
+so its payload should leave out anything that moves on every call.
+
+A topic whose compute raises (an overloaded prediction pool, a timeout) is
+logged and skipped for that tick; its last published state stands and the
+other topics still go out. A producer thread that dies anyway is restarted
+by the next subscription.
+
+Every open stream holds a request thread, so a hub given ``max_streams``
+refuses subscriptions beyond it (StreamsFull) rather than let dashboards
+take every thread its worker has for API requests.
+"""
+
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+KEEPALIVE_SECONDS = 15.0
+SUBSCRIBER_QUEUE_SIZE = 256
+
+logger = logging.getLogger(__name__)
+
+
+class StreamsFull(Exception):
+    """``max_streams`` streams are already open; retry after ``retry_after`` seconds"""
+
+    def __init__(self, max_streams: int, retry_after: int):
+        super().__init__(f'At most {max_streams} live streams per worker, retry in {retry_after} s')
+        self.retry_after = retry_after
+
+
+class Topic:
+    """A published state: ``compute(key)`` builds it, ``signature(key)`` says when it may have changed"""
+
+    def __init__(self, name: str, compute: Callable[[Optional[str]], Any],
+                 signature: Optional[Callable[[Optional[str]], Any]] = None, per_player: bool = False):
+        self.name = name
+        self.compute = compute
+        self.signature = signature
+        self.per_player = per_player
+
+
+def dict_delta(old: Any, new: Any) -> Any:
+    """Fields of ``new`` that differ from ``old`` (nested dicts recursed, removed keys as None)"""
+    if not isinstance(old, dict) or not isinstance(new, dict):
+        return new
+    delta = {k: dict_delta(old.get(k), v) for k, v in new.items() if k not in old or old[k] != v}
+    delta.update({k: None for k in old if k not in new})
+    return delta
+
+
+def encode_event(event: str, event_id: int, data: Any, dumps: Callable[[Any], str] = json.dumps) -> str:
+    return f'event: {event}\nid: {event_id}\ndata: {dumps(data)}\n\n'
+
+
+class Subscriber:
+    def __init__(self, topics: Set[str], players: Set[str]):
+        self.topics = topics
+        self.players = players
+        self.queue: 'queue.Queue[str]' = queue.Queue(SUBSCRIBER_QUEUE_SIZE)
+        # Set when the queue overflowed; the stream then resends a snapshot
+        self.resync = False
+
+    def wants(self, topic: Topic, key: Optional[str]) -> bool:
+        return topic.name in self.topics and (key is None or key in self.players)
+
+
+class LiveHub:
+    """Single producer fanning out state changes to SSE subscribers"""
+
+    def __init__(self, topics: Sequence[Topic], interval: float = 2.0, dumps: Callable[[Any], str] = json.dumps,
+                 max_streams: Optional[int] = None):
+        self.topics = {t.name: t for t in topics}
+        self.interval = interval
+        self.dumps = dumps
+        self.max_streams = max_streams
+        self._lock = threading.Lock()
+        self._subscribers: List[Subscriber] = []
+        self._state: Dict[Tuple[str, Optional[str]], Tuple[Any, Any]] = {}  # -> (signature, payload)
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._event_id = 0
+        self.ticks = 0
+        self.events = 0
+        self.deliveries = 0
+        self.dropped = 0
+        self.rejected = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+        self.last_tick_ms = 0.0
+
+    def _keys(self, topic: Topic, players: Set[str]) -> List[Optional[str]]:
+        return sorted(players) if topic.per_player else [None]
+
+    def _advance(self, topic: Topic, key: Optional[str]) -> Optional[Any]:
+        """Delta to publish (None if unchanged); the stored state moves to the new payload"""
+        signature = topic.signature(key) if topic.signature else None
+        with self._lock:
+            stored = self._state.get((topic.name, key))
+        if stored is not None and signature is not None and stored[0] == signature:
+            return None
+        payload = topic.compute(key)
+        with self._lock:
+            self._state[(topic.name, key)] = (signature, payload)
+        if stored is None:
+            return payload
+        delta = dict_delta(stored[1], payload)
+        return delta or None
+
+    def _read(self, topic: Topic, key: Optional[str]) -> Any:
+        """Current payload without advancing published state, so other subscribers still get the delta"""
+        signature = topic.signature(key) if topic.signature else None
+        with self._lock:
+            stored = self._state.get((topic.name, key))
+        if stored is not None and signature is not None and stored[0] == signature:
+            return stored[1]
+        payload = topic.compute(key)
+        if stored is None:
+            with self._lock:
+                self._state.setdefault((topic.name, key), (signature, payload))
+        return payload
+
+    def _failed(self, topic: Topic, key: Optional[str], error: Exception):
+        self.errors += 1
+        self.last_error = f'{topic.name}{"/" + key if key else ""}: {type(error).__name__}: {error}'
+        logger.warning('live topic %s (%s) failed', topic.name, key, exc_info=error)
+
+    def _read_or_none(self, topic: Topic, key: Optional[str]) -> Any:
+        try:
+            return self._read(topic, key)
+        except Exception as e:
+            self._failed(topic, key, e)
+            return None
+
+    def snapshot(self, subscriber: Subscriber) -> str:
+        """Full current state of everything the subscriber follows, as one event (None where a topic failed)"""
+        state: Dict[str, Any] = {}
+        for name in sorted(subscriber.topics):
+            topic = self.topics[name]
+            if topic.per_player:
+                state[name] = {key: self._read_or_none(topic, key) for key in self._keys(topic, subscriber.players)}
+            else:
+                state[name] = self._read_or_none(topic, None)
+        with self._lock:
+            self._event_id += 1
+            event_id = self._event_id
+        return encode_event('snapshot', event_id, state, self.dumps)
+
+    def tick(self) -> int:
+        """Publish every change since the last tick; returns the number of events"""
+        start = time.perf_counter()
+        with self._lock:
+            subscribers = list(self._subscribers)
+        wanted: Dict[str, Set[Optional[str]]] = {}
+        for subscriber in subscribers:
+            for name in subscriber.topics:
+                wanted.setdefault(name, set()).update(self._keys(self.topics[name], subscriber.players))
+
+        published = 0
+        for name, keys in wanted.items():
+            topic = self.topics[name]
+            for key in sorted(keys, key=str):
+                try:
+                    delta = self._advance(topic, key)
+                except Exception as e:
+                    self._failed(topic, key, e)
+                    continue
+                if delta is None:
+                    continue
+                with self._lock:
+                    self._event_id += 1
+                    event_id = self._event_id
+                data = {'player_id': key, 'changes': delta} if topic.per_player else {'changes': delta}
+                message = encode_event(name, event_id, data, self.dumps)
+                published += 1
+                for subscriber in subscribers:
+                    if subscriber.wants(topic, key):
+                        self._deliver(subscriber, message)
+
+        self.ticks += 1
+        self.events += published
+        self.last_tick_ms = round((time.perf_counter() - start) * 1000, 3)
+        return published
+
+    def _deliver(self, subscriber: Subscriber, message: str):
+        try:
+            subscriber.queue.put_nowait(message)
+            self.deliveries += 1
+        except queue.Full:
+            # Slow client: drop its backlog and let the stream resend a snapshot
+            self.dropped += 1
+            subscriber.resync = True
+            while True:
+                try:
+                    subscriber.queue.get_nowait()
+                except queue.Empty:
+                    break
+
+    def notify(self):
+        """Run the next tick now instead of waiting out the interval"""
+        self._wake.set()
+
+    def _producer_running(self) -> bool:
+        return self._thread is not None and self._pid == os.getpid() and self._thread.is_alive()
+
+    def _ensure_producer(self):
+        # One producer per process; a forked worker starts its own, a dead one is replaced
+        if self._producer_running():
+            return
+        with self._lock:
+            if self._producer_running():
+                return
+
+            def run():
+                while True:
+                    self._wake.wait(self.interval)
+                    self._wake.clear()
+                    if not self._subscribers:
+                        continue
+                    try:
+                        self.tick()
+                    except Exception as e:
+                        self.errors += 1
+                        self.last_error = f'tick: {type(e).__name__}: {e}'
+                        logger.exception('live producer tick failed')
+
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=run, name='live-hub', daemon=True)
+            self._thread.start()
+
+    def subscribe(self, topics: Set[str], players: Set[str]) -> Subscriber:
+        """Register a subscriber; raises StreamsFull when ``max_streams`` are already open"""
+        subscriber = Subscriber(topics, players)
+        with self._lock:
+            if self.max_streams is not None and len(self._subscribers) >= self.max_streams:
+                self.rejected += 1
+                # A closed stream is only noticed at its next write, at the latest a keep-alive away
+                raise StreamsFull(self.max_streams, int(KEEPALIVE_SECONDS))
+            self._subscribers.append(subscriber)
+        self._ensure_producer()
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        with self._lock:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+
+    def stream(self, subscriber: Subscriber, keepalive: float = KEEPALIVE_SECONDS) -> Iterator[str]:
+        """SSE body: a snapshot, then deltas as they are published, with keep-alive comments"""
+        try:
+            yield f'retry: {int(self.interval * 1000)}\n' + self.snapshot(subscriber)
+            while True:
+                if subscriber.resync:
+                    subscriber.resync = False
+                    yield self.snapshot(subscriber)
+                try:
+                    yield subscriber.queue.get(timeout=keepalive)
+                except queue.Empty:
+                    yield ': keep-alive\n\n'
+        finally:
+            self.unsubscribe(subscriber)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            subscribers = len(self._subscribers)
+            followed = len(self._state)
+        return {
+            'subscribers': subscribers,
+            'max_streams': self.max_streams,
+            'rejected_streams': self.rejected,
+            'tracked_states': followed,
+            'interval_seconds': self.interval,
+            'ticks': self.ticks,
+            'events_published': self.events,
+            'deliveries': self.deliveries,
+            'dropped_backlogs': self.dropped,
+            'errors': self.errors,
+            'last_error': self.last_error,
+            'producer_alive': self._producer_running(),
+            'last_tick_ms': self.last_tick_ms
+        }
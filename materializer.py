@@ -0,0 +1,168 @@
+"""
+Champions Gen - Prediction Materializer
+
+Precomputes every MockAIEngine prediction per player so /api/predict/* is a
+lookup instead of a model call. Each prediction type keeps one slot per store
+row plus the record version it was computed from; a refresh recomputes only
+the rows whose store version moved on since, and a lookup of a stale row
+computes and stores just that one prediction.
+
+Materialized predictions are always seeded through ``prediction_rng`` so a
+precomputed value is identical to what the route would compute on demand.
+
+With ``eager=False`` (large, memory-mapped stores) nothing is precomputed up
+front: slots fill on first lookup and background refreshes only keep those
+already-requested rows current. A ``compute`` hook takes over those
+on-demand computations (the app hands them to its offload executor).
+"""
+
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from ai_engine import MockAIEngine, prediction_rng
+
+PREDICTION_TYPES = ('injury', 'development', 'value')
+
+
+def score_rows_batch(engine: MockAIEngine, store, rows: np.ndarray, prediction_type: str,
+                     rng: Optional[np.random.Generator] = None) -> List[Dict]:
+    """Score store rows with the vectorized engine methods"""
+    ages = store.column('age')[rows]
+    positions = store.categorical['position'].values(rows)
+    if prediction_type == 'injury':
+        return engine.predict_injury_risk_batch(ages, positions, rng)
+    if prediction_type == 'development':
+        return engine.predict_player_development_batch(ages, positions, rng)
+    return engine.predict_market_value_batch(store.column('current_value')[rows], ages, positions, rng)
+
+
+class PredictionMaterializer:
+    """Per-row prediction slots kept in step with a PlayerStore's record versions"""
+
+    def __init__(self, store_getter: Callable, engine: MockAIEngine, chunk_size: int = 1024, eager: bool = True,
+                 compute: Optional[Callable[[str, str, int, Dict], Dict]] = None):
+        self._store_getter = store_getter
+        self.engine = engine
+        # compute(prediction_type, player_id, version, record) for lookups of stale rows
+        self.compute = compute
+        self.chunk_size = chunk_size
+        self.eager = eager
+        self._methods = {
+            'injury': engine.predict_injury_risk,
+            'development': engine.predict_player_development,
+            'value': engine.predict_market_value,
+        }
+        self._lock = threading.Lock()
+        self._store = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.last_refresh: Dict = {}
+        self.on_demand = 0
+
+    def _bind(self):
+        """Reset all slots when the app swaps in a different store"""
+        store = self._store_getter()
+        if store is not self._store:
+            with self._lock:
+                if store is not self._store:
+                    n = len(store)
+                    # Lazy slots are a dict so untouched rows cost nothing
+                    self._results = {t: [None] * n if self.eager else {} for t in PREDICTION_TYPES}
+                    self._versions = {t: np.full(n, -1, dtype=np.int64) for t in PREDICTION_TYPES}
+                    self._store = store
+        return store
+
+    def _compute(self, store, row: int, record: Dict, prediction_type: str, version: int) -> Dict:
+        rng = prediction_rng(store.ids[row], version, prediction_type)
+        return self._methods[prediction_type](record, rng=rng)
+
+    def stale_rows(self) -> np.ndarray:
+        """Rows with at least one prediction older than the current record version.
+
+        Without ``eager`` only rows that were ever materialized count.
+        """
+        store = self._bind()
+        stale = np.zeros(len(store), dtype=bool)
+        for versions in self._versions.values():
+            outdated = versions != store.versions
+            stale |= outdated if self.eager else outdated & (versions >= 0)
+        return np.flatnonzero(stale)
+
+    def refresh(self, full: bool = False) -> Dict:
+        """Recompute stale rows (or every row with ``full``) in chunks"""
+        store = self._bind()
+        start = time.perf_counter()
+        rows = np.arange(len(store), dtype=np.intp) if full else self.stale_rows()
+        for offset in range(0, len(rows), self.chunk_size):
+            chunk = rows[offset:offset + self.chunk_size]
+            versions = store.versions[chunk].tolist()
+            records = store.records(chunk)
+            with self._lock:
+                for row, version, record in zip(chunk.tolist(), versions, records):
+                    for prediction_type in PREDICTION_TYPES:
+                        self._results[prediction_type][row] = self._compute(
+                            store, row, record, prediction_type, version)
+                        self._versions[prediction_type][row] = version
+        self.last_refresh = {
+            'full': full,
+            'rows': len(rows),
+            'duration_ms': round((time.perf_counter() - start) * 1000, 2),
+            'finished_at': time.time()
+        }
+        return self.last_refresh
+
+    def get(self, prediction_type: str, player_id: str) -> Optional[Dict]:
+        """Materialized prediction for a player, computing it first if stale"""
+        store = self._bind()
+        row = store.index.get(player_id)
+        if row is None:
+            return None
+        version = int(store.versions[row])
+        if self._versions[prediction_type][row] == version:
+            return self._results[prediction_type][row]
+        if self.compute is not None:
+            prediction = self.compute(prediction_type, player_id, version, store.record(row))
+        else:
+            prediction = self._compute(store, row, store.record(row), prediction_type, version)
+        with self._lock:
+            self._results[prediction_type][row] = prediction
+            self._versions[prediction_type][row] = version
+            self.on_demand += 1
+        return prediction
+
+    def start(self, interval: float = 30.0) -> None:
+        """Materialize everything now, then refresh changed rows every ``interval`` seconds"""
+        if self._thread is not None:
+            return
+
+        def run():
+            self.refresh()
+            while not self._stop.wait(interval):
+                self.refresh()
+
+        self._thread = threading.Thread(target=run, name='prediction-materializer', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def status(self) -> Dict:
+        store = self._bind()
+        stale = self.stale_rows()
+        # Rows with an up-to-date prediction (in eager mode every type is present)
+        materialized = np.zeros(len(store), dtype=bool)
+        for versions in self._versions.values():
+            materialized |= versions >= 0
+        materialized[stale] = False
+        return {
+            'players': len(store),
+            'eager': self.eager,
+            'materialized': int(materialized.sum()),
+            'stale': len(stale),
+            'on_demand_computations': self.on_demand,
+            'background_refresh': self._thread is not None and self._thread.is_alive(),
+            'last_refresh': self.last_refresh
+        }
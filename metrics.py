@@ -0,0 +1,204 @@
+"""
+Champions Gen - Request Instrumentation
+
+In-process metrics with Prometheus text exposition. The registry keeps
+fixed-bucket histograms keyed by label tuples: request latency per route and
+status, response payload size, JSON serialization time and MockAIEngine
+method timings. ``ProcessSampler`` reports measured CPU, RSS and disk usage
+for /api/governance/status.
+
+Recording one observation is a bisect and a few list updates under one lock,
+so per-request overhead stays in the low microseconds (see
+benchmarks/bench_metrics_overhead.py).
+"""
+
+import bisect
+import functools
+import os
+import shutil
+import threading
+import time
+from typing import Callable, Dict, List, Sequence, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class Histogram:
+    """Cumulative-bucket histogram family keyed by label values"""
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str], buckets: Sequence[float]):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts (+Inf last), sum, count]
+        self.series: Dict[Tuple, List] = {}
+
+    def observe(self, labels: Tuple, value: float):
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        for labels, (counts, total, count) in sorted(self.series.items()):
+            base = ','.join(f'{k}="{_escape(v)}"' for k, v in zip(self.label_names, labels))
+            prefix = base + ',' if base else ''
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{self.name}_bucket{{{prefix}le="{le}"}} {cumulative}')
+            lines.append(f'{self.name}_sum{{{base}}} {total!r}')
+            lines.append(f'{self.name}_count{{{base}}} {count}')
+        return lines
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def render_gauges(name: str, help_text: str, samples: Dict[Tuple[Tuple[str, str], ...], float],
+                  kind: str = 'gauge') -> List[str]:
+    """Exposition lines for a gauge/counter family: {((label, value), ...): sample}"""
+    lines = [f'# HELP {name} {help_text}', f'# TYPE {name} {kind}']
+    for labels, value in samples.items():
+        rendered = ','.join(f'{k}="{_escape(v)}"' for k, v in labels)
+        lines.append(f'{name}{{{rendered}}} {float(value)!r}' if rendered else f'{name} {float(value)!r}')
+    return lines
+
+
+class MetricsRegistry:
+    """Request, serialization and engine timings for one process"""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.request_latency = Histogram(
+            'champions_http_request_duration_seconds', 'Request handling time',
+            ('method', 'route', 'status'), LATENCY_BUCKETS)
+        self.response_size = Histogram(
+            'champions_http_response_size_bytes', 'Response payload size',
+            ('method', 'route'), SIZE_BUCKETS)
+        self.json_serialization = Histogram(
+            'champions_json_serialization_seconds', 'Time spent encoding JSON response bodies',
+            ('route',), LATENCY_BUCKETS)
+        self.engine_latency = Histogram(
+            'champions_engine_call_duration_seconds', 'MockAIEngine method execution time',
+            ('method',), LATENCY_BUCKETS)
+
+    def record_request(self, method: str, route: str, status: int, seconds: float, size):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.request_latency.observe((method, route, status), seconds)
+            if size is not None:
+                self.response_size.observe((method, route), size)
+
+    def record_serialization(self, route: str, seconds: float):
+        if self.enabled:
+            with self._lock:
+                self.json_serialization.observe((route,), seconds)
+
+    def record_engine(self, method: str, seconds: float):
+        if self.enabled:
+            with self._lock:
+                self.engine_latency.observe((method,), seconds)
+
+    def mean_request_latency(self) -> float:
+        """Mean handling time in seconds over every recorded request"""
+        with self._lock:
+            total = sum(s[1] for s in self.request_latency.series.values())
+            count = sum(s[2] for s in self.request_latency.series.values())
+        return total / count if count else 0.0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            lines = []
+            for histogram in (self.request_latency, self.response_size, self.json_serialization,
+                              self.engine_latency):
+                lines.extend(histogram.render())
+        return lines
+
+
+def _timed(method: Callable, name: str, registry: MetricsRegistry) -> Callable:
+    @functools.wraps(method)
+    def timed(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            registry.record_engine(name, time.perf_counter() - start)
+    return timed
+
+
+def instrument_engine(engine, registry: MetricsRegistry, names: Sequence[str]):
+    """Replace the named engine methods on the instance with timed wrappers"""
+    for name in names:
+        setattr(engine, name, _timed(getattr(engine, name), name, registry))
+    return engine
+
+
+def _total_memory() -> int:
+    try:
+        return os.sysconf('SC_PHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (ValueError, OSError, AttributeError):
+        return 0
+
+
+def current_rss() -> int:
+    """Resident set size in bytes; peak RSS where /proc is unavailable"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        if resource is None:
+            return 0
+        usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is KiB on Linux, bytes on macOS
+        return usage if os.uname().sysname == 'Darwin' else usage * 1024
+
+
+def process_cpu_seconds() -> float:
+    """User + system CPU time consumed by this process"""
+    return time.process_time()
+
+
+class ProcessSampler:
+    """CPU utilisation of this process between consecutive samples"""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.started = clock()
+        self._last = (self.started, process_cpu_seconds())
+
+    def cpu_percent(self) -> float:
+        now, cpu = self._clock(), process_cpu_seconds()
+        with self._lock:
+            last_wall, last_cpu = self._last
+            self._last = (now, cpu)
+        elapsed = now - last_wall
+        return 100.0 * (cpu - last_cpu) / elapsed if elapsed > 0 else 0.0
+
+    def snapshot(self) -> Dict:
+        rss = current_rss()
+        total = _total_memory()
+        disk = shutil.disk_usage(os.path.dirname(os.path.abspath(__file__)))
+        return {
+            'cpu_usage': round(self.cpu_percent(), 2),
+            'cpu_seconds': round(process_cpu_seconds(), 3),
+            'memory_usage': round(100.0 * rss / total, 2) if total else None,
+            'rss_bytes': rss,
+            'disk_usage': round(100.0 * disk.used / disk.total, 2),
+            'uptime_seconds': round(self._clock() - self.started, 1)
+        }
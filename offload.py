@@ -0,0 +1,191 @@
+"""
+Champions Gen - Engine Job Offload
+
+Runs expensive MockAIEngine calls (on-demand predictions, XAI
+explanations and training plans) outside the request thread. With ``processes`` > 0 jobs go to
+a bounded pool of spawned worker processes, so a heavy model call holds
+another interpreter's GIL rather than the one serving every other route; a
+request thread only waits on its job's future. With no processes jobs run
+inline in the submitting thread, which keeps the coalescing below but not
+the isolation; there the server's request threads already bound how many
+jobs run at once, so backpressure applies only with an explicit
+``max_pending``.
+
+- Coalescing: jobs carry a key (prediction type, player, record version,
+  model version); a job submitted while an identical one is in flight
+  shares its future instead of computing again. Jobs without a key (fresh
+  random draws) always run.
+- Backpressure: at most ``max_pending`` jobs are queued or running. Past
+  that, ``submit`` raises Overloaded with a Retry-After estimate from the
+  queue depth and the mean job time, which the app turns into a 503.
+- Timeouts: ``run`` waits at most ``timeout`` seconds and raises JobTimeout
+  (a 504). The job itself keeps running and stays in flight, so a retry
+  joins it instead of starting another.
+
+Workers rebuild the prediction generator from its seed, so an offloaded
+deterministic prediction is identical to one computed in the request.
+``simulated_ms`` burns that much CPU per job, standing in for real model
+inference when benchmarking.
+"""
+
+import math
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import numpy as np
+
+from ai_engine import MockAIEngine
+
+DEFAULT_TIMEOUT = 10.0
+# Queued or running jobs per pool process before new ones get a 503
+PENDING_PER_PROCESS = 8
+
+
+class Overloaded(Exception):
+    """Too many jobs pending; retry after ``retry_after`` seconds"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f'Engine job queue is full, retry in {retry_after} s')
+        self.retry_after = retry_after
+
+
+class JobTimeout(Exception):
+    """A job did not finish within its timeout"""
+
+
+def burn_cpu(milliseconds: float):
+    """Busy-loop in Python (holding the GIL) for ``milliseconds``, like pure-Python model code would"""
+    deadline = time.perf_counter() + milliseconds / 1000
+    while time.perf_counter() < deadline:
+        sum(range(1000))
+
+
+def engine_job(method: str, args: tuple, seed: Optional[int], simulated_ms: float = 0.0):
+    """(result, seconds) of one MockAIEngine call; top-level so pool workers can unpickle it"""
+    start = time.perf_counter()
+    if simulated_ms:
+        burn_cpu(simulated_ms)
+    rng = None if seed is None else np.random.default_rng(seed)
+    result = getattr(MockAIEngine, method)(*args, rng=rng)
+    return result, time.perf_counter() - start
+
+
+class OffloadExecutor:
+    """Coalescing, bounded executor for engine jobs, inline or in a process pool"""
+
+    def __init__(self, processes: int = 0, max_pending: Optional[int] = None, timeout: float = DEFAULT_TIMEOUT,
+                 simulated_ms: float = 0.0, on_job: Optional[Callable[[str, float], None]] = None):
+        self.processes = processes
+        self.max_pending = max_pending or (processes * PENDING_PER_PROCESS if processes else None)
+        self.timeout = timeout
+        self.simulated_ms = simulated_ms
+        self.on_job = on_job
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_pid: Optional[int] = None
+        self._inflight: Dict[Hashable, Future] = {}
+        self._pending = 0
+        # Seconds per job, smoothed; None until a job finished
+        self.job_seconds: Optional[float] = None
+        self.counts = {'completed': 0, 'coalesced': 0, 'rejected': 0, 'timeouts': 0, 'errors': 0}
+
+    def close(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(cancel_futures=True)
+                self._pool = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        # A pool inherited from a prefork master belongs to the master; each process starts its own
+        if self._pool is None or self._pool_pid != os.getpid():
+            # Spawned, not forked: the serving process has threads that hold locks
+            self._pool = ProcessPoolExecutor(self.processes, mp_context=multiprocessing.get_context('spawn'))
+            self._pool_pid = os.getpid()
+        return self._pool
+
+    def retry_after(self) -> int:
+        """Seconds until the current queue has likely drained"""
+        seconds = (self.job_seconds or 1.0) * self._pending / max(self.processes, 1)
+        return max(1, math.ceil(seconds))
+
+    def submit(self, key: Optional[Hashable], method: str, *args, seed: Optional[int] = None) -> Future:
+        """Future of ``(result, seconds)`` for ``MockAIEngine.<method>(*args)``, shared with an in-flight twin.
+
+        Raises Overloaded when ``max_pending`` (if any) jobs are already queued or running.
+        """
+        with self._lock:
+            if key is not None and key in self._inflight:
+                self.counts['coalesced'] += 1
+                return self._inflight[key]
+            if self.max_pending is not None and self._pending >= self.max_pending:
+                self.counts['rejected'] += 1
+                raise Overloaded(self.retry_after())
+            if self.processes:
+                try:
+                    future = self._executor().submit(engine_job, method, args, seed, self.simulated_ms)
+                except BrokenProcessPool:
+                    # A worker died; the next pool starts fresh
+                    self._pool = None
+                    future = self._executor().submit(engine_job, method, args, seed, self.simulated_ms)
+            else:
+                future = Future()
+            self._pending += 1
+            if key is not None:
+                self._inflight[key] = future
+        future.add_done_callback(lambda done: self._finished(key, method, done))
+        if not self.processes:
+            try:
+                future.set_result(engine_job(method, args, seed, self.simulated_ms))
+            except Exception as e:
+                future.set_exception(e)
+        return future
+
+    def _finished(self, key: Optional[Hashable], method: str, future: Future):
+        seconds = None
+        with self._lock:
+            self._pending -= 1
+            if key is not None and self._inflight.get(key) is future:
+                del self._inflight[key]
+            if future.cancelled() or future.exception() is not None:
+                self.counts['errors'] += 1
+                if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+                    self._pool = None
+            else:
+                self.counts['completed'] += 1
+                seconds = future.result()[1]
+                self.job_seconds = seconds if self.job_seconds is None else 0.8 * self.job_seconds + 0.2 * seconds
+        if seconds is not None and self.on_job is not None:
+            self.on_job(method, seconds)
+
+    def run(self, key: Optional[Hashable], method: str, *args, seed: Optional[int] = None,
+            timeout: Optional[float] = None) -> Any:
+        """Result of an engine job, waiting at most ``timeout`` (default ``self.timeout``) seconds.
+
+        Raises Overloaded when the queue is full and JobTimeout when the wait runs out.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        future = self.submit(key, method, *args, seed=seed)
+        try:
+            return future.result(timeout)[0]
+        except FutureTimeout:
+            with self._lock:
+                self.counts['timeouts'] += 1
+            raise JobTimeout(f'{method} did not finish within {timeout:g} s')
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'mode': 'pool' if self.processes else 'inline',
+                'processes': self.processes,
+                'max_pending': self.max_pending,
+                'pending': self._pending,
+                'in_flight_keys': len(self._inflight),
+                'timeout_seconds': self.timeout,
+                'mean_job_ms': round(self.job_seconds * 1000, 2) if self.job_seconds is not None else None,
+                **self.counts
+            }
@@ -0,0 +1,590 @@
+"""
+Champions Gen - Columnar Player Store
+
+Holds the player database as NumPy columns instead of a dict of dicts so that
+filtering scales to hundreds of thousands of scouted players. Categorical
+fields (position, league, club) are stored as integer codes with posting-list
+indexes, numeric fields (age, current_value) carry a sorted index, and every
+``stats`` field is its own array. Records are rebuilt on demand in the same
+JSON shape the API has always served.
+
+Records can be updated in place; each update bumps the record's version,
+marks the affected indexes for a lazy rebuild on the next filter and is
+logged, so derived structures catch up with ``changes`` instead of
+comparing every version.
+
+``save`` writes the store as one ``.npy`` file per column (strings packed
+into a UTF-8 buffer plus offsets, ids sorted for binary search) and ``open``
+memory-maps them back. Opening a directory costs the same for a thousand or
+a million players; pages are read on first touch and shared between worker
+processes through the page cache. Mappings are copy-on-write, so updates
+stay private to the process and are not written back. Single-record reads
+go through a bounded LRU of rebuilt records.
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+STAT_FIELDS = ('overall', 'goals_90', 'assists_90', 'pass_accuracy', 'tackles_90', 'dribbles_90')
+CATEGORICAL_FIELDS = ('position', 'league', 'club')
+NUMERIC_FIELDS = ('age', 'current_value')
+RECORD_FIELDS = ('id', 'name', 'position', 'club', 'league', 'age', 'nationality', 'current_value', 'stats')
+UPDATABLE_FIELDS = tuple(f for f in RECORD_FIELDS if f != 'id')
+SORT_KEYS = NUMERIC_FIELDS + STAT_FIELDS
+# Values an update may set, per numeric field (further narrowed to the column's integer dtype)
+FIELD_RANGES = {
+    'age': (14, 50),
+    'current_value': (0, 10_000_000_000),
+    'overall': (0, 100),
+    'pass_accuracy': (0, 100),
+    'goals_90': (0, 30),
+    'assists_90': (0, 30),
+    'tackles_90': (0, 30),
+    'dribbles_90': (0, 30),
+}
+STORE_FORMAT = 1
+MANIFEST = 'manifest.json'
+DEFAULT_RECORD_CACHE = 10000
+# Updates remembered for ``changes``; callers further behind compare versions instead
+CHANGE_LOG_LIMIT = 65536
+
+
+def resolve_fields(fields: Optional[Iterable[str]] = None):
+    """Split a field projection into (top-level fields, stat fields).
+
+    ``None`` selects the full record. Raises ValueError on unknown names.
+    """
+    if fields is None:
+        return [f for f in RECORD_FIELDS if f != 'stats'], list(STAT_FIELDS)
+    top, stats = [], []
+    for field in fields:
+        if field == 'stats':
+            stats.extend(f for f in STAT_FIELDS if f not in stats)
+        elif field.startswith('stats.') and field[6:] in STAT_FIELDS:
+            if field[6:] not in stats:
+                stats.append(field[6:])
+        elif field in RECORD_FIELDS:
+            if field not in top:
+                top.append(field)
+        else:
+            raise ValueError(f'Unknown field: {field}')
+    # Keep record key order stable regardless of how the projection was written
+    top.sort(key=RECORD_FIELDS.index)
+    stats.sort(key=STAT_FIELDS.index)
+    return top, stats
+
+
+class CategoricalColumn:
+    """Dictionary-encoded column with a posting-list index per category"""
+
+    def __init__(self, values: Iterable[str]):
+        categories: Dict[str, int] = {}
+        codes = [categories.setdefault(v, len(categories)) for v in values]
+        self.categories: List[str] = list(categories)
+        self.lookup = categories
+        self.codes = np.asarray(codes, dtype=np.int32)
+        self._reindex()
+
+    @classmethod
+    def from_arrays(cls, categories: List[str], codes: np.ndarray, order: np.ndarray,
+                    bounds: np.ndarray) -> 'CategoricalColumn':
+        """Column over saved codes and posting lists, without re-sorting"""
+        column = cls.__new__(cls)
+        column.categories = list(categories)
+        column.lookup = {name: code for code, name in enumerate(column.categories)}
+        column.codes, column.order, column.bounds = codes, order, bounds
+        column.stale = False
+        return column
+
+    def _reindex(self):
+        # Rows grouped by code: rows for category c are order[bounds[c]:bounds[c + 1]]
+        self.order = np.argsort(self.codes, kind='stable')
+        self.bounds = np.searchsorted(self.codes[self.order], np.arange(len(self.categories) + 1))
+        self.stale = False
+
+    def set(self, row: int, value: str):
+        """Assign a category to one row; the posting lists rebuild on next lookup"""
+        code = self.lookup.get(value)
+        if code is None:
+            code = self.lookup[value] = len(self.categories)
+            self.categories.append(value)
+        self.codes[row] = code
+        self.stale = True
+
+    def rows_for(self, codes: Iterable[int]) -> np.ndarray:
+        """Row ids (unsorted) belonging to any of the given category codes"""
+        if self.stale:
+            self._reindex()
+        parts = [self.order[self.bounds[c]:self.bounds[c + 1]] for c in codes]
+        if not parts:
+            return np.empty(0, dtype=np.intp)
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def codes_matching(self, needle: str) -> List[int]:
+        """Codes whose category contains ``needle`` (case-insensitive)"""
+        needle = needle.lower()
+        return [code for code, name in enumerate(self.categories) if needle in name.lower()]
+
+    def values(self, rows: np.ndarray) -> List[str]:
+        cats = self.categories
+        return [cats[c] for c in self.codes[rows].tolist()]
+
+
+class SortedColumn:
+    """Numeric column with a sorted index for range lookups"""
+
+    def __init__(self, values: Iterable, dtype):
+        self.data = np.asarray(list(values), dtype=dtype)
+        self._reindex()
+
+    @classmethod
+    def from_arrays(cls, data: np.ndarray, order: np.ndarray, sorted_values: np.ndarray) -> 'SortedColumn':
+        column = cls.__new__(cls)
+        column.data, column.order, column.sorted = data, order, sorted_values
+        column.stale = False
+        return column
+
+    def _reindex(self):
+        self.order = np.argsort(self.data, kind='stable')
+        self.sorted = self.data[self.order]
+        self.stale = False
+
+    def set(self, row: int, value):
+        """Assign one value; the sorted index rebuilds on next range lookup"""
+        self.data[row] = value
+        self.stale = True
+
+    def range_rows(self, low=None, high=None) -> np.ndarray:
+        """Row ids (unsorted) with ``low <= value <= high``"""
+        if self.stale:
+            self._reindex()
+        lo = 0 if low is None else np.searchsorted(self.sorted, low, side='left')
+        hi = len(self.sorted) if high is None else np.searchsorted(self.sorted, high, side='right')
+        return self.order[lo:hi]
+
+    def range_mask(self, rows: np.ndarray, low=None, high=None) -> np.ndarray:
+        values = self.data[rows]
+        mask = np.ones(len(rows), dtype=bool)
+        if low is not None:
+            mask &= values >= low
+        if high is not None:
+            mask &= values <= high
+        return mask
+
+
+class StringColumn(Sequence):
+    """Strings packed into one UTF-8 buffer plus row offsets, so the column can be memory-mapped.
+
+    Rows assigned after packing live in an overlay instead of rewriting the buffer.
+    """
+
+    def __init__(self, offsets: np.ndarray, data: np.ndarray):
+        self.offsets = offsets
+        self.data = data
+        self.overlay: Dict[int, str] = {}
+
+    @classmethod
+    def pack(cls, values: Iterable[str]) -> 'StringColumn':
+        encoded = [v.encode() for v in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum(np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)), out=offsets[1:])
+        return cls(offsets, np.frombuffer(b''.join(encoded), dtype=np.uint8))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, row: int) -> str:
+        value = self.overlay.get(row)
+        if value is not None:
+            return value
+        if not 0 <= row < len(self):
+            raise IndexError(row)
+        return self.data[self.offsets[row]:self.offsets[row + 1]].tobytes().decode()
+
+    def __setitem__(self, row: int, value: str):
+        self.overlay[row] = value
+
+    def __iter__(self) -> Iterator[str]:
+        return (self[row] for row in range(len(self)))
+
+
+class IdIndex(Mapping):
+    """Player id -> row by binary search over the ids sorted at save time"""
+
+    def __init__(self, sorted_ids: np.ndarray, order: np.ndarray):
+        self.sorted_ids = sorted_ids
+        self.order = order
+
+    def __getitem__(self, player_id: str) -> int:
+        if isinstance(player_id, str):
+            key = player_id.encode()
+            if len(key) <= self.sorted_ids.dtype.itemsize:
+                i = int(np.searchsorted(self.sorted_ids, key))
+                if i < len(self.sorted_ids) and self.sorted_ids[i] == key:
+                    return int(self.order[i])
+        raise KeyError(player_id)
+
+    def __iter__(self) -> Iterator[str]:
+        return (key.decode() for key in self.sorted_ids.tolist())
+
+    def __len__(self) -> int:
+        return len(self.sorted_ids)
+
+
+def _load_column(directory: str, name: str) -> np.ndarray:
+    """Copy-on-write mapping of a saved column (empty columns are simply read)"""
+    path = os.path.join(directory, name + '.npy')
+    try:
+        return np.load(path, mmap_mode='c').view(np.ndarray)
+    except ValueError:
+        return np.load(path)
+
+
+def _stat_dtype(values: List) -> type:
+    """Keep integer stats as integers so records serialize exactly as before"""
+    return np.int32 if all(isinstance(v, int) for v in values) else np.float64
+
+
+class PlayerStore(Mapping):
+    """Columnar player database keyed by player id, in memory or memory-mapped from disk"""
+
+    def __init__(self, records: Iterable[Dict], cache_size: int = DEFAULT_RECORD_CACHE):
+        records = list(records)
+        self.ids: List[str] = [r['id'] for r in records]
+        self.index: Dict[str, int] = {pid: row for row, pid in enumerate(self.ids)}
+        self.names: List[str] = [r['name'] for r in records]
+        self.nationalities: List[str] = [r['nationality'] for r in records]
+        self.categorical = {f: CategoricalColumn(r[f] for r in records) for f in CATEGORICAL_FIELDS}
+        self.numeric = {
+            'age': SortedColumn((r['age'] for r in records), np.int16),
+            'current_value': SortedColumn((r['current_value'] for r in records), np.int64),
+        }
+        self.stats: Dict[str, np.ndarray] = {}
+        for field in STAT_FIELDS:
+            values = [r['stats'][field] for r in records]
+            self.stats[field] = np.asarray(values, dtype=_stat_dtype(values))
+        # Per-record version; anything derived from a record (seeded predictions, cached responses) keys on it
+        self.versions = np.zeros(len(self.ids), dtype=np.int64)
+        self.directory: Optional[str] = None
+        self._init_cache(cache_size)
+
+    def _init_cache(self, cache_size: int):
+        self._write_lock = threading.Lock()
+        # Rows of the latest updates, in order; _changes[0] is update number _change_base
+        self._changes: List[int] = []
+        self._change_base = 0
+        self.cache_size = cache_size
+        # row -> [record version, record, encoded record]
+        self._cache: 'OrderedDict[int, list]' = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @classmethod
+    def from_dict(cls, players: Dict[str, Dict], cache_size: int = DEFAULT_RECORD_CACHE) -> 'PlayerStore':
+        return cls(players.values(), cache_size)
+
+    @classmethod
+    def open(cls, directory: str, cache_size: int = DEFAULT_RECORD_CACHE) -> 'PlayerStore':
+        """Memory-map a store written by ``save``.
+
+        Raises FileNotFoundError without a manifest and ValueError for an
+        unsupported format.
+        """
+        with open(os.path.join(directory, MANIFEST)) as f:
+            manifest = json.load(f)
+        if manifest.get('format') != STORE_FORMAT:
+            raise ValueError(f"Unsupported player store format: {manifest.get('format')}")
+
+        def load(name):
+            return _load_column(directory, name)
+
+        store = cls.__new__(cls)
+        store.ids = StringColumn(load('ids.offsets'), load('ids.data'))
+        store.index = IdIndex(load('ids.sorted'), load('ids.order'))
+        store.names = StringColumn(load('names.offsets'), load('names.data'))
+        store.nationalities = StringColumn(load('nationalities.offsets'), load('nationalities.data'))
+        store.categorical = {
+            f: CategoricalColumn.from_arrays(manifest['categories'][f], load(f'{f}.codes'),
+                                             load(f'{f}.order'), load(f'{f}.bounds'))
+            for f in CATEGORICAL_FIELDS
+        }
+        store.numeric = {
+            f: SortedColumn.from_arrays(load(f'{f}.data'), load(f'{f}.order'), load(f'{f}.sorted'))
+            for f in NUMERIC_FIELDS
+        }
+        store.stats = {f: load(f'stats.{f}') for f in STAT_FIELDS}
+        store.versions = load('versions')
+        store.directory = directory
+        store._init_cache(cache_size)
+        return store
+
+    def save(self, directory: str):
+        """Write one ``.npy`` file per column plus a manifest, readable with ``open``.
+
+        The manifest is written last, so a directory without one is incomplete.
+        """
+        os.makedirs(directory, exist_ok=True)
+        arrays = {}
+        for name in ('ids', 'names', 'nationalities'):
+            packed = StringColumn.pack(getattr(self, name))
+            arrays[f'{name}.offsets'], arrays[f'{name}.data'] = packed.offsets, packed.data
+        id_bytes = np.array([pid.encode() for pid in self.ids], dtype=bytes)
+        order = np.argsort(id_bytes, kind='stable')
+        arrays['ids.sorted'], arrays['ids.order'] = id_bytes[order], order
+        for field, column in self.categorical.items():
+            if column.stale:
+                column._reindex()
+            arrays[f'{field}.codes'], arrays[f'{field}.order'], arrays[f'{field}.bounds'] = (
+                column.codes, column.order, column.bounds)
+        for field, column in self.numeric.items():
+            if column.stale:
+                column._reindex()
+            arrays[f'{field}.data'], arrays[f'{field}.order'], arrays[f'{field}.sorted'] = (
+                column.data, column.order, column.sorted)
+        for field, column in self.stats.items():
+            arrays[f'stats.{field}'] = column
+        arrays['versions'] = self.versions
+        for name, array in arrays.items():
+            np.save(os.path.join(directory, name + '.npy'), np.ascontiguousarray(array))
+        with open(os.path.join(directory, MANIFEST), 'w') as f:
+            json.dump({
+                'format': STORE_FORMAT,
+                'players': len(self),
+                'categories': {f: c.categories for f, c in self.categorical.items()}
+            }, f)
+
+    def _cache_entry(self, row: int) -> list:
+        """LRU entry [version, record, encoded record or None], rebuilt when the version moved on"""
+        version = int(self.versions[row])
+        with self._cache_lock:
+            entry = self._cache.get(row)
+            if entry is not None and entry[0] == version:
+                self._cache.move_to_end(row)
+                self.cache_hits += 1
+                return entry
+            self.cache_misses += 1
+        entry = [version, self.record(row), None]
+        if self.cache_size > 0:
+            with self._cache_lock:
+                self._cache[row] = entry
+                self._cache.move_to_end(row)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return entry
+
+    def encoded_record(self, row: int, encode: Callable[[Dict], Any]) -> Any:
+        """``encode(record)`` for one full record, cached with it in the LRU (e.g. pre-encoded JSON)"""
+        entry = self._cache_entry(row)
+        if entry[2] is None:
+            entry[2] = encode(entry[1])
+        return entry[2]
+
+    # Mapping interface, so existing ``PLAYERS_DB.get(player_id)`` call sites keep working
+    def __getitem__(self, player_id: str) -> Dict:
+        """Full record, served from the LRU while the record version is unchanged"""
+        record = self._cache_entry(self.index[player_id])[1]
+        # Callers get their own copy; the cached record stays pristine
+        return dict(record, stats=dict(record['stats']))
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.ids)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, player_id) -> bool:
+        return player_id in self.index
+
+    def cache_stats(self) -> Dict:
+        with self._cache_lock:
+            lookups = self.cache_hits + self.cache_misses
+            return {
+                'storage': 'mmap' if self.directory else 'memory',
+                'directory': self.directory,
+                'players': len(self),
+                'size': len(self._cache),
+                'maxsize': self.cache_size,
+                'hits': self.cache_hits,
+                'misses': self.cache_misses,
+                'hit_ratio': round(self.cache_hits / lookups, 4) if lookups else 0.0
+            }
+
+    def version(self, player_id: str) -> Optional[int]:
+        """Current record version, or None for an unknown player"""
+        row = self.index.get(player_id)
+        return None if row is None else int(self.versions[row])
+
+    @property
+    def change_cursor(self) -> int:
+        """Number of updates applied so far, to pass to ``changes`` later"""
+        return self._change_base + len(self._changes)
+
+    def changes(self, since: int) -> Tuple[Optional[np.ndarray], int]:
+        """Rows updated after cursor ``since`` (sorted, unique) and the cursor to pass next time.
+
+        The rows are None once the log no longer reaches back to ``since``.
+        """
+        if since == self.change_cursor:
+            return np.empty(0, dtype=np.intp), since
+        with self._write_lock:
+            cursor = self.change_cursor
+            if since < self._change_base:
+                return None, cursor
+            return np.unique(np.array(self._changes[since - self._change_base:], dtype=np.intp)), cursor
+
+    def update(self, player_id: str, changes: Dict) -> int:
+        """Apply a partial record update and return the new record version.
+
+        ``changes`` holds top-level fields from UPDATABLE_FIELDS; ``stats`` may
+        be a partial dict of stat fields. Raises KeyError for an unknown player
+        and ValueError for unknown or non-updatable fields, for numbers
+        outside FIELD_RANGES and for fractions in integer stat columns.
+        """
+        row = self.index[player_id]
+
+        def check_range(field, value, dtype):
+            low, high = FIELD_RANGES[field]
+            if np.issubdtype(dtype, np.integer):
+                info = np.iinfo(dtype)
+                low, high = max(low, int(info.min)), min(high, int(info.max))
+            # Also rejects NaN
+            if not low <= value <= high:
+                raise ValueError(f'{field} must be between {low} and {high}')
+
+        for field, value in changes.items():
+            if field not in UPDATABLE_FIELDS:
+                raise ValueError(f'Field cannot be updated: {field}')
+            if field == 'stats':
+                if not isinstance(value, dict) or any(k not in STAT_FIELDS for k in value):
+                    raise ValueError(f"stats must be an object with keys from {', '.join(STAT_FIELDS)}")
+                if any(isinstance(v, bool) or not isinstance(v, (int, float)) for v in value.values()):
+                    raise ValueError('stats values must be numbers')
+                for stat, stat_value in value.items():
+                    dtype = self.stats[stat].dtype
+                    check_range(stat, stat_value, dtype)
+                    # Integer columns keep their dtype; 90.0 is stored as 90, 90.5 is refused
+                    if np.issubdtype(dtype, np.integer) and isinstance(stat_value, float) and not stat_value.is_integer():
+                        raise ValueError(f'{stat} must be an integer')
+            elif field in NUMERIC_FIELDS:
+                if isinstance(value, bool) or not isinstance(value, int):
+                    raise ValueError(f'{field} must be an integer')
+                check_range(field, value, self.numeric[field].data.dtype)
+            elif not isinstance(value, str):
+                raise ValueError(f'{field} must be a string')
+
+        with self._write_lock:
+            for field, value in changes.items():
+                if field == 'stats':
+                    for stat, stat_value in value.items():
+                        self.stats[stat][row] = stat_value
+                elif field in self.categorical:
+                    self.categorical[field].set(row, value)
+                elif field in self.numeric:
+                    self.numeric[field].set(row, value)
+                elif field == 'name':
+                    self.names[row] = value
+                else:
+                    self.nationalities[row] = value
+            self.versions[row] += 1
+            self._changes.append(row)
+            if len(self._changes) > CHANGE_LOG_LIMIT:
+                drop = len(self._changes) // 2
+                del self._changes[:drop]
+                self._change_base += drop
+            return int(self.versions[row])
+
+    def record(self, row: int) -> Dict:
+        """Rebuild a single player record"""
+        return self.records(np.array([row], dtype=np.intp))[0]
+
+    def records(self, rows: np.ndarray, fields: Optional[Iterable[str]] = None) -> List[Dict]:
+        """Rebuild player records for the given rows, column by column.
+
+        ``fields`` projects the output: top-level names from RECORD_FIELDS,
+        ``stats`` for every stat, or ``stats.<name>`` for a single stat. Only
+        the requested columns are gathered.
+        """
+        rows = np.asarray(rows, dtype=np.intp)
+        top_fields, stat_fields = resolve_fields(fields)
+        columns = [(f, self._gather(f, rows)) for f in top_fields]
+        stat_columns = [(f, self.stats[f][rows].tolist()) for f in stat_fields]
+
+        players = []
+        for i in range(len(rows)):
+            player = {f: col[i] for f, col in columns}
+            if stat_columns:
+                player['stats'] = {f: col[i] for f, col in stat_columns}
+            players.append(player)
+        return players
+
+    def _gather(self, field: str, rows: np.ndarray) -> List:
+        if field in self.categorical:
+            return self.categorical[field].values(rows)
+        if field in self.numeric:
+            return self.numeric[field].data[rows].tolist()
+        source = {'id': self.ids, 'name': self.names, 'nationality': self.nationalities}[field]
+        return [source[r] for r in rows.tolist()]
+
+    def rows_for_ids(self, player_ids: Iterable[str]) -> np.ndarray:
+        """Row ids for the known players among ``player_ids``, in request order"""
+        index = self.index
+        return np.array([index[pid] for pid in player_ids if pid in index], dtype=np.intp)
+
+    def column(self, key: str) -> np.ndarray:
+        """Full numeric column for a stat, ``age`` or ``current_value``"""
+        if key in self.stats:
+            return self.stats[key]
+        return self.numeric[key].data
+
+    def sort_rows(self, rows: np.ndarray, key: str, descending: bool = False) -> np.ndarray:
+        """Stable sort of ``rows`` by a numeric column; ties keep insertion order"""
+        values = self.column(key)[rows]
+        if descending:
+            values = -values.astype(np.float64)
+        return rows[np.argsort(values, kind='stable')]
+
+    def filter(self, position: Optional[str] = None, league: Optional[str] = None,
+               min_age: Optional[int] = None, max_age: Optional[int] = None,
+               max_value: Optional[int] = None) -> np.ndarray:
+        """Return matching row ids in insertion order.
+
+        Each active filter is resolved through its index; the smallest
+        candidate set is then narrowed by the remaining predicates with
+        vectorized column comparisons.
+        """
+        candidates = []
+        checks = []
+        if position is not None:
+            codes = self.categorical['position'].codes_matching(position)
+            candidates.append(self.categorical['position'].rows_for(codes))
+            checks.append(lambda rows, c=codes: np.isin(self.categorical['position'].codes[rows], c))
+        if league is not None:
+            code = self.categorical['league'].lookup.get(league)
+            codes = [] if code is None else [code]
+            candidates.append(self.categorical['league'].rows_for(codes))
+            checks.append(lambda rows, c=codes: np.isin(self.categorical['league'].codes[rows], c))
+        if min_age is not None or max_age is not None:
+            age = self.numeric['age']
+            candidates.append(age.range_rows(min_age, max_age))
+            checks.append(lambda rows: age.range_mask(rows, min_age, max_age))
+        if max_value is not None:
+            value = self.numeric['current_value']
+            candidates.append(value.range_rows(None, max_value))
+            checks.append(lambda rows: value.range_mask(rows, None, max_value))
+
+        if not candidates:
+            return np.arange(len(self.ids), dtype=np.intp)
+
+        smallest = min(range(len(candidates)), key=lambda i: len(candidates[i]))
+        rows = np.sort(candidates[smallest])
+        for i, check in enumerate(checks):
+            if i != smallest and len(rows):
+                rows = rows[check(rows)]
+        return rows
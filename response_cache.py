@@ -0,0 +1,88 @@
+"""
+Champions Gen - Response Cache
+
+Bounded LRU cache with a per-entry TTL for serialized API responses. Keys are
+tuples that already encode everything a response depends on (route, player,
+record version, model version, parameters), so entries never need explicit
+invalidation: a changed record simply produces a new key and the stale entry
+ages out of the LRU.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+
+def etag_for(key: Hashable) -> str:
+    """Entity tag derived from the cache key.
+
+    Served as a weak validator: regenerated bodies carry a fresh timestamp
+    while the prediction content for the key is identical.
+    """
+    return hashlib.blake2b(repr(key).encode(), digest_size=12).hexdigest()
+
+
+class ResponseCache:
+    """Thread-safe LRU of (body bytes, mimetype) with TTL expiry and hit/eviction counters"""
+
+    def __init__(self, maxsize: int = 4096, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: 'OrderedDict[Hashable, Tuple[float, bytes, str]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Optional[Tuple[bytes, str]]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires, body, mimetype = entry
+            if expires <= now:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body, mimetype
+
+    def put(self, key: Hashable, body: bytes, mimetype: str) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, body, mimetype)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def record_not_modified(self) -> None:
+        """Count a conditional request answered with 304 (no body built or sent)"""
+        with self._lock:
+            self.not_modified += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'not_modified': self.not_modified,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
@@ -0,0 +1,191 @@
+"""
+Champions Gen - Squad Rotation Planner
+
+Chooses a lineup for each of the next N fixtures that maximizes expected
+squad strength while keeping every player under fatigue and injury-risk
+caps. Playing a fixture adds load by its intensity and fatigue recovers
+between fixtures; fatigue lowers a player's effective strength and raises
+their match injury risk on top of their predicted base risk.
+
+Each player's season is a small dynamic program over discretized fatigue
+(play or rest at each fixture), solved for the whole squad at once with
+NumPy. The only coupling between players - exactly the formation's count
+per position in every lineup - is priced in Lagrangian style: prices rise
+where too many players want to play and fall where too few do, and the
+per-player DPs are re-solved. A final forward pass fills every lineup from
+the DP's play-vs-rest advantages, so each fixture gets a feasible lineup
+that accounts for what playing now costs later. States that break a cap
+are pruned from the DP.
+"""
+
+import datetime
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+POSITIONS = ('Goalkeeper', 'Defender', 'Midfielder', 'Forward')
+FORMATIONS = {
+    '4-3-3': (1, 4, 3, 3),
+    '4-4-2': (1, 4, 4, 2),
+    '4-2-3-1': (1, 4, 5, 1),
+    '3-5-2': (1, 3, 5, 2),
+    '5-3-2': (1, 5, 3, 2),
+}
+# intensity -> (fatigue load, weight of the result, match injury risk multiplier)
+INTENSITIES = {
+    'High': (38.0, 1.5, 1.4),
+    'Medium': (28.0, 1.0, 1.0),
+    'Low': (20.0, 0.7, 0.8),
+}
+OPPONENTS = [
+    ('Barcelona', 'High'), ('Atletico Madrid', 'Medium'), ('Sevilla', 'Medium'), ('Manchester City', 'High'),
+    ('Real Sociedad', 'Medium'), ('Girona', 'Low'), ('Villarreal', 'Medium'), ('Bayern Munich', 'High'),
+    ('Osasuna', 'Low'), ('Valencia', 'Medium'),
+]
+MAX_FATIGUE_STATE = 100
+RECOVERY_PER_DAY = 9.0
+DEFAULT_GAP_DAYS = 3
+MAX_FATIGUE = 75
+MAX_MATCH_RISK = 0.08
+# Cost of an expected injury, in units of the player's strength
+RISK_PENALTY = 3.0
+
+
+def match_risk(base_risk: np.ndarray, fatigue: np.ndarray, intensity_risk: float) -> np.ndarray:
+    """Probability of injury in one match from the predicted risk (%) and current fatigue"""
+    return np.minimum(1.0, base_risk / 100 * 0.15 * intensity_risk * (1 + fatigue / 40))
+
+
+def fixture_gaps(fixtures: Sequence[Dict]) -> List[int]:
+    """Recovery days after each fixture (the last one has none)"""
+    gaps = []
+    for current, following in zip(fixtures, fixtures[1:]):
+        try:
+            days = (datetime.date.fromisoformat(following['date']) -
+                    datetime.date.fromisoformat(current['date'])).days
+        except (KeyError, TypeError, ValueError):
+            days = DEFAULT_GAP_DAYS
+        gaps.append(max(0, days))
+    return gaps + [0]
+
+
+def plan_rotation(strength: np.ndarray, base_risk: np.ndarray, positions: Sequence[str],
+                  initial_fatigue: np.ndarray, fixtures: Sequence[Dict], formation: str = '4-3-3',
+                  iterations: int = 60, lookahead: bool = True) -> Dict:
+    """Lineups (squad indices) for each fixture plus the fatigue and risk trajectory.
+
+    ``lookahead=False`` skips the DP and fills each lineup greedily on the
+    current fixture's value alone (the myopic baseline).
+    """
+    strength = np.asarray(strength, dtype=np.float64)
+    base_risk = np.asarray(base_risk, dtype=np.float64)
+    position_index = np.array([POSITIONS.index(p) if p in POSITIONS else 2 for p in positions])
+    required = np.array(FORMATIONS[formation])
+    n_players, n_fixtures = len(strength), len(fixtures)
+    states = np.arange(MAX_FATIGUE_STATE + 1, dtype=np.float64)
+    gaps = fixture_gaps(fixtures)
+
+    # Per fixture: value of playing from each fatigue state (-inf where a cap is broken)
+    # and the fatigue state after playing or resting
+    values = np.empty((n_fixtures, n_players, len(states)))
+    after_play = np.empty((n_fixtures, len(states)), dtype=np.intp)
+    after_rest = np.empty((n_fixtures, len(states)), dtype=np.intp)
+    for t, fixture in enumerate(fixtures):
+        load, weight, intensity_risk = INTENSITIES[fixture.get('intensity', 'Medium')]
+        risk = match_risk(base_risk[:, None], states[None, :], intensity_risk)
+        value = strength[:, None] * (weight * (1 - 0.004 * states[None, :]) - RISK_PENALTY * risk)
+        value[(risk > MAX_MATCH_RISK) | (states[None, :] > MAX_FATIGUE)] = -np.inf
+        values[t] = value
+        recovery = RECOVERY_PER_DAY * gaps[t]
+        after_play[t] = np.clip(np.rint(states + load - recovery), 0, MAX_FATIGUE_STATE)
+        after_rest[t] = np.clip(np.rint(states - recovery), 0, MAX_FATIGUE_STATE)
+
+    start = np.clip(np.rint(initial_fatigue), 0, MAX_FATIGUE_STATE).astype(np.intp)
+    rows = np.arange(n_players)
+
+    def solve(prices):
+        """Backward DP for every player at once; continuation values per fixture"""
+        future = np.zeros((n_fixtures + 1, n_players, len(states)))
+        for t in range(n_fixtures - 1, -1, -1):
+            play = values[t] - prices[t, position_index][:, None] + future[t + 1][:, after_play[t]]
+            future[t] = np.maximum(play, future[t + 1][:, after_rest[t]])
+        return future
+
+    def forward_counts(prices, future):
+        counts = np.zeros((n_fixtures, len(POSITIONS)))
+        fatigue = start.copy()
+        for t in range(n_fixtures):
+            play = values[t][rows, fatigue] - prices[t, position_index] + future[t + 1][rows, after_play[t][fatigue]]
+            plays = play > future[t + 1][rows, after_rest[t][fatigue]]
+            np.add.at(counts[t], position_index[plays], 1)
+            fatigue = np.where(plays, after_play[t][fatigue], after_rest[t][fatigue])
+        return counts
+
+    prices = np.zeros((n_fixtures, len(POSITIONS)))
+    future = np.zeros((n_fixtures + 1, n_players, len(states)))
+    iterations_run = 0
+    if lookahead:
+        step = max(1.0, float(np.mean(strength)) * 0.05) if n_players else 1.0
+        for k in range(iterations):
+            future = solve(prices)
+            excess = forward_counts(prices, future) - required
+            iterations_run = k + 1
+            if not excess.any():
+                break
+            prices += step / np.sqrt(k + 1) * np.sign(excess)
+        future = solve(prices)
+
+    # Fill every lineup by play-vs-rest advantage (just this fixture's value when myopic)
+    lineups, expected, shortfalls = [], [], []
+    fatigue_path = [start.astype(np.float64)]
+    risk_path = []
+    fatigue = start.copy()
+    objective = 0.0
+    for t, fixture in enumerate(fixtures):
+        current = values[t][rows, fatigue]
+        advantage = current + future[t + 1][rows, after_play[t][fatigue]] - future[t + 1][rows, after_rest[t][fatigue]]
+        feasible = np.isfinite(current)
+        chosen, shortfall = [], {}
+        for p, position in enumerate(POSITIONS):
+            candidates = np.flatnonzero(feasible & (position_index == p))
+            best = candidates[np.argsort(-advantage[candidates], kind='stable')[:required[p]]]
+            chosen.extend(best.tolist())
+            if len(best) < required[p]:
+                shortfall[position] = int(required[p] - len(best))
+        plays = np.zeros(n_players, dtype=bool)
+        plays[chosen] = True
+        _, weight, intensity_risk = INTENSITIES[fixture.get('intensity', 'Medium')]
+        risk_path.append(match_risk(base_risk, fatigue.astype(np.float64), intensity_risk))
+        lineups.append(chosen)
+        expected.append(float(np.sum(strength[chosen] * (1 - 0.004 * fatigue[chosen]))))
+        objective += float(current[chosen].sum())
+        shortfalls.append(shortfall)
+        fatigue = np.where(plays, after_play[t][fatigue], after_rest[t][fatigue])
+        fatigue_path.append(fatigue.astype(np.float64))
+
+    return {
+        'lineups': lineups,
+        'expected_strength': expected,
+        'shortfalls': shortfalls,
+        'fatigue': np.array(fatigue_path),
+        'match_risk': np.array(risk_path),
+        'objective': objective,
+        'iterations': iterations_run
+    }
+
+
+def default_fixtures(horizon: int, start: Optional[datetime.date] = None) -> List[Dict]:
+    """Upcoming fixtures every 3-4 days against a rotating list of opponents"""
+    start = start or datetime.date.today()
+    fixtures, day = [], start
+    for i in range(horizon):
+        opponent, intensity = OPPONENTS[i % len(OPPONENTS)]
+        day = day + datetime.timedelta(days=3 + i % 2)
+        fixtures.append({
+            'opponent': opponent,
+            'date': day.isoformat(),
+            'venue': 'Home' if i % 2 == 0 else 'Away',
+            'intensity': intensity
+        })
+    return fixtures
+
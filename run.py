@@ -4,13 +4,18 @@ Champions Gen - Quick Start Script
 Run this script to start the Champions Gen platform with all services
 """
 
+import argparse
+import os
+import socket
 import subprocess
 import sys
-import os
-import webbrowser
+import threading
 import time
+import webbrowser
 from pathlib import Path
 
+REQUIREMENTS = "requirements.txt"
+
 def check_python_version():
     """Check if Python version is compatible"""
     if sys.version_info < (3, 8):
@@ -19,21 +24,57 @@ def check_python_version():
         sys.exit(1)
     print(f"✅ Python {sys.version.split()[0]} detected")
 
-def install_dependencies():
-    """Install required Python packages"""
-    print("📦 Installing dependencies...")
+def missing_requirements(path=REQUIREMENTS):
+    """Requirements in ``path`` not installed at a matching version (None if they cannot be checked)"""
+    from importlib.metadata import PackageNotFoundError, version
     try:
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"], 
+        from packaging.requirements import Requirement
+    except ImportError:
+        try:
+            from pip._vendor.packaging.requirements import Requirement
+        except ImportError:
+            return None
+
+    missing = []
+    for line in Path(path).read_text().splitlines():
+        line = line.split("#", 1)[0].strip()
+        if not line or line.startswith("-"):
+            continue
+        requirement = Requirement(line)
+        if requirement.marker is not None and not requirement.marker.evaluate():
+            continue
+        try:
+            installed = version(requirement.name)
+        except PackageNotFoundError:
+            missing.append(str(requirement))
+            continue
+        if not requirement.specifier.contains(installed, prereleases=True):
+            missing.append(f"{requirement} (found {installed})")
+    return missing
+
+def install_dependencies(force=False):
+    """Install required Python packages, unless every requirement is already satisfied"""
+    missing = None if force else missing_requirements()
+    if missing == []:
+        print("✅ Dependencies already satisfied")
+        return
+    if missing:
+        print(f"📦 Installing dependencies (missing: {', '.join(missing)})...")
+    else:
+        print("📦 Installing dependencies...")
+    try:
+        subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", REQUIREMENTS],
                             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
         print("✅ Dependencies installed successfully")
     except subprocess.CalledProcessError:
         print("❌ Failed to install dependencies")
-        print("   Please run: pip install -r requirements.txt")
+        print(f"   Please run: pip install -r {REQUIREMENTS}")
         sys.exit(1)
 
 def check_files():
     """Check if required files exist"""
-    required_files = ["app.py", "index.html", "styles.css", "script.js", "data.js"]
+    required_files = ["app.py", "serve.py", "templates/index.html", "static/styles.css",
+                      "static/script.js", "static/dashboard.js"]
     missing_files = []
     
     for file in required_files:
@@ -46,43 +87,70 @@ def check_files():
     
     print("✅ All required files found")
 
-def start_server():
-    """Start the Flask development server"""
+def open_browser_when_ready(port, timeout=60.0):
+    """Open the app in a browser once the server accepts connections"""
+    url = f"http://localhost:{port}"
+
+    def wait_and_open():
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                    break
+            except OSError:
+                time.sleep(0.1)
+        else:
+            print(f"🌐 Please open {url} in your browser")
+            return
+        try:
+            webbrowser.open(url)
+        except Exception:
+            print(f"🌐 Please open {url} in your browser")
+
+    threading.Thread(target=wait_and_open, name="open-browser", daemon=True).start()
+
+def start_server(argv, browser=True):
+    """Start the API server; argv is passed through to serve.py (--mode, --workers, --threads, ...)"""
+    import serve
+
+    port = serve.build_parser().parse_known_args(argv)[0].port
     print("🚀 Starting Champions Gen Platform...")
     print("📊 AI-Powered Football Analytics")
-    print("🌐 Server will be available at: http://localhost:5000")
-    print("📋 API documentation at: http://localhost:5000/api/health")
+    print(f"🌐 Server will be available at: http://localhost:{port}")
+    print(f"📋 API documentation at: http://localhost:{port}/api/health")
     print("\n" + "="*50)
     print("🎯 CHAMPIONS GEN - READY TO LAUNCH")
     print("="*50)
-    
-    # Wait a moment for user to read
-    time.sleep(2)
-    
-    try:
-        # Try to open browser automatically
-        webbrowser.open("http://localhost:5000")
-        print("🌐 Opening browser automatically...")
-    except:
-        print("🌐 Please open http://localhost:5000 in your browser")
-    
-    # Start Flask app
-    os.system("python app.py")
+
+    # The dev server's reloader runs this script again in its child process
+    if browser and not os.environ.get("WERKZEUG_RUN_MAIN"):
+        open_browser_when_ready(port)
+
+    # Serve in-process instead of spawning a second interpreter
+    serve.main(argv)
 
 def main():
     """Main execution function"""
+    parser = argparse.ArgumentParser(description="Check requirements and start Champions Gen; "
+                                                 "other arguments are passed to serve.py")
+    parser.add_argument("--no-browser", dest="browser", action="store_false",
+                        help="do not open a browser once the server is up")
+    parser.add_argument("--install", action="store_true",
+                        help="run pip install -r requirements.txt even if everything is satisfied")
+    options, argv = parser.parse_known_args()
+
     print("🏆 Champions Gen - Football Analytics Platform")
     print("="*50)
-    
+
     # Check system requirements
     check_python_version()
     check_files()
-    
-    # Install dependencies
-    install_dependencies()
-    
+
+    # Install dependencies only when something is missing or outdated
+    install_dependencies(force=options.install)
+
     # Start the server
-    start_server()
+    start_server(argv, browser=options.browser)
 
 if __name__ == "__main__":
     try:
@@ -0,0 +1,205 @@
+"""
+Champions Gen - Scouting Matrix
+
+Dense player x feature matrix behind /api/compare/matrix: stats, all three
+predictions and XAI factor importances for many players, scored in one
+vectorized pass per model over the store columns instead of one request per
+player per model. Categorical prediction outputs are encoded numerically
+(performance trend and contract status as +1/0/-1) so every column is a
+float.
+
+Without a seed the models are drawn in one pass per column; deterministic
+servers instead hand over each player's own prediction and explanation
+dicts (``predictions``), so every cell equals what the per-player routes
+return whoever else is in the matrix.
+
+Besides JSON the matrix is served as a NumPy ``.npy`` structured array (one
+named field per column, ``np.load`` without pickling) or, when pyarrow is
+installed, as an Arrow IPC stream.
+"""
+
+import io
+import re
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ai_engine import CONTRACT_STATUSES, DEVELOPMENT_SKILLS, INJURY_DRIVERS, PERFORMANCE_TRENDS, MockAIEngine, XAI_FACTORS
+from player_store import NUMERIC_FIELDS, STAT_FIELDS
+
+FORMATS = ('json', 'npy', 'arrow')
+MIMETYPES = {
+    'npy': 'application/octet-stream',
+    'arrow': 'application/vnd.apache.arrow.stream',
+}
+INJURY_COLUMNS = ('current_risk', 'weekly_risk', 'biweekly_risk', 'confidence') + tuple(k for _, k in INJURY_DRIVERS)
+DEVELOPMENT_COLUMNS = ('potential_growth', 'peak_age', 'confidence')
+VALUE_HORIZONS = 5
+# PERFORMANCE_TRENDS / CONTRACT_STATUSES index -> score
+TREND_SCORES = np.array([1.0, 0.0, -1.0])
+CONTRACT_SCORES = np.array([1.0, 0.0, -1.0])
+
+
+def arrow_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _slug(name: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '_', name.lower()).strip('_')
+
+
+def overlay_workload(engine: MockAIEngine, injury: Dict[str, np.ndarray], player_ids: Sequence[str],
+                     workload: Callable[[str], Optional[Dict]]):
+    """Apply measured workload to injury columns in place, for the players that have any"""
+    for i, player_id in enumerate(player_ids):
+        reading = workload(player_id)
+        if not reading or reading.get('acwr') is None:
+            continue
+        prediction = {
+            'current_risk': round(float(injury['current_risk'][i]), 1),
+            'drivers': [{'name': name, 'impact': round(float(injury[key][i]), 1)} for name, key in INJURY_DRIVERS]
+        }
+        adjusted = engine.apply_workload(prediction, reading)
+        for column in ('current_risk', 'weekly_risk', 'biweekly_risk'):
+            injury[column][i] = adjusted[column]
+        impacts = {d['name']: d['impact'] for d in adjusted['drivers']}
+        for name, key in INJURY_DRIVERS:
+            injury[key][i] = impacts[name]
+
+
+def prediction_columns(kind: str, results: Sequence[Dict]) -> Dict[str, np.ndarray]:
+    """Per-player prediction dicts as the arrays the ``*_columns`` engine methods return.
+
+    ``kind`` is injury, development, value or ``explain-<type>`` for
+    generate_xai_explanation results of that type.
+    """
+    if kind == 'injury':
+        columns = {key: np.array([r[key] for r in results], dtype=np.float64)
+                   for key in ('current_risk', 'weekly_risk', 'biweekly_risk', 'confidence')}
+        for i, (_, key) in enumerate(INJURY_DRIVERS):
+            columns[key] = np.array([r['drivers'][i]['impact'] for r in results], dtype=np.float64)
+        return columns
+    if kind == 'development':
+        columns = {
+            'potential_growth': np.array([r['potential_growth'] for r in results], dtype=np.float64),
+            'peak_age': np.array([r['peak_age'] for r in results])
+        }
+        for i, (skill, _, _) in enumerate(DEVELOPMENT_SKILLS):
+            columns[f'{skill.lower()}_current'] = np.array([r['development_areas'][i]['current'] for r in results])
+            columns[f'{skill.lower()}_potential'] = np.array([r['development_areas'][i]['potential'] for r in results])
+        columns['confidence'] = np.array([r['confidence'] for r in results], dtype=np.float64)
+        return columns
+    if kind == 'value':
+        factors = [{f['name']: f['impact'] for f in r['factors']} for r in results]
+        return {
+            'predictions': np.array([r['predictions'] for r in results],
+                                    dtype=np.int64).reshape(len(results), VALUE_HORIZONS),
+            'confidence': np.array([r['confidence'] for r in results], dtype=np.float64),
+            'performance_trend': np.array([PERFORMANCE_TRENDS.index(f['Performance Trend']) for f in factors],
+                                          dtype=np.intp),
+            'contract_status': np.array([CONTRACT_STATUSES.index(f['Contract Status']) for f in factors],
+                                        dtype=np.intp)
+        }
+    importances = [{e['factor']: e['importance'] for e in r['explanations']} for r in results]
+    factors = XAI_FACTORS.get(kind[len('explain-'):], XAI_FACTORS['recruitment'])
+    columns = {factor: np.array([i[factor] for i in importances], dtype=np.float64) for factor, _, _ in factors}
+    columns['confidence'] = np.array([r['confidence'] for r in results], dtype=np.float64)
+    return columns
+
+
+def prediction_matrix(engine: MockAIEngine, store, rows: np.ndarray, rngs: Dict[str, np.random.Generator],
+                      explain: str = 'recruitment',
+                      workload: Optional[Callable[[str], Optional[Dict]]] = None,
+                      predictions: Optional[Callable[[str, str], Dict]] = None) -> Tuple[List[str], np.ndarray]:
+    """(column names, float64 matrix with one row per store row).
+
+    ``rngs`` holds a generator per model (injury, development, value,
+    explain); ``workload`` maps a player id to its wearables reading.
+    ``predictions(kind, player_id)``, when given, supplies each player's
+    prediction (kind as in prediction_columns) instead of the vectorized
+    draws.
+    """
+    rows = np.asarray(rows, dtype=np.intp)
+    ages = store.column('age')[rows]
+    positions = store.categorical['position'].values(rows)
+    player_ids = [store.ids[r] for r in rows.tolist()]
+
+    def model(kind, columns):
+        if predictions is None:
+            return columns()
+        return prediction_columns(kind, [predictions(kind, player_id) for player_id in player_ids])
+
+    names: List[str] = []
+    columns: List[np.ndarray] = []
+
+    def add(name, values, decimals=None):
+        values = np.asarray(values, dtype=np.float64)
+        names.append(name)
+        columns.append(values if decimals is None else np.round(values, decimals))
+
+    for field in STAT_FIELDS + NUMERIC_FIELDS:
+        add(field, store.column(field)[rows])
+
+    injury = model('injury', lambda: engine.predict_injury_risk_columns(ages, positions, rngs.get('injury')))
+    if workload is not None:
+        overlay_workload(engine, injury, player_ids, workload)
+    for key in INJURY_COLUMNS:
+        add(f'injury.{key}', injury[key], 1)
+
+    development = model('development',
+                        lambda: engine.predict_player_development_columns(ages, positions, rngs.get('development')))
+    for key in DEVELOPMENT_COLUMNS:
+        add(f'development.{key}', development[key], 1)
+    for key, values in development.items():
+        if key not in DEVELOPMENT_COLUMNS:
+            add(f'development.{key}', values)
+
+    value = model('value', lambda: engine.predict_market_value_columns(store.column('current_value')[rows], ages,
+                                                                       positions, rngs.get('value')))
+    for horizon in range(VALUE_HORIZONS):
+        add(f'value.horizon_{horizon + 1}', value['predictions'][:, horizon])
+    add('value.confidence', value['confidence'], 1)
+    add('value.performance_trend', TREND_SCORES[value['performance_trend']])
+    add('value.contract_status', CONTRACT_SCORES[value['contract_status']])
+
+    factors = XAI_FACTORS.get(explain, XAI_FACTORS['recruitment'])
+    xai = model(f'explain-{explain}',
+                lambda: engine.generate_xai_explanation_columns(len(rows), explain, rngs.get('explain')))
+    for factor, _, _ in factors:
+        add(f'xai.{_slug(factor)}', xai[factor], 4)
+    add('xai.confidence', xai['confidence'], 1)
+
+    matrix = np.column_stack(columns) if columns else np.empty((len(rows), 0))
+    return names, matrix.reshape(len(rows), len(names))
+
+
+def structured(player_ids: Sequence[str], names: Sequence[str], matrix: np.ndarray) -> np.ndarray:
+    """The matrix as a structured array: ``player_id`` plus one float64 field per column"""
+    width = max([len(pid) for pid in player_ids] + [1])
+    table = np.empty(len(player_ids), dtype=[('player_id', f'U{width}')] + [(n, np.float64) for n in names])
+    table['player_id'] = player_ids
+    for i, name in enumerate(names):
+        table[name] = matrix[:, i]
+    return table
+
+
+def encode_npy(player_ids: Sequence[str], names: Sequence[str], matrix: np.ndarray) -> bytes:
+    buffer = io.BytesIO()
+    np.save(buffer, structured(player_ids, names, matrix), allow_pickle=False)
+    return buffer.getvalue()
+
+
+def encode_arrow(player_ids: Sequence[str], names: Sequence[str], matrix: np.ndarray) -> bytes:
+    """Arrow IPC stream with a ``player_id`` column; requires pyarrow"""
+    import pyarrow as pa
+
+    table = pa.table({'player_id': pa.array(list(player_ids), pa.string()),
+                      **{name: pa.array(matrix[:, i]) for i, name in enumerate(names)}})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
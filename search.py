@@ -0,0 +1,500 @@
+"""
+Champions Gen - Player Search Index
+
+Full-text, typo-tolerant search over player name, club, league and
+nationality for /api/players/search. Text is accent-folded and split into
+terms ("Pedri González" -> ``pedri``, ``gonzalez``), so "Gonzalez" finds
+"González". Every distinct term goes into one sorted vocabulary (UTF-8
+bytes, whose order is code point order), which answers exact and prefix
+lookups ("mbap" -> ``mbappe``) by binary search. Alphabetic terms are also
+indexed by character trigram, and a query term sharing enough trigrams
+with a vocabulary term is scored by edit distance, so "mbapep" and
+"bellignham" still match. Each field keeps a posting list
+per term: of rows for names, and of values for club, league and
+nationality, which have few distinct values shared by many rows.
+
+Rows are also grouped by their (club, league, nationality) combination, so
+a query term's matches in those fields are scored once per value, then
+once per group, and hit whole groups; its name matches hit rows directly.
+A row keeps its best field match weighted by field, and a player's score
+sums its query terms. Only the rows of the term hitting the fewest are
+materialized, and each other term scores just those (every row matching
+all terms is among them), so a query touches the rows it can return
+rather than every row. Rows matching every term rank first, by score and
+then overall rating; when none does, every row any term hits is scored
+and those matching the most terms are returned instead.
+
+Records updated after the build are scored directly from their current
+values, folded once per update, until the next rebuild, which happens once
+REBUILD_FRACTION of the rows (at most MAX_DIRTY_ROWS) changed.
+"""
+
+import threading
+import time
+import unicodedata
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+SEARCH_FIELDS = ('name', 'club', 'league', 'nationality')
+GROUP_FIELDS = SEARCH_FIELDS[1:]
+# A name match counts more than a club match, which counts more than league or nationality
+FIELD_WEIGHTS = {'name': 1.0, 'club': 0.8, 'league': 0.6, 'nationality': 0.6}
+EXACT_SCORE = 1.0
+# Prefix matches score between these, closer to the top the more of the term was typed
+PREFIX_SCORE = (0.8, 0.95)
+# Score of a whole-term match with 1 or 2 typos, and of a typo in the typed prefix
+TYPO_SCORES = {1: 0.75, 2: 0.6}
+PREFIX_TYPO_SCORES = {1: 0.65, 2: 0.5}
+MIN_TERM_SCORE = 0.5
+MIN_PREFIX_LENGTH = 2
+MAX_PREFIX_TERMS = 256
+# Trigram Dice coefficient a vocabulary term needs before its edit distance is computed
+MIN_DICE = 0.3
+MAX_FUZZY_TERMS = 32
+# Vocabulary terms read per query trigram when gathering typo candidates
+MAX_GRAM_TERMS = 2048
+MAX_QUERY_TERMS = 8
+REBUILD_FRACTION = 0.05
+MAX_DIRTY_ROWS = 1000
+
+# Letters NFKD does not decompose into a base letter and a combining mark
+_FOLD = str.maketrans({'ø': 'o', 'đ': 'd', 'ł': 'l', 'æ': 'ae', 'œ': 'oe', 'ı': 'i', 'þ': 'th', 'ð': 'd'})
+# Joins a column's values so the whole column is folded and split in a few C-level passes
+_SEPARATOR = '\x00'
+
+
+@lru_cache(maxsize=None)
+def _fold_char(char: str) -> str:
+    """Accent-free form of one (case-folded) character: itself, its base letters, or a space between words"""
+    if char.isascii():
+        return char if char.isalnum() else ' '
+    folded = ''.join(c for c in unicodedata.normalize('NFKD', char.translate(_FOLD)) if not unicodedata.combining(c))
+    return ''.join(c if c.isalnum() else ' ' for c in folded)
+
+
+def _fold_text(text: str) -> str:
+    """Replace every distinct character needing it once, instead of walking the text per character"""
+    for char in set(text):
+        if char != _SEPARATOR and not (char.isascii() and char.isalnum()):
+            folded = _fold_char(char)
+            if folded != char:
+                text = text.replace(char, folded)
+    return text
+
+
+def fold(text: str) -> List[str]:
+    """Lower-case, accent-free search terms of ``text``"""
+    return _fold_text(text.casefold().replace(_SEPARATOR, ' ')).split()
+
+
+def _tokenize(values: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """UTF-8 terms of all ``values`` and the index of the value each came from"""
+    joined = _SEPARATOR.join(values)
+    if joined.count(_SEPARATOR) != max(len(values) - 1, 0):
+        joined = _SEPARATOR.join(value.replace(_SEPARATOR, ' ') for value in values)
+    separator = _SEPARATOR.encode()
+    tokens = np.array(_fold_text(joined.casefold()).encode().replace(separator, b' ' + separator + b' ').split(),
+                      dtype=bytes)
+    # NumPy drops trailing NULs, so separators read back as empty strings
+    is_separator = tokens == b''
+    return tokens[~is_separator], np.cumsum(is_separator)[~is_separator]
+
+
+def max_edits(term: str) -> int:
+    """Typos tolerated in a query term of this length"""
+    if len(term) < 4 or not term.isalpha():
+        return 0
+    return 1 if len(term) < 7 else 2
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal string alignment distance (adjacent swaps count once), or ``limit + 1`` beyond ``limit``"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        best = i
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, previous2[j - 2] + 1)
+            current[j] = value
+            best = min(best, value)
+        if best > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+def term_score(query: str, term: str) -> float:
+    """How well a vocabulary term matches a query term: exact, prefix, or within a few typos"""
+    if query == term:
+        return EXACT_SCORE
+    if len(query) >= MIN_PREFIX_LENGTH and term.startswith(query):
+        low, high = PREFIX_SCORE
+        return low + (high - low) * len(query) / len(term)
+    limit = max_edits(query)
+    if not limit:
+        return 0.0
+    distance = edit_distance(query, term, limit)
+    if distance <= limit:
+        return TYPO_SCORES[distance]
+    if len(term) > len(query):
+        distance = edit_distance(query, term[:len(query)], limit)
+        if distance <= limit:
+            return PREFIX_TYPO_SCORES[distance]
+    return 0.0
+
+
+def trigrams(term: str) -> List[str]:
+    padded = f'^{term}$'
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+def _dice(grams: set, term_grams: set) -> float:
+    return 2 * len(grams & term_grams) / (len(grams) + len(term_grams))
+
+
+def _field_codes(store, field: str) -> Tuple[List[str], Optional[np.ndarray]]:
+    """Distinct values of a field and each row's value code (None for names, where each row is its own value)"""
+    if field in store.categorical:
+        column = store.categorical[field]
+        return list(column.categories), np.array(column.codes, dtype=np.int32)
+    if field == 'name':
+        return list(store.names), None
+    lookup: Dict[str, int] = {}
+    codes = np.fromiter((lookup.setdefault(value, len(lookup)) for value in store.nationalities),
+                        dtype=np.int32, count=len(store))
+    return list(lookup), codes
+
+
+class SearchIndex:
+    """Accent-folded term and trigram index over a PlayerStore, rebuilt when the app swaps stores"""
+
+    def __init__(self, store_getter: Callable):
+        self._store_getter = store_getter
+        self._lock = threading.Lock()
+        self._store = None
+        self.build_seconds: Optional[float] = None
+
+    def _bind(self):
+        store = self._store_getter()
+        if store is not self._store:
+            with self._lock:
+                if store is not self._store:
+                    self._build(store)
+        else:
+            self._sync(store)
+        return store
+
+    def refresh(self):
+        """Build the index now (for the current store) instead of on the first search"""
+        self._bind()
+
+    def _build(self, store):
+        start = time.perf_counter()
+        fields = {}
+        for field in SEARCH_FIELDS:
+            values, codes = _field_codes(store, field)
+            terms, pair_values = _tokenize(values)
+            fields[field] = (codes, len(values), terms, pair_values)
+
+        # One sorted vocabulary; pair_ids maps each (value, term) pair to its term
+        vocabulary, pair_ids = np.unique(np.concatenate([terms for _, _, terms, _ in fields.values()]),
+                                         return_inverse=True)
+        self.vocabulary = vocabulary
+        self._fields = {}
+        # Rows holding each term, so typo candidates can be read most common first
+        frequency = np.zeros(len(vocabulary))
+        offset = 0
+        for field in SEARCH_FIELDS:
+            codes, value_count, _, pair_values = fields[field]
+            term_ids = pair_ids[offset:offset + len(pair_values)]
+            offset += len(pair_values)
+            # CSR postings: values holding term t are values[offsets[t]:offsets[t + 1]], each once
+            order = np.argsort(term_ids, kind='stable')
+            term_ids, pair_values = term_ids[order], pair_values[order]
+            first = np.ones(len(term_ids), dtype=bool)
+            first[1:] = (term_ids[1:] != term_ids[:-1]) | (pair_values[1:] != pair_values[:-1])
+            term_ids, pair_values = term_ids[first], pair_values[first].astype(np.int32)
+            offsets = np.zeros(len(vocabulary) + 1, dtype=np.int32)
+            np.cumsum(np.bincount(term_ids, minlength=len(vocabulary)), out=offsets[1:])
+            rows = 1 if codes is None else np.bincount(codes, minlength=value_count)[pair_values]
+            frequency += np.bincount(term_ids, weights=np.broadcast_to(rows, term_ids.shape),
+                                     minlength=len(vocabulary))
+            self._fields[field] = (codes, value_count, offsets, pair_values)
+
+        # Rows grouped by their (club, league, nationality) values, which few distinct combinations cover: a
+        # term's matches in those fields are whole groups, and a row's score is read through its group
+        key = np.zeros(len(store), dtype=np.int64)
+        for field in GROUP_FIELDS:
+            codes, value_count = self._fields[field][:2]
+            key = key * value_count + codes
+        group_keys, row_groups = np.unique(key, return_inverse=True)
+        group_codes = {}
+        for field in reversed(GROUP_FIELDS):
+            value_count = self._fields[field][1]
+            group_codes[field] = (group_keys % value_count).astype(np.int32)
+            group_keys //= value_count
+        # Rows of group g are group_rows[group_offsets[g]:group_offsets[g + 1]]
+        group_offsets = np.zeros(len(group_codes[GROUP_FIELDS[0]]) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(row_groups), out=group_offsets[1:])
+        self._groups = (group_codes, row_groups.astype(np.int32), group_offsets,
+                        np.argsort(row_groups, kind='stable').astype(np.int32))
+
+        grams: Dict[str, List[int]] = {}
+        gram_counts = np.zeros(len(vocabulary), dtype=np.int16)
+        for term_id, raw in enumerate(vocabulary.tolist()):
+            if raw.isdigit():
+                continue
+            term = raw.decode()
+            if term.isalpha():
+                term_grams = set(trigrams(term))
+                gram_counts[term_id] = len(term_grams)
+                for gram in term_grams:
+                    grams.setdefault(gram, []).append(term_id)
+        # Most common terms first, so a query reading the first MAX_GRAM_TERMS keeps the likeliest matches
+        self._grams = {}
+        for gram, ids in grams.items():
+            ids = np.array(ids, dtype=np.int32)
+            self._grams[gram] = ids[np.argsort(-frequency[ids], kind='stable')]
+        self._gram_counts = gram_counts
+        self.versions = store.versions.copy()
+        self.dirty = np.empty(0, dtype=np.intp)
+        self._dirty_terms: Dict[int, List[Tuple[float, str]]] = {}
+        self._pending = (self.dirty, np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float32),
+                         np.empty(0, dtype=np.intp), [], [], np.zeros(len(store), dtype=bool))
+        self._store = store
+        self.build_seconds = time.perf_counter() - start
+
+    def _sync(self, store):
+        """Track rows updated since the build; they are scored from their live values"""
+        changed = np.flatnonzero(store.versions != self.versions)
+        if not len(changed):
+            return
+        with self._lock:
+            dirty = np.union1d(self.dirty, changed)
+            if len(dirty) > min(REBUILD_FRACTION * len(store), MAX_DIRTY_ROWS):
+                self._build(store)
+                return
+            for row, record in zip(changed.tolist(), store.records(changed, SEARCH_FIELDS)):
+                self._dirty_terms[row] = [(FIELD_WEIGHTS[field], term) for field in SEARCH_FIELDS
+                                          for term in fold(record[field])]
+            # Dirty rows with their flattened (position, field weight, term id) triples, the distinct terms and
+            # their trigrams, and a row mask, swapped in as one tuple so a concurrent search never pairs rows
+            # with another update's terms
+            term_ids: Dict[str, int] = {}
+            pairs = [(i, weight, term_ids.setdefault(term, len(term_ids))) for i, row in enumerate(dirty.tolist())
+                     for weight, term in self._dirty_terms[row]]
+            positions, weights, pair_terms = zip(*pairs) if pairs else ((), (), ())
+            is_dirty = np.zeros(len(store), dtype=bool)
+            is_dirty[dirty] = True
+            self._pending = (dirty, np.array(positions, dtype=np.intp), np.array(weights, dtype=np.float32),
+                             np.array(pair_terms, dtype=np.intp), list(term_ids),
+                             [set(trigrams(term)) for term in term_ids], is_dirty)
+            self.versions[changed] = store.versions[changed]
+            self.dirty = dirty
+
+    def matching_terms(self, query: str) -> List[Tuple[int, float]]:
+        """(vocabulary id, score) for every term matching one query term"""
+        vocabulary = self.vocabulary
+        key = query.encode()
+        found: Dict[int, float] = {}
+        low = int(np.searchsorted(vocabulary, key))
+        if len(query) >= MIN_PREFIX_LENGTH:
+            # 0xff never occurs in UTF-8, so this bounds every term starting with the query
+            high = int(np.searchsorted(vocabulary, key + b'\xff'))
+            candidates = range(low, min(high, low + MAX_PREFIX_TERMS))
+        else:
+            candidates = range(low, min(low + 1, len(vocabulary)))
+        for term_id in candidates:
+            score = term_score(query, vocabulary[term_id].decode())
+            if score:
+                found[term_id] = score
+
+        if max_edits(query):
+            query_grams = set(trigrams(query))
+            hits = [self._grams[g][:MAX_GRAM_TERMS] for g in query_grams if g in self._grams]
+            if hits:
+                candidates, shared = np.unique(np.concatenate(hits), return_counts=True)
+                dice = 2 * shared / (len(query_grams) + self._gram_counts[candidates])
+                keep = dice >= MIN_DICE
+                candidates, dice = candidates[keep], dice[keep]
+                for term_id in candidates[np.argsort(-dice, kind='stable')[:MAX_FUZZY_TERMS]].tolist():
+                    if term_id not in found:
+                        score = term_score(query, vocabulary[term_id].decode())
+                        if score:
+                            found[term_id] = score
+        return [(term_id, score) for term_id, score in found.items() if score >= MIN_TERM_SCORE]
+
+    def _term_hits(self, matches: List[Tuple[int, float]]) -> Tuple[List, Optional[np.ndarray], int]:
+        """What one query term's matching vocabulary terms hit: (name rows with their weighted score,
+        weighted score per row group or None, rows hit)"""
+        names = []
+        size = 0
+        _, _, offsets, values = self._fields['name']
+        for term_id, score in matches:
+            rows = values[offsets[term_id]:offsets[term_id + 1]]
+            if len(rows):
+                names.append((rows, score * FIELD_WEIGHTS['name']))
+                size += len(rows)
+        group_codes, _, group_offsets, _ = self._groups
+        groups = None
+        for field in GROUP_FIELDS:
+            _, value_count, offsets, values = self._fields[field]
+            scores = np.zeros(value_count, dtype=np.float32)
+            for term_id, score in matches:
+                posting = values[offsets[term_id]:offsets[term_id + 1]]
+                scores[posting] = np.maximum(scores[posting], score * FIELD_WEIGHTS[field])
+            if scores.any():
+                scores = scores[group_codes[field]]
+                groups = scores if groups is None else np.maximum(groups, scores)
+        if groups is not None:
+            found = np.flatnonzero(groups)
+            size += int((group_offsets[found + 1] - group_offsets[found]).sum())
+        return names, groups, size
+
+    def _term_rows(self, hits: Tuple, n: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Every row one query term hits, each once, and its best score"""
+        names, groups, _ = hits
+        parts = [(rows, np.full(len(rows), score, dtype=np.float32)) for rows, score in names]
+        if groups is not None:
+            _, _, group_offsets, group_rows = self._groups
+            found = np.flatnonzero(groups)
+            starts, counts = group_offsets[found], group_offsets[found + 1] - group_offsets[found]
+            # Positions of the found groups' rows in group_rows, run by run
+            positions = np.arange(counts.sum()) + np.repeat(starts - np.cumsum(counts) + counts, counts)
+            parts.append((group_rows[positions], np.repeat(groups[found], counts)))
+        if len(parts) == 1:
+            return parts[0]
+        # Rows hit by several terms or fields keep their best score, listed where first hit
+        best = np.zeros(n, dtype=np.float32)
+        first = [parts[0][0]]
+        best[parts[0][0]] = parts[0][1]
+        for rows, scores in parts[1:]:
+            current = best[rows]
+            best[rows] = np.maximum(current, scores)
+            first.append(rows[current == 0])
+        rows = np.concatenate(first)
+        return rows, best[rows]
+
+    def _row_scores(self, hits: Tuple, rows: np.ndarray, n: int) -> np.ndarray:
+        """One query term's best score for each of ``rows``"""
+        names, groups, _ = hits
+        scores = np.zeros(len(rows), dtype=np.float32) if groups is None else groups[self._groups[1][rows]]
+        if names:
+            best = np.zeros(n, dtype=np.float32)
+            for name_rows, score in names:
+                best[name_rows] = np.maximum(best[name_rows], score)
+            np.maximum(scores, best[rows], out=scores)
+        return scores
+
+    @staticmethod
+    def _dirty_scores(pending: Tuple, terms: List[str]) -> np.ndarray:
+        """(dirty rows, query terms) best weighted score from each row's current values"""
+        dirty, positions, weights, pair_terms, distinct, distinct_grams, _ = pending
+        scores = np.zeros((len(dirty), len(terms)), dtype=np.float32)
+        # Pairs are in row order: each row's pairs start where its position first appears
+        starts = np.flatnonzero(np.diff(positions, prepend=-1))
+        for j, query in enumerate(terms):
+            query_grams = set(trigrams(query))
+            term_scores = np.zeros(len(distinct), dtype=np.float32)
+            for k, (term, grams) in enumerate(zip(distinct, distinct_grams)):
+                # The same trigram screen the index applies before computing edit distances
+                if term.startswith(query) or _dice(query_grams, grams) >= MIN_DICE:
+                    score = term_score(query, term)
+                    if score >= MIN_TERM_SCORE:
+                        term_scores[k] = score
+            if term_scores.any():
+                scores[positions[starts], j] = np.maximum.reduceat(term_scores[pair_terms] * weights, starts)
+        return scores
+
+    def search(self, query: str, limit: int = 20) -> Dict:
+        """Best ``limit`` rows for ``query`` with 0-100 relevance scores.
+
+        Returns ``rows``, ``scores``, ``terms`` (the folded query terms),
+        ``total`` (rows matching every term) and ``partial``: True when no
+        row matches every term, in which case the results and ``total``
+        cover the rows matching the most terms.
+        """
+        store = self._bind()
+        terms = list(dict.fromkeys(fold(query)))[:MAX_QUERY_TERMS]
+        empty = {'rows': np.empty(0, dtype=np.intp), 'scores': [], 'terms': terms, 'total': 0, 'partial': False}
+        if not terms or not len(store):
+            return empty
+
+        n = len(store)
+        hits = [self._term_hits(self.matching_terms(term)) for term in terms]
+        rows, total = np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+        if all(size for _, _, size in hits):
+            # A row matching every term is one of the rarest term's rows, so only those are scored for the rest
+            order = sorted(range(len(terms)), key=lambda i: hits[i][2])
+            rows, total = self._term_rows(hits[order[0]], n)
+            for i in order[1:]:
+                if not len(rows):
+                    break
+                scores = self._row_scores(hits[i], rows, n)
+                keep = scores > 0
+                rows, total = rows[keep], total[keep] + scores[keep]
+
+        pending = self._pending
+        dirty, is_dirty = pending[0], pending[-1]
+        if len(dirty):
+            dirty_scores = self._dirty_scores(pending, terms)
+            live = (dirty_scores > 0).all(axis=1)
+            keep = ~is_dirty[rows]
+            rows = np.concatenate([rows[keep], dirty[live]])
+            total = np.concatenate([total[keep], dirty_scores[live].sum(axis=1)])
+
+        most = len(terms)
+        if not len(rows):
+            # No row matches every term: score every row any term matches and keep those matching the most
+            total = np.zeros(n, dtype=np.float32)
+            matched = np.zeros(n, dtype=np.int8)
+            candidates = [dirty]
+            for term_hits in hits:
+                if term_hits[2]:
+                    term_rows, scores = self._term_rows(term_hits, n)
+                    total[term_rows] += scores
+                    matched[term_rows] += 1
+                    candidates.append(term_rows)
+            if len(dirty):
+                total[dirty] = dirty_scores.sum(axis=1)
+                matched[dirty] = (dirty_scores > 0).sum(axis=1)
+            candidates = np.unique(np.concatenate(candidates))
+            candidates = candidates[matched[candidates] > 0]
+            if not len(candidates):
+                return empty
+            most = int(matched[candidates].max())
+            rows = candidates[matched[candidates] == most]
+            total = total[rows]
+
+        # Score (to 0.1 points), then overall rating, in one sortable key
+        relevance = np.round(total.astype(np.float64) / len(terms) * 100, 1)
+        key = relevance * 1000 + np.asarray(store.stats['overall'])[rows]
+        k = min(limit, len(rows))
+        top = np.argpartition(-key, k - 1)[:k] if k < len(rows) else np.arange(len(rows))
+        # Equal keys in row order
+        top = top[np.lexsort((rows[top], -key[top]))]
+        return {
+            'rows': rows[top].astype(np.intp),
+            'scores': relevance[top].tolist(),
+            'terms': terms,
+            'total': len(rows),
+            'partial': most < len(terms)
+        }
+
+    def stats(self) -> Dict:
+        self._bind()
+        return {
+            'terms': len(self.vocabulary),
+            'trigrams': len(self._grams),
+            'postings': int(sum(len(field[3]) for field in self._fields.values())),
+            'dirty_rows': len(self.dirty),
+            'build_ms': round(self.build_seconds * 1000, 1) if self.build_seconds is not None else None
+        }
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Champions Gen - Server Entry Point
+
+Runs the Flask app in one of three modes:
+
+- ``dev``: Flask's debug server with the reloader, for local development
+- ``threaded``: one process, multi-threaded WSGI server with HTTP/1.1 keep-alive;
+  also the fallback where gunicorn is unavailable (e.g. Windows)
+- ``prefork``: gunicorn master with pre-forked workers running ``--threads``
+  threads each. ``kill -HUP <master pid>`` reloads gracefully: new workers
+  start before old ones drain and exit.
+
+Prefork workers share the state in ``CHAMPIONS_STATE_DIR`` (training jobs,
+wearables workloads); when it is unset the master creates a temporary one
+for its workers. Each prefork worker serves at most
+``CHAMPIONS_LIVE_MAX_STREAMS`` live streams (default: half its
+``--threads``) and answers more with a 503.
+
+Outside dev mode the app is preloaded (``app.preload``) before serving: in
+prefork mode once in the master, so workers fork with a warm, shared copy
+of the player store and its predictions instead of each building its own
+on its first requests. A preloaded master keeps serving the code it loaded
+across ``-HUP`` reloads; restart it (or pass ``--no-preload``) to pick up
+code changes.
+
+Usage: python serve.py --mode prefork --workers auto --threads 4
+"""
+
+import argparse
+import atexit
+import os
+import shutil
+import sys
+import tempfile
+
+DEFAULT_HOST = '0.0.0.0'
+DEFAULT_PORT = 5000
+
+
+def gunicorn_available() -> bool:
+    try:
+        import gunicorn  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def worker_count(value: str) -> int:
+    """``auto`` sizes to the CPU count, otherwise a positive integer"""
+    if value == 'auto':
+        return os.cpu_count() or 1
+    try:
+        workers = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError("workers must be a positive integer or 'auto'")
+    if workers < 1:
+        raise argparse.ArgumentTypeError("workers must be a positive integer or 'auto'")
+    return workers
+
+
+def build_parser(default_mode: str = None) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='Serve the Champions Gen API')
+    parser.add_argument('--mode', choices=('dev', 'threaded', 'prefork'),
+                        default=default_mode or ('prefork' if gunicorn_available() else 'threaded'))
+    parser.add_argument('--host', default=os.environ.get('CHAMPIONS_HOST', DEFAULT_HOST))
+    parser.add_argument('--port', type=int, default=int(os.environ.get('CHAMPIONS_PORT', DEFAULT_PORT)))
+    parser.add_argument('--workers', type=worker_count, default=os.environ.get('CHAMPIONS_WORKERS', 'auto'),
+                        help="pre-forked worker processes, or 'auto' for one per CPU (prefork)")
+    parser.add_argument('--threads', type=int, default=int(os.environ.get('CHAMPIONS_THREADS', 4)),
+                        help='request threads per worker (prefork)')
+    parser.add_argument('--keepalive', type=int, default=5,
+                        help='seconds to hold idle keep-alive connections open (prefork)')
+    parser.add_argument('--timeout', type=int, default=30,
+                        help='seconds before a silent worker is killed and replaced (prefork)')
+    parser.add_argument('--graceful-timeout', type=int, default=30,
+                        help='seconds workers get to finish in-flight requests on reload/stop (prefork)')
+    parser.add_argument('--max-requests', type=int, default=0,
+                        help='recycle a worker after this many requests, 0 to disable (prefork)')
+    parser.add_argument('--backlog', type=int, default=2048, help='listen socket backlog (prefork)')
+    parser.add_argument('--no-preload', dest='preload', action='store_false',
+                        default=os.environ.get('CHAMPIONS_PRELOAD', '1') != '0',
+                        help='do not warm the app before serving; prefork workers then each build their own (threaded, prefork)')
+    return parser
+
+
+def print_banner(args):
+    print("🚀 Starting Champions Gen Backend Server...")
+    print("📊 AI-Powered Football Analytics Platform")
+    print(f"🔗 API endpoints available at http://localhost:{args.port}/api/")
+    print(f"🌐 Frontend available at http://localhost:{args.port}/")
+    print(f"📋 Health check: http://localhost:{args.port}/api/health")
+    if args.mode == 'prefork':
+        print(f"⚙️  Mode: prefork, {args.workers} workers x {args.threads} threads "
+              f"(master pid {os.getpid()}, kill -HUP to reload)")
+    else:
+        print(f"⚙️  Mode: {args.mode}")
+
+
+def load_app(args):
+    from app import get_app, preload
+    return preload() if args.preload else get_app()
+
+
+def serve_dev(args):
+    from app import app, start_background_tasks
+    # With the reloader, only the child process actually serves requests
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_background_tasks()
+    app.run(debug=True, host=args.host, port=args.port)
+
+
+def serve_threaded(args):
+    from werkzeug.serving import WSGIRequestHandler, make_server
+    from app import start_background_tasks
+
+    class KeepAliveHandler(WSGIRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+    app = load_app(args)
+    start_background_tasks()
+    server = make_server(args.host, args.port, app, threaded=True, request_handler=KeepAliveHandler)
+    server.serve_forever()
+
+
+def shared_state_dir():
+    """Point every worker at one CHAMPIONS_STATE_DIR (created here, removed on exit) unless one is set"""
+    if os.environ.get('CHAMPIONS_STATE_DIR'):
+        return
+    directory = tempfile.mkdtemp(prefix='champions-state-')
+    master = os.getpid()
+    # Workers inherit the exit hooks; only the master removes the directory
+    atexit.register(lambda: os.getpid() == master and shutil.rmtree(directory, ignore_errors=True))
+    os.environ['CHAMPIONS_STATE_DIR'] = directory
+
+
+def live_stream_cap(threads: int):
+    """Cap each worker's live streams at half its threads (unless set), so streams never take them all"""
+    os.environ.setdefault('CHAMPIONS_LIVE_MAX_STREAMS', str(threads // 2))
+
+
+def serve_prefork(args):
+    from gunicorn.app.base import BaseApplication
+
+    def post_worker_init(worker):
+        # Background threads do not survive fork, so each worker starts its own
+        from app import start_background_tasks
+        start_background_tasks()
+
+    class ChampionsApplication(BaseApplication):
+        def __init__(self, options):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            # With preload_app this runs once in the master, before the workers fork
+            return load_app(args)
+
+    # Set before the app is imported, by the master or (without preload) by each worker
+    shared_state_dir()
+    live_stream_cap(args.threads)
+    ChampionsApplication({
+        'bind': f'{args.host}:{args.port}',
+        'workers': args.workers,
+        'threads': args.threads,
+        'worker_class': 'gthread',
+        'keepalive': args.keepalive,
+        'timeout': args.timeout,
+        'graceful_timeout': args.graceful_timeout,
+        'max_requests': args.max_requests,
+        'max_requests_jitter': args.max_requests // 10,
+        'backlog': args.backlog,
+        'preload_app': args.preload,
+        'post_worker_init': post_worker_init,
+    }).run()
+
+
+def main(argv=None, default_mode: str = None):
+    args = build_parser(default_mode).parse_args(argv)
+    if args.mode == 'prefork' and not gunicorn_available():
+        print("⚠️  gunicorn is not installed; falling back to threaded mode")
+        args.mode = 'threaded'
+    print_banner(args)
+    {'dev': serve_dev, 'threaded': serve_threaded, 'prefork': serve_prefork}[args.mode](args)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,275 @@
+"""
+Champions Gen - Player Similarity Index
+
+Embeds every player as a float32 vector of z-scored ``stats`` fields and
+answers two questions: how similar is a given set of players (a dense
+pairwise matrix, used by /api/compare) and who are the k players most like
+this one (/api/players/<id>/similar).
+
+Nearest-player search is exact blocked brute force with ``argpartition`` for
+small stores and an inverted-file (IVF) index above EXACT_SEARCH_LIMIT rows:
+players are clustered into ~sqrt(N) cells with k-means, laid out contiguously
+by cell, and a query only scans the ``nprobe`` closest cells. Records updated
+after the build (read from the store's change log, not by comparing every
+version) are re-embedded and scanned on every query. Once they pass
+REBUILD_FRACTION of the store, a background thread embeds and clusters a
+replacement while queries keep using the current index, then swaps it in.
+``warm`` builds the cells ahead of time (the app's preload hook calls it)
+so no request pays for the clustering.
+"""
+
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from player_store import STAT_FIELDS
+
+METRICS = ('cosine', 'euclidean')
+EXACT_SEARCH_LIMIT = 50000
+DEFAULT_NPROBE = 8
+SEARCH_BLOCK = 131072
+# Bytes of vector x centroid distances computed at once while assigning cells
+ASSIGN_BLOCK_BYTES = 16 << 20
+# Rebuild the IVF cells once this share of rows changed since the last build
+REBUILD_FRACTION = 0.05
+
+logger = logging.getLogger(__name__)
+
+
+def similarity_scores(values: np.ndarray, metric: str) -> np.ndarray:
+    """Map raw cosine similarities or euclidean distances onto a 0-100 score"""
+    values = np.asarray(values, dtype=np.float64)
+    if metric == 'cosine':
+        return (values + 1.0) * 50.0
+    return 100.0 / (1.0 + values)
+
+
+def _top_k(scores: np.ndarray, k: int, largest: bool) -> np.ndarray:
+    """Indices of the k best ``scores``, best first"""
+    k = min(k, len(scores))
+    if k == 0:
+        return np.empty(0, dtype=np.intp)
+    keyed = -scores if largest else scores
+    part = np.argpartition(keyed, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+    return part[np.argsort(keyed[part], kind='stable')]
+
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Nearest centroid per vector, in blocks of about ASSIGN_BLOCK_BYTES of distances"""
+    c_norms = (centroids * centroids).sum(axis=1)
+    cells = np.empty(len(vectors), dtype=np.int32)
+    block_rows = max(256, ASSIGN_BLOCK_BYTES // (4 * len(centroids)))
+    for start in range(0, len(vectors), block_rows):
+        distances = vectors[start:start + block_rows] @ centroids.T
+        distances *= -2.0
+        distances += c_norms
+        cells[start:start + len(distances)] = np.argmin(distances, axis=1)
+    return cells
+
+
+def _kmeans(vectors: np.ndarray, nlist: int, iterations: int = 8, seed: int = 0) -> np.ndarray:
+    """Lloyd's k-means on a sample; returns float32 centroids"""
+    rng = np.random.default_rng(seed)
+    sample_size = min(len(vectors), nlist * 64)
+    sample = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+    centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+    for _ in range(iterations):
+        cells = _assign(sample, centroids)
+        counts = np.bincount(cells, minlength=nlist)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, cells, sample)
+        filled = counts > 0
+        centroids[filled] = sums[filled] / counts[filled, None]
+    return centroids
+
+
+class _IVF:
+    """Inverted-file layout: rows grouped by k-means cell with contiguous vectors"""
+
+    def __init__(self, vectors: np.ndarray):
+        nlist = max(1, int(np.sqrt(len(vectors))))
+        self.centroids = _kmeans(vectors, nlist)
+        cells = _assign(vectors, self.centroids)
+        self.order = np.argsort(cells, kind='stable')
+        self.vectors = vectors[self.order]
+        self.offsets = np.concatenate(([0], np.cumsum(np.bincount(cells, minlength=nlist))))
+
+    def candidates(self, query: np.ndarray, nprobe: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(row ids, vectors) of the ``nprobe`` cells closest to ``query``"""
+        c_dist = ((self.centroids - query) ** 2).sum(axis=1)
+        probe = _top_k(c_dist, nprobe, largest=False)
+        slices = [slice(self.offsets[c], self.offsets[c + 1]) for c in probe.tolist()]
+        rows = np.concatenate([self.order[s] for s in slices])
+        vectors = np.concatenate([self.vectors[s] for s in slices])
+        return rows, vectors
+
+
+class _Embedding:
+    """One build's vectors: normalization, per-metric vectors, IVF cells and rows re-embedded since"""
+
+    def __init__(self, store, cursor: int):
+        raw = np.column_stack([store.stats[f] for f in STAT_FIELDS]).astype(np.float32)
+        self.mean = raw.mean(axis=0) if len(raw) else np.zeros(len(STAT_FIELDS), dtype=np.float32)
+        std = raw.std(axis=0) if len(raw) else np.ones(len(STAT_FIELDS), dtype=np.float32)
+        self.std = np.where(std > 0, std, 1.0).astype(np.float32)
+        self.versions = store.versions.copy()
+        self.vectors = {'euclidean': self.embed(store)}
+        self.vectors['cosine'] = _unit(self.vectors['euclidean'])
+        self.dirty = np.empty(0, dtype=np.intp)
+        self.ivf: Dict[str, _IVF] = {}
+        # Store updates up to this one are in the vectors
+        self.cursor = cursor
+
+    def embed(self, store, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        columns = [store.stats[f] if rows is None else store.stats[f][rows] for f in STAT_FIELDS]
+        matrix = np.column_stack(columns).astype(np.float32)
+        return (matrix - self.mean) / self.std
+
+    def refresh(self, store, rows: np.ndarray):
+        """Re-embed updated rows in place and put them on the always-scanned dirty list"""
+        embedded = self.embed(store, rows)
+        self.vectors['euclidean'][rows] = embedded
+        self.vectors['cosine'][rows] = _unit(embedded)
+        self.versions[rows] = store.versions[rows]
+        self.dirty = np.union1d(self.dirty, rows)
+
+
+def _unit(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1.0)
+
+
+class SimilarityIndex:
+    """Stat-vector similarity over a PlayerStore, rebuilt when the app swaps stores"""
+
+    def __init__(self, store_getter: Callable, exact_limit: int = EXACT_SEARCH_LIMIT):
+        self._store_getter = store_getter
+        self.exact_limit = exact_limit
+        self._lock = threading.Lock()
+        self._store = None
+        self._embedding: Optional[_Embedding] = None
+        self._rebuilding = False
+        self.rebuilds = 0
+        self.last_error: Optional[str] = None
+
+    def _bind(self) -> Tuple[object, _Embedding]:
+        store = self._store_getter()
+        if store is not self._store:
+            with self._lock:
+                if store is not self._store:
+                    self._embedding = self._build(store)
+                    self._store = store
+        else:
+            self._sync(store)
+        return store, self._embedding
+
+    def _build(self, store) -> _Embedding:
+        """Embed the whole store; above ``exact_limit`` rows also cluster every metric's IVF cells"""
+        embedding = _Embedding(store, store.change_cursor)
+        if len(store) > self.exact_limit:
+            for metric in METRICS:
+                embedding.ivf[metric] = _IVF(embedding.vectors[metric])
+        return embedding
+
+    def _sync(self, store):
+        """Re-embed rows updated since the last look; past REBUILD_FRACTION of them, rebuild in the background"""
+        embedding = self._embedding
+        if embedding.cursor == store.change_cursor:
+            return
+        with self._lock:
+            embedding = self._embedding
+            changed, cursor = store.changes(embedding.cursor)
+            if changed is None:
+                # Too many updates since the last look for the log; compare versions once
+                changed = np.flatnonzero(store.versions != embedding.versions)
+            if len(changed):
+                embedding.refresh(store, changed)
+            embedding.cursor = cursor
+            if len(embedding.dirty) > REBUILD_FRACTION * len(store) and not self._rebuilding:
+                self._rebuilding = True
+                threading.Thread(target=self._rebuild, args=(store,), name='similarity-rebuild', daemon=True).start()
+
+    def _rebuild(self, store):
+        """Build a replacement off the request path, catch it up and swap it in; queries keep the old one meanwhile"""
+        try:
+            embedding = self._build(store)
+            with self._lock:
+                if store is self._store:
+                    changed, cursor = store.changes(embedding.cursor)
+                    if changed is None:
+                        changed = np.flatnonzero(store.versions != embedding.versions)
+                    if len(changed):
+                        embedding.refresh(store, changed)
+                    embedding.cursor = cursor
+                    self._embedding = embedding
+                    self.rebuilds += 1
+        except Exception as e:
+            self.last_error = f'rebuild: {type(e).__name__}: {e}'
+            logger.exception('similarity index rebuild failed')
+        finally:
+            self._rebuilding = False
+
+    def _ivf_for(self, embedding: _Embedding, metric: str) -> _IVF:
+        ivf = embedding.ivf.get(metric)
+        if ivf is None:
+            with self._lock:
+                ivf = embedding.ivf.get(metric) or embedding.ivf.setdefault(metric, _IVF(embedding.vectors[metric]))
+        return ivf
+
+    def warm(self) -> None:
+        """Embed the current store and, above ``exact_limit`` rows, build the IVF cells of every metric"""
+        self._bind()
+
+    def _score(self, vectors: np.ndarray, query: np.ndarray, metric: str) -> np.ndarray:
+        """Raw cosine similarity or euclidean distance of each row to ``query``"""
+        if metric == 'cosine':
+            return vectors @ query
+        diff = vectors - query
+        return np.sqrt(np.einsum('ij,ij->i', diff, diff))
+
+    def pairwise(self, rows: np.ndarray, metric: str = 'cosine') -> np.ndarray:
+        """Dense 0-100 similarity matrix between the given rows"""
+        _, embedding = self._bind()
+        vectors = embedding.vectors[metric][rows]
+        if metric == 'cosine':
+            raw = np.clip(vectors @ vectors.T, -1.0, 1.0)
+        else:
+            sq = (vectors * vectors).sum(axis=1)
+            raw = np.sqrt(np.maximum(sq[:, None] + sq[None, :] - 2.0 * (vectors @ vectors.T), 0.0))
+        return similarity_scores(raw, metric)
+
+    def nearest(self, row: int, k: int = 10, metric: str = 'cosine', exact: Optional[bool] = None,
+                nprobe: int = DEFAULT_NPROBE) -> List[Tuple[int, float]]:
+        """The k players most similar to ``row`` as (row, 0-100 score), best first"""
+        store, embedding = self._bind()
+        vectors = embedding.vectors[metric]
+        query = vectors[row]
+        largest = metric == 'cosine'
+        if exact is None:
+            exact = len(store) <= self.exact_limit
+
+        if exact:
+            best_rows, best_raw = [], []
+            for start in range(0, len(vectors), SEARCH_BLOCK):
+                raw = self._score(vectors[start:start + SEARCH_BLOCK], query, metric)
+                top = _top_k(raw, k + 1, largest)
+                best_rows.append(top + start)
+                best_raw.append(raw[top])
+            rows, raw = np.concatenate(best_rows), np.concatenate(best_raw)
+        else:
+            rows, cand = self._ivf_for(embedding, metric).candidates(query, nprobe)
+            dirty = embedding.dirty
+            if len(dirty):
+                # Updated rows may have moved cells: drop stale placements, scan current vectors
+                keep = ~np.isin(rows, dirty)
+                rows = np.concatenate([rows[keep], dirty])
+                cand = np.concatenate([cand[keep], vectors[dirty]])
+            raw = self._score(cand, query, metric)
+
+        keep = rows != row
+        rows, raw = rows[keep], raw[keep]
+        top = _top_k(raw, k, largest)
+        scores = similarity_scores(raw[top], metric)
+        return list(zip(rows[top].tolist(), np.round(scores, 1).tolist()))
@@ -15,9 +15,14 @@ if errorlevel 1 (
     exit /b 1
 )
 
-REM Install dependencies
-echo Installing dependencies...
-pip install -r requirements.txt >nul 2>&1
+REM Install dependencies only when something is missing or outdated
+python -c "import sys, run; sys.exit(run.missing_requirements() != [])" >nul 2>&1
+if errorlevel 1 (
+    echo Installing dependencies...
+    pip install -r requirements.txt >nul 2>&1
+) else (
+    echo Dependencies already satisfied
+)
 
 REM Start the server
 echo.
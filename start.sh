@@ -24,9 +24,13 @@ fi
 
 echo "✅ Python $python_version detected"
 
-# Install dependencies
-echo "📦 Installing dependencies..."
-pip3 install -r requirements.txt > /dev/null 2>&1
+# Install dependencies only when something is missing or outdated
+if python3 -c "import sys, run; sys.exit(run.missing_requirements() != [])" 2> /dev/null; then
+    echo "✅ Dependencies already satisfied"
+else
+    echo "📦 Installing dependencies..."
+    pip3 install -r requirements.txt > /dev/null 2>&1
+fi
 
 # Start the server
 echo
@@ -36,4 +40,4 @@ echo "   Open: http://localhost:5000"
 echo "========================================"
 echo
 
-python3 app.py
+exec python3 serve.py "$@"
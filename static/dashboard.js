@@ -0,0 +1,160 @@
+// Champions Gen - Dashboard Content
+// Fixtures, governance overview and chart configurations for the dashboard pages;
+// player data comes from /api/bootstrap
+
+// Team fixtures and strategy data
+const fixturesData = {
+    upcoming: [
+        { opponent: 'Barcelona', venue: 'H', intensity: 'High', date: '2024-10-26', competition: 'El Clasico' },
+        { opponent: 'Atletico Madrid', venue: 'A', intensity: 'Medium', date: '2024-10-29', competition: 'La Liga' },
+        { opponent: 'Valencia', venue: 'H', intensity: 'Low', date: '2024-11-02', competition: 'La Liga' },
+        { opponent: 'AC Milan', venue: 'A', intensity: 'High', date: '2024-11-05', competition: 'Champions League' },
+        { opponent: 'Osasuna', venue: 'H', intensity: 'Medium', date: '2024-11-09', competition: 'La Liga' }
+    ],
+    squadFatigue: {
+        overall: 65,
+        keyPlayers: 80,
+        recommendations: [
+            {
+                title: 'Midfield Rotation',
+                description: 'Rest Bellingham for Valencia fixture. Deploy Camavinga and Tchouaméni to maintain intensity while managing load.',
+                priority: 'HIGH'
+            },
+            {
+                title: 'Forward Line Management',
+                description: 'Rotate Mbappé and Vinícius across fixtures to maintain freshness for high-intensity matches.',
+                priority: 'MEDIUM'
+            },
+            {
+                title: 'Defense Stability',
+                description: 'Maintain core defensive partnership while introducing rotation in fullback positions.',
+                priority: 'LOW'
+            }
+        ]
+    }
+};
+
+// Data governance information
+const governanceData = {
+    dataSources: [
+        { name: 'Performance Database', status: 'online', latency: 0 },
+        { name: 'Biomedical EMR', status: 'online', latency: 0 },
+        { name: 'Wearables Data', status: 'warning', latency: 2 },
+        { name: 'Match Statistics', status: 'online', latency: 0 },
+        { name: 'Training Load Data', status: 'online', latency: 1 },
+        { name: 'Video Analysis', status: 'online', latency: 0 }
+    ],
+    systemHealth: [
+        { name: 'CPU Usage', value: 45, status: 'good' },
+        { name: 'Memory Usage', value: 72, status: 'warning' },
+        { name: 'Disk Storage', value: 38, status: 'good' },
+        { name: 'Network Latency', value: 12, status: 'good' }
+    ],
+    accessControl: [
+        { role: 'Head Coach', access: 'Full Access', level: 'admin' },
+        { role: 'Assistant Coaches', access: 'Limited Access', level: 'coach' },
+        { role: 'Medical Staff', access: 'Medical Data Only', level: 'medical' },
+        { role: 'Analysts', access: 'Performance Data', level: 'analyst' },
+        { role: 'Management', access: 'Strategic Overview', level: 'management' }
+    ]
+};
+
+// Chart data configurations
+const chartConfigs = {
+    performance: {
+        labels: ['Week 1', 'Week 2', 'Week 3', 'Week 4', 'Week 5', 'Week 6', 'Week 7', 'Week 8', 'Week 9', 'Week 10', 'Week 11', 'Week 12'],
+        datasets: [
+            {
+                label: 'Passing Accuracy',
+                data: [82, 84, 85, 83, 86, 87, 88, 87, 89, 87, 88, 90],
+                borderColor: '#00f5ff',
+                backgroundColor: 'rgba(0, 245, 255, 0.1)',
+                tension: 0.4
+            },
+            {
+                label: 'Dribbling Success',
+                data: [70, 72, 71, 74, 76, 75, 78, 79, 77, 80, 78, 82],
+                borderColor: '#0080ff',
+                backgroundColor: 'rgba(0, 128, 255, 0.1)',
+                tension: 0.4
+            },
+            {
+                label: 'Defensive Actions',
+                data: [75, 74, 76, 73, 72, 74, 71, 73, 72, 70, 71, 72],
+                borderColor: '#ff6666',
+                backgroundColor: 'rgba(255, 102, 102, 0.1)',
+                tension: 0.4
+            }
+        ]
+    },
+    riskTimeline: {
+        labels: ['T0', 'T+1', 'T+2', 'T+3', 'T+4', 'T+5', 'T+6', 'T+7', 'T+8', 'T+9', 'T+10', 'T+11', 'T+12', 'T+13', 'T+14'],
+        datasets: [{
+            label: 'Injury Risk %',
+            data: [15, 16, 17, 18, 19, 20, 21, 22, 23, 24, 25, 26, 27, 28, 28],
+            borderColor: '#ff6666',
+            backgroundColor: 'rgba(255, 102, 102, 0.2)',
+            tension: 0.4,
+            fill: true
+        }]
+    },
+    valuation: {
+        labels: ['Current', '1 Year', '2 Years', '3 Years', '4 Years', '5 Years'],
+        datasets: [{
+            label: 'Market Value (€M)',
+            data: [200, 195, 180, 160, 140, 120],
+            borderColor: '#00f5ff',
+            backgroundColor: 'rgba(0, 245, 255, 0.1)',
+            tension: 0.4,
+            fill: true
+        }]
+    },
+    fatigue: {
+        labels: ['Bellingham', 'Mbappé', 'Vinicius', 'Camavinga', 'Tchouaméni', 'Modric', 'Kroos', 'Valverde'],
+        datasets: [{
+            label: 'Fatigue Level %',
+            data: [75, 82, 68, 58, 65, 88, 72, 61],
+            backgroundColor: [
+                'rgba(255, 206, 84, 0.8)',
+                'rgba(255, 99, 132, 0.8)',
+                'rgba(54, 162, 235, 0.8)',
+                'rgba(75, 192, 192, 0.8)',
+                'rgba(153, 102, 255, 0.8)',
+                'rgba(255, 159, 64, 0.8)',
+                'rgba(199, 199, 199, 0.8)',
+                'rgba(83, 102, 255, 0.8)'
+            ],
+            borderColor: [
+                'rgba(255, 206, 84, 1)',
+                'rgba(255, 99, 132, 1)',
+                'rgba(54, 162, 235, 1)',
+                'rgba(75, 192, 192, 1)',
+                'rgba(153, 102, 255, 1)',
+                'rgba(255, 159, 64, 1)',
+                'rgba(199, 199, 199, 1)',
+                'rgba(83, 102, 255, 1)'
+            ],
+            borderWidth: 1
+        }]
+    },
+    success: {
+        labels: ['Transfer Error Reduction', 'Injury Prevention Rate', 'ROI Improvement', 'Player Development'],
+        datasets: [{
+            label: 'Success Metrics %',
+            data: [67, 43, 156, 89],
+            backgroundColor: [
+                'rgba(0, 255, 0, 0.8)',
+                'rgba(0, 245, 255, 0.8)',
+                'rgba(255, 215, 0, 0.8)',
+                'rgba(138, 43, 226, 0.8)'
+            ],
+            borderColor: [
+                'rgba(0, 255, 0, 1)',
+                'rgba(0, 245, 255, 1)',
+                'rgba(255, 215, 0, 1)',
+                'rgba(138, 43, 226, 1)'
+            ],
+            borderWidth: 2
+        }]
+    }
+};
@@ -11,14 +11,119 @@ let currentFilters = {
     league: 'All Leagues',
     budget: 50
 };
+let playersDatabase = {};
+let trainingRecommendations = {};
 
-// Initialize the application
+// Initialize the application once player data has loaded
 document.addEventListener('DOMContentLoaded', function() {
-    initializeApp();
     setupEventListeners();
-    loadInitialData();
+    loadBootstrapData().then(() => {
+        initializeApp();
+        loadInitialData();
+    });
 });
 
+// Player data from the backend store (/api/bootstrap), cached by the browser and
+// revalidated by ETag, so a reload only downloads it again after it changed
+async function loadBootstrapData() {
+    try {
+        const response = await fetch('/api/bootstrap');
+        if (!response.ok) {
+            throw new Error(`HTTP ${response.status}`);
+        }
+        const data = await response.json();
+        const records = data.players.map(row =>
+            Object.fromEntries(data.fields.map((field, i) => [field, row[i]])));
+        records.forEach(record => {
+            playersDatabase[record.id] = toPlayerView(record, records);
+            trainingRecommendations[record.id] = record.training;
+        });
+        populatePlayerSelects();
+    } catch (error) {
+        console.error('Failed to load player data:', error);
+        showNotification('Player data could not be loaded');
+    }
+}
+
+function toPlayerView(record, records) {
+    const injury = record.injury;
+    const value = record.value;
+    const risk = injury.current_risk;
+    return {
+        id: record.id,
+        name: record.name,
+        position: record.position,
+        club: record.club,
+        league: record.league,
+        age: record.age,
+        nationality: record.nationality,
+        currentValue: record.current_value,
+        predictedValue: value.predictions[1],
+        riskLevel: risk <= 20 ? 'low' : risk <= 35 ? 'medium' : 'high',
+        similarity: record.similarity === null ? '-' : Math.round(record.similarity),
+        stats: {
+            overall: record.stats.overall,
+            goals90: record.stats.goals_90,
+            assists90: record.stats.assists_90,
+            passAccuracy: record.stats.pass_accuracy,
+            tackles90: record.stats.tackles_90,
+            dribbles90: record.stats.dribbles_90
+        },
+        workload: record.workload,
+        development: Object.fromEntries(record.development.development_areas.map(area => [
+            area.skill.toLowerCase(),
+            {
+                current: area.current,
+                change: area.potential - area.current,
+                trend: area.potential >= area.current ? 'positive' : 'negative'
+            }
+        ])),
+        injury: {
+            currentRisk: injury.current_risk,
+            weeklyRisk: injury.weekly_risk,
+            biweeklyRisk: injury.biweekly_risk,
+            drivers: injury.drivers
+        },
+        xai: {
+            confidence: record.explanation.confidence,
+            factors: record.explanation.explanations.map(factor => ({
+                name: factor.factor,
+                impact: factor.explanation,
+                confidence: Math.round(factor.importance * 100)
+            }))
+        },
+        valuation: {
+            comparable: record.comparable.map(i => ({
+                name: records[i].name,
+                club: records[i].club,
+                value: records[i].current_value
+            })),
+            insights: value.factors.map(factor => ({
+                title: factor.name,
+                description: `Rated ${factor.impact} by the valuation model`
+            })).concat([{
+                title: 'Optimal Sell Window',
+                description: value.optimal_sell_window
+            }]),
+            predictions: [record.current_value].concat(value.predictions)
+        }
+    };
+}
+
+function populatePlayerSelects() {
+    const players = Object.values(playersDatabase);
+    ['dev-player-select', 'injury-player-select', 'valuation-player-select'].forEach(id => {
+        const select = document.getElementById(id);
+        if (!select) return;
+        const selected = select.value;
+        select.innerHTML = '';
+        players.forEach(player => select.add(new Option(player.name, player.id)));
+        if (playersDatabase[selected]) {
+            select.value = selected;
+        }
+    });
+}
+
 function initializeApp() {
     // Initialize page navigation
     showPage('landing');
@@ -370,24 +475,36 @@ function updateDevelopmentData() {
 
 function updatePhysicalMetrics(player) {
     const physicalMetrics = document.getElementById('physical-metrics');
-    if (!physicalMetrics || !player.physical) return;
+    if (!physicalMetrics) return;
+    
+    // Measured workload from ingested wearables samples
+    const workload = player.workload;
+    if (!workload) {
+        physicalMetrics.innerHTML = `
+            <div class="metric-card">
+                <span class="metric-value">-</span>
+                <span class="metric-label">No wearables data yet</span>
+            </div>
+        `;
+        return;
+    }
     
     physicalMetrics.innerHTML = `
         <div class="metric-card">
-            <span class="metric-value">${player.physical.sprintSpeed}</span>
-            <span class="metric-label">Sprint Speed (km/h)</span>
+            <span class="metric-value">${(workload.distance_7d_m / 1000).toFixed(1)}</span>
+            <span class="metric-label">Distance, 7 Days (km)</span>
         </div>
         <div class="metric-card">
-            <span class="metric-value">${player.physical.distanceCovered}</span>
-            <span class="metric-label">Distance Covered (km)</span>
+            <span class="metric-value">${(workload.high_speed_distance_7d_m / 1000).toFixed(1)}</span>
+            <span class="metric-label">High-Speed Distance, 7 Days (km)</span>
         </div>
         <div class="metric-card">
-            <span class="metric-value">${player.physical.sprintRecovery}%</span>
-            <span class="metric-label">Sprint Recovery</span>
+            <span class="metric-value">${workload.acwr ?? '-'}</span>
+            <span class="metric-label">Acute:Chronic Workload Ratio</span>
         </div>
         <div class="metric-card">
-            <span class="metric-value">${player.physical.powerOutput}</span>
-            <span class="metric-label">Power Output</span>
+            <span class="metric-value">${workload.load_48h}</span>
+            <span class="metric-label">Load, Last 48h</span>
         </div>
     `;
 }
@@ -1070,26 +1187,32 @@ function resetDemo() {
     showNotification('Demo Reset Complete', 'info');
 }
 
+// The name filter answers each keystroke at once; a debounced /api/players/search
+// request then narrows the list with accent-folded, typo-tolerant matching that
+// also covers club, league and nationality
+const PLAYER_SEARCH_DELAY_MS = 150;
+let playerSearchTimer = null;
+let playerSearchController = null;
+
+function filterPlayerOptions(dropdown, matches) {
+    dropdown.querySelectorAll('option').forEach(option => {
+        if (option.value === '') return; // Skip the default option
+        option.style.display = matches(option) ? 'block' : 'none';
+    });
+}
+
 function searchPlayers() {
     const searchInput = document.getElementById('playerSearch');
     const dropdown = document.getElementById('playerDropdown');
     
     if (!searchInput || !dropdown) return;
     
-    const searchTerm = searchInput.value.toLowerCase();
+    const query = searchInput.value.trim();
+    const searchTerm = query.toLowerCase();
     const options = dropdown.querySelectorAll('option');
     
     // Filter dropdown options based on search
-    options.forEach(option => {
-        if (option.value === '') return; // Skip the default option
-        
-        const playerName = option.textContent.toLowerCase();
-        if (playerName.includes(searchTerm)) {
-            option.style.display = 'block';
-        } else {
-            option.style.display = 'none';
-        }
-    });
+    filterPlayerOptions(dropdown, option => option.textContent.toLowerCase().includes(searchTerm));
     
     // Auto-select if exact match
     const exactMatch = Array.from(options).find(option => 
@@ -1100,6 +1223,28 @@ function searchPlayers() {
         dropdown.value = exactMatch.value;
         selectPlayer();
     }
+    
+    clearTimeout(playerSearchTimer);
+    if (playerSearchController) playerSearchController.abort();
+    if (!query) return;
+    playerSearchTimer = setTimeout(() => fetchPlayerMatches(dropdown, query), PLAYER_SEARCH_DELAY_MS);
+}
+
+async function fetchPlayerMatches(dropdown, query) {
+    const controller = playerSearchController = new AbortController();
+    try {
+        const params = new URLSearchParams({q: query, fields: 'id', limit: 100});
+        const response = await fetch(`/api/players/search?${params}`, {signal: controller.signal});
+        if (!response.ok) {
+            throw new Error(`HTTP ${response.status}`);
+        }
+        const data = await response.json();
+        const matches = new Set(data.results.map(result => result.player.id));
+        filterPlayerOptions(dropdown, option => matches.has(option.value));
+    } catch (error) {
+        // Superseded by a newer keystroke, or unavailable: the name filter stays
+        if (error.name !== 'AbortError') console.error('Player search failed:', error);
+    }
 }
 
 function selectPlayer() {
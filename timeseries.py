@@ -0,0 +1,405 @@
+"""
+Champions Gen - Performance Time-Series Store
+
+Append-only per-player history of match and training sessions behind
+/api/analytics/performance. Each player's sessions live in fixed-capacity
+chunks of a structured NumPy array (timestamp + one float32 column per
+metric). Full chunks are sealed; with a ``directory`` they are written as
+``.npy`` files and reopened memory-mapped, so years of history cost page
+cache rather than heap and survive restarts. The open tail chunk is
+mirrored by an append-only ``.tail`` log of raw records, written on every
+append and removed once its chunk is sealed, so recent sessions survive a
+restart too. Processes sharing a directory (prefork workers) append under
+an exclusive lock on it, first reloading any player whose chunks or tail
+another process extended, so no process seals or logs over another's
+sessions. The lock file also counts appends; queries compare it with the
+count they last saw and reload changed players, so every worker answers
+with every worker's sessions.
+
+Range queries binary-search the chunk boundaries and then each chunk's
+timestamps. Downsampling groups the selected sessions into fixed buckets
+with ``np.add.reduceat``/``np.maximum.reduceat``, and trends come from a
+rolling least-squares slope computed with cumulative sums.
+"""
+
+import hashlib
+import os
+import re
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from numpy.lib.recfunctions import structured_to_unstructured
+
+try:
+    import fcntl
+except ImportError:  # Windows, where serve.py runs a single process
+    fcntl = None
+
+METRICS = ('passing_accuracy', 'dribbling_success', 'defensive_actions', 'goals', 'assists')
+# Count metrics add up within a bucket; rate metrics average
+COUNT_METRICS = ('goals', 'assists')
+SESSION_DTYPE = np.dtype([('t', np.int64)] + [(m, np.float32) for m in METRICS])
+CHUNK_CAPACITY = 4096
+AGGREGATIONS = ('auto', 'mean', 'max', 'sum')
+LOCK_FILE = '.append.lock'
+
+DAY = 86400
+WEEK = 7 * DAY
+_UNITS = {'d': DAY, 'day': DAY, 'days': DAY, 'w': WEEK, 'week': WEEK, 'weeks': WEEK,
+          'm': 30 * DAY, 'month': 30 * DAY, 'months': 30 * DAY,
+          'y': 365 * DAY, 'year': 365 * DAY, 'years': 365 * DAY}
+_DURATION = re.compile(r'^\s*(\d+)\s*([a-z]+)\s*$')
+# Longer durations would overflow the int64 timestamps they are subtracted from
+MAX_DURATION = 10000 * 365 * DAY
+
+
+def parse_duration(text: str) -> int:
+    """Seconds in a duration like ``12weeks``, ``30d``, ``6months`` or ``5years``"""
+    match = _DURATION.match(text.lower())
+    if not match or match.group(2) not in _UNITS or int(match.group(1)) < 1:
+        raise ValueError(f'Invalid duration: {text}. Use e.g. 12weeks, 30d, 6months, 5years')
+    seconds = int(match.group(1)) * _UNITS[match.group(2)]
+    if seconds > MAX_DURATION:
+        raise ValueError(f'Duration too long: {text}')
+    return seconds
+
+
+class _Chunk:
+    __slots__ = ('data', 'size')
+
+    def __init__(self, data: np.ndarray, size: int):
+        self.data = data
+        self.size = size
+
+    @property
+    def last(self) -> int:
+        return int(self.data['t'][self.size - 1])
+
+    def view(self) -> np.ndarray:
+        return self.data[:self.size]
+
+
+class _Series:
+    """Chunked, time-ordered sessions of one player"""
+
+    def __init__(self):
+        self.chunks: List[_Chunk] = []
+        self.starts: List[int] = []  # first timestamp per chunk, for bisecting
+
+    @property
+    def last(self) -> Optional[int]:
+        return self.chunks[-1].last if self.chunks else None
+
+    def __len__(self) -> int:
+        return sum(c.size for c in self.chunks)
+
+
+class TimeSeriesStore:
+    """Append-only session history keyed by player id"""
+
+    def __init__(self, directory: Optional[str] = None, chunk_capacity: int = CHUNK_CAPACITY):
+        self.directory = directory
+        self.chunk_capacity = chunk_capacity
+        self._series: Dict[str, _Series] = {}
+        self._lock = threading.Lock()
+        self._lock_file: Optional[int] = None
+        self._lock_pid: Optional[int] = None
+        self._seen = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            with self._writing():
+                self._load()
+                if fcntl is not None:
+                    self._seen = self._generation()
+
+    def _player_dir(self, player_id: str) -> str:
+        return os.path.join(self.directory, player_id)
+
+    def _chunk_path(self, player_id: str, index: int, suffix: str) -> str:
+        return os.path.join(self._player_dir(player_id), f'{index:06d}{suffix}')
+
+    def _load(self):
+        """Reopen every player's chunks written by previous (or other) processes"""
+        for player_id in sorted(os.listdir(self.directory)):
+            if os.path.isdir(self._player_dir(player_id)):
+                self._series[player_id] = self._load_series(player_id)
+
+    def _load_series(self, player_id: str) -> _Series:
+        """A player's sealed chunks as read-only memory maps, then its open tail"""
+        series = _Series()
+        path = self._player_dir(player_id)
+        names = sorted(os.listdir(path))
+        for name in names:
+            if name.endswith('.npy'):
+                data = np.load(os.path.join(path, name), mmap_mode='r')
+                series.chunks.append(_Chunk(data, len(data)))
+                series.starts.append(int(data['t'][0]))
+        for name in names:
+            if not name.endswith('.tail'):
+                continue
+            if int(name[:-len('.tail')]) < len(series.chunks):
+                # Sealed just before the process stopped; the .npy holds these records
+                os.remove(os.path.join(path, name))
+                continue
+            with open(os.path.join(path, name), 'rb+') as f:
+                raw = f.read()
+                whole = len(raw) - len(raw) % SESSION_DTYPE.itemsize
+                if whole < len(raw):
+                    # A record cut short by a crash mid-write; later appends must stay aligned
+                    f.truncate(whole)
+            tail = np.frombuffer(raw[:whole], dtype=SESSION_DTYPE)
+            if len(tail):
+                chunk = _Chunk(np.empty(self.chunk_capacity, dtype=SESSION_DTYPE), len(tail))
+                chunk.data[:len(tail)] = tail
+                series.chunks.append(chunk)
+                series.starts.append(int(tail['t'][0]))
+        return series
+
+    def _lock_fd(self) -> int:
+        if self._lock_pid != os.getpid():
+            # A descriptor inherited across fork shares its lock with the parent; each process opens its own
+            self._lock_file = os.open(os.path.join(self.directory, LOCK_FILE), os.O_RDWR | os.O_CREAT, 0o644)
+            self._lock_pid = os.getpid()
+        return self._lock_file
+
+    def _generation(self) -> int:
+        """Appends made to the directory by all processes, counted in the lock file"""
+        raw = os.pread(self._lock_fd(), 8, 0)
+        return int.from_bytes(raw, 'little') if len(raw) == 8 else 0
+
+    @contextmanager
+    def _writing(self):
+        """Exclusive hold on the directory across processes (prefork workers share it)"""
+        if not self.directory or fcntl is None:
+            yield
+            return
+        fcntl.flock(self._lock_fd(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_fd(), fcntl.LOCK_UN)
+
+    def _sync(self):
+        """Reload players other processes appended to since this one last looked (lock held)"""
+        generation = self._generation()
+        if generation != self._seen:
+            for player_id in os.listdir(self.directory):
+                if os.path.isdir(self._player_dir(player_id)):
+                    self._current(player_id)
+            self._seen = generation
+
+    def _refresh(self):
+        if self.directory and fcntl is not None and self._generation() != self._seen:
+            with self._lock, self._writing():
+                self._sync()
+
+    def _current(self, player_id: str) -> _Series:
+        """The player's series, reloaded first if another process appended to it since this one last did"""
+        series = self._series.get(player_id)
+        if not self.directory:
+            return series if series is not None else self._series.setdefault(player_id, _Series())
+        path = self._player_dir(player_id)
+        if not os.path.isdir(path):
+            return series if series is not None else self._series.setdefault(player_id, _Series())
+        sealed = sum(name.endswith('.npy') for name in os.listdir(path))
+        try:
+            tail = os.path.getsize(self._chunk_path(player_id, sealed, '.tail')) // SESSION_DTYPE.itemsize
+        except FileNotFoundError:
+            tail = 0
+        if series is not None:
+            chunks = series.chunks
+            open_size = chunks[-1].size if chunks and chunks[-1].size < self.chunk_capacity else 0
+            if (len(chunks) - (open_size > 0), open_size) == (sealed, tail):
+                return series
+        series = self._series[player_id] = self._load_series(player_id)
+        return series
+
+    def _log(self, player_id: str, index: int, sessions: np.ndarray):
+        """Append records of the open chunk ``index`` to its tail log"""
+        if not self.directory:
+            return
+        os.makedirs(self._player_dir(player_id), exist_ok=True)
+        with open(self._chunk_path(player_id, index, '.tail'), 'ab') as f:
+            f.write(sessions.tobytes())
+
+    def _seal(self, player_id: str, series: _Series, chunk: _Chunk):
+        if not self.directory:
+            return
+        index = len(series.chunks) - 1
+        path = self._chunk_path(player_id, index, '.npy')
+        # Write then rename, so a reopened directory never sees a half-written chunk
+        with open(path + '.tmp', 'wb') as f:
+            np.save(f, chunk.view())
+        os.replace(path + '.tmp', path)
+        os.remove(self._chunk_path(player_id, index, '.tail'))
+        chunk.data = np.load(path, mmap_mode='r')
+
+    def players(self) -> List[str]:
+        self._refresh()
+        return list(self._series)
+
+    def append(self, player_id: str, sessions: np.ndarray) -> int:
+        """Append sessions (SESSION_DTYPE) in time order; returns the player's session count.
+
+        Raises ValueError if the batch starts before the player's last stored session.
+        """
+        sessions = np.sort(np.asarray(sessions, dtype=SESSION_DTYPE), order='t')
+        if not len(sessions):
+            return len(self._series.get(player_id, ()))
+        with self._lock, self._writing():
+            if self.directory and fcntl is not None:
+                self._sync()
+            series = self._current(player_id)
+            if series.last is not None and sessions['t'][0] < series.last:
+                raise ValueError('Sessions must not precede the latest stored session (append-only)')
+            offset = 0
+            while offset < len(sessions):
+                if not series.chunks or series.chunks[-1].size == self.chunk_capacity:
+                    chunk = _Chunk(np.empty(self.chunk_capacity, dtype=SESSION_DTYPE), 0)
+                    series.chunks.append(chunk)
+                    series.starts.append(int(sessions['t'][offset]))
+                chunk = series.chunks[-1]
+                take = min(self.chunk_capacity - chunk.size, len(sessions) - offset)
+                self._log(player_id, len(series.chunks) - 1, sessions[offset:offset + take])
+                chunk.data[chunk.size:chunk.size + take] = sessions[offset:offset + take]
+                chunk.size += take
+                offset += take
+                if chunk.size == self.chunk_capacity:
+                    self._seal(player_id, series, chunk)
+            if self.directory and fcntl is not None:
+                self._seen += 1
+                os.pwrite(self._lock_fd(), self._seen.to_bytes(8, 'little'), 0)
+            return len(series)
+
+    def slices(self, player_id: str, start: Optional[int] = None, end: Optional[int] = None) -> List[np.ndarray]:
+        """Per-chunk views of the sessions with ``start <= t < end``, in time order, without copying"""
+        self._refresh()
+        series = self._series.get(player_id)
+        if series is None or not series.chunks:
+            return []
+        chunks = series.chunks
+        first = 0 if start is None else max(0, int(np.searchsorted(series.starts, start, side='right')) - 1)
+        last = len(chunks) if end is None else int(np.searchsorted(series.starts, end, side='left'))
+        parts = []
+        for chunk in chunks[first:last]:
+            view = chunk.view()
+            lo = 0 if start is None else np.searchsorted(view['t'], start, side='left')
+            hi = chunk.size if end is None else np.searchsorted(view['t'], end, side='left')
+            if hi > lo:
+                parts.append(view[lo:hi])
+        return parts
+
+    def range(self, player_id: str, start: Optional[int] = None, end: Optional[int] = None) -> np.ndarray:
+        """Sessions with ``start <= t < end`` in time order (empty for unknown players)"""
+        parts = self.slices(player_id, start, end)
+        if not parts:
+            return np.empty(0, dtype=SESSION_DTYPE)
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+
+def _bucket_partials(sessions: np.ndarray, bounds: np.ndarray):
+    """Per-bucket session counts, metric sums and metric maxima (columns in METRICS order)"""
+    edges = np.searchsorted(sessions['t'], bounds, side='left')
+    counts = np.diff(np.append(edges, len(sessions)))
+    filled = counts > 0
+    sums = np.zeros((len(bounds), len(METRICS)))
+    maxima = np.full((len(bounds), len(METRICS)), np.nan)
+    # reduceat only over non-empty buckets, whose offsets are strictly increasing
+    offsets = edges[filled]
+    if len(offsets):
+        values = structured_to_unstructured(sessions[list(METRICS)], dtype=np.float64)
+        sums[filled] = np.add.reduceat(values, offsets, axis=0)
+        maxima[filled] = np.maximum.reduceat(values, offsets, axis=0)
+    return counts, sums, maxima
+
+
+def downsample(sessions, start: int, end: int, bucket: int, aggregation: str = 'auto') -> Dict[str, np.ndarray]:
+    """Per-bucket aggregates of every metric over [start, end).
+
+    ``sessions`` is one time-ordered array or a list of them (chunk slices,
+    one player's or several players'); each is aggregated on its own and the
+    partials combined, so they never need merging. Empty buckets are NaN, or
+    0 for sums.
+    """
+    parts = [sessions] if isinstance(sessions, np.ndarray) else sessions
+    n_buckets = max(1, -(-(end - start) // bucket))
+    bounds = start + bucket * np.arange(n_buckets)
+    counts = np.zeros(n_buckets, dtype=np.int64)
+    sums = np.zeros((n_buckets, len(METRICS)))
+    maxima = np.full((n_buckets, len(METRICS)), np.nan)
+    for part in parts:
+        if len(part):
+            part_counts, part_sums, part_maxima = _bucket_partials(part, bounds)
+            counts += part_counts
+            sums += part_sums
+            np.fmax(maxima, part_maxima, out=maxima)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = sums / counts[:, None]
+    result = {}
+    for i, metric in enumerate(METRICS):
+        how = aggregation
+        if how == 'auto':
+            how = 'sum' if metric in COUNT_METRICS else 'mean'
+        result[metric] = {'max': maxima, 'sum': sums, 'mean': means}[how][:, i]
+    return result
+
+
+def rolling_slopes(values: np.ndarray, window: int) -> np.ndarray:
+    """Least-squares slope of every ``window``-long run of ``values`` (NaNs skipped)"""
+    y = np.asarray(values, dtype=np.float64)
+    valid = ~np.isnan(y)
+    x = np.arange(len(y), dtype=np.float64)
+    window = max(2, min(window, len(y)))
+
+    def sliding(a):
+        c = np.concatenate(([0.0], np.cumsum(a)))
+        return c[window:] - c[:-window]
+
+    w = valid.astype(np.float64)
+    yv = np.where(valid, y, 0.0)
+    n = sliding(w)
+    sx, sy = sliding(x * w), sliding(yv)
+    sxx, sxy = sliding(x * x * w), sliding(x * yv)
+    denom = n * sxx - sx * sx
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where((n >= 2) & (denom > 0), (n * sxy - sx * sy) / denom, np.nan)
+
+
+def trend_label(values: np.ndarray, window: int = 8, tolerance: float = 0.02) -> Tuple[str, Optional[float]]:
+    """improving/stable/declining from the latest rolling slope and that slope per bucket.
+
+    The slope is projected over the window and compared with the series mean:
+    a change beyond ``tolerance`` (2%) counts as a trend.
+    """
+    if np.count_nonzero(~np.isnan(values)) < 2:
+        return 'stable', None
+    window = max(2, min(window, len(values)))
+    slope = rolling_slopes(values, window)[-1]
+    if np.isnan(slope):
+        return 'stable', None
+    relative = slope * window / (abs(np.nanmean(values)) or 1.0)
+    if relative > tolerance:
+        return 'improving', float(slope)
+    if relative < -tolerance:
+        return 'declining', float(slope)
+    return 'stable', float(slope)
+
+
+def synthetic_sessions(player_id: str, start: int, end: int, sessions_per_week: int = 5,
+                       seed: int = 0) -> np.ndarray:
+    """Plausible session history for demo players, reproducible per player id"""
+    digest = hashlib.blake2b(player_id.encode(), digest_size=8).digest()
+    rng = np.random.default_rng([seed, int.from_bytes(digest, 'big')])
+    n = max(0, int((end - start) / WEEK * sessions_per_week))
+    sessions = np.zeros(n, dtype=SESSION_DTYPE)
+    sessions['t'] = np.sort(rng.integers(start, end, n))
+    drift = np.linspace(0, 1, n)
+    sessions['passing_accuracy'] = np.clip(rng.normal(86 + 3 * drift, 4, n), 50, 100)
+    sessions['dribbling_success'] = np.clip(rng.normal(74 + rng.uniform(-4, 4) * drift, 6, n), 30, 100)
+    sessions['defensive_actions'] = np.clip(rng.normal(75 - 2 * drift, 8, n), 20, 100)
+    sessions['goals'] = rng.poisson(0.25, n)
+    sessions['assists'] = rng.poisson(0.18, n)
+    return sessions
@@ -0,0 +1,473 @@
+"""
+Champions Gen - Training Plan Jobs
+
+Background generation of training recommendations for many players at
+once, behind /api/training/jobs. A job is one submission of player rows;
+it is split into batches of ``batch_size`` players. With ``processes`` > 0
+the batches go to a pool of spawned worker processes, a few per process
+in flight, so throughput is bounded by cores rather than by HTTP round
+trips; with none they run in the runner thread.
+
+Jobs and their results are kept in a SQLite database under ``directory``,
+so every serving process (each prefork worker) sees, pages and cancels the
+same jobs whichever one accepted them. Each process runs a runner thread
+that claims queued jobs from the database, one running job at a time
+across all of them, in submission order; a job left running by a process
+that exited is marked failed by the next claim. A runner that died is
+restarted on the next submission or status read.
+
+Plans are kept per player together with the record version they were
+generated from, and reused by later jobs (and the per-player route) until
+that record changes. This plan store is per process and holds at most
+``max_plans`` players, least recently used first out. Each plan draws from
+its player's own seeded generator, so it is identical whichever job,
+batch or process made it; without a ``seed`` function plans are fresh
+random draws and are not kept.
+
+Results can be read while a job runs. They are appended in completion
+order, so pages by offset are stable and a reader can follow a running
+job to the end. Finished jobs past ``max_jobs`` are forgotten oldest
+first.
+"""
+
+import json
+import logging
+import math
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ai_engine import MockAIEngine
+from offload import Overloaded, burn_cpu
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 50
+# Batches in flight per worker process, so one is queued while another runs
+BATCHES_PER_PROCESS = 2
+MAX_JOBS = 100
+MAX_QUEUED_JOBS = 16
+DEFAULT_MAX_PLANS = 100000
+FINISHED_STATES = ('done', 'cancelled', 'failed')
+DATABASE = 'training_jobs.sqlite3'
+# Seconds an idle runner waits before looking for jobs another process accepted
+RUNNER_POLL_SECONDS = 1.0
+# Seconds between database reads while following a running job
+WAIT_POLL_SECONDS = 0.1
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    rows BLOB NOT NULL,
+    total INTEGER NOT NULL,
+    missing TEXT NOT NULL,
+    completed INTEGER NOT NULL DEFAULT 0,
+    reused INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    owner INTEGER
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state);
+CREATE TABLE IF NOT EXISTS results (
+    job_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    player_id TEXT NOT NULL,
+    player_name TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    plan TEXT NOT NULL,
+    PRIMARY KEY (job_id, position)
+) WITHOUT ROWID;
+'''
+JOB_COLUMNS = ('id, state, total, missing, completed, reused, error, created_at, started_at, finished_at')
+
+
+def training_batch(records: List[Dict], seeds: Sequence[Optional[int]], simulated_ms: float = 0.0):
+    """(plans, seconds) for a batch of player records; top-level so pool workers can unpickle it"""
+    start = time.perf_counter()
+    plans = []
+    for record, seed in zip(records, seeds):
+        if simulated_ms:
+            burn_cpu(simulated_ms)
+        rng = None if seed is None else np.random.default_rng(seed)
+        plans.append(MockAIEngine.generate_training_recommendations(record, rng=rng))
+    return plans, time.perf_counter() - start
+
+
+def job_status(row: Tuple) -> Dict:
+    """Status of a job from its JOB_COLUMNS"""
+    job_id, state, total, missing, completed, reused, error, created_at, started_at, finished_at = row
+    end = finished_at or time.time()
+    elapsed = end - started_at if started_at is not None else 0.0
+    generated = completed - reused
+    return {
+        'job_id': job_id,
+        'state': state,
+        'total': total,
+        'completed': completed,
+        'reused': reused,
+        'progress': round(completed / total, 4) if total else 1.0,
+        'missing': json.loads(missing),
+        'error': error,
+        'created_at': created_at,
+        'started_at': started_at,
+        'finished_at': finished_at,
+        'elapsed_ms': round(elapsed * 1000, 2),
+        'players_per_second': round(generated / elapsed, 1) if elapsed > 0 and generated else None
+    }
+
+
+def process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class TrainingJob:
+    """A job claimed by this process's runner: its rows and what it has appended so far"""
+
+    def __init__(self, job_id: str, rows: np.ndarray, started_at: float):
+        self.id = job_id
+        self.rows = rows
+        self.started_at = started_at
+        self.completed = 0
+        self.reused = 0
+        self.cancel_requested = False
+
+
+class TrainingJobs:
+    """Queue of training plan jobs in a shared database, run in batches inline or in a process pool"""
+
+    def __init__(self, store: Callable, processes: int = 0, batch_size: int = DEFAULT_BATCH_SIZE,
+                 seed: Optional[Callable[[str, int], int]] = None, simulated_ms: float = 0.0,
+                 max_jobs: int = MAX_JOBS, max_plans: int = DEFAULT_MAX_PLANS,
+                 on_batch: Optional[Callable[[str, float], None]] = None, directory: Optional[str] = None):
+        self.store = store
+        self.processes = processes
+        self.batch_size = batch_size
+        self.seed = seed
+        self.simulated_ms = simulated_ms
+        self.max_jobs = max_jobs
+        self.max_plans = max_plans
+        self.on_batch = on_batch
+        # Without a directory the jobs are private to this process (and the processes it forks)
+        self.directory = directory or tempfile.mkdtemp(prefix='champions-training-')
+        os.makedirs(self.directory, exist_ok=True)
+        self.path = os.path.join(self.directory, DATABASE)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._plans: 'OrderedDict[str, Tuple[int, List[Dict]]]' = OrderedDict()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_pid: Optional[int] = None
+        # Players generated per second by a whole job, smoothed; None until a job generated any
+        self.players_per_second: Optional[float] = None
+        self.counts = {'submitted': 0, 'generated': 0, 'reused': 0}
+        self.errors = 0
+        self.last_error: Optional[str] = None
+        self._db().executescript(SCHEMA)
+
+    def _db(self) -> sqlite3.Connection:
+        # One connection per thread, and none carried across a fork
+        local = self._local
+        if getattr(local, 'pid', None) != os.getpid():
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            local.db, local.pid = db, os.getpid()
+        return local.db
+
+    @contextmanager
+    def _transaction(self):
+        """Write transaction, serialized across threads and processes"""
+        db = self._db()
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            yield db
+        except BaseException:
+            db.execute('ROLLBACK')
+            raise
+        db.execute('COMMIT')
+
+    def close(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(cancel_futures=True)
+                self._pool = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        # A pool inherited from a prefork master belongs to the master; each process starts its own
+        if self._pool is None or self._pool_pid != os.getpid():
+            # Spawned, not forked: the serving process has threads that hold locks
+            self._pool = ProcessPoolExecutor(self.processes, mp_context=multiprocessing.get_context('spawn'))
+            self._pool_pid = os.getpid()
+        return self._pool
+
+    def plan(self, player_id: str, version: int) -> Optional[List[Dict]]:
+        """Stored plan for ``player_id`` if it was generated from record ``version``"""
+        with self._lock:
+            entry = self._plans.get(player_id)
+            if entry is None or entry[0] != version:
+                return None
+            self._plans.move_to_end(player_id)
+            return entry[1]
+
+    def remember(self, player_id: str, version: int, plan: List[Dict]):
+        """Keep a plan generated elsewhere (the per-player route) for reuse"""
+        if self.seed is None:
+            return
+        with self._lock:
+            self._remember(player_id, version, plan)
+
+    def _remember(self, player_id: str, version: int, plan: List[Dict]):
+        self._plans[player_id] = (version, plan)
+        self._plans.move_to_end(player_id)
+        while len(self._plans) > self.max_plans:
+            self._plans.popitem(last=False)
+
+    def _retry_after(self, db: sqlite3.Connection) -> int:
+        """Seconds until the queued jobs have likely run"""
+        queued = db.execute("SELECT COALESCE(SUM(total), 0) FROM jobs WHERE state = 'queued'").fetchone()[0]
+        return max(1, math.ceil(queued / (self.players_per_second or 100.0)))
+
+    def submit(self, rows: np.ndarray, missing: Sequence[str] = ()) -> Dict:
+        """Queue a job for store ``rows`` and return its status; raises Overloaded when MAX_QUEUED_JOBS
+        are already waiting"""
+        rows = np.asarray(rows, dtype=np.int64)
+        job_id = uuid.uuid4().hex
+        with self._transaction() as db:
+            if db.execute("SELECT COUNT(*) FROM jobs WHERE state = 'queued'").fetchone()[0] >= MAX_QUEUED_JOBS:
+                raise Overloaded(self._retry_after(db))
+            db.execute('INSERT INTO jobs (id, state, rows, total, missing, created_at) VALUES (?, ?, ?, ?, ?, ?)',
+                       (job_id, 'queued', rows.tobytes(), len(rows), json.dumps(list(missing)), time.time()))
+            self._forget_finished(db)
+        with self._lock:
+            self.counts['submitted'] += 1
+        self._ensure_runner()
+        self._wake.set()
+        return self.status(job_id)
+
+    def _forget_finished(self, db: sqlite3.Connection):
+        excess = db.execute('SELECT COUNT(*) FROM jobs').fetchone()[0] - self.max_jobs
+        if excess <= 0:
+            return
+        forgotten = [job_id for job_id, in db.execute(
+            'SELECT id FROM jobs WHERE state IN (?, ?, ?) ORDER BY rowid LIMIT ?', FINISHED_STATES + (excess,))]
+        db.executemany('DELETE FROM results WHERE job_id = ?', [(job_id,) for job_id in forgotten])
+        db.executemany('DELETE FROM jobs WHERE id = ?', [(job_id,) for job_id in forgotten])
+
+    def status(self, job_id: str) -> Optional[Dict]:
+        self._ensure_runner()
+        row = self._db().execute(f'SELECT {JOB_COLUMNS} FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        return None if row is None else job_status(row)
+
+    def results(self, job_id: str, offset: int, limit: Optional[int] = None) -> List[Tuple[str, str, int, List[Dict]]]:
+        """(player_id, player_name, record version, plan) in completion order, from ``offset``"""
+        rows = self._db().execute(
+            'SELECT player_id, player_name, version, plan FROM results WHERE job_id = ? AND position >= ? '
+            'ORDER BY position LIMIT ?', (job_id, offset, -1 if limit is None else limit))
+        return [(player_id, name, version, json.loads(plan)) for player_id, name, version, plan in rows]
+
+    def wait(self, job_id: str, offset: int, timeout: float) -> Tuple[List[Tuple[str, str, int, List[Dict]]], bool]:
+        """Results past ``offset`` once there are any (or the job finished, or ``timeout`` ran out), and whether it finished"""
+        deadline = time.monotonic() + timeout
+        while True:
+            # Read before the results, so none can arrive between the two
+            status = self.status(job_id)
+            finished = status is None or status['state'] in FINISHED_STATES
+            results = self.results(job_id, offset)
+            if results or finished or time.monotonic() >= deadline:
+                return results, finished
+            time.sleep(WAIT_POLL_SECONDS)
+
+    def cancel(self, job_id: str) -> Optional[Dict]:
+        """Stop a job after its batches in flight; a queued job never starts"""
+        with self._transaction() as db:
+            row = db.execute('SELECT state FROM jobs WHERE id = ?', (job_id,)).fetchone()
+            if row is None:
+                return None
+            if row[0] == 'queued':
+                db.execute("UPDATE jobs SET state = 'cancelled', finished_at = ? WHERE id = ?", (time.time(), job_id))
+            elif row[0] not in FINISHED_STATES:
+                db.execute('UPDATE jobs SET cancel_requested = 1 WHERE id = ?', (job_id,))
+        return self.status(job_id)
+
+    def _runner_running(self) -> bool:
+        return self._thread is not None and self._pid == os.getpid() and self._thread.is_alive()
+
+    def _ensure_runner(self):
+        # One runner per process; a forked worker starts its own, a dead one is replaced
+        if self._runner_running():
+            return
+        with self._lock:
+            if self._runner_running():
+                return
+
+            def run():
+                while True:
+                    self._wake.wait(RUNNER_POLL_SECONDS)
+                    self._wake.clear()
+                    try:
+                        while True:
+                            job = self._claim()
+                            if job is None:
+                                break
+                            self._run(job)
+                    except Exception as e:
+                        self.errors += 1
+                        self.last_error = f'{type(e).__name__}: {e}'
+                        logger.exception('training job runner failed')
+
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=run, name='training-jobs', daemon=True)
+            self._thread.start()
+
+    def _claim(self) -> Optional[TrainingJob]:
+        """The oldest queued job, now running here, unless a job is running in a live process"""
+        with self._transaction() as db:
+            for job_id, owner in db.execute("SELECT id, owner FROM jobs WHERE state = 'running'").fetchall():
+                # This process's runner only claims between jobs, so its own running job is an orphan too
+                if owner != os.getpid() and process_alive(owner):
+                    return None
+                db.execute("UPDATE jobs SET state = 'failed', error = ?, finished_at = ? WHERE id = ?",
+                           ('The process running the job exited', time.time(), job_id))
+            row = db.execute("SELECT id, rows FROM jobs WHERE state = 'queued' ORDER BY rowid LIMIT 1").fetchone()
+            if row is None:
+                return None
+            started_at = time.time()
+            db.execute("UPDATE jobs SET state = 'running', owner = ?, started_at = ? WHERE id = ?",
+                       (os.getpid(), started_at, row[0]))
+        return TrainingJob(row[0], np.frombuffer(row[1], dtype=np.int64).astype(np.intp), started_at)
+
+    def _run(self, job: TrainingJob):
+        try:
+            store = self.store()
+            rows = job.rows.tolist()
+            ids = [store.ids[row] for row in rows]
+            versions = store.versions[job.rows].tolist()
+            reused, todo = [], []
+            for i, (row, player_id, version) in enumerate(zip(rows, ids, versions)):
+                plan = self.plan(player_id, version) if self.seed is not None else None
+                if plan is None:
+                    todo.append(i)
+                else:
+                    reused.append((player_id, store.names[row], version, plan))
+            job.reused = len(reused)
+            self._append(job, reused)
+            batches = [todo[start:start + self.batch_size] for start in range(0, len(todo), self.batch_size)]
+            if self.processes:
+                self._run_pooled(job, batches, store, ids, versions)
+            else:
+                for batch in batches:
+                    if self._cancelled(job):
+                        break
+                    records, seeds = self._batch_inputs(job, batch, store, ids, versions)
+                    self._complete(job, batch, ids, versions, records, training_batch(records, seeds, self.simulated_ms))
+        except Exception as e:
+            if isinstance(e, BrokenProcessPool):
+                # A worker died; the next job starts a fresh pool
+                self._pool = None
+            self._finish(job, 'failed', f'{type(e).__name__}: {e}')
+        else:
+            self._finish(job, 'cancelled' if job.cancel_requested else 'done')
+        with self._lock:
+            self.counts['reused'] += job.reused
+            generated = job.completed - job.reused
+            elapsed = time.time() - job.started_at
+            if generated and elapsed > 0:
+                observed = generated / elapsed
+                self.players_per_second = (observed if self.players_per_second is None
+                                           else 0.7 * self.players_per_second + 0.3 * observed)
+
+    def _cancelled(self, job: TrainingJob) -> bool:
+        if not job.cancel_requested:
+            row = self._db().execute('SELECT cancel_requested FROM jobs WHERE id = ?', (job.id,)).fetchone()
+            job.cancel_requested = bool(row and row[0])
+        return job.cancel_requested
+
+    def _append(self, job: TrainingJob, results: List[Tuple[str, str, int, List[Dict]]]):
+        with self._transaction() as db:
+            db.executemany('INSERT INTO results VALUES (?, ?, ?, ?, ?, ?)',
+                           [(job.id, job.completed + i, player_id, name, version, json.dumps(plan))
+                            for i, (player_id, name, version, plan) in enumerate(results)])
+            job.completed += len(results)
+            db.execute('UPDATE jobs SET completed = ?, reused = ? WHERE id = ?', (job.completed, job.reused, job.id))
+
+    def _finish(self, job: TrainingJob, state: str, error: Optional[str] = None):
+        with self._transaction() as db:
+            db.execute('UPDATE jobs SET state = ?, error = ?, finished_at = ? WHERE id = ?',
+                       (state, error, time.time(), job.id))
+
+    def _run_pooled(self, job: TrainingJob, batches: List[List[int]], store, ids, versions):
+        pool = self._executor()
+        pending = {}
+        window = self.processes * BATCHES_PER_PROCESS
+        batches = deque(batches)
+        while batches or pending:
+            while batches and len(pending) < window and not self._cancelled(job):
+                batch = batches.popleft()
+                records, seeds = self._batch_inputs(job, batch, store, ids, versions)
+                pending[pool.submit(training_batch, records, seeds, self.simulated_ms)] = (batch, records)
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                batch, records = pending.pop(future)
+                self._complete(job, batch, ids, versions, records, future.result())
+
+    def _batch_inputs(self, job: TrainingJob, batch: List[int], store, ids, versions):
+        records = store.records(job.rows[batch])
+        seeds = [None if self.seed is None else self.seed(ids[i], versions[i]) for i in batch]
+        return records, seeds
+
+    def _complete(self, job: TrainingJob, batch: List[int], ids, versions, records: List[Dict], outcome):
+        plans, seconds = outcome
+        results = [(ids[i], record['name'], versions[i], plan) for i, record, plan in zip(batch, records, plans)]
+        with self._lock:
+            self.counts['generated'] += len(results)
+            if self.seed is not None:
+                for player_id, _, version, plan in results:
+                    self._remember(player_id, version, plan)
+        self._append(job, results)
+        if self.on_batch is not None:
+            self.on_batch('generate_training_recommendations_batch', seconds)
+
+    def stats(self) -> Dict:
+        self._ensure_runner()
+        states = dict(self._db().execute('SELECT state, COUNT(*) FROM jobs GROUP BY state').fetchall())
+        with self._lock:
+            return {
+                'mode': 'pool' if self.processes else 'inline',
+                'processes': self.processes,
+                'batch_size': self.batch_size,
+                'directory': self.directory,
+                'jobs': {state: states.get(state, 0) for state in ('queued', 'running') + FINISHED_STATES},
+                'stored_plans': len(self._plans),
+                'max_plans': self.max_plans,
+                'players_per_second': (round(self.players_per_second, 1)
+                                       if self.players_per_second is not None else None),
+                'runner_alive': self._runner_running(),
+                'errors': self.errors,
+                'last_error': self.last_error,
+                **self.counts
+            }
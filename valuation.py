@@ -0,0 +1,261 @@
+"""
+Champions Gen - Market Value Simulation
+
+Monte Carlo engine for market value trajectories. Every player gets
+thousands of stochastic yearly paths over the five prediction horizons,
+and the result is a percentile band per horizon rather than one
+multiplier per age bucket. Each year of a path moves the log value by:
+
+- an age-curve drift (growth until the mid-twenties, an accelerating
+  decline after) plus a small premium for the positions the market pays
+  for, with volatility that is highest for young players;
+- a performance term that starts at the player's current trend and
+  evolves as an AR(1) process, so good and bad seasons persist;
+- an occasional serious injury that knocks a share off the value.
+
+On top of that sits the contract. Value is discounted as the remaining
+term falls under two years, and at expiry a path either renews or stays
+at the full discount. Confidence comes from the band width: the mean
+log spread between the 5th and 95th percentiles, mapped onto 0-100.
+
+All players of a batch are simulated together in (players x paths)
+arrays, one vectorized step per year, in chunks that bound memory. Each
+player draws from its own seeded generator, so results do not depend on
+batching, chunking or whether a process pool ran the chunks. A latency
+budget caps the path count using the throughput measured on earlier
+runs.
+"""
+
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from ai_engine import CONTRACT_STATUSES, PERFORMANCE_TRENDS
+
+HORIZONS = 5
+PERCENTILES = (5, 25, 50, 75, 95)
+DEFAULT_PATHS = 2000
+MIN_PATHS = 200
+MAX_PATHS = 20000
+# Player-paths simulated at once per chunk of players (about 40 bytes each)
+CHUNK_SAMPLES = 1 << 21
+# Batches smaller than this stay in-process even with a pool configured
+POOL_MIN_PLAYERS = 2000
+# Share of a latency budget planned for; throughput drifts a little with batch size
+BUDGET_HEADROOM = 0.85
+
+# Annual log-value drift and volatility by age, interpolated between breakpoints
+AGE_BREAKPOINTS = np.array([17, 21, 24, 27, 30, 33, 36], dtype=np.float64)
+AGE_DRIFT = np.array([0.18, 0.12, 0.05, -0.03, -0.15, -0.28, -0.40])
+AGE_VOLATILITY = np.array([0.30, 0.26, 0.20, 0.16, 0.17, 0.20, 0.22])
+POSITION_DRIFT = {'Forward': 0.02, 'Midfielder': 0.01, 'Defender': 0.0, 'Goalkeeper': -0.01}
+# PERFORMANCE_TRENDS order (positive, stable, declining) -> starting performance term
+TREND_DRIFT = np.array([0.04, 0.0, -0.05])
+PERFORMANCE_PERSISTENCE = 0.6
+PERFORMANCE_VOLATILITY = 0.06
+INJURY_RATE = 0.06
+INJURY_SHOCK = 0.25
+# Value discount as the contract runs down: up to CONTRACT_DISCOUNT under CONTRACT_WINDOW years
+CONTRACT_DISCOUNT = 0.35
+CONTRACT_WINDOW = 2.0
+RENEWAL_PROBABILITY = 0.6
+RENEWAL_YEARS = 4.0
+# CONTRACT_STATUSES order (favorable, neutral, concerning) -> remaining years
+CONTRACT_YEARS = np.array([4.0, 2.5, 1.0])
+CONFIDENCE_SCALE = 0.3
+
+
+def contract_discount(years: np.ndarray) -> np.ndarray:
+    return CONTRACT_DISCOUNT * np.clip((CONTRACT_WINDOW - years) / CONTRACT_WINDOW, 0.0, 1.0)
+
+
+def band_confidence(bands: np.ndarray) -> np.ndarray:
+    """0-100 confidence from (players, horizons, PERCENTILES) bands: narrower is higher"""
+    low, high = bands[:, :, 0], bands[:, :, -1]
+    spread = np.log(np.maximum(high, 1.0) / np.maximum(low, 1.0)).mean(axis=1)
+    return np.clip(100.0 * np.exp(-CONFIDENCE_SCALE * spread), 1.0, 99.0)
+
+
+def row_percentiles(values: np.ndarray) -> np.ndarray:
+    """PERCENTILES of every row (linear interpolation, as np.percentile); one SIMD sort
+    per row is several times faster than np.percentile's repeated partitioning"""
+    ordered = np.sort(values, axis=1)
+    position = np.array(PERCENTILES) / 100 * (values.shape[1] - 1)
+    low = np.floor(position).astype(np.intp)
+    high = np.minimum(low + 1, values.shape[1] - 1)
+    fraction = position - low
+    return ordered[:, low] * (1 - fraction) + ordered[:, high] * fraction
+
+
+def simulate_chunk(current_values: np.ndarray, ages: np.ndarray, position_drift: np.ndarray,
+                   trends: np.ndarray, contract_years: np.ndarray, seeds: np.ndarray,
+                   paths: int) -> Dict[str, np.ndarray]:
+    """Percentile bands (n, HORIZONS, PERCENTILES) and means (n, HORIZONS) for one chunk of players"""
+    n = len(current_values)
+    generators = [np.random.default_rng(seed) for seed in seeds.tolist()]
+    # Each year every player's generator draws 2 normals and 2 uniforms per path, antithetic
+    # (the second half of the paths mirrors the first), which halves the draws and the variance
+    half = (paths + 1) // 2
+    normal_buffer = np.empty((2, n, 2 * half), dtype=np.float32)
+    uniform_buffer = np.empty((2, n, 2 * half), dtype=np.float32)
+    normals, uniforms = normal_buffer[..., :paths], uniform_buffer[..., :paths]
+
+    years = np.repeat(contract_years[:, None].astype(np.float32), paths, axis=1)
+    # Current value already carries the current contract discount
+    log_base = np.repeat(np.log(np.maximum(current_values, 1.0) / (1.0 - contract_discount(contract_years)))
+                         [:, None].astype(np.float32), paths, axis=1)
+    performance = np.repeat(TREND_DRIFT[trends][:, None].astype(np.float32), paths, axis=1)
+    scratch = np.empty_like(log_base)
+    values = np.empty_like(log_base)
+    bands = np.empty((n, HORIZONS, len(PERCENTILES)))
+    means = np.empty((n, HORIZONS))
+    for t in range(HORIZONS):
+        for i, rng in enumerate(generators):
+            normal_buffer[:, i, :half] = rng.standard_normal((2, half), dtype=np.float32)
+            uniform_buffer[:, i, :half] = rng.random((2, half), dtype=np.float32)
+        np.negative(normal_buffer[..., :half], out=normal_buffer[..., half:])
+        np.subtract(1.0, uniform_buffer[..., :half], out=uniform_buffer[..., half:])
+        age = ages + t
+        drift = (np.interp(age, AGE_BREAKPOINTS, AGE_DRIFT) + position_drift)[:, None].astype(np.float32)
+        sigma = np.interp(age, AGE_BREAKPOINTS, AGE_VOLATILITY)[:, None].astype(np.float32)
+        # In place throughout: these arrays are (players x paths) and the loop is memory-bound
+        log_base += drift
+        log_base += performance
+        np.multiply(normals[0], sigma, out=scratch)
+        log_base += scratch
+        performance *= PERFORMANCE_PERSISTENCE
+        np.multiply(normals[1], PERFORMANCE_VOLATILITY, out=scratch)
+        performance += scratch
+        np.subtract(log_base, INJURY_SHOCK, out=log_base, where=uniforms[0] < INJURY_RATE)
+        years -= 1.0
+        years[(years <= 0) & (uniforms[1] < RENEWAL_PROBABILITY)] = RENEWAL_YEARS
+        # 1 - contract_discount(years), rearranged to work in place
+        np.clip(years, 0.0, CONTRACT_WINDOW, out=scratch)
+        scratch *= CONTRACT_DISCOUNT / CONTRACT_WINDOW
+        scratch += 1.0 - CONTRACT_DISCOUNT
+        np.exp(log_base, out=values)
+        values *= scratch
+        bands[:, t] = row_percentiles(values)
+        means[:, t] = values.mean(axis=1, dtype=np.float64)
+    return {'bands': bands, 'mean': means}
+
+
+def _simulate_chunk_args(args):
+    return simulate_chunk(*args)
+
+
+class ValueSimulator:
+    """Batched Monte Carlo market value bands with a latency budget and optional process pool"""
+
+    def __init__(self, processes: int = 0):
+        self.processes = processes
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        # Player-paths per second, smoothed over runs; None until the first run
+        self.throughput: Optional[float] = None
+
+    def close(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(cancel_futures=True)
+                self._pool = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                # Spawned, not forked: the serving process has threads that hold locks
+                self._pool = ProcessPoolExecutor(self.processes, mp_context=multiprocessing.get_context('spawn'))
+            return self._pool
+
+    def _pooled(self, n: int) -> bool:
+        return self.processes > 1 and n >= POOL_MIN_PLAYERS
+
+    def plan_paths(self, n: int, paths: int, budget_ms: Optional[float] = None) -> int:
+        """Paths per player that fit ``budget_ms`` at the measured throughput (at most ``paths``)"""
+        paths = int(np.clip(paths, MIN_PATHS, MAX_PATHS))
+        if not budget_ms or not n:
+            return paths
+        if self.throughput is None:
+            pilot = min(n, 32)
+            self.simulate(np.full(pilot, 1e7), np.full(pilot, 25.0), ['Midfielder'] * pilot,
+                          paths=MIN_PATHS, seeds=np.arange(pilot))
+        throughput = self.throughput * (self.processes if self._pooled(n) else 1)
+        fitting = int(budget_ms * BUDGET_HEADROOM / 1000 * throughput / n)
+        return int(np.clip(fitting // 100 * 100, MIN_PATHS, paths))
+
+    def simulate(self, current_values, ages, positions: Sequence[str], trends=None, contract_years=None,
+                 paths: int = DEFAULT_PATHS, budget_ms: Optional[float] = None, seeds=None,
+                 rng: Optional[np.random.Generator] = None) -> Dict:
+        """Percentile bands per player and horizon.
+
+        ``trends`` and ``contract_years`` default to a stable trend and the
+        'neutral' contract term; ``seeds`` (one per player) make results
+        reproducible, otherwise they are drawn from ``rng``. Returns
+        ``bands`` (N, HORIZONS, PERCENTILES), ``mean`` (N, HORIZONS),
+        ``confidence`` (N,) and the ``paths`` actually run.
+        """
+        current_values = np.asarray(current_values, dtype=np.float64)
+        n = len(current_values)
+        ages = np.asarray(ages, dtype=np.float64)
+        position_drift = np.array([POSITION_DRIFT.get(p, 0.0) for p in positions], dtype=np.float64)
+        trends = np.ones(n, dtype=np.intp) if trends is None else np.asarray(trends, dtype=np.intp)
+        contract_years = (np.full(n, CONTRACT_YEARS[1]) if contract_years is None
+                          else np.asarray(contract_years, dtype=np.float64))
+        if seeds is None:
+            seeds = (rng or np.random.default_rng()).integers(0, 2 ** 63, n, dtype=np.uint64)
+        seeds = np.asarray(seeds, dtype=np.uint64)
+        paths = self.plan_paths(n, paths, budget_ms)
+
+        start = time.perf_counter()
+        pooled = self._pooled(n)
+        size = max(1, CHUNK_SAMPLES // paths)
+        if pooled:
+            size = min(size, -(-n // self.processes))
+        chunks = [(current_values[i:i + size], ages[i:i + size], position_drift[i:i + size], trends[i:i + size],
+                   contract_years[i:i + size], seeds[i:i + size], paths) for i in range(0, n, size)]
+        if pooled:
+            results = list(self._executor().map(_simulate_chunk_args, chunks))
+        else:
+            results = [simulate_chunk(*chunk) for chunk in chunks]
+        elapsed = time.perf_counter() - start
+        if n and not pooled:
+            observed = n * paths / max(elapsed, 1e-6)
+            self.throughput = observed if self.throughput is None else 0.7 * self.throughput + 0.3 * observed
+
+        bands = (np.concatenate([r['bands'] for r in results]) if results
+                 else np.empty((0, HORIZONS, len(PERCENTILES))))
+        means = np.concatenate([r['mean'] for r in results]) if results else np.empty((0, HORIZONS))
+        return {
+            'bands': bands,
+            'mean': means,
+            'confidence': band_confidence(bands),
+            'paths': paths,
+            'elapsed_ms': elapsed * 1000
+        }
+
+
+def value_bands(current_value: float, bands: np.ndarray, mean: np.ndarray, confidence: float) -> Dict:
+    """One player's simulation as JSON: a band per horizon in whole currency units"""
+    return {
+        'current_value': int(current_value),
+        'confidence': round(float(confidence), 1),
+        'horizons': [{
+            'years': t + 1,
+            'mean': int(mean[t]),
+            **{f'p{q}': int(v) for q, v in zip(PERCENTILES, bands[t].tolist())}
+        } for t in range(HORIZONS)]
+    }
+
+
+def simulation_inputs(predictions: List[Dict]) -> Dict[str, np.ndarray]:
+    """Trend and contract-years arrays from value predictions' factors (predict_market_value output)"""
+    trends, years = [], []
+    for prediction in predictions:
+        factors = {f['name']: f['impact'] for f in prediction['factors']}
+        trends.append(PERFORMANCE_TRENDS.index(factors['Performance Trend']))
+        years.append(CONTRACT_YEARS[CONTRACT_STATUSES.index(factors['Contract Status'])])
+    return {'trends': np.array(trends, dtype=np.intp), 'contract_years': np.array(years, dtype=np.float64)}
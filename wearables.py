@@ -0,0 +1,361 @@
+"""
+Champions Gen - Wearables Workload Tracker
+
+Ingests GPS/heart-rate samples in batches and folds them straight into
+per-player daily load totals, so acute:chronic workload ratios (ACWR) are
+always current without keeping or re-scanning raw samples.
+
+Batches arrive either as packed binary records (``SAMPLE_DTYPE``, read with
+``np.frombuffer`` without parsing) or as NDJSON lines. Each sample's load is
+Banister TRIMP over the time since that player's previous sample; distance
+and high-speed running come from GPS speed. Per player the tracker keeps a
+28-day ring of daily totals: acute load is the 7-day mean, chronic load the
+28-day mean, and the ratio feeds the injury-risk drivers. Windows end at
+the current (UTC) day, per player, so a player who stops training decays
+toward no load and nobody else's samples move their window. Samples with a
+non-finite, negative or future timestamp are dropped at ingest.
+
+Given a directory (``CHAMPIONS_STATE_DIR``), the rings and counters live in
+one memory-mapped file there, so prefork workers all read and fold into the
+same totals; ingests lock the file exclusively, reads share it.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows, where serve.py runs a single process
+    fcntl = None
+
+SAMPLE_DTYPE = np.dtype([
+    ('player_id', 'S32'),
+    ('t', '<f8'),           # epoch seconds
+    ('speed', '<f4'),       # m/s, NaN if no GPS fix
+    ('heart_rate', '<f4'),  # bpm, NaN if no HR strap
+])
+CHANNELS = ('load', 'distance', 'high_speed_distance')
+ACUTE_DAYS = 7
+CHRONIC_DAYS = 28
+DAY = 86400
+# Gaps longer than this (strap off, half time) contribute no load
+MAX_SAMPLE_GAP = 5.0
+# Device clocks may run this far ahead of the server's before a sample counts as future-dated
+MAX_CLOCK_SKEW = 300.0
+HIGH_SPEED = 5.5  # m/s
+REST_HR, MAX_HR = 60.0, 200.0
+
+WORKLOADS_FILE = 'workloads.bin'
+# Tracker-wide counters, then one SLOT_DTYPE record per player in order of first sample
+HEADER_DTYPE = np.dtype([
+    ('capacity', '<i8'), ('players', '<i8'), ('samples', '<i8'), ('invalid', '<i8'),
+    ('batches', '<i8'), ('latest_day', '<i8'),
+    ('batch_samples', '<i8'), ('batch_players', '<i8'), ('batch_invalid', '<i8'), ('batch_ms', '<f8'),
+])
+SLOT_DTYPE = np.dtype([
+    ('player_id', 'S32'),
+    ('daily', '<f8', (CHRONIC_DAYS, len(CHANNELS))),  # ring of daily totals, indexed by day % CHRONIC_DAYS
+    ('day', '<i8'),        # latest day in the ring
+    ('first_day', '<i8'),
+    ('last_t', '<f8'),     # the player's latest sample
+])
+
+
+def parse_binary(body: bytes) -> np.ndarray:
+    """Packed SAMPLE_DTYPE records"""
+    if len(body) % SAMPLE_DTYPE.itemsize:
+        raise ValueError(f'Binary body must be a whole number of {SAMPLE_DTYPE.itemsize}-byte samples')
+    return np.frombuffer(body, dtype=SAMPLE_DTYPE)
+
+
+def parse_ndjson(text: str) -> np.ndarray:
+    """One ``{"player_id", "t", "speed", "heart_rate"}`` object per line"""
+    lines = [line for line in text.splitlines() if line.strip()]
+    try:
+        # One json.loads over the joined lines is much faster than one per line
+        records = json.loads('[' + ','.join(lines) + ']')
+    except json.JSONDecodeError as e:
+        raise ValueError(f'Invalid NDJSON: {e.msg}') from None
+    samples = np.zeros(len(records), dtype=SAMPLE_DTYPE)
+    try:
+        samples['player_id'] = [r['player_id'].encode() for r in records]
+        samples['t'] = [r['t'] for r in records]
+        samples['speed'] = [r.get('speed', np.nan) for r in records]
+        samples['heart_rate'] = [r.get('heart_rate', np.nan) for r in records]
+    except (KeyError, TypeError, AttributeError) as e:
+        raise ValueError(f'Invalid sample: {e!r}') from None
+    return samples
+
+
+def sample_loads(dt: np.ndarray, speed: np.ndarray, heart_rate: np.ndarray) -> np.ndarray:
+    """Per-sample (TRIMP load, distance, high-speed distance) as an (n, 3) array"""
+    reserve = np.clip((np.nan_to_num(heart_rate, nan=REST_HR) - REST_HR) / (MAX_HR - REST_HR), 0, 1)
+    trimp = dt / 60.0 * reserve * 0.64 * np.exp(1.92 * reserve)
+    distance = np.nan_to_num(speed) * dt
+    return np.column_stack((trimp, distance, np.where(np.nan_to_num(speed) >= HIGH_SPEED, distance, 0.0)))
+
+
+class WorkloadTracker:
+    """Rolling daily load totals per player, updated incrementally per batch.
+
+    With a ``directory`` the totals live in a memory-mapped file there, shared
+    by every process that opens it; otherwise in this process's memory.
+    """
+
+    def __init__(self, capacity: int = 64, clock: Callable[[], float] = time.time,
+                 directory: Optional[str] = None):
+        self._lock = threading.Lock()
+        self._clock = clock
+        self._slots: Dict[str, int] = {}
+        self.path = os.path.join(directory, WORKLOADS_FILE) if directory else None
+        self._fd: Optional[int] = None
+        self._fd_pid: Optional[int] = None
+        if self.path is None:
+            self._header = np.zeros(1, dtype=HEADER_DTYPE)
+            self._header['capacity'] = capacity
+            self._header['latest_day'] = -1
+            self._records = np.zeros(capacity, dtype=SLOT_DTYPE)
+            return
+        os.makedirs(directory, exist_ok=True)
+        fd = self._file()
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(fd).st_size < HEADER_DTYPE.itemsize:
+                os.ftruncate(fd, HEADER_DTYPE.itemsize + capacity * SLOT_DTYPE.itemsize)
+                header = np.zeros(1, dtype=HEADER_DTYPE)
+                header['capacity'] = capacity
+                header['latest_day'] = -1
+                os.pwrite(fd, header.tobytes(), 0)
+            self._map()
+            self._sync()
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+
+    def _file(self) -> int:
+        if self._fd_pid != os.getpid():
+            # An inherited descriptor would share its lock with the parent; each process opens its own
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            self._fd_pid = os.getpid()
+        return self._fd
+
+    def _map(self):
+        self._header = np.memmap(self.path, dtype=HEADER_DTYPE, mode='r+', shape=(1,))
+        self._records = np.memmap(self.path, dtype=SLOT_DTYPE, mode='r+', offset=HEADER_DTYPE.itemsize,
+                                  shape=(int(self._header['capacity'][0]),))
+
+    def _sync(self):
+        """Follow slots added, and the file grown, by other processes"""
+        if self.path is not None and int(self._header['capacity'][0]) != len(self._records):
+            self._map()
+        players = int(self._header['players'][0])
+        for slot in range(len(self._slots), players):
+            self._slots[self._records['player_id'][slot].decode()] = slot
+
+    @contextmanager
+    def _locked(self, exclusive: bool = False):
+        """This process's lock plus, with a file, a lock on it shared with the other processes"""
+        with self._lock:
+            if self.path is None or fcntl is None:
+                yield
+                return
+            fd = self._file()
+            fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                self._sync()
+                yield
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+
+    def _slot(self, player_id: str) -> int:
+        slot = self._slots.get(player_id)
+        if slot is None:
+            slot = int(self._header['players'][0])
+            capacity = len(self._records)
+            if slot == capacity:
+                self._header['capacity'] = 2 * capacity
+                if self.path is None:
+                    self._records = np.concatenate((self._records, np.zeros_like(self._records)))
+                else:
+                    os.ftruncate(self._file(), HEADER_DTYPE.itemsize + 2 * capacity * SLOT_DTYPE.itemsize)
+                    self._map()
+            record = self._records[slot:slot + 1]
+            record['player_id'] = player_id.encode()
+            record['daily'] = 0
+            record['day'] = record['first_day'] = -1
+            record['last_t'] = np.nan
+            self._header['players'] = slot + 1
+            self._slots[player_id] = slot
+        return slot
+
+    def _add_day(self, slot: int, day: int, totals: np.ndarray):
+        daily, days, first_days = self._records['daily'], self._records['day'], self._records['first_day']
+        current = days[slot]
+        if current < 0:
+            current = days[slot] = first_days[slot] = day
+        first_days[slot] = min(first_days[slot], day)
+        if day > current:
+            if day - current >= CHRONIC_DAYS:
+                daily[slot] = 0
+            else:
+                for skipped in range(current + 1, day + 1):
+                    daily[slot, skipped % CHRONIC_DAYS] = 0
+            days[slot] = current = day
+        if day > current - CHRONIC_DAYS:
+            daily[slot, day % CHRONIC_DAYS] += totals
+
+    @property
+    def samples(self) -> int:
+        return int(self._header['samples'][0])
+
+    @property
+    def invalid(self) -> int:
+        return int(self._header['invalid'][0])
+
+    @property
+    def batches(self) -> int:
+        return int(self._header['batches'][0])
+
+    @property
+    def latest_day(self) -> int:
+        return int(self._header['latest_day'][0])
+
+    @property
+    def last_batch(self) -> Dict:
+        header = self._header[0]
+        if not header['batches']:
+            return {}
+        duration = float(header['batch_ms']) / 1000
+        return {
+            'samples': int(header['batch_samples']),
+            'players': int(header['batch_players']),
+            'invalid': int(header['batch_invalid']),
+            'duration_ms': round(duration * 1000, 3),
+            'samples_per_sec': round(int(header['batch_samples']) / duration) if duration > 0 else None
+        }
+
+    def ingest(self, samples: np.ndarray) -> Dict:
+        """Fold a batch into the daily totals; returns per-batch counts and timing.
+
+        Samples should arrive roughly in time order per player: a sample older
+        than the player's previous one contributes no load. Samples timed
+        before the epoch, after now (plus MAX_CLOCK_SKEW) or not at all are
+        dropped and counted as ``invalid``.
+        """
+        start = time.perf_counter()
+        valid = (samples['t'] >= 0) & (samples['t'] <= self._clock() + MAX_CLOCK_SKEW)
+        invalid = len(samples) - int(valid.sum())
+        if invalid:
+            samples = samples[valid]
+        if not len(samples):
+            with self._locked(exclusive=True):
+                self._header['invalid'] += invalid
+            return {'samples': 0, 'players': 0, 'invalid': invalid, 'duration_ms': 0.0}
+        ids, inverse = np.unique(samples['player_id'], return_inverse=True)
+        with self._locked(exclusive=True):
+            self._header['invalid'] += invalid
+            slots = np.array([self._slot(i.decode()) for i in ids])[inverse]
+            order = np.lexsort((samples['t'], slots))
+            slots, t = slots[order], samples['t'][order]
+
+            # Time since each player's previous sample, continuing from the last batch
+            previous = np.empty_like(t)
+            previous[1:] = t[:-1]
+            first = np.ones(len(t), dtype=bool)
+            first[1:] = slots[1:] != slots[:-1]
+            last_ts = self._records['last_t']
+            previous[first] = last_ts[slots[first]]
+            dt = np.clip(np.nan_to_num(t - previous), 0, MAX_SAMPLE_GAP)
+            loads = sample_loads(dt, samples['speed'][order].astype(np.float64),
+                                 samples['heart_rate'][order].astype(np.float64))
+            last = np.append(first[1:], True)
+            last_ts[slots[last]] = np.fmax(last_ts[slots[last]], t[last])
+
+            # Daily totals per (player, day), then a handful of ring updates
+            days = (t // DAY).astype(np.int64)
+            first_day = int(days.min())
+            span = int(days.max()) - first_day + 1
+            # Sorted by (player, time), so keys are non-decreasing and each group contiguous
+            keys = slots * span + (days - first_day)
+            starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+            totals = np.add.reduceat(loads, starts, axis=0)
+            for key, total in zip(keys[starts].tolist(), totals):
+                self._add_day(key // span, first_day + key % span, total)
+
+            header = self._header
+            header['latest_day'] = max(self.latest_day, int(days.max()))
+            header['samples'] += len(samples)
+            header['batches'] += 1
+            duration = time.perf_counter() - start
+            header['batch_samples'] = len(samples)
+            header['batch_players'] = len(ids)
+            header['batch_invalid'] = invalid
+            header['batch_ms'] = duration * 1000
+            return self.last_batch
+
+    def _today(self) -> int:
+        return int(self._clock() // DAY)
+
+    def _window(self, slot: int, today: int) -> np.ndarray:
+        """Daily totals for the CHRONIC_DAYS ending today, most recent first"""
+        days = today - np.arange(CHRONIC_DAYS)
+        latest = self._records['day'][slot]
+        held = (days <= latest) & (days > latest - CHRONIC_DAYS)
+        return np.where(held[:, None], self._records['daily'][slot, days % CHRONIC_DAYS], 0.0)
+
+    def workload(self, player_id: str) -> Optional[Dict]:
+        """Acute/chronic loads and ACWR for a player, or None without any samples.
+
+        Until a player has CHRONIC_DAYS of history both means cover only the
+        days held, so a new player's first week does not read as a spike.
+        """
+        with self._locked():
+            slot = self._slots.get(player_id)
+            if slot is None:
+                return None
+            today = self._today()
+            window = self._window(slot, today)
+            last_t = float(self._records['last_t'][slot])
+            # Samples up to MAX_CLOCK_SKEW ahead can start a player's history tomorrow
+            history = int(max(1, min(CHRONIC_DAYS, today - self._records['first_day'][slot] + 1)))
+        acute = window[:ACUTE_DAYS, 0].sum() / min(ACUTE_DAYS, history)
+        chronic = window[:, 0].sum() / history
+        return {
+            'history_days': history,
+            'acute_load': round(float(acute), 2),
+            'chronic_load': round(float(chronic), 2),
+            'acwr': round(float(acute / chronic), 2) if chronic > 0 else None,
+            'load_48h': round(float(window[:2, 0].sum()), 2),
+            'distance_7d_m': round(float(window[:ACUTE_DAYS, 1].sum()), 1),
+            'high_speed_distance_7d_m': round(float(window[:ACUTE_DAYS, 2].sum()), 1),
+            'last_sample': float(last_t)
+        }
+
+    def signature(self, player_id: str) -> Tuple:
+        """The workload values that move a prediction, for cache keys"""
+        workload = self.workload(player_id)
+        if workload is None:
+            return ()
+        return workload['acwr'], workload['load_48h'], workload['chronic_load']
+
+    def players(self) -> List[str]:
+        with self._locked():
+            return list(self._slots)
+
+    def stats(self) -> Dict:
+        return {
+            'players': len(self.players()),
+            'samples': self.samples,
+            'batches': self.batches,
+            'invalid_samples': self.invalid,
+            'latest_day': (time.strftime('%Y-%m-%d', time.gmtime(self.latest_day * DAY))
+                           if self.latest_day >= 0 else None),
+            'last_batch': self.last_batch
+        }